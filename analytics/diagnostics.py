@@ -9,15 +9,29 @@ Features:
 - Per-symbol, per-strategy file organization
 - Non-blocking writes (best-effort)
 - Automatic directory creation
+
+Writes go through a background DiagnosticsWriter: append_diagnostic()
+only queues the record. The writer thread drains the queue in batches
+(when ``batch_size`` records are waiting or every ``flush_interval_sec``),
+keeps up to ``max_open_files`` file handles open in an LRU pool instead of
+opening each file per record, and when the queue is full drops records by
+policy ("drop_oldest" or "drop_newest"), counting them. load_diagnostics()
+flushes pending records first and reads only the tail of the file.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -54,18 +68,265 @@ def path_for(symbol: str, strategy: str) -> Path:
     Returns:
         Path to JSONL file for this symbol-strategy pair
     """
-    # Sanitize symbol and strategy names (remove invalid chars)
-    safe_symbol = "".join(c for c in symbol if c.isalnum() or c in "_-")
-    safe_strategy = "".join(c for c in strategy if c.isalnum() or c in "_-")
+    file_path = _file_path(symbol, strategy)
     
     # Create symbol subdirectory
-    symbol_dir = DIAGNOSTICS_DIR / safe_symbol
     try:
-        symbol_dir.mkdir(parents=True, exist_ok=True)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
     except Exception as exc:
-        logger.debug("Failed to create symbol directory %s: %s", symbol_dir, exc)
+        logger.debug("Failed to create symbol directory %s: %s", file_path.parent, exc)
     
-    return symbol_dir / f"{safe_strategy}.jsonl"
+    return file_path
+
+
+@lru_cache(maxsize=4096)
+def _safe_name(name: str) -> str:
+    """Strip characters that are not valid in a file name."""
+    return "".join(c for c in name if c.isalnum() or c in "_-")
+
+
+def _file_path(symbol: str, strategy: str) -> Path:
+    """path_for() without creating the directory (the writer creates it on open)."""
+    return DIAGNOSTICS_DIR / _safe_name(symbol) / f"{_safe_name(strategy)}.jsonl"
+
+
+class DiagnosticsWriter:
+    """
+    Background writer batching diagnostic records into their JSONL files.
+    
+    Args:
+        max_queue: Records that may wait for the writer thread
+        batch_size: Queued records that wake the writer before the interval
+        flush_interval_sec: Longest time a record waits in the queue
+        max_open_files: Size of the LRU file handle pool
+        drop_policy: "drop_oldest" evicts the oldest queued record for a new
+            one when the queue is full, "drop_newest" rejects the new one
+        idle_close_sec: Close handles unused for this long
+    """
+    
+    DROP_POLICIES = ("drop_oldest", "drop_newest")
+    
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval_sec: float = 1.0,
+        max_open_files: int = 64,
+        drop_policy: str = "drop_oldest",
+        idle_close_sec: float = 60.0,
+    ):
+        if drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {self.DROP_POLICIES}, got {drop_policy!r}")
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_sec = float(flush_interval_sec)
+        self.max_open_files = max(1, int(max_open_files))
+        self.drop_policy = drop_policy
+        self.idle_close_sec = float(idle_close_sec)
+        
+        self._queue: Deque[Tuple[Path, Dict[str, Any]]] = deque()
+        self._cond = threading.Condition()
+        # Held while draining so batches reach each file in queue order
+        self._io_lock = threading.Lock()
+        # path -> (handle, last use); least recently used first
+        self._handles: "OrderedDict[Path, Tuple[IO[str], float]]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.stats: Dict[str, int] = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "errors": 0,
+            "batches": 0,
+            "files_opened": 0,
+            "files_evicted": 0,
+        }
+    
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "DiagnosticsWriter":
+        """Build from a ``diagnostics`` config block."""
+        cfg = cfg or {}
+        keys = ("max_queue", "batch_size", "flush_interval_sec", "max_open_files", "drop_policy", "idle_close_sec")
+        return cls(**{key: cfg[key] for key in keys if key in cfg})
+    
+    def submit(self, path: Path, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record for path; never blocks on I/O.
+        
+        A shallow copy is queued, so the caller may reuse or update its dict
+        once submit() returns.
+        
+        Returns:
+            False when the record was dropped (queue full with drop_newest,
+            or the writer is closed)
+        """
+        with self._cond:
+            if self._stopping:
+                self.stats["dropped"] += 1
+                return False
+            if len(self._queue) >= self.max_queue:
+                self.stats["dropped"] += 1
+                if self.drop_policy == "drop_newest":
+                    return False
+                self._queue.popleft()
+            self._queue.append((path, dict(record)))
+            self.stats["queued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        if self._thread is None:
+            self._start()
+        return True
+    
+    def flush(self) -> None:
+        """Write everything queued so far (on the calling thread)."""
+        self._drain()
+    
+    def close(self) -> None:
+        """Stop the writer thread, write what is queued and close all handles."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self._drain()
+        with self._io_lock:
+            for handle, _ in self._handles.values():
+                self._close_handle(handle)
+            self._handles.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus the current queue depth and open handle count."""
+        with self._cond:
+            return {**self.stats, "pending": len(self._queue), "open_files": len(self._handles)}
+    
+    def _start(self) -> None:
+        with self._cond:
+            if self._thread is not None or self._stopping:
+                return
+            self._thread = threading.Thread(target=self._run, name="diagnostics-writer", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval_sec)
+                stopping = self._stopping
+            self._drain()
+            if stopping:
+                return
+    
+    def _drain(self) -> None:
+        with self._io_lock:
+            with self._cond:
+                batch = list(self._queue)
+                self._queue.clear()
+            if batch:
+                self._write_batch(batch)
+            self._close_idle()
+    
+    def _write_batch(self, batch: List[Tuple[Path, Dict[str, Any]]]) -> None:
+        # Group by file, keeping per-file order
+        lines: Dict[Path, List[str]] = {}
+        for path, record in batch:
+            try:
+                lines.setdefault(path, []).append(json.dumps(record, default=str))
+            except Exception as exc:
+                self.stats["errors"] += 1
+                logger.debug("Failed to serialize diagnostic for %s: %s", path, exc)
+        
+        written = 0
+        for path, file_lines in lines.items():
+            try:
+                handle = self._handle(path)
+                handle.write("\n".join(file_lines) + "\n")
+                handle.flush()
+                written += len(file_lines)
+            except Exception as exc:
+                self.stats["errors"] += 1
+                self._discard_handle(path)
+                logger.debug("Failed to write %d diagnostics to %s: %s", len(file_lines), path, exc)
+        with self._cond:
+            self.stats["written"] += written
+            self.stats["batches"] += 1
+    
+    def _handle(self, path: Path) -> IO[str]:
+        entry = self._handles.get(path)
+        now = time.monotonic()
+        if entry is not None:
+            self._handles.move_to_end(path)
+            self._handles[path] = (entry[0], now)
+            return entry[0]
+        while len(self._handles) >= self.max_open_files:
+            _, (old, _) = self._handles.popitem(last=False)
+            self._close_handle(old)
+            self.stats["files_evicted"] += 1
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open("a", encoding="utf-8")
+        self._handles[path] = (handle, now)
+        self.stats["files_opened"] += 1
+        return handle
+    
+    def _discard_handle(self, path: Path) -> None:
+        entry = self._handles.pop(path, None)
+        if entry is not None:
+            self._close_handle(entry[0])
+    
+    def _close_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_close_sec
+        while self._handles:
+            path, (handle, last_used) = next(iter(self._handles.items()))
+            if last_used > cutoff:
+                break
+            del self._handles[path]
+            self._close_handle(handle)
+    
+    @staticmethod
+    def _close_handle(handle: IO[str]) -> None:
+        try:
+            handle.close()
+        except Exception as exc:
+            logger.debug("Failed to close diagnostics file: %s", exc)
+
+
+_writer: Optional[DiagnosticsWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_diagnostics_writer() -> DiagnosticsWriter:
+    """Process-wide DiagnosticsWriter used by append_diagnostic()."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = DiagnosticsWriter()
+    return _writer
+
+
+def configure_diagnostics_writer(cfg: Optional[Dict[str, Any]]) -> DiagnosticsWriter:
+    """Replace the process-wide writer with one built from a ``diagnostics`` config block."""
+    global _writer
+    writer = DiagnosticsWriter.from_config(cfg)
+    with _writer_lock:
+        previous, _writer = _writer, writer
+    if previous is not None:
+        previous.close()
+    return writer
+
+
+def flush_diagnostics() -> None:
+    """Write all queued diagnostics now (engine shutdown, before reads)."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def _close_writer() -> None:
+    if _writer is not None:
+        _writer.close()
+
+
+atexit.register(_close_writer)
 
 
 def append_diagnostic(
@@ -77,7 +338,8 @@ def append_diagnostic(
     Append a diagnostic record to the symbol-strategy JSONL file.
     
     This is a non-blocking, best-effort operation that should never
-    crash or slow down the trading engine.
+    crash or slow down the trading engine: the record is queued on the
+    DiagnosticsWriter and written by its background thread.
     
     Args:
         symbol: Trading symbol
@@ -95,25 +357,14 @@ def append_diagnostic(
             - reason: str
     
     Returns:
-        True if write succeeded, False otherwise
+        True if the record was queued, False if it was dropped
     """
     try:
-        # Ensure base directory exists
-        ensure_diagnostics_dir()
-        
-        # Get file path
-        file_path = path_for(symbol, strategy)
-        
         # Ensure timestamp is present
         if "ts" not in record:
             record["ts"] = datetime.now(timezone.utc).isoformat()
         
-        # Append to JSONL file
-        with file_path.open("a", encoding="utf-8") as f:
-            json.dump(record, f)
-            f.write("\n")
-        
-        return True
+        return get_diagnostics_writer().submit(_file_path(symbol, strategy), record)
         
     except Exception as exc:
         # Log at debug level to avoid noise
@@ -141,29 +392,30 @@ def load_diagnostics(
         List of diagnostic records (most recent first)
     """
     try:
-        file_path = path_for(symbol, strategy)
+        file_path = _file_path(symbol, strategy)
+        
+        # Records still queued for this file would otherwise be missed
+        flush_diagnostics()
         
         if not file_path.exists():
             logger.debug("No diagnostics file found for %s/%s", symbol, strategy)
             return []
         
-        # Read all lines from the file
+        # Parse lines from the end of the file, most recent first
         records = []
-        with file_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    records.append(record)
-                except json.JSONDecodeError as exc:
-                    logger.debug("Failed to parse diagnostic line: %s", exc)
-                    continue
-        
-        # Return most recent records first
-        records = records[-limit:] if len(records) > limit else records
-        records.reverse()  # Most recent first
+        if limit <= 0:
+            return records
+        for line in _tail_lines(file_path):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                logger.debug("Failed to parse diagnostic line: %s", exc)
+                continue
+            if len(records) >= limit:
+                break
         
         return records
         
@@ -175,6 +427,26 @@ def load_diagnostics(
         return []
 
 
+def _tail_lines(file_path: Path, block_size: int = 65536):
+    """Yield the lines of a file last to first, reading fixed-size blocks from the end."""
+    with file_path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + remainder
+            lines = chunk.split(b"\n")
+            # The first piece may be the end of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
 def build_diagnostic_record(
     price: float,
     decision: str,
@@ -241,5 +513,9 @@ __all__ = [
     "path_for",
     "append_diagnostic",
     "load_diagnostics",
+    "DiagnosticsWriter",
+    "get_diagnostics_writer",
+    "configure_diagnostics_writer",
+    "flush_diagnostics",
     "build_diagnostic_record",
 ]
@@ -18,6 +18,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from core import indicators
+from core.indicator_cache import bar_key, get_indicator_cache
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +67,14 @@ class HTFTrendResult:
         }
 
 
-def compute_ema_trend(close_prices: List[float], ema_fast_period: int = 20, ema_slow_period: int = 50) -> Dict[str, Any]:
+def compute_ema_trend(
+    close_prices: List[float],
+    ema_fast_period: int = 20,
+    ema_slow_period: int = 50,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    key: Optional[Any] = None,
+) -> Dict[str, Any]:
     """
     Compute EMA-based trend from close prices.
     
@@ -74,6 +82,9 @@ def compute_ema_trend(close_prices: List[float], ema_fast_period: int = 20, ema_
         close_prices: List of close prices (oldest first)
         ema_fast_period: Period for fast EMA (default: 20)
         ema_slow_period: Period for slow EMA (default: 50)
+        symbol: Symbol for the shared indicator cache (uncached if omitted)
+        timeframe: Timeframe of close_prices
+        key: Last-bar key from core.indicator_cache.bar_key
     
     Returns:
         Dict with trend info: trend, ema_fast, ema_slow, separation
@@ -87,8 +98,12 @@ def compute_ema_trend(close_prices: List[float], ema_fast_period: int = 20, ema_
         }
     
     try:
-        ema_fast = indicators.ema(close_prices, ema_fast_period)
-        ema_slow = indicators.ema(close_prices, ema_slow_period)
+        cache = get_indicator_cache()
+        n = len(close_prices)
+        ema_fast = cache.get(symbol, timeframe, key, ("ema", ema_fast_period, n),
+                             lambda: indicators.ema(close_prices, ema_fast_period))
+        ema_slow = cache.get(symbol, timeframe, key, ("ema", ema_slow_period, n),
+                             lambda: indicators.ema(close_prices, ema_slow_period))
         
         if ema_fast is None or ema_slow is None:
             return {
@@ -141,9 +156,9 @@ def compute_htf_trend(
     to determine the overall higher timeframe bias.
     
     Args:
-        symbol: Trading symbol (for logging purposes)
-        htf_df_15m: Dict with 'close' list for 15m timeframe
-        htf_df_1h: Dict with 'close' list for 1h timeframe
+        symbol: Trading symbol (logging and the shared indicator cache)
+        htf_df_15m: Dict with 'close' list (and optional 'ts' list) for 15m timeframe
+        htf_df_1h: Dict with 'close' list (and optional 'ts' list) for 1h timeframe
         ema_fast_period: Period for fast EMA (default: 20)
         ema_slow_period: Period for slow EMA (default: 50)
     
@@ -158,7 +173,10 @@ def compute_htf_trend(
         trend_15m_result = compute_ema_trend(
             htf_df_15m["close"],
             ema_fast_period,
-            ema_slow_period
+            ema_slow_period,
+            symbol=symbol,
+            timeframe="15m",
+            key=bar_key(htf_df_15m),
         )
     
     # Compute 1h trend
@@ -167,7 +185,10 @@ def compute_htf_trend(
         trend_1h_result = compute_ema_trend(
             htf_df_1h["close"],
             ema_fast_period,
-            ema_slow_period
+            ema_slow_period,
+            symbol=symbol,
+            timeframe="1h",
+            key=bar_key(htf_df_1h),
         )
     
     trend_15m = trend_15m_result["trend"]
@@ -237,6 +258,8 @@ def compute_htf_trend_from_series(
     close_1h: Optional[List[float]] = None,
     ema_fast_period: int = 20,
     ema_slow_period: int = 50,
+    ts_15m: Optional[List[Any]] = None,
+    ts_1h: Optional[List[Any]] = None,
 ) -> HTFTrendResult:
     """
     Convenience function to compute HTF trend from close price lists.
@@ -247,12 +270,14 @@ def compute_htf_trend_from_series(
         close_1h: List of close prices for 1h timeframe
         ema_fast_period: Period for fast EMA (default: 20)
         ema_slow_period: Period for slow EMA (default: 50)
+        ts_15m: Optional bar timestamps matching close_15m (enables caching)
+        ts_1h: Optional bar timestamps matching close_1h (enables caching)
     
     Returns:
         HTFTrendResult with trend analysis
     """
-    htf_df_15m = {"close": close_15m} if close_15m else None
-    htf_df_1h = {"close": close_1h} if close_1h else None
+    htf_df_15m = {"close": close_15m, "ts": ts_15m} if close_15m else None
+    htf_df_1h = {"close": close_1h, "ts": ts_1h} if close_1h else None
     
     return compute_htf_trend(
         symbol=symbol,
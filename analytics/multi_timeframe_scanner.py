@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from core.history_loader import load_history, resample_history
+from core.indicators_np import linear_recurrence
 
 
 TIMEFRAME_CONFIG: Dict[str, Dict[str, object]] = {
@@ -42,7 +45,11 @@ def _ensure_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
+    if isinstance(df["timestamp"].dtype, pd.DatetimeTZDtype):
+        # load_history already parsed it; to_datetime would re-scan every value
+        df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+    else:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
     df = df.dropna(subset=["timestamp", "close"])
     df.sort_values("timestamp", inplace=True)
     df.reset_index(drop=True, inplace=True)
@@ -188,30 +195,276 @@ class MultiTimeframeScanner:
             else:
                 df = df_source
 
-            enriched = _compute_indicator_frame(df, timeframe=tf, intraday=bool(cfg.get("intraday")))
-            enriched = enriched.dropna(subset=["close"])
-            if enriched.empty:
-                continue
-            last = enriched.iloc[-1]
-            snapshots.append(
-                IndicatorSnapshot(
-                    symbol=symbol.upper(),
-                    timeframe=tf,
-                    timestamp=last["timestamp"],
-                    close=float(last["close"]),
-                    ema20=_safe_float(last.get("ema20")),
-                    ema50=_safe_float(last.get("ema50")),
-                    ema100=_safe_float(last.get("ema100")),
-                    ema200=_safe_float(last.get("ema200")),
-                    rsi14=_safe_float(last.get("rsi14")),
-                    atr14=_safe_float(last.get("atr14")),
-                    adx14=_safe_float(last.get("adx14")),
-                    vwap=_safe_float(last.get("vwap")),
-                    rel_volume=_safe_float(last.get("rel_volume")),
-                )
-            )
+            snapshot = _snapshot_from_frame(symbol, tf, df)
+            if snapshot is not None:
+                snapshots.append(snapshot)
         return snapshots
 
+    def scan_universe(
+        self,
+        symbols: Sequence[str],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, List[IndicatorSnapshot]]:
+        """
+        Batch mode of scan_symbol for many symbols.
+
+        For each timeframe all symbols are aligned into (symbols x bars)
+        arrays and every indicator is computed in one vectorized pass;
+        timeframes run in parallel threads. Returns symbol -> snapshots in
+        self.timeframes order, matching scan_symbol(symbol) for each symbol.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        daily: Dict[str, pd.DataFrame] = {}
+        if any(TIMEFRAME_CONFIG[tf]["interval"] == "day" for tf in self.timeframes):
+            daily = {sym: load_history(sym, "day") for sym in symbols}
+
+        def frames_for(tf: str) -> Dict[str, pd.DataFrame]:
+            cfg = TIMEFRAME_CONFIG[tf]
+            frames: Dict[str, pd.DataFrame] = {}
+            for sym in symbols:
+                df = daily[sym] if cfg["interval"] == "day" else load_history(sym, cfg["interval"])  # type: ignore[arg-type]
+                if df.empty:
+                    continue
+                if cfg.get("resample"):
+                    df = resample_history(df, cfg["resample"])  # type: ignore[arg-type]
+                frames[sym] = df
+            return frames
+
+        def scan_tf(tf: str) -> Dict[str, IndicatorSnapshot]:
+            intraday = bool(TIMEFRAME_CONFIG[tf].get("intraday"))
+            return _batch_snapshots(frames_for(tf), tf, intraday)
+
+        workers = max_workers or len(self.timeframes) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mtf-scan") as pool:
+            per_tf = list(pool.map(scan_tf, self.timeframes))
+
+        results: Dict[str, List[IndicatorSnapshot]] = {sym: [] for sym in symbols}
+        for by_symbol in per_tf:
+            for sym, snapshot in by_symbol.items():
+                results[sym].append(snapshot)
+        return results
+
+
+def _snapshot_from_frame(symbol: str, tf: str, df: pd.DataFrame) -> Optional[IndicatorSnapshot]:
+    intraday = bool(TIMEFRAME_CONFIG[tf].get("intraday"))
+    enriched = _compute_indicator_frame(df, timeframe=tf, intraday=intraday)
+    enriched = enriched.dropna(subset=["close"])
+    if enriched.empty:
+        return None
+    last = enriched.iloc[-1]
+    return IndicatorSnapshot(
+        symbol=symbol.upper(),
+        timeframe=tf,
+        timestamp=last["timestamp"],
+        close=float(last["close"]),
+        ema20=_safe_float(last.get("ema20")),
+        ema50=_safe_float(last.get("ema50")),
+        ema100=_safe_float(last.get("ema100")),
+        ema200=_safe_float(last.get("ema200")),
+        rsi14=_safe_float(last.get("rsi14")),
+        atr14=_safe_float(last.get("atr14")),
+        adx14=_safe_float(last.get("adx14")),
+        vwap=_safe_float(last.get("vwap")),
+        rel_volume=_safe_float(last.get("rel_volume")),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Batch (symbols x bars) pass
+#
+# Each symbol's bars are right-aligned in a matrix so column -1 is every
+# symbol's latest bar; shorter histories are NaN-padded on the left. The
+# functions below return the latest value per row with the same semantics
+# as the pandas helpers above (ewm adjust=False seeded at the first valid
+# value, min_periods, rolling windows).
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Panel:
+    symbols: List[str]
+    timestamps: List[pd.Timestamp]  # latest bar per row
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    day: np.ndarray  # UTC day number per bar (-1 in the padding)
+    counts: np.ndarray  # real bars per row
+
+    @property
+    def first(self) -> np.ndarray:
+        """Column index of each row's first real bar."""
+        return self.close.shape[1] - self.counts
+
+
+def _build_panel(frames: Dict[str, pd.DataFrame]) -> _Panel:
+    width = max(len(df) for df in frames.values())
+    rows = len(frames)
+    high, low, close, volume = (np.full((rows, width), np.nan) for _ in range(4))
+    day = np.full((rows, width), -1, dtype=np.int64)
+    counts = np.zeros(rows, dtype=np.int64)
+    timestamps: List[pd.Timestamp] = []
+    for i, df in enumerate(frames.values()):
+        n = len(df)
+        cols = slice(width - n, width)
+        high[i, cols] = pd.to_numeric(df["high"], errors="coerce").to_numpy(dtype=float)
+        low[i, cols] = pd.to_numeric(df["low"], errors="coerce").to_numpy(dtype=float)
+        close[i, cols] = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float)
+        volume[i, cols] = pd.to_numeric(df["volume"], errors="coerce").to_numpy(dtype=float)
+        ts = df["timestamp"].dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+        day[i, cols] = ts.astype("datetime64[D]").astype(np.int64)
+        counts[i] = n
+        timestamps.append(df["timestamp"].iloc[-1])
+    return _Panel(list(frames), timestamps, high, low, close, volume, day, counts)
+
+
+def _backfill(values: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Replace each row's left padding with its first real value."""
+    rows = np.arange(values.shape[0])
+    seed = values[rows, first]
+    pad = np.arange(values.shape[1])[None, :] < first[:, None]
+    return np.where(pad, seed[:, None], values)
+
+
+def _ewm_last(values: np.ndarray, first: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Latest ewm(alpha, adjust=False) value per row, seeded at column `first`.
+
+    Padding is filled with the seed, which the recurrence leaves unchanged,
+    so every row can share one pass from column 0.
+    """
+    filled = _backfill(values, first)
+    if filled.shape[1] == 1:
+        return filled[:, 0]
+    return linear_recurrence(alpha * filled[:, 1:], 1.0 - alpha, filled[:, 0])[:, -1]
+
+
+def _batch_ema(panel: _Panel, span: int) -> np.ndarray:
+    last = _ewm_last(panel.close, panel.first, 2.0 / (span + 1.0))
+    return np.where(panel.counts >= span, last, np.nan)
+
+
+def _batch_rsi(panel: _Panel, period: int = 14) -> np.ndarray:
+    width = panel.close.shape[1]
+    if width < 2:
+        return np.full(len(panel.symbols), np.nan)
+    delta = np.diff(panel.close, axis=1)
+    # The first real delta sits at column first (bar first + 1)
+    first = np.minimum(panel.first, width - 2)
+    avg_gain = _ewm_last(np.clip(delta, 0, None), first, 1.0 / period)
+    avg_loss = _ewm_last(-np.clip(delta, None, 0), first, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        rsi = 100 - (100 / (1 + rs))
+    return np.where(panel.counts - 1 >= period, rsi, np.nan)
+
+
+def _true_range(panel: _Panel) -> np.ndarray:
+    prev_close = np.empty_like(panel.close)
+    prev_close[:, 0] = np.nan
+    prev_close[:, 1:] = panel.close[:, :-1]
+    # fmax skips NaN like DataFrame.max(axis=1), so the first bar is high - low
+    return np.fmax(
+        panel.high - panel.low,
+        np.fmax(np.abs(panel.high - prev_close), np.abs(panel.low - prev_close)),
+    )
+
+
+def _batch_atr(panel: _Panel, period: int = 14) -> np.ndarray:
+    last = _ewm_last(_true_range(panel), panel.first, 1.0 / period)
+    return np.where(panel.counts >= period, last, np.nan)
+
+
+def _batch_adx(panel: _Panel, period: int = 14) -> np.ndarray:
+    rows, width = panel.close.shape
+    need = 2 * period - 1  # dx needs `period` bars, adx averages `period` dx values
+    if width < need:
+        return np.full(rows, np.nan)
+
+    up_move = np.full_like(panel.high, np.nan)
+    down_move = np.full_like(panel.low, np.nan)
+    up_move[:, 1:] = np.diff(panel.high, axis=1)
+    down_move[:, 1:] = -np.diff(panel.low, axis=1)
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    span = min(width, need + period - 1)
+    windows = lambda x: sliding_window_view(x[:, -span:], period, axis=1)  # noqa: E731
+    atr = windows(_true_range(panel)).mean(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * windows(plus_dm).sum(axis=2) / atr
+        minus_di = 100 * windows(minus_dm).sum(axis=2) / atr
+        dx = np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    dx[np.isinf(dx)] = np.nan
+    adx = (dx[:, -period:] * 100).mean(axis=1)
+    return np.where(panel.counts >= need, adx, np.nan)
+
+
+def _batch_vwap(panel: _Panel) -> np.ndarray:
+    """VWAP of each row's latest session (UTC date of the last bar)."""
+    same_day = panel.day == panel.day[:, -1:]
+    typical = (panel.high + panel.low + panel.close) / 3.0
+    volume = np.nan_to_num(panel.volume, nan=0.0)
+    tpv = np.where(same_day, typical * volume, 0.0)
+    vol = np.where(same_day, volume, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nansum(tpv, axis=1) / np.where(vol == 0, np.nan, vol)
+
+
+def _batch_rel_volume(panel: _Panel, window: int = 20, min_periods: int = 5) -> np.ndarray:
+    recent = panel.volume[:, -window:]
+    valid = np.sum(~np.isnan(recent), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(recent, axis=1) / valid
+        rel = panel.volume[:, -1] / np.where(valid >= min_periods, mean, np.nan)
+    return rel
+
+
+def _batch_snapshots(frames: Dict[str, pd.DataFrame], tf: str, intraday: bool) -> Dict[str, IndicatorSnapshot]:
+    """Latest IndicatorSnapshot per symbol for one timeframe in a single vectorized pass."""
+    prepared: Dict[str, pd.DataFrame] = {}
+    snapshots: Dict[str, IndicatorSnapshot] = {}
+    for sym, df in frames.items():
+        df = _ensure_dataframe(df)
+        if df.empty:
+            continue
+        high = pd.to_numeric(df["high"], errors="coerce")
+        low = pd.to_numeric(df["low"], errors="coerce")
+        if high.isna().any() or low.isna().any():
+            # Gaps inside the bars change pandas' NaN handling; keep the exact path
+            snapshot = _snapshot_from_frame(sym, tf, df)
+            if snapshot is not None:
+                snapshots[sym] = snapshot
+            continue
+        prepared[sym] = df
+    if not prepared:
+        return snapshots
+
+    panel = _build_panel(prepared)
+    columns = {
+        "ema20": _batch_ema(panel, 20),
+        "ema50": _batch_ema(panel, 50),
+        "ema100": _batch_ema(panel, 100),
+        "ema200": _batch_ema(panel, 200),
+        "rsi14": _batch_rsi(panel, 14),
+        "atr14": _batch_atr(panel, 14),
+        "adx14": _batch_adx(panel, 14),
+        "vwap": _batch_vwap(panel) if intraday else np.full(len(panel.symbols), np.nan),
+        "rel_volume": _batch_rel_volume(panel),
+    }
+    closes = panel.close[:, -1]
+    for i, sym in enumerate(panel.symbols):
+        values = {name: _safe_float(column[i]) for name, column in columns.items()}
+        snapshots[sym] = IndicatorSnapshot(
+            symbol=sym.upper(),
+            timeframe=tf,
+            timestamp=panel.timestamps[i],
+            close=float(closes[i]),
+            **values,
+        )
+    return snapshots
+
 
 def _safe_float(value: object) -> Optional[float]:
     try:
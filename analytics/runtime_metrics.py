@@ -49,6 +49,7 @@ class RuntimeMetrics:
     pnl_per_symbol: Dict[str, float] = field(default_factory=dict)
     pnl_per_strategy: Dict[str, float] = field(default_factory=dict)
     equity_curve: List[Dict[str, Any]] = field(default_factory=list)
+    evaluations: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -117,6 +118,9 @@ class RuntimeMetricsTracker:
         # Rolling equity curve
         self.equity_curve: deque = deque(maxlen=equity_curve_maxlen)
         
+        # Strategy evaluation counters (executed / skipped by the scheduler)
+        self.evaluations: Dict[str, Any] = {}
+        
         # Track last snapshot time for rate limiting
         self._last_snapshot_time = 0.0
         
@@ -234,6 +238,16 @@ class RuntimeMetricsTracker:
         with self._lock:
             self.pnl_per_strategy[strategy] += pnl_delta
     
+    def update_evaluation_stats(self, stats: Dict[str, Any]) -> None:
+        """
+        Record the latest strategy evaluation counters.
+        
+        Args:
+            stats: EvaluationScheduler.snapshot() (executed, skipped, triggers)
+        """
+        with self._lock:
+            self.evaluations = dict(stats)
+    
     def push_equity_snapshot(
         self,
         min_interval_sec: float = 5.0,
@@ -298,6 +312,7 @@ class RuntimeMetricsTracker:
                 pnl_per_symbol=dict(self.pnl_per_symbol),
                 pnl_per_strategy=dict(self.pnl_per_strategy),
                 equity_curve=list(self.equity_curve),
+                evaluations=dict(self.evaluations),
             )
     
     def save(self) -> bool:
@@ -359,6 +374,7 @@ def load_runtime_metrics(
         "pnl_per_symbol": {},
         "pnl_per_strategy": {},
         "equity_curve": [],
+        "evaluations": {},
     }
     
     # Determine path
@@ -0,0 +1,426 @@
+"""
+In-memory bar store and precomputed indicators for Backtest Engine v3.
+
+Replaying history through StrategyEngineV2 one bar at a time would
+recompute every indicator over the lookback window on every bar. A
+backtest knows the whole history up front, so instead:
+
+- BarStore reads each symbol's bars from HistoricalDataLoader once and
+  keeps them as float64 arrays (SymbolBars);
+- IndicatorArrays computes every StrategyEngineV2 indicator as a full
+  series with the NumPy backend (core/indicators_np) in one pass;
+- each bar step then only indexes into those arrays: ``bundle(i)`` is the
+  indicator dict a strategy sees on bar ``i`` and ``SymbolBars.window``
+  hands out array views as the strategy's ``series``.
+
+SharedBarStore holds the same bars and indicator columns for many
+symbols in one shared-memory block, so worker processes (parameter
+sweeps) read them without parsing CSVs or recomputing anything.
+
+Indicator values are computed over all bars up to and including ``i``
+(what StrategyEngineV2 produces when handed the whole history as its
+window), and keys appear with the batch path's warmup rules: nothing
+before 20 bars, only ema9/ema20 before 50 bars, ema100/ema200 from 100/200
+bars. Extra EMA periods (``ema_periods``) appear from ``max(period, 20)``
+bars.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from datetime import date, datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core import indicators_np
+
+logger = logging.getLogger(__name__)
+
+# (bars required, keys added) in the order StrategyEngineV2 adds them
+_WARMUP_STAGES: Tuple[Tuple[int, Tuple[str, ...]], ...] = (
+    (20, ("ema9", "ema20")),
+    (50, (
+        "ema50", "sma20", "sma50", "rsi14", "atr14", "bb_upper", "bb_middle", "bb_lower",
+        "supertrend", "supertrend_direction", "vwap", "slope10", "hl2", "hl3", "trend",
+    )),
+    (100, ("ema100",)),
+    (200, ("ema200",)),
+)
+_STANDARD_KEYS = frozenset(key for _, keys in _WARMUP_STAGES for key in keys)
+
+
+def strategy_ema_periods(params: Dict[str, Any]) -> frozenset:
+    """EMA periods a strategy config reads: the integer values of its ``ema_*`` params."""
+    return frozenset(
+        value for name, value in params.items()
+        if name.startswith("ema_") and isinstance(value, int) and not isinstance(value, bool) and value > 0
+    )
+
+
+class SymbolBars:
+    """One symbol's bars as arrays, oldest first."""
+
+    __slots__ = ("symbol", "timestamps", "open", "high", "low", "close", "volume", "_columns", "_days")
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamps: List[Any],
+        open_: Iterable[float],
+        high: Iterable[float],
+        low: Iterable[float],
+        close: Iterable[float],
+        volume: Iterable[float],
+    ) -> None:
+        self.symbol = symbol
+        # Object array so window() slices stay views, like the price arrays
+        self.timestamps = np.empty(len(timestamps), dtype=object)
+        self.timestamps[:] = timestamps
+        self.open = indicators_np.as_array(open_)
+        self.high = indicators_np.as_array(high)
+        self.low = indicators_np.as_array(low)
+        self.close = indicators_np.as_array(close)
+        self.volume = indicators_np.as_array(volume)
+        self._columns: Optional[Tuple[List[float], ...]] = None
+        self._days: Optional[List[date]] = None
+
+    @classmethod
+    def from_bars(cls, symbol: str, bars: Iterable[Dict[str, Any]]) -> "SymbolBars":
+        """Build from HistoricalDataLoader bar dicts."""
+        ts: List[Any] = []
+        o: List[float] = []
+        h: List[float] = []
+        l: List[float] = []
+        c: List[float] = []
+        v: List[float] = []
+        for bar in bars:
+            ts.append(bar["timestamp"])
+            o.append(bar["open"])
+            h.append(bar["high"])
+            l.append(bar["low"])
+            c.append(bar["close"])
+            v.append(bar.get("volume", 0.0))
+        return cls(symbol, ts, o, h, l, c, v)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def bar(self, i: int) -> Dict[str, Any]:
+        """Bar ``i`` in HistoricalDataLoader format (plain floats) plus its symbol."""
+        if self._columns is None:
+            self._columns = tuple(a.tolist() for a in (self.open, self.high, self.low, self.close, self.volume))
+        o, h, l, c, v = self._columns
+        return {
+            "symbol": self.symbol,
+            "timestamp": self.timestamps[i],
+            "open": o[i],
+            "high": h[i],
+            "low": l[i],
+            "close": c[i],
+            "volume": v[i],
+        }
+
+    def index_range(self, start: date, end: date) -> Tuple[int, int]:
+        """``(lo, hi)`` such that bars ``lo..hi-1`` fall on dates ``start..end``."""
+        if self._days is None:
+            self._days = [ts.date() for ts in self.timestamps]
+        return bisect.bisect_left(self._days, start), bisect.bisect_right(self._days, end)
+
+    def window(self, i: int, size: int) -> Dict[str, Any]:
+        """
+        The ``series`` a strategy sees on bar ``i``: the last ``size`` bars up
+        to and including ``i``, as read-only array views (no copies).
+        """
+        start = max(0, i + 1 - size)
+        end = i + 1
+        return {
+            "open": self.open[start:end],
+            "high": self.high[start:end],
+            "low": self.low[start:end],
+            "close": self.close[start:end],
+            "volume": self.volume[start:end],
+            "ts": self.timestamps[start:end],
+        }
+
+
+class IndicatorArrays:
+    """StrategyEngineV2 indicator series for every bar of one symbol."""
+
+    def __init__(self, columns: Dict[str, np.ndarray], length: int) -> None:
+        self.columns = columns
+        self.length = length
+        self._lists: Optional[Dict[str, List[Any]]] = None
+
+    @classmethod
+    def compute(cls, bars: SymbolBars, ema_periods: Iterable[int] = ()) -> "IndicatorArrays":
+        """
+        Compute every series in one pass over the symbol's history, plus an
+        ``ema<period>`` column for each extra period.
+        """
+        n = len(bars)
+        close, high, low, volume = bars.close, bars.high, bars.low, bars.volume
+        columns: Dict[str, np.ndarray] = {}
+        if n < 20:
+            return cls(columns, n)
+
+        for period in sorted({9, 20, 50, 100, 200, *(int(p) for p in ema_periods)}):
+            if 1 <= period <= n:
+                columns[f"ema{period}"] = indicators_np.ema(close, period, return_series=True)
+        if n >= 50:
+            columns["sma20"] = indicators_np.sma(close, 20, return_series=True)
+            columns["sma50"] = indicators_np.sma(close, 50, return_series=True)
+            # rsi() has one value per price change; bar 0 has none
+            rsi = np.full(n, np.nan)
+            rsi[1:] = indicators_np.rsi(close, 14, return_series=True)
+            columns["rsi14"] = rsi
+            columns["atr14"] = indicators_np.atr(high, low, close, 14, return_series=True)
+            bb = indicators_np.bollinger(close, 20, 2.0, return_series=True)
+            columns["bb_upper"], columns["bb_middle"], columns["bb_lower"] = bb["upper"], bb["middle"], bb["lower"]
+            st = indicators_np.supertrend(high, low, close, 10, 3.0, return_series=True)
+            columns["supertrend"], columns["supertrend_direction"] = st["supertrend"], st["direction"]
+            columns["vwap"] = indicators_np.vwap(close, volume, return_series=True)
+            columns["slope10"] = indicators_np.slope(close, 10, return_series=True)
+            columns["hl2"] = indicators_np.hl2(high, low, return_series=True)
+            columns["hl3"] = indicators_np.hl3(high, low, close, return_series=True)
+        return cls(columns, n)
+
+    def _as_lists(self) -> Dict[str, List[Any]]:
+        # Python lists index several times faster than arrays and yield plain floats
+        if self._lists is None:
+            lists: Dict[str, List[Any]] = {name: values.tolist() for name, values in self.columns.items()}
+            if "ema50" in lists:
+                lists["trend"] = np.where(self.columns["ema20"] > self.columns["ema50"], "up", "down").tolist()
+            self._lists = lists
+        return self._lists
+
+    def _stages(self) -> List[Tuple[int, List[Tuple[str, List[Any]]]]]:
+        """(first bar index, [(key, values)]) for each warmup stage reached."""
+        lists = self._as_lists()
+        required_keys: Dict[int, List[str]] = {required: list(keys) for required, keys in _WARMUP_STAGES}
+        for key in self.columns:
+            if key not in _STANDARD_KEYS:  # extra EMA periods
+                required_keys.setdefault(max(int(key[3:]), 20), []).append(key)
+        stages = []
+        active: List[Tuple[str, List[Any]]] = []
+        for required in sorted(required_keys):
+            if self.length < required:
+                break
+            active = active + [(key, lists[key]) for key in required_keys[required] if key in lists]
+            stages.append((required - 1, active))
+        return stages
+
+    def bundle(self, i: int) -> Dict[str, Any]:
+        """The indicator dict for bar ``i`` (empty during warmup)."""
+        active: List[Tuple[str, List[Any]]] = []
+        for first, keys in self._stages():
+            if i < first:
+                break
+            active = keys
+        return {key: values[i] for key, values in active}
+
+    def iter_bundles(self, start: int = 0, stop: Optional[int] = None):
+        """Yield bundle(i) for bars ``start..stop-1`` in order, resolving warmup stages once."""
+        stop = self.length if stop is None else min(stop, self.length)
+        stages = self._stages()
+        bounds = [first for first, _ in stages] + [self.length]
+        for _ in range(start, min(bounds[0] if stages else self.length, stop)):
+            yield {}
+        for (first, keys), end in zip(stages, bounds[1:]):
+            for i in range(max(first, start), min(end, stop)):
+                yield {key: values[i] for key, values in keys}
+
+
+class BarStore:
+    """
+    Bars and indicator arrays per symbol, loaded on first use and kept in
+    memory until released. ``ema_periods`` adds EMA columns beyond the
+    standard ones.
+    """
+
+    def __init__(self, data_loader: Any, start_date: str, end_date: str, ema_periods: Iterable[int] = ()) -> None:
+        self.data_loader = data_loader
+        self.start_date = start_date
+        self.end_date = end_date
+        self.ema_periods = frozenset(ema_periods)
+        self._bars: Dict[str, SymbolBars] = {}
+        self._indicators: Dict[str, IndicatorArrays] = {}
+
+    def bars(self, symbol: str) -> SymbolBars:
+        bars = self._bars.get(symbol)
+        if bars is None:
+            bars = SymbolBars.from_bars(
+                symbol, self.data_loader.iter_bars(symbol, self.start_date, self.end_date)
+            )
+            self._bars[symbol] = bars
+            logger.debug("BarStore: loaded %d bars for %s", len(bars), symbol)
+        return bars
+
+    def indicators(self, symbol: str) -> IndicatorArrays:
+        arrays = self._indicators.get(symbol)
+        if arrays is None:
+            arrays = self._indicators[symbol] = IndicatorArrays.compute(self.bars(symbol), self.ema_periods)
+        return arrays
+
+    def use_ema_periods(self, periods: Iterable[int]) -> None:
+        """Make sure ``indicators()`` has these EMA periods (recomputed on next use if not)."""
+        periods = frozenset(periods)
+        if not periods <= self.ema_periods:
+            self.ema_periods |= periods
+            self._indicators.clear()
+
+    def release(self, symbol: str) -> None:
+        """Drop a symbol's bars and indicators."""
+        self._bars.pop(symbol, None)
+        self._indicators.pop(symbol, None)
+
+    def keep_only(self, symbol: str) -> None:
+        """Drop every symbol except ``symbol``."""
+        for cached in [name for name in self._bars if name != symbol]:
+            self.release(cached)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_BAR_ROWS = ("ts_us", "open", "high", "low", "close", "volume")
+
+
+def _epoch_us(ts: datetime) -> int:
+    return (ts - (_EPOCH if ts.tzinfo is not None else _EPOCH_NAIVE)) // _MICROSECOND
+
+
+def _from_epoch_us(values: np.ndarray, tz: Any) -> List[datetime]:
+    if tz is None:
+        return [_EPOCH_NAIVE + timedelta(microseconds=us) for us in values.astype(np.int64).tolist()]
+    return [(_EPOCH + timedelta(microseconds=us)).astimezone(tz) for us in values.astype(np.int64).tolist()]
+
+
+class SharedBarStore:
+    """
+    Bars and indicator columns of several symbols in one shared-memory
+    block, with the BarStore interface.
+
+    The parent process builds it once with ``create()`` (which reads each
+    symbol through a BarStore and computes its indicators) and hands
+    ``spec`` to the worker processes it starts, which ``attach()``. Each symbol is a
+    (rows x bars) float64 matrix: timestamps as epoch microseconds (rebuilt
+    in the first bar's timezone), OHLCV, then the indicator columns.
+    ``bars()`` and ``indicators()`` return views into the block, built once
+    per process and symbol.
+
+    ``ema_periods`` selects the extra EMA columns ``indicators()`` hands
+    out (None: all of them), so parameter sets that read the same periods
+    share one memoized IndicatorArrays and their bundles carry only the
+    columns they need.
+
+    Use as a context manager in the creating process to free the block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: Dict[str, Any], owner: bool) -> None:
+        self._shm = shm
+        self.spec = spec
+        self._owner = owner
+        self.ema_periods: Optional[frozenset] = None
+        self._matrix: Dict[str, np.ndarray] = {}
+        self._bars: Dict[str, SymbolBars] = {}
+        self._indicators: Dict[Tuple[str, Optional[frozenset]], IndicatorArrays] = {}
+        buffer = np.ndarray((shm.size // 8,), dtype=np.float64, buffer=shm.buf)
+        for symbol, layout in spec["symbols"].items():
+            rows, length = len(layout["rows"]), layout["length"]
+            start = layout["offset"]
+            self._matrix[symbol] = buffer[start:start + rows * length].reshape(rows, length)
+
+    @classmethod
+    def create(cls, bar_store: BarStore, symbols: Sequence[str], ema_periods: Iterable[int] = ()) -> "SharedBarStore":
+        """Load ``symbols`` through ``bar_store`` and copy them into a new block."""
+        ema_periods = tuple(ema_periods)
+        parts: List[Tuple[str, List[str], List[np.ndarray], Any]] = []
+        for symbol in symbols:
+            bars = bar_store.bars(symbol)
+            arrays = IndicatorArrays.compute(bars, ema_periods)
+            ts_us = np.array([_epoch_us(ts) for ts in bars.timestamps], dtype=np.float64)
+            tz = bars.timestamps[0].tzinfo if len(bars) else None
+            names = list(_BAR_ROWS) + list(arrays.columns)
+            values = [ts_us, bars.open, bars.high, bars.low, bars.close, bars.volume] + list(arrays.columns.values())
+            parts.append((symbol, names, values, tz))
+            bar_store.release(symbol)
+
+        layouts: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for symbol, names, values, tz in parts:
+            length = len(values[0])
+            layouts[symbol] = {"offset": offset, "length": length, "rows": names, "tz": tz}
+            offset += len(names) * length
+        shm = shared_memory.SharedMemory(create=True, size=max(8, offset * 8))
+        store = cls(shm, {"name": shm.name, "symbols": layouts}, owner=True)
+        for symbol, _, values, _ in parts:
+            matrix = store._matrix[symbol]
+            for row, series in enumerate(values):
+                matrix[row] = series
+        logger.info("SharedBarStore: %d symbols, %.1f MB in %s", len(parts), offset * 8 / 1e6, shm.name)
+        return store
+
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> "SharedBarStore":
+        """
+        Open a block created by the parent process. Children share the
+        parent's resource tracker, so the block is unlinked once, by the
+        owner's close().
+        """
+        return cls(shared_memory.SharedMemory(name=spec["name"]), spec, owner=False)
+
+    def _rows(self, symbol: str) -> Dict[str, np.ndarray]:
+        matrix = self._matrix[symbol]
+        return dict(zip(self.spec["symbols"][symbol]["rows"], matrix))
+
+    def bars(self, symbol: str) -> SymbolBars:
+        bars = self._bars.get(symbol)
+        if bars is None:
+            rows = self._rows(symbol)
+            timestamps = _from_epoch_us(rows["ts_us"], self.spec["symbols"][symbol]["tz"])
+            bars = SymbolBars(symbol, timestamps, rows["open"], rows["high"], rows["low"], rows["close"], rows["volume"])
+            self._bars[symbol] = bars
+        return bars
+
+    def indicators(self, symbol: str) -> IndicatorArrays:
+        key = (symbol, self.ema_periods)
+        arrays = self._indicators.get(key)
+        if arrays is None:
+            wanted = None if self.ema_periods is None else {f"ema{period}" for period in self.ema_periods}
+            columns = {
+                name: values for name, values in self._rows(symbol).items()
+                if name not in _BAR_ROWS and (wanted is None or name in _STANDARD_KEYS or name in wanted)
+            }
+            arrays = self._indicators[key] = IndicatorArrays(columns, self.spec["symbols"][symbol]["length"])
+        return arrays
+
+    def use_ema_periods(self, periods: Iterable[int]) -> None:
+        """Hand out only these extra EMA columns (they must be in the block)."""
+        self.ema_periods = frozenset(periods)
+
+    def release(self, symbol: str) -> None:
+        """Nothing to free per symbol; the block lives until close()."""
+
+    def keep_only(self, symbol: str) -> None:
+        """Nothing to free per symbol; the block lives until close()."""
+
+    def close(self) -> None:
+        self._matrix.clear()
+        self._bars.clear()
+        self._indicators.clear()
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views handed out earlier are still referenced; the mapping goes with them
+            logger.debug("SharedBarStore %s still has views in use", self._shm.name)
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedBarStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -10,25 +10,42 @@ This module provides the core backtest engine that:
 
 from __future__ import annotations
 
+import importlib
+import itertools
 import json
 import logging
+import shutil
+import time
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from analytics.strategy_analytics import StrategyAnalyticsEngine
+from backtest.bar_store import BarStore, strategy_ema_periods
 from backtest.data_loader import HistoricalDataLoader
+from backtest.event_loop import SymbolStream, merge_bar_streams
+from backtest.sharding import Shard, ShardRows, plan_shards, run_shards
 from core.portfolio_engine import PortfolioConfig, PortfolioEngine
 from core.regime_detector import RegimeDetector
 from core.risk_engine_v2 import OrderPlan, RiskConfig, RiskEngine, RiskState
 from core.state_store import JournalStateStore, StateStore, make_fresh_state_from_config
-from core.strategy_engine_v2 import OrderIntent, StrategyEngineV2
+from core.strategy_engine_v2 import BaseStrategy, OrderIntent, StrategyEngineV2, StrategyState
 from core.trade_guardian import TradeGuardian
 
 logger = logging.getLogger(__name__)
 
+# Journal rows are buffered and appended in batches of this size
+JOURNAL_BATCH_SIZE = 500
+
+
+class _DrawdownStop(Exception):
+    """Raised from the replay once equity falls past stop_drawdown_pct."""
+
 
 @dataclass
 class BacktestConfig:
@@ -44,6 +61,12 @@ class BacktestConfig:
         timeframe: Bar timeframe ('1m', '5m', '15m', '1h', '1d')
         initial_equity: Starting capital
         position_sizing_mode: Position sizing mode ('fixed_qty', 'fixed_risk_atr')
+        workers: Worker processes for a sharded run
+        shard_by: Shard granularity ('symbol', 'day'); None runs serially
+            unless workers > 1, which shards by symbol (see backtest/sharding.py)
+        event_loop: 'per_symbol' replays one symbol after another;
+            'chronological' replays all symbols together in timestamp
+            order (see backtest/event_loop.py)
     """
     
     symbols: List[str]
@@ -61,6 +84,12 @@ class BacktestConfig:
     regime_config: Optional[Dict[str, Any]] = None
     enable_guardian: bool = False
     
+    # Sharded execution
+    workers: int = 1
+    shard_by: Optional[str] = None
+    
+    event_loop: str = "per_symbol"
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -73,6 +102,9 @@ class BacktestConfig:
             "initial_equity": self.initial_equity,
             "position_sizing_mode": self.position_sizing_mode,
             "enable_guardian": self.enable_guardian,
+            # workers is left out: it does not change the results
+            "shard_by": self.shard_by,
+            "event_loop": self.event_loop,
         }
 
 
@@ -112,14 +144,30 @@ class BacktestResult:
         }
 
 
+class _BacktestStateView:
+    """
+    Checkpoint-style access to the in-memory backtest state, for components
+    that read equity and positions through ``state_store.load_checkpoint()``
+    (PortfolioEngine, TradeGuardian).
+    """
+
+    def __init__(self, state: Dict[str, Any]):
+        self._state = state
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        return self._state
+
+
 class BacktestEngineV3:
     """
     Backtest Engine v3 - Offline backtesting with core component reuse.
     
     Architecture:
     - HistoricalDataLoader: Load bars from data source
+    - BarStore: Bars and precomputed indicator arrays per symbol
     - RegimeEngine: Compute market regime
-    - StrategyEngine v2: Generate trading signals
+    - StrategyEngine v2: Generate trading signals (strategies run directly
+      on the precomputed indicators, one array index per bar)
     - PortfolioEngine: Compute position sizes
     - RiskEngine: Apply risk checks
     - TradeGuardian: Pre-execution validation (optional)
@@ -132,6 +180,8 @@ class BacktestEngineV3:
         bt_config: BacktestConfig,
         config: Dict[str, Any],
         logger_instance: Optional[logging.Logger] = None,
+        run_id: Optional[str] = None,
+        output_dir: Optional[Path] = None,
     ):
         """
         Initialize the backtest engine.
@@ -140,18 +190,20 @@ class BacktestEngineV3:
             bt_config: Backtest-specific configuration
             config: Main application config (YAML)
             logger_instance: Optional logger instance
+            run_id: Run identifier (generated if None)
+            output_dir: Run directory (default artifacts/backtests/<run_id>)
         """
         self.bt_config = bt_config
         self.config = config
         self.logger = logger_instance or logger
         
         # Generate run ID
-        self.run_id = f"bt_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.run_id = run_id or f"bt_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         
         # Setup output directory
         base_dir = Path(__file__).resolve().parents[1]
         self.artifacts_dir = base_dir / "artifacts"
-        self.backtest_dir = self.artifacts_dir / "backtests" / self.run_id
+        self.backtest_dir = Path(output_dir) if output_dir else self.artifacts_dir / "backtests" / self.run_id
         self.backtest_dir.mkdir(parents=True, exist_ok=True)
         
         self.logger.info("BacktestEngineV3 initialized: run_id=%s", self.run_id)
@@ -168,11 +220,8 @@ class BacktestEngineV3:
         )
         
         # Initialize state
-        self.state = make_fresh_state_from_config(config)
-        self.state["mode"] = "BACKTEST"
-        self.state["equity"]["paper_capital"] = bt_config.initial_equity
-        self.state["equity"]["cash"] = bt_config.initial_equity
-        self.state["equity"]["free_notional"] = bt_config.initial_equity
+        self.state = self._fresh_state()
+        self.state_view = _BacktestStateView(self.state)
         
         # Initialize data loader
         self.data_loader = HistoricalDataLoader(
@@ -182,16 +231,11 @@ class BacktestEngineV3:
             config=config,
             logger_instance=self.logger,
         )
+        # Each symbol's bars are read once and kept as arrays with their indicators
+        self.bar_store = BarStore(self.data_loader, bt_config.start_date, bt_config.end_date)
         
         # Initialize regime engine
-        regime_cfg = bt_config.regime_config or config.get("regime", {})
-        self.regime_engine = RegimeDetector(
-            short_window=regime_cfg.get("short_window", 21),
-            long_window=regime_cfg.get("long_window", 55),
-            atr_window=regime_cfg.get("atr_window", 21),
-            atr_threshold=regime_cfg.get("atr_threshold", 0.75),
-            primary_symbol=bt_config.symbols[0] if bt_config.symbols else None,
-        )
+        self.regime_engine = self._make_regime_engine()
         
         # Initialize portfolio engine
         portfolio_cfg_dict = bt_config.portfolio_config or config.get("portfolio", {})
@@ -199,7 +243,7 @@ class BacktestEngineV3:
         portfolio_cfg = PortfolioConfig.from_dict(portfolio_cfg_dict)
         self.portfolio_engine = PortfolioEngine(
             portfolio_config=portfolio_cfg,
-            state_store=self.state,
+            state_store=self.state_view,
             journal_store=self.journal_store,
             logger_instance=self.logger,
             mde=None,  # No MDE in backtest
@@ -220,6 +264,8 @@ class BacktestEngineV3:
             max_symbol_loss_pct=risk_cfg_dict.get("max_symbol_loss_pct", 0.01),
         )
         self.risk_engine = RiskEngine(self.risk_config, state=None)
+        # Concurrent open positions across symbols (None = unlimited)
+        self.max_open_positions = (config.get("trading") or {}).get("max_open_positions")
         
         # Initialize trade guardian (optional)
         self.guardian = None
@@ -228,22 +274,57 @@ class BacktestEngineV3:
             guardian_config["enabled"] = True
             self.guardian = TradeGuardian(
                 config={"guardian": guardian_config},
-                state_store=self.state,
+                state_store=self.state_view,
                 logger_instance=self.logger,
             )
         
-        # Initialize strategy engine v2 (will be configured when strategies are registered)
-        self.strategy_engine = None
+        # Strategy engine v2 and its strategies (loaded in _initialize_strategy_engine)
+        self.strategy_engine: Optional[StrategyEngineV2] = None
+        self.strategies: Dict[str, BaseStrategy] = {}
+        # (strategy_id, class, config) to rebuild fresh instances per shard
+        self._strategy_specs: List[tuple] = []
+        self.window_size = 200
         
         # Tracking
         self.current_bar: Optional[Dict[str, Any]] = None
+        self.current_indicators: Dict[str, Any] = {}
         self.bar_index = 0
         self.positions: Dict[str, Dict[str, Any]] = {}  # symbol -> position
+        self._marks: Dict[str, float] = {}  # symbol -> last close
+        self._position_rows: Dict[str, Dict[str, Any]] = {}  # symbol -> state["positions"] row
         self.equity_history: List[Dict[str, Any]] = []
         self.trades: List[Dict[str, Any]] = []
+        self.signals_generated = 0
+        self.rejected_intents: Dict[str, int] = {}
+        self.strategy_errors: Dict[str, int] = {}
+        self._journal_rows: List[Dict[str, Any]] = []
+        self._journal_enabled = True
+        self._started_at: Optional[float] = None
+        # Drawdown (% of peak equity) that aborts an evaluate() run
+        self.stop_drawdown_pct: Optional[float] = None
+        self._peak_equity = bt_config.initial_equity
         
         self.logger.info("BacktestEngineV3 initialization complete")
     
+    def _fresh_state(self) -> Dict[str, Any]:
+        state = make_fresh_state_from_config(self.config)
+        state["mode"] = "BACKTEST"
+        state["equity"]["paper_capital"] = self.bt_config.initial_equity
+        state["equity"]["cash"] = self.bt_config.initial_equity
+        state["equity"]["free_notional"] = self.bt_config.initial_equity
+        state["positions"] = []
+        return state
+    
+    def _make_regime_engine(self) -> RegimeDetector:
+        regime_cfg = self.bt_config.regime_config or self.config.get("regime", {})
+        return RegimeDetector(
+            short_window=regime_cfg.get("short_window", 21),
+            long_window=regime_cfg.get("long_window", 55),
+            atr_window=regime_cfg.get("atr_window", 21),
+            atr_threshold=regime_cfg.get("atr_threshold", 0.75),
+            primary_symbol=self.bt_config.symbols[0] if self.bt_config.symbols else None,
+        )
+    
     def run(self) -> BacktestResult:
         """
         Run the backtest.
@@ -253,6 +334,7 @@ class BacktestEngineV3:
         """
         self.logger.info("Starting backtest run: %s", self.run_id)
         self.logger.info("Config: %s", self.bt_config.to_dict())
+        self._started_at = time.perf_counter()
         
         # Save config
         config_path = self.backtest_dir / "config.json"
@@ -262,10 +344,20 @@ class BacktestEngineV3:
         # Initialize strategy engine (needs to be done before running)
         self._initialize_strategy_engine()
         
-        # Run backtest for each symbol
-        for symbol in self.bt_config.symbols:
-            self.logger.info("Processing symbol: %s", symbol)
-            self._process_symbol(symbol)
+        sharded = bool(self.bt_config.shard_by) or self.bt_config.workers > 1
+        if self.bt_config.event_loop == "chronological":
+            if sharded:
+                raise ValueError("Chronological (portfolio-level) backtests cannot be sharded")
+            self._run_chronological()
+        elif self.bt_config.event_loop != "per_symbol":
+            raise ValueError(f"Unknown event_loop {self.bt_config.event_loop!r}")
+        elif sharded:
+            self._run_sharded()
+        else:
+            # Run backtest for each symbol
+            for symbol in self.bt_config.symbols:
+                self.logger.info("Processing symbol: %s", symbol)
+                self._process_symbol(symbol)
         
         # Compute final results
         result = self._compute_results()
@@ -277,33 +369,279 @@ class BacktestEngineV3:
         return result
     
     def _initialize_strategy_engine(self):
-        """Initialize strategy engine with configured strategies."""
-        # For now, we'll use a mock strategy engine
-        # In a full implementation, this would load actual strategies
+        """
+        Load the requested StrategyEngineV2 strategies.
+        
+        Each entry of bt_config.strategies is matched against
+        strategy_engine.strategies_v2 by id or by module name (so both
+        "EMA_20_50" and "ema20_50_intraday_v2" select the same strategy).
+        A requested strategy runs even if it is disabled for live/paper;
+        strategies on a different timeframe than the backtest are skipped.
+        """
         self.logger.info("Initializing strategy engine with strategies: %s", self.bt_config.strategies)
         
-        # Note: StrategyEngineV2 requires a MarketDataEngine, which we don't have in backtest
-        # We'll need to either mock it or create a lightweight version
-        # For now, we'll defer actual strategy execution
+        engine_cfg = self.config.get("strategy_engine") or {}
+        self.strategy_engine = StrategyEngineV2(config=engine_cfg, logger_instance=self.logger)
+        # Backtests publish no telemetry; strategies are called directly
+        self.strategy_engine.stop_telemetry()
+        self.strategy_engine._enable_telemetry = False
+        self.window_size = self.strategy_engine.window_size
+        
+        requested = set()
+        for code in self.bt_config.strategies:
+            if isinstance(code, dict):  # strategies_v2 entries passed through as-is
+                code = code.get("id", "")
+            if code:
+                requested.add(str(code).lower())
+        
+        for strategy_cfg in engine_cfg.get("strategies_v2") or []:
+            if not isinstance(strategy_cfg, dict):
+                continue
+            strategy_id = strategy_cfg.get("id", "")
+            module_name = strategy_cfg.get("module", "")
+            class_name = strategy_cfg.get("class", "")
+            names = {strategy_id.lower(), module_name.rsplit(".", 1)[-1].lower()}
+            if not strategy_id or not module_name or not class_name or not names & requested:
+                continue
+            requested -= names
+            
+            params = dict(strategy_cfg.get("params") or {})
+            params.setdefault("timeframe", params.get("intraday_timeframe", params.get("timeframe")))
+            timeframe = params.get("timeframe") or self.bt_config.timeframe
+            if timeframe != self.bt_config.timeframe:
+                self.logger.warning(
+                    "Skipping strategy %s: timeframe %s != backtest timeframe %s",
+                    strategy_id, timeframe, self.bt_config.timeframe,
+                )
+                continue
+            try:
+                strategy_class = getattr(importlib.import_module(module_name), class_name)
+                full_config = {"strategy_id": strategy_id, **params, "role": "intraday"}
+                strategy = strategy_class(config=dict(full_config), strategy_state=StrategyState())
+            except Exception as exc:  # noqa: BLE001
+                self.logger.error("Failed to load strategy %s from %s.%s: %s", strategy_id, module_name, class_name, exc)
+                continue
+            self.strategy_engine.register_strategy(strategy_id, strategy)
+            self.strategies[strategy_id] = strategy
+            self._strategy_specs.append((strategy_id, strategy_class, full_config))
+        
+        # EMA periods the strategies are configured with (ema_fast=13, ...)
+        self.bar_store.use_ema_periods(frozenset().union(
+            *(strategy_ema_periods(full_config) for _, _, full_config in self._strategy_specs)
+        ))
+        
+        if requested:
+            self.logger.warning("Strategies not found in strategy_engine.strategies_v2: %s", sorted(requested))
+        self.logger.info("Backtest strategies: %s", list(self.strategies))
+    
+    def _run_sharded(self):
+        """Run the shards on the worker pool and merge their output (backtest/sharding.py)."""
+        shard_by = self.bt_config.shard_by or "symbol"
+        shards = plan_shards(self.bt_config.symbols, self.bt_config.start_date, self.bt_config.end_date, shard_by)
+        self.logger.info("Sharded run: %d %s shards, %d workers", len(shards), shard_by, self.bt_config.workers)
+        summaries, trade_rows, equity_rows = run_shards(
+            self.bt_config,
+            self.config,
+            self.run_id,
+            self.backtest_dir,
+            self.data_loader.market_data_dir,
+            shards,
+            self.bt_config.workers,
+        )
+        self._merge_shards(summaries, trade_rows, equity_rows)
+        shutil.rmtree(self.backtest_dir / "shards", ignore_errors=True)
+    
+    def _reset_run_state(self, strategy_params: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Fresh state, risk and regime engines, strategy instances and tracking
+        for the next shard or evaluation.
+        
+        Args:
+            strategy_params: Per strategy id, params overriding its config
+        """
+        strategy_params = strategy_params or {}
+        self.state.clear()
+        self.state.update(self._fresh_state())
+        self.risk_engine = RiskEngine(self.risk_config, state=None)
+        self.regime_engine = self._make_regime_engine()
+        self.strategies = {
+            strategy_id: strategy_class(
+                config={**full_config, **strategy_params.get(strategy_id, {})},
+                strategy_state=StrategyState(),
+            )
+            for strategy_id, strategy_class, full_config in self._strategy_specs
+        }
+        self.bar_index = 0
+        self.positions = {}
+        self._marks = {}
+        self._position_rows = {}
+        self.equity_history = []
+        self.trades = []
+        self.signals_generated = 0
+        self.rejected_intents = {}
+        self.strategy_errors = {}
+        self._peak_equity = self.bt_config.initial_equity
+        # Shard trades are journaled by the parent once merged
+        self._journal_enabled = False
+    
+    def run_shard(self, shard: Shard) -> Dict[str, Any]:
+        """
+        Replay one shard from a fresh state (called in the worker processes).
+        
+        The shard's trades and equity snapshots are left in ``trades`` and
+        ``equity_history`` with bar indexes counted from the shard's first
+        bar; the returned summary holds its counters for the merge.
+        """
+        self._reset_run_state()
+        self.bar_store.keep_only(shard.symbol)
+        closed_at_end = self._process_symbol(
+            shard.symbol,
+            start=date.fromisoformat(shard.start_date),
+            end=date.fromisoformat(shard.end_date),
+            close_reason=shard.close_reason,
+            release=shard.shard_by == "symbol",
+        )
+        return {
+            "index": shard.index,
+            "bars": self.bar_index,
+            "signals": self.signals_generated,
+            "rejected_intents": self.rejected_intents,
+            "strategy_errors": self.strategy_errors,
+            "closed_at_end": closed_at_end,
+        }
+    
+    def evaluate(
+        self,
+        strategy_params: Optional[Dict[str, Dict[str, Any]]] = None,
+        stop_drawdown_pct: Optional[float] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> BacktestResult:
+        """
+        Replay bt_config.symbols in this process and return the results
+        without writing anything (parameter sweeps, walk-forward windows).
+        
+        Bars and indicators stay in the BarStore between calls, so repeated
+        evaluations only pay for the replay.
+        
+        Args:
+            strategy_params: Per strategy id, params overriding its config
+            stop_drawdown_pct: Stop once equity is this many percent below
+                its peak; overall_metrics["stopped_early"] records it
+            start, end: Only replay bars on these dates
+        """
+        if not self._strategy_specs:
+            self._initialize_strategy_engine()
+        self._reset_run_state(strategy_params)
+        overrides = strategy_params or {}
+        self.bar_store.use_ema_periods(frozenset().union(*(
+            strategy_ema_periods({**full_config, **overrides.get(strategy_id, {})})
+            for strategy_id, _, full_config in self._strategy_specs
+        )))
+        self.stop_drawdown_pct = stop_drawdown_pct
+        self._started_at = time.perf_counter()
+        stopped_early = False
+        try:
+            for symbol in self.bt_config.symbols:
+                self._process_symbol(symbol, start=start, end=end, release=False)
+        except _DrawdownStop:
+            stopped_early = True
+        finally:
+            self.stop_drawdown_pct = None
+        
+        result = self._compute_results()
+        result.overall_metrics["stopped_early"] = stopped_early
+        return result
+    
+    def _merge_shards(self, summaries: List[Dict[str, Any]], trade_rows: ShardRows, equity_rows: ShardRows):
+        """
+        Append the shards' trades and equity snapshots in shard order.
+        
+        Bar indexes are offset by the bars of earlier shards, and realized
+        P&L is booked into cash trade by trade in the same order as a
+        serial run, so the equity curve carries every earlier shard's P&L.
+        """
+        equity = self.state["equity"]
+        
+        for summary in summaries:
+            offset = self.bar_index
+            trades = trade_rows.get(summary["index"], [])
+            # A close-out after the last bar follows the shard's last snapshot
+            before_close = len(trades) - (1 if summary["closed_at_end"] else 0)
+            t = 0
+            for snapshot in equity_rows.get(summary["index"], []):
+                while t < before_close and trades[t]["bar_index"] <= snapshot["bar_index"]:
+                    self._merge_trade(trades[t], offset)
+                    t += 1
+                snapshot["bar_index"] += offset
+                snapshot["cash"] = equity["cash"]
+                snapshot["equity"] = equity["cash"] + snapshot["unrealized_pnl"]
+                equity["unrealized_pnl"] = snapshot["unrealized_pnl"]
+                self.equity_history.append(snapshot)
+            for trade in trades[t:]:
+                self._merge_trade(trade, offset)
+            
+            self.bar_index += summary["bars"]
+            self.signals_generated += summary["signals"]
+            for counts, merged in (
+                (summary["rejected_intents"], self.rejected_intents),
+                (summary["strategy_errors"], self.strategy_errors),
+            ):
+                for key, count in counts.items():
+                    merged[key] = merged.get(key, 0) + count
+    
+    def _merge_trade(self, trade: Dict[str, Any], offset: int):
+        trade["bar_index"] += offset
+        self.trades.append(trade)
+        if trade["position_qty"] == 0:
+            self.state["equity"]["realized_pnl"] += trade["pnl"]
+            self.state["equity"]["cash"] += trade["pnl"]
+        self._journal_trade(trade)
     
-    def _process_symbol(self, symbol: str):
+    def _process_symbol(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        close_reason: str = "end_of_data",
+        release: bool = True,
+    ) -> bool:
         """
         Process all bars for a symbol.
         
+        Bars and indicators come from the BarStore; each step indexes the
+        precomputed arrays instead of recomputing indicators. A position
+        still open after the last bar is closed at its close.
+        
         Args:
             symbol: Trading symbol
+            start, end: Only replay bars on these dates (indicators still
+                cover the whole loaded history)
+            close_reason: Reason recorded for the close-out after the last bar
+            release: Drop the symbol from the BarStore afterwards
+        
+        Returns:
+            True if a position was closed out after the last bar
         """
-        bars_processed = 0
+        bars = self.bar_store.bars(symbol)
+        lo, hi = (0, len(bars)) if start is None and end is None else bars.index_range(start or date.min, end or date.max)
+        bundles = self.bar_store.indicators(symbol).iter_bundles(lo, hi)
+        bar = None
+        closed_at_end = False
         
-        for bar in self.data_loader.iter_bars(symbol, self.bt_config.start_date, self.bt_config.end_date):
+        for index, indicators in enumerate(bundles, lo):
+            bar = bars.bar(index)
             self.current_bar = bar
+            self.current_indicators = indicators
             self.bar_index += 1
+            self._roll_trading_day(bar["timestamp"])
+            self._mark(symbol, bar["close"])
             
             # Update regime
             self._update_regime(symbol, bar)
             
-            # Generate signals (simplified for now)
-            intents = self._generate_signals(symbol, bar)
+            # Generate signals
+            intents = self._generate_signals(symbol, bar, bars.window(index, self.window_size), indicators)
             
             # Process intents
             for intent in intents:
@@ -311,10 +649,80 @@ class BacktestEngineV3:
             
             # Update equity snapshot
             self._record_equity_snapshot(bar)
-            
-            bars_processed += 1
         
-        self.logger.info("Processed %d bars for %s", bars_processed, symbol)
+        if bar is not None and symbol in self.positions:
+            self._close_out(symbol, bar, close_reason)
+            closed_at_end = True
+        
+        if release:
+            self.bar_store.release(symbol)
+        self.logger.info("Processed %d bars for %s", hi - lo, symbol)
+        return closed_at_end
+    
+    def _run_chronological(self):
+        """
+        Replay all symbols together in timestamp order (backtest/event_loop.py).
+        
+        Bars sharing a timestamp form one step: each is processed in
+        bt_config.symbols order, then every open position is marked at its
+        symbol's last close and one equity snapshot is recorded. Positions
+        still open at the end are closed at their symbol's last bar.
+        """
+        streams: Dict[str, SymbolStream] = {}
+        ema_periods = frozenset().union(
+            *(strategy_ema_periods(full_config) for _, _, full_config in self._strategy_specs)
+        )
+        events = merge_bar_streams(
+            self.data_loader, self.bt_config.symbols, self.bt_config.start_date, self.bt_config.end_date
+        )
+        
+        for timestamp, step in itertools.groupby(events, key=itemgetter("timestamp")):
+            self._roll_trading_day(timestamp)
+            for bar in step:
+                symbol = bar["symbol"]
+                stream = streams.get(symbol)
+                if stream is None:
+                    stream = streams[symbol] = SymbolStream(symbol, self.window_size, ema_periods)
+                indicators = stream.push(bar)
+                self.current_bar = bar
+                self.current_indicators = indicators
+                self.bar_index += 1
+                self._mark(symbol, bar["close"])
+                self._update_regime(symbol, bar)
+                for intent in self._generate_signals(symbol, bar, stream.bars.window(), indicators):
+                    self._process_intent(intent, bar)
+            self._record_equity_snapshot(bar)
+        
+        for symbol in list(self.positions):
+            self._close_out(symbol, streams[symbol].last_bar, "end_of_data")
+        self.logger.info("Replayed %d bars of %d symbols in timestamp order", self.bar_index, len(streams))
+    
+    def _close_out(self, symbol: str, bar: Dict[str, Any], reason: str):
+        """Close the symbol's open position at ``bar``'s close."""
+        position = self.positions[symbol]
+        exit_intent = OrderIntent(
+            symbol=symbol,
+            action="EXIT",
+            qty=abs(position["qty"]),
+            reason=reason,
+            strategy_code=position["strategy"],
+        )
+        self._simulate_fill(exit_intent, bar)
+    
+    def _mark(self, symbol: str, price: float):
+        """Record the symbol's latest close (marks its open position to market)."""
+        self._marks[symbol] = price
+        row = self._position_rows.get(symbol)
+        if row is not None:
+            row["last_price"] = price
+    
+    def _roll_trading_day(self, timestamp: datetime):
+        """Start a fresh RiskEngine day (daily loss, trade and notional caps) on a new date."""
+        day = timestamp.date()
+        if day == self.risk_engine.state.trading_day:
+            return
+        open_notional = sum(position["notional"] for position in self.positions.values())
+        self.risk_engine.state = RiskState(trading_day=day, total_notional=open_notional)
     
     def _update_regime(self, symbol: str, bar: Dict[str, Any]):
         """Update market regime."""
@@ -326,24 +734,82 @@ class BacktestEngineV3:
             timestamp=bar["timestamp"],
         )
     
-    def _generate_signals(self, symbol: str, bar: Dict[str, Any]) -> List[OrderIntent]:
+    def _generate_signals(
+        self,
+        symbol: str,
+        bar: Dict[str, Any],
+        series: Dict[str, Any],
+        indicators: Dict[str, Any],
+    ) -> List[OrderIntent]:
         """
-        Generate trading signals.
+        Run every strategy on one bar, as StrategyEngineV2.run_strategy does.
         
-        For now, this is a placeholder. In full implementation,
-        this would call StrategyEngine v2.
+        The series is a view of the last ``history_lookback`` bars and the
+        indicators are the precomputed (or streamed) bundle for this bar.
         """
-        # Placeholder: no signals
-        return []
+        if not self.strategies:
+            return []
+        
+        candle = dict(bar, ts=bar["timestamp"])
+        context = {"symbol": symbol}
+        intents: List[OrderIntent] = []
+        
+        for strategy_code, strategy in self.strategies.items():
+            strategy.config["current_symbol"] = symbol
+            try:
+                decision = strategy.generate_signal(candle, series, indicators, context)
+            except Exception as exc:  # noqa: BLE001
+                errors = self.strategy_errors.get(strategy_code, 0) + 1
+                self.strategy_errors[strategy_code] = errors
+                if errors == 1:
+                    self.logger.exception("Strategy %s failed for %s: %s", strategy_code, symbol, exc)
+                continue
+            
+            if decision and decision.action in ("BUY", "SELL", "EXIT"):
+                intents.append(OrderIntent(
+                    symbol=symbol,
+                    action=decision.action,
+                    qty=None,  # Sized by PortfolioEngine / RiskEngine
+                    reason=decision.reason,
+                    strategy_code=strategy_code,
+                    confidence=getattr(decision, "confidence", 0.0),
+                    metadata={"timeframe": self.bt_config.timeframe},
+                ))
+            intents.extend(strategy.get_pending_intents())
+        
+        self.signals_generated += len(intents)
+        return intents
     
     def _process_intent(self, intent: OrderIntent, bar: Dict[str, Any]):
         """
         Process an order intent.
         
+        A symbol holds one net position, owned by the strategy that opened
+        it: only that strategy's EXIT or opposite signal closes it, and
+        signals in the same direction do not add to it. Entries go through
+        portfolio sizing, risk checks and the guardian; exits are always
+        filled.
+        
         Args:
             intent: Order intent from strategy
             bar: Current bar
         """
+        position = self.positions.get(intent.symbol)
+        if position is not None:
+            if position["strategy"] != intent.strategy_code:
+                self._reject("symbol_held_by_other_strategy")
+                return
+            closes = intent.action == "EXIT" or (intent.action == "BUY") != (position["qty"] > 0)
+            if closes:
+                intent.qty = abs(position["qty"])
+                self._simulate_fill(intent, bar)
+            return
+        if intent.action == "EXIT":
+            return
+        if self.max_open_positions is not None and len(self.positions) >= self.max_open_positions:
+            self._reject("max_open_positions")
+            return
+        
         # Apply portfolio sizing
         sized_intent = self._apply_portfolio_sizing(intent, bar)
         if sized_intent is None:
@@ -366,17 +832,41 @@ class BacktestEngineV3:
         intent: OrderIntent,
         bar: Dict[str, Any],
     ) -> Optional[OrderIntent]:
-        """Apply portfolio sizing logic."""
-        # Simplified: use intent as-is
-        # Full implementation would call PortfolioEngine.compute_position_size()
+        """Size an entry with PortfolioEngine (ATR from the precomputed indicators)."""
+        qty = self.portfolio_engine.compute_position_size(
+            intent,
+            bar["close"],
+            self.current_indicators.get("atr14"),
+        )
+        if qty <= 0:
+            self._reject("portfolio_sizing")
+            return None
+        intent.qty = qty
         return intent
     
     def _apply_risk_checks(self, intent: OrderIntent, bar: Dict[str, Any]) -> bool:
-        """Apply risk engine checks."""
-        # Simplified: always approve
-        # Full implementation would call RiskEngine.plan_order()
+        """Plan the entry with RiskEngine; its quantity caps the portfolio size."""
+        symbol_upper = intent.symbol.upper()
+        is_fno = "FUT" in symbol_upper or "OPT" in symbol_upper
+        plan = self.risk_engine.plan_order(
+            symbol=intent.symbol,
+            strategy=intent.strategy_code,
+            side=intent.action,
+            price=bar["close"],
+            lot_size=self.portfolio_engine.config.lot_size_fallback if is_fno else 1,
+            bar_index=self.bar_index,
+            quality_mult=intent.confidence,
+        )
+        if not plan.approve:
+            self.logger.debug("Risk rejected %s %s: %s", intent.action, intent.symbol, plan.reason)
+            self._reject("risk")
+            return False
+        intent.qty = min(intent.qty, plan.qty)
         return True
     
+    def _reject(self, stage: str):
+        self.rejected_intents[stage] = self.rejected_intents.get(stage, 0) + 1
+    
     def _apply_guardian_checks(self, intent: OrderIntent, bar: Dict[str, Any]) -> bool:
         """Apply trade guardian checks."""
         # Simplified: always approve
@@ -395,7 +885,8 @@ class BacktestEngineV3:
         fill_time = bar["timestamp"]
         
         # Update position
-        current_qty = self.positions.get(intent.symbol, {}).get("qty", 0)
+        position = self.positions.get(intent.symbol)
+        current_qty = position["qty"] if position else 0
         
         if intent.action == "BUY":
             new_qty = current_qty + intent.qty
@@ -404,6 +895,10 @@ class BacktestEngineV3:
         else:  # EXIT
             new_qty = 0
         
+        pnl = 0.0
+        if position is not None and new_qty == 0:
+            pnl = (fill_price - position["entry_price"]) * current_qty
+        
         # Record trade
         trade = {
             "timestamp": fill_time.isoformat(),
@@ -414,6 +909,8 @@ class BacktestEngineV3:
             "price": fill_price,
             "reason": intent.reason,
             "bar_index": self.bar_index,
+            "pnl": pnl,
+            "position_qty": new_qty,
         }
         self.trades.append(trade)
         
@@ -425,22 +922,64 @@ class BacktestEngineV3:
                 "qty": new_qty,
                 "entry_price": fill_price,
                 "entry_time": fill_time,
+                "strategy": intent.strategy_code,
+                "notional": abs(new_qty) * fill_price,
             }
         
         # Update state
-        self._update_state_after_fill(intent, fill_price, new_qty)
+        self._update_state_after_fill(intent, fill_price, new_qty, position, pnl)
         
         # Journal the trade
         self._journal_trade(trade)
     
-    def _update_state_after_fill(self, intent: OrderIntent, fill_price: float, new_qty: int):
-        """Update state after a fill."""
-        # Update equity (simplified)
-        # Full implementation would track P&L properly
-        pass
+    def _update_state_after_fill(
+        self,
+        intent: OrderIntent,
+        fill_price: float,
+        new_qty: int,
+        previous: Optional[Dict[str, Any]] = None,
+        pnl: float = 0.0,
+    ):
+        """Book realized P&L and exposure in the state, RiskEngine and strategy state."""
+        equity = self.state["equity"]
+        if previous is not None:
+            equity["realized_pnl"] += pnl
+            equity["cash"] += pnl
+            self.risk_engine.on_exposure_change(symbol=intent.symbol, delta_notional=-previous["notional"])
+            self.risk_engine.on_fill(
+                symbol=intent.symbol,
+                strategy=intent.strategy_code,
+                pnl=pnl,
+                bar_index=self.bar_index,
+            )
+        if new_qty != 0:
+            self.risk_engine.on_exposure_change(
+                symbol=intent.symbol,
+                delta_notional=self.positions[intent.symbol]["notional"],
+            )
+        
+        # Positions as PortfolioEngine reads them for exposure limits (marked by _mark)
+        self._position_rows = {
+            symbol: {
+                "symbol": symbol,
+                "quantity": pos["qty"],
+                "avg_price": pos["entry_price"],
+                "last_price": self._marks.get(symbol, pos["entry_price"]),
+            }
+            for symbol, pos in self.positions.items()
+        }
+        self.state["positions"] = list(self._position_rows.values())
+        
+        strategy = self.strategies.get(intent.strategy_code)
+        if strategy is not None:
+            strategy.state.update_position(intent.symbol, new_qty, fill_price)
+            if previous is not None:
+                strategy.state.update_pnl(pnl)
     
     def _journal_trade(self, trade: Dict[str, Any]):
-        """Journal a trade to the store."""
+        """Queue a trade for the journal (written in batches)."""
+        if not self._journal_enabled:
+            return
         order_row = {
             "timestamp": trade["timestamp"],
             "symbol": trade["symbol"],
@@ -451,7 +990,14 @@ class BacktestEngineV3:
             "status": "FILLED",
             "order_id": f"BT_{self.run_id}_{len(self.trades)}",
         }
-        self.journal_store.append_orders([order_row])
+        self._journal_rows.append(order_row)
+        if len(self._journal_rows) >= JOURNAL_BATCH_SIZE:
+            self._flush_journal()
+    
+    def _flush_journal(self):
+        if self._journal_rows:
+            self.journal_store.append_orders(self._journal_rows)
+            self._journal_rows = []
     
     def _record_equity_snapshot(self, bar: Dict[str, Any]):
         """Record equity snapshot."""
@@ -459,15 +1005,14 @@ class BacktestEngineV3:
         cash = self.state["equity"]["cash"]
         unrealized_pnl = 0.0
         
-        # Calculate unrealized P&L from open positions
+        # Mark every open position at its symbol's last close
         for symbol, pos in self.positions.items():
-            if symbol == bar.get("symbol"):
-                current_price = bar["close"]
-                entry_price = pos["entry_price"]
-                qty = pos["qty"]
-                unrealized_pnl += (current_price - entry_price) * qty
+            entry_price = pos["entry_price"]
+            current_price = self._marks.get(symbol, entry_price)
+            unrealized_pnl += (current_price - entry_price) * pos["qty"]
         
         equity = cash + unrealized_pnl
+        self.state["equity"]["unrealized_pnl"] = unrealized_pnl
         
         snapshot = {
             "timestamp": bar["timestamp"].isoformat(),
@@ -477,6 +1022,11 @@ class BacktestEngineV3:
             "bar_index": self.bar_index,
         }
         self.equity_history.append(snapshot)
+        
+        if self.stop_drawdown_pct is not None:
+            self._peak_equity = max(self._peak_equity, equity)
+            if self._peak_equity > 0 and (self._peak_equity - equity) / self._peak_equity * 100 > self.stop_drawdown_pct:
+                raise _DrawdownStop()
     
     def _compute_results(self) -> BacktestResult:
         """Compute final backtest results."""
@@ -485,23 +1035,16 @@ class BacktestEngineV3:
         # Compute overall metrics
         overall_metrics = self._compute_overall_metrics()
         
-        # Compute per-strategy metrics (placeholder)
-        per_strategy = {}
-        for strategy_code in self.bt_config.strategies:
-            per_strategy[strategy_code] = {
-                "trades": 0,
-                "pnl": 0.0,
-                "win_rate": 0.0,
-            }
-        
-        # Compute per-symbol metrics (placeholder)
-        per_symbol = {}
-        for symbol in self.bt_config.symbols:
-            per_symbol[symbol] = {
-                "trades": 0,
-                "pnl": 0.0,
-                "win_rate": 0.0,
-            }
+        # Per-strategy and per-symbol metrics over closed positions
+        per_strategy = {code: self._trade_stats([]) for code in self.strategies}
+        per_symbol = {symbol: self._trade_stats([]) for symbol in self.bt_config.symbols}
+        closed = [trade for trade in self.trades if trade["position_qty"] == 0]
+        for key, table in (("strategy", per_strategy), ("symbol", per_symbol)):
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for trade in closed:
+                groups.setdefault(trade[key], []).append(trade)
+            for name, trades in groups.items():
+                table[name] = self._trade_stats(trades)
         
         result = BacktestResult(
             run_id=self.run_id,
@@ -515,6 +1058,15 @@ class BacktestEngineV3:
         
         return result
     
+    @staticmethod
+    def _trade_stats(closed_trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        wins = sum(1 for trade in closed_trades if trade["pnl"] > 0)
+        return {
+            "trades": len(closed_trades),
+            "pnl": sum(trade["pnl"] for trade in closed_trades),
+            "win_rate": wins / len(closed_trades) if closed_trades else 0.0,
+        }
+    
     def _compute_overall_metrics(self) -> Dict[str, Any]:
         """Compute overall performance metrics."""
         if not self.equity_history:
@@ -526,23 +1078,39 @@ class BacktestEngineV3:
         total_return = final_equity - initial_equity
         total_return_pct = (total_return / initial_equity) * 100 if initial_equity > 0 else 0.0
         
+        equity = np.fromiter((point["equity"] for point in self.equity_history), dtype=float)
+        peaks = np.maximum.accumulate(np.maximum(equity, initial_equity))
+        drawdowns = (peaks - equity) / np.where(peaks > 0, peaks, 1.0)
+        max_drawdown_pct = float(drawdowns.max()) * 100 if len(drawdowns) else 0.0
+        
         return {
             "initial_equity": initial_equity,
             "final_equity": final_equity,
             "total_return": total_return,
             "total_return_pct": total_return_pct,
+            "max_drawdown_pct": max_drawdown_pct,
             "total_trades": len(self.trades),
             "bars_processed": self.bar_index,
+            "realized_pnl": self.state["equity"]["realized_pnl"],
+            "signals": self.signals_generated,
+            "rejected_intents": dict(self.rejected_intents),
+            "strategy_errors": dict(self.strategy_errors),
+            "elapsed_sec": time.perf_counter() - self._started_at if self._started_at else 0.0,
         }
     
     def _save_results(self, result: BacktestResult):
         """Save backtest results to disk."""
         self.logger.info("Saving backtest results...")
+        self._flush_journal()
+        
+        # Result files are encoded in one shot with json.dumps: json.dump (and
+        # any indented dump) goes through the pure-Python encoder, which on
+        # long runs takes longer than the replay itself
         
         # Save summary JSON
         summary_path = self.backtest_dir / "summary.json"
         with summary_path.open("w") as f:
-            json.dump(result.to_dict(), f, indent=2, default=str)
+            f.write(json.dumps(result.to_dict(), default=str))
         
         # Save trades CSV
         trades_path = self.backtest_dir / "trades.csv"
@@ -556,6 +1124,6 @@ class BacktestEngineV3:
         # Save equity curve JSON
         equity_path = self.backtest_dir / "equity_curve.json"
         with equity_path.open("w") as f:
-            json.dump(self.equity_history, f, indent=2, default=str)
+            f.write(json.dumps(self.equity_history, default=str))
         
         self.logger.info("Results saved to: %s", self.backtest_dir)
@@ -0,0 +1,161 @@
+"""
+Chronological multi-symbol replay for Backtest Engine v3.
+
+The per-symbol loop replays each symbol's whole history before the next,
+so cross-symbol state (portfolio exposure, open position counts, the
+equity curve) never sees more than one symbol at a time. With
+``event_loop="chronological"`` BacktestEngineV3 instead replays every
+symbol together in timestamp order:
+
+- merge_bar_streams() heap-merges the HistoricalDataLoader.iter_bars
+  iterators of all symbols, holding one pending bar per symbol;
+- each symbol keeps a SymbolStream: the last ``window_size`` bars in
+  fixed-size buffers (the strategy ``series``) and an IndicatorStream
+  (core/indicator_stream) updated bar by bar.
+
+Memory is constant per symbol however long the date range; nothing is
+loaded up front. Indicator bundles follow the same warmup rules as the
+BarStore fast path (nothing before 20 bars, only ema9/ema20 before 50,
+extra EMA periods from ``max(period, 20)`` bars).
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from core.indicator_stream import IndicatorStream, StreamingEMA
+
+logger = logging.getLogger(__name__)
+
+# Keys present from 20 bars on; everything else needs 50 (as StrategyEngineV2)
+_EARLY_KEYS = ("ema9", "ema20")
+_FULL_BUNDLE_BARS = 50
+
+
+def _ordered_bars(data_loader: Any, symbol: str, rank: int, start_date: str, end_date: str):
+    """(timestamp, rank, bar) for one symbol, dropping bars that do not move forward in time."""
+    last = None
+    dropped = 0
+    for bar in data_loader.iter_bars(symbol, start_date, end_date):
+        timestamp = bar["timestamp"]
+        if last is not None and timestamp <= last:
+            dropped += 1
+            continue
+        last = timestamp
+        bar["symbol"] = symbol
+        yield timestamp, rank, bar
+    if dropped:
+        logger.warning("Dropped %d out-of-order or duplicate bars for %s", dropped, symbol)
+
+
+def merge_bar_streams(
+    data_loader: Any,
+    symbols: Sequence[str],
+    start_date: str,
+    end_date: str,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Bars of all symbols in timestamp order; bars with the same timestamp
+    come in ``symbols`` order. Each bar carries its ``symbol``.
+    """
+    streams = [
+        _ordered_bars(data_loader, symbol, rank, start_date, end_date)
+        for rank, symbol in enumerate(symbols)
+    ]
+    for _, _, bar in heapq.merge(*streams):
+        yield bar
+
+
+class RollingBars:
+    """
+    The last ``size`` bars of one symbol, oldest first.
+
+    Bars go into buffers of twice the window; when they fill up, the last
+    ``size - 1`` bars move back to the front, so appends are amortized
+    O(1) and ``window()`` hands out array views without copying. Views are
+    only valid until the next append.
+    """
+
+    __slots__ = ("size", "count", "_values", "_ts", "_end")
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, size: int) -> None:
+        self.size = max(1, int(size))
+        self.count = 0
+        self._values = np.empty((len(self.FIELDS), 2 * self.size))
+        self._ts = np.empty(2 * self.size, dtype=object)
+        self._end = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def append(self, bar: Dict[str, Any]) -> None:
+        capacity = self._ts.shape[0]
+        if self._end == capacity:
+            keep = self.size - 1
+            if keep:
+                self._values[:, :keep] = self._values[:, capacity - keep:]
+                self._ts[:keep] = self._ts[capacity - keep:]
+            self._end = keep
+        end = self._end
+        self._values[:, end] = (bar["open"], bar["high"], bar["low"], bar["close"], bar.get("volume", 0.0))
+        self._ts[end] = bar["timestamp"]
+        self._end = end + 1
+        self.count += 1
+
+    def window(self) -> Dict[str, Any]:
+        """The ``series`` a strategy sees on the latest bar (same keys as SymbolBars.window)."""
+        start = max(0, self._end - self.size)
+        end = self._end
+        values = self._values
+        return {
+            "open": values[0, start:end],
+            "high": values[1, start:end],
+            "low": values[2, start:end],
+            "close": values[3, start:end],
+            "volume": values[4, start:end],
+            "ts": self._ts[start:end],
+        }
+
+
+class SymbolStream:
+    """
+    Rolling bars and streaming indicators for one symbol.
+
+    ``ema_periods`` adds an ``ema<period>`` key for each period beyond the
+    standard ones (see bar_store.strategy_ema_periods), as BarStore does.
+    """
+
+    __slots__ = ("symbol", "bars", "indicators", "extra_emas", "last_bar")
+
+    def __init__(self, symbol: str, window_size: int, ema_periods: Iterable[int] = ()) -> None:
+        self.symbol = symbol
+        self.bars = RollingBars(window_size)
+        self.indicators = IndicatorStream(include_supertrend=True)
+        # key -> (bars required, stream)
+        self.extra_emas = {
+            f"ema{period}": (max(period, 20), StreamingEMA(period))
+            for period in sorted({int(p) for p in ema_periods} - set(IndicatorStream.EMA_PERIODS))
+        }
+        self.last_bar: Optional[Dict[str, Any]] = None
+
+    def push(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """Feed the next bar; returns the indicator bundle as of that bar."""
+        self.bars.append(bar)
+        self.indicators.update(bar, bar["timestamp"])
+        close = float(bar["close"])
+        for _, ema in self.extra_emas.values():
+            ema.update(close)
+        self.last_bar = bar
+        bundle = self.indicators.snapshot()
+        if bundle and self.indicators.count < _FULL_BUNDLE_BARS:
+            bundle = {key: bundle[key] for key in _EARLY_KEYS}
+        for key, (required, ema) in self.extra_emas.items():
+            if self.indicators.count >= required:
+                bundle[key] = ema.value
+        return bundle
@@ -0,0 +1,181 @@
+"""
+Sharded execution for Backtest Engine v3.
+
+A serial run replays bt_config.symbols one after another in one process.
+With ``shard_by`` set (or ``workers`` > 1) the run is split into shards
+that replay independently on a process pool:
+
+- ``symbol``: one shard per symbol over the whole date range;
+- ``day``: one shard per symbol and calendar day. Indicators still come
+  from the symbol's full history, but strategies, risk state and
+  positions start fresh each day and a position open at the day's last
+  bar is closed there ("end_of_day").
+
+Each worker builds one BacktestEngineV3 for the run and resets it between
+shards. Shard rows are appended to the worker's own partial files under
+``<run dir>/shards/`` (``worker_<pid>.trades.jsonl`` and
+``worker_<pid>.equity.jsonl``, one ``[shard index, rows]`` line per shard); the
+parent reads them back and BacktestEngineV3 merges them in shard order.
+
+Reproducibility: a shard's output depends only on the shard and the
+inputs, and the merge is ordered by shard index, so a run gives the same
+trades, equity curve and metrics for any number of workers (workers=1
+runs the same shard code in-process). Symbol shards also reproduce the
+serial run, except where symbols interact there: equity-based sizing
+(``fixed_risk_atr``) and RiskEngine day limits carried from one symbol to
+the next when both trade the same day.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARD_MODES = ("symbol", "day")
+
+# shard index -> the shard's rows in the order it produced them
+ShardRows = Dict[int, List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One independent slice of a backtest: a symbol over a date range."""
+
+    index: int
+    symbol: str
+    start_date: str
+    end_date: str
+    shard_by: str = "symbol"
+
+    @property
+    def close_reason(self) -> str:
+        """Reason recorded when a position is still open after the shard's last bar."""
+        return "end_of_day" if self.shard_by == "day" else "end_of_data"
+
+
+def _daterange(start: date, end: date) -> Iterable[date]:
+    current = start
+    while current <= end:
+        yield current
+        current += timedelta(days=1)
+
+
+def plan_shards(symbols: Sequence[str], start_date: str, end_date: str, shard_by: str) -> List[Shard]:
+    """
+    Shards in serial order: by symbol, then (for day shards) by date.
+
+    Raises:
+        ValueError: Unknown ``shard_by``
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"Unknown shard_by {shard_by!r} (expected one of {SHARD_MODES})")
+    if shard_by == "symbol":
+        return [Shard(i, symbol, start_date, end_date) for i, symbol in enumerate(symbols)]
+    days = [day.isoformat() for day in _daterange(date.fromisoformat(start_date), date.fromisoformat(end_date))]
+    shards = []
+    for symbol in symbols:
+        for day in days:
+            shards.append(Shard(len(shards), symbol, day, day, shard_by="day"))
+    return shards
+
+
+# The worker process's engine (set by _init_worker)
+_engine: Optional[Any] = None
+_partial_dir: Optional[Path] = None
+
+
+def _build_shard_engine(bt_config: Any, config: Dict[str, Any], run_id: str, output_dir: Path, data_dir: Path) -> Any:
+    from backtest.engine_v3 import BacktestEngineV3
+
+    engine = BacktestEngineV3(bt_config=bt_config, config=config, run_id=run_id, output_dir=output_dir)
+    engine.data_loader.market_data_dir = data_dir
+    engine._initialize_strategy_engine()
+    return engine
+
+
+def _init_worker(bt_config: Any, config: Dict[str, Any], run_id: str, output_dir: Path, data_dir: Path, partial_dir: Path) -> None:
+    global _engine, _partial_dir
+    _engine = _build_shard_engine(bt_config, config, run_id, output_dir, data_dir)
+    _partial_dir = partial_dir
+
+
+def _append_rows(path: Path, index: int, rows: List[Dict[str, Any]]) -> None:
+    # One line per shard: a single dumps() call stays in the C encoder
+    if rows:
+        with path.open("a") as f:
+            f.write(json.dumps([index, rows]) + "\n")
+
+
+def _execute(engine: Any, shard: Shard, partial_dir: Path) -> Dict[str, Any]:
+    """Run one shard and append its trades and equity snapshots to this process's partial files."""
+    summary = engine.run_shard(shard)
+    name = f"worker_{os.getpid()}"
+    _append_rows(partial_dir / f"{name}.trades.jsonl", shard.index, engine.trades)
+    _append_rows(partial_dir / f"{name}.equity.jsonl", shard.index, engine.equity_history)
+    return summary
+
+
+def _run_shard(shard: Shard) -> Dict[str, Any]:
+    return _execute(_engine, shard, _partial_dir)
+
+
+def _read_partials(partial_dir: Path, suffix: str) -> ShardRows:
+    rows: ShardRows = {}
+    for path in sorted(partial_dir.glob(f"*{suffix}")):
+        with path.open() as f:
+            for line in f:
+                index, shard_rows = json.loads(line)
+                rows[index] = shard_rows
+    return rows
+
+
+def run_shards(
+    bt_config: Any,
+    config: Dict[str, Any],
+    run_id: str,
+    output_dir: Path,
+    data_dir: Path,
+    shards: Sequence[Shard],
+    workers: int,
+    start_method: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], ShardRows, ShardRows]:
+    """
+    Run every shard and collect the results.
+
+    Args:
+        bt_config, config: The run's BacktestConfig and main config
+        run_id, output_dir: The parent run (workers share its directory)
+        data_dir: Market data directory the workers read bars from
+        shards: Shards from plan_shards()
+        workers: Worker processes; 1 runs the shards in this process
+        start_method: multiprocessing start method (platform default if None)
+
+    Returns:
+        (shard summaries in shard order, trade rows by shard, equity rows by shard)
+    """
+    partial_dir = output_dir / "shards"
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    init_args = (bt_config, config, run_id, output_dir, data_dir)
+    workers = max(1, min(workers, len(shards)))
+
+    if workers == 1:
+        engine = _build_shard_engine(*init_args)
+        summaries = [_execute(engine, shard, partial_dir) for shard in shards]
+    else:
+        # Consecutive shards (a symbol's days) go to the same worker, which
+        # keeps that symbol's bars and indicators loaded between them
+        chunksize = max(1, len(shards) // (workers * 4))
+        ctx = multiprocessing.get_context(start_method)
+        logger.info("Running %d shards on %d workers (chunksize %d)", len(shards), workers, chunksize)
+        with ctx.Pool(workers, initializer=_init_worker, initargs=init_args + (partial_dir,)) as pool:
+            summaries = list(pool.imap(_run_shard, shards, chunksize))
+
+    return summaries, _read_partials(partial_dir, ".trades.jsonl"), _read_partials(partial_dir, ".equity.jsonl")
@@ -0,0 +1,301 @@
+"""
+Parameter sweeps for Backtest Engine v3.
+
+Evaluates one strategy under many parameter combinations over the same
+symbols and dates:
+
+- bars are read once and, with their indicator columns, copied into a
+  SharedBarStore that every worker attaches to (no CSV parsing or
+  indicator math per combination);
+- integer ``ema_*`` params (``ema_fast``, ``ema_slow``, ...) are EMA
+  periods: each one swept is computed once as an extra column, and
+  combinations reading the same periods share one memoized
+  IndicatorArrays per worker;
+- combinations run on a process pool through BacktestEngineV3.evaluate(),
+  each from a fresh state; with ``max_drawdown_pct`` a combination stops
+  as soon as its equity falls that far below its peak.
+
+Search is either the full grid or ``samples`` combinations drawn from it
+without replacement (``search: random``, reproducible through ``seed``).
+Results are ranked by ``rank_by`` (stopped combinations last) and written
+to one columnar file, ``artifacts/sweeps/<sweep_id>/results.json``::
+
+    {"sweep_id": ..., "config": {...}, "sweep": {...},
+     "columns": {"rank": [1, 2, ...], "ema_fast": [...], "total_return_pct": [...], ...}}
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from backtest.bar_store import SharedBarStore, strategy_ema_periods
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("grid", "random")
+
+# Result columns after the swept params, in file order
+METRIC_COLUMNS = (
+    "total_return_pct",
+    "max_drawdown_pct",
+    "realized_pnl",
+    "final_equity",
+    "closed_trades",
+    "win_rate",
+    "total_trades",
+    "signals",
+    "stopped_early",
+)
+
+
+@dataclass
+class SweepConfig:
+    """
+    What to sweep and how.
+
+    Attributes:
+        strategy: strategies_v2 id of the strategy whose params are swept
+        grid: Param name -> candidate values
+        search: 'grid' (every combination) or 'random' (``samples`` of them)
+        samples: Combinations drawn for a random search
+        seed: Random search seed
+        max_drawdown_pct: Stop a combination once its drawdown exceeds this
+        rank_by: overall metric to rank by (higher is better)
+        workers: Worker processes (1 evaluates in this process)
+    """
+
+    strategy: str
+    grid: Dict[str, List[Any]] = field(default_factory=dict)
+    search: str = "grid"
+    samples: Optional[int] = None
+    seed: int = 0
+    max_drawdown_pct: Optional[float] = None
+    rank_by: str = "total_return_pct"
+    workers: int = 1
+
+    def __post_init__(self) -> None:
+        if self.search not in SEARCH_MODES:
+            raise ValueError(f"Unknown search {self.search!r} (expected one of {SEARCH_MODES})")
+        if self.search == "random" and not self.samples:
+            raise ValueError("A random search needs samples")
+        if self.rank_by not in METRIC_COLUMNS or self.rank_by == "stopped_early":
+            raise ValueError(f"Cannot rank by {self.rank_by!r}")
+        for name, values in self.grid.items():
+            if not isinstance(values, (list, tuple)) or not values:
+                raise ValueError(f"Grid values for {name!r} must be a non-empty list")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SweepConfig":
+        """Create SweepConfig from a ``sweep`` config section."""
+        max_drawdown_pct = data.get("max_drawdown_pct")
+        samples = data.get("samples")
+        return cls(
+            strategy=str(data["strategy"]),
+            grid={str(name): list(values) for name, values in (data.get("grid") or {}).items()},
+            search=str(data.get("search", "grid")),
+            samples=int(samples) if samples is not None else None,
+            seed=int(data.get("seed", 0)),
+            max_drawdown_pct=float(max_drawdown_pct) if max_drawdown_pct is not None else None,
+            rank_by=str(data.get("rank_by", "total_return_pct")),
+            workers=int(data.get("workers", 1)),
+        )
+
+    def combinations(self) -> List[Dict[str, Any]]:
+        if self.search == "random":
+            return random_combinations(self.grid, self.samples, self.seed)
+        return grid_combinations(self.grid)
+
+
+def grid_combinations(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Every combination, the last param varying fastest."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def random_combinations(grid: Dict[str, Sequence[Any]], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    ``samples`` distinct combinations drawn uniformly from the grid (all of
+    them if the grid is smaller), without enumerating it.
+    """
+    names = list(grid)
+    size = math.prod(len(grid[name]) for name in names)
+    combos = []
+    for number in random.Random(seed).sample(range(size), min(samples, size)):
+        combo = {}
+        # Mixed-radix decode, matching grid_combinations() order
+        for name in reversed(names):
+            number, digit = divmod(number, len(grid[name]))
+            combo[name] = grid[name][digit]
+        combos.append({name: combo[name] for name in names})
+    return combos
+
+
+# The worker process's engine (set by _init_worker)
+_engine: Optional[Any] = None
+_job: Optional[Tuple[str, Dict[str, Any], Optional[float]]] = None
+
+
+def _build_engine(bt_config: Any, config: Dict[str, Any], sweep_id: str, output_dir: Path, store: SharedBarStore) -> Any:
+    from backtest.engine_v3 import BacktestEngineV3
+
+    engine = BacktestEngineV3(bt_config=bt_config, config=config, run_id=sweep_id, output_dir=output_dir)
+    engine.bar_store = store
+    engine._initialize_strategy_engine()
+    return engine
+
+
+def _init_worker(
+    bt_config: Any,
+    config: Dict[str, Any],
+    sweep_id: str,
+    output_dir: Path,
+    spec: Dict[str, Any],
+    job: Tuple[str, Dict[str, Any], Optional[float]],
+) -> None:
+    global _engine, _job
+    _engine = _build_engine(bt_config, config, sweep_id, output_dir, SharedBarStore.attach(spec))
+    _job = job
+
+
+def _evaluate(
+    engine: Any,
+    job: Tuple[str, Dict[str, Any], Optional[float]],
+    task: Tuple[int, Dict[str, Any]],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Run one combination (on bars from ``start`` to ``end``); returns its result row."""
+    strategy, _, max_drawdown_pct = job
+    index, combo = task
+    result = engine.evaluate(
+        strategy_params={strategy: combo}, stop_drawdown_pct=max_drawdown_pct, start=start, end=end,
+    )
+    metrics = result.overall_metrics
+    stats = result.per_strategy.get(strategy) or {}
+    row = {"index": index, **combo}
+    for name in METRIC_COLUMNS:
+        row[name] = metrics.get(name, 0)
+    row["closed_trades"] = stats.get("trades", 0)
+    row["win_rate"] = stats.get("win_rate", 0.0)
+    return row
+
+
+def _evaluate_task(task: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    return _evaluate(_engine, _job, task)
+
+
+def rank_rows(rows: List[Dict[str, Any]], rank_by: str) -> List[Dict[str, Any]]:
+    """Best first by ``rank_by``; combinations stopped early go last. Adds a ``rank`` column."""
+    ranked = sorted(rows, key=lambda row: (bool(row["stopped_early"]), -row[rank_by], row["index"]))
+    for rank, row in enumerate(ranked, 1):
+        row["rank"] = rank
+    return ranked
+
+
+def to_columns(rows: List[Dict[str, Any]], param_names: Sequence[str]) -> Dict[str, List[Any]]:
+    names = ["rank", *param_names, *METRIC_COLUMNS]
+    return {name: [row[name] for row in rows] for name in names}
+
+
+def _prepare(
+    bt_config: Any,
+    config: Dict[str, Any],
+    sweep: SweepConfig,
+    run_id: str,
+    output_dir: Path,
+    data_dir: Optional[Path],
+) -> Tuple[Any, Any, Tuple[str, Dict[str, Any], Optional[float]], List[Dict[str, Any]], Set[int]]:
+    """
+    The BacktestConfig running only ``sweep.strategy``, an engine for it
+    (its BarStore loads the bars), the worker job, the combinations and
+    the EMA periods they read.
+    """
+    from backtest.engine_v3 import BacktestEngineV3
+
+    bt_config = dataclasses.replace(bt_config, strategies=[sweep.strategy], workers=1, shard_by=None)
+    engine = BacktestEngineV3(bt_config=bt_config, config=config, run_id=run_id, output_dir=output_dir)
+    if data_dir is not None:
+        engine.data_loader.market_data_dir = data_dir
+    engine._initialize_strategy_engine()
+    specs = {strategy_id: full_config for strategy_id, _, full_config in engine._strategy_specs}
+    if sweep.strategy not in specs:
+        raise ValueError(f"Strategy {sweep.strategy!r} not found in strategy_engine.strategies_v2")
+    base_params = specs[sweep.strategy]
+
+    combos = sweep.combinations()
+    periods: Set[int] = set()
+    for combo in combos:
+        periods |= strategy_ema_periods({**base_params, **combo})
+    return bt_config, engine, (sweep.strategy, base_params, sweep.max_drawdown_pct), combos, periods
+
+
+def run_sweep(
+    bt_config: Any,
+    config: Dict[str, Any],
+    sweep: SweepConfig,
+    sweep_id: Optional[str] = None,
+    output_dir: Optional[Path] = None,
+    data_dir: Optional[Path] = None,
+    start_method: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Path]:
+    """
+    Evaluate every combination of ``sweep`` and write the ranked results.
+
+    Args:
+        bt_config: Symbols, dates and sizing for every evaluation (only
+            ``sweep.strategy`` runs)
+        config: Main application config (YAML)
+        sweep: What to sweep
+        sweep_id: Sweep identifier (generated if None)
+        output_dir: Sweep directory (default artifacts/sweeps/<sweep_id>)
+        data_dir: Market data directory (default: the data loader's)
+        start_method: multiprocessing start method (platform default if None)
+
+    Returns:
+        (result rows best first, path of results.json)
+
+    Raises:
+        ValueError: ``sweep.strategy`` is not in strategy_engine.strategies_v2
+    """
+    sweep_id = sweep_id or f"sweep_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    output_dir = Path(output_dir) if output_dir else Path(__file__).resolve().parents[1] / "artifacts" / "sweeps" / sweep_id
+    bt_config, loader_engine, job, combos, periods = _prepare(bt_config, config, sweep, sweep_id, output_dir, data_dir)
+    tasks = list(enumerate(combos))
+    workers = max(1, min(sweep.workers, len(tasks)))
+    logger.info("Sweep %s: %d combinations of %s on %d workers", sweep_id, len(tasks), sweep.strategy, workers)
+
+    with SharedBarStore.create(loader_engine.bar_store, bt_config.symbols, periods) as store:
+        if workers == 1:
+            loader_engine.bar_store = store
+            rows = [_evaluate(loader_engine, job, task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            ctx = multiprocessing.get_context(start_method)
+            init_args = (bt_config, config, sweep_id, output_dir, store.spec, job)
+            with ctx.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+                rows = list(pool.imap(_evaluate_task, tasks, chunksize))
+
+    ranked = rank_rows(rows, sweep.rank_by)
+    path = output_dir / "results.json"
+    payload = {
+        "sweep_id": sweep_id,
+        "config": bt_config.to_dict(),
+        "sweep": dataclasses.asdict(sweep),
+        "columns": to_columns(ranked, list(sweep.grid)),
+    }
+    with path.open("w") as f:
+        f.write(json.dumps(payload))
+    stopped = sum(1 for row in ranked if row["stopped_early"])
+    logger.info("Sweep %s complete: %d combinations (%d stopped early) -> %s", sweep_id, len(ranked), stopped, path)
+    return ranked, path
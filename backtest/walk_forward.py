@@ -0,0 +1,287 @@
+"""
+Walk-forward optimization for Backtest Engine v3.
+
+The date range is cut into rolling windows: ``in_sample_months`` to pick
+params, then the next ``out_of_sample_months`` to trade them, rolling
+forward by the out-of-sample length. For each window every combination
+of the sweep grid is evaluated on the in-sample dates, the best one by
+``rank_by`` (see backtest/sweep.py) is replayed on the out-of-sample
+dates, and the out-of-sample replays are stitched into one result.
+
+Bars and indicators are read and computed once for the whole range into
+a SharedBarStore, so overlapping windows reuse them and indicators are
+warm at each window's first bar (EMAs carry the history before it, as
+they would live). Windows run in parallel on a process pool, one window
+per task.
+
+Each out-of-sample replay starts flat from ``initial_equity``; stitching
+carries the realized P&L of earlier windows into the later windows' cash
+and equity, and offsets bar indexes. The stitched run is a regular
+BacktestResult (trades carry their ``window``), written to
+``artifacts/backtests/<strategy>/<run_id>/`` where the dashboard's
+backtest registry lists it; overall_metrics["walk_forward"] holds the
+windows and the params chosen in each.
+"""
+
+from __future__ import annotations
+
+import calendar
+import dataclasses
+import json
+import logging
+import multiprocessing
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backtest import sweep as sweep_module
+from backtest.bar_store import SharedBarStore
+from backtest.sweep import SweepConfig, rank_rows
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Window:
+    """One in-sample period and the out-of-sample period after it."""
+
+    index: int
+    in_sample_start: date
+    in_sample_end: date
+    out_of_sample_start: date
+    out_of_sample_end: date
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "in_sample": [self.in_sample_start.isoformat(), self.in_sample_end.isoformat()],
+            "out_of_sample": [self.out_of_sample_start.isoformat(), self.out_of_sample_end.isoformat()],
+        }
+
+
+@dataclass
+class WalkForwardConfig:
+    """
+    Walk-forward settings.
+
+    Attributes:
+        sweep: Strategy, grid, search and ranking used in each in-sample period
+        in_sample_months: Months to optimize on
+        out_of_sample_months: Months to trade the chosen params (and roll by)
+    """
+
+    sweep: SweepConfig
+    in_sample_months: int = 3
+    out_of_sample_months: int = 1
+
+    def __post_init__(self) -> None:
+        if self.in_sample_months < 1 or self.out_of_sample_months < 1:
+            raise ValueError("in_sample_months and out_of_sample_months must be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WalkForwardConfig":
+        """Create WalkForwardConfig from a ``sweep`` section with a ``walk_forward`` block."""
+        walk_forward = data.get("walk_forward") or {}
+        return cls(
+            sweep=SweepConfig.from_dict(data),
+            in_sample_months=int(walk_forward.get("in_sample_months", 3)),
+            out_of_sample_months=int(walk_forward.get("out_of_sample_months", 1)),
+        )
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def plan_windows(start_date: str, end_date: str, in_sample_months: int, out_of_sample_months: int = 1) -> List[Window]:
+    """
+    Rolling windows over ``start_date..end_date``; the last out-of-sample
+    period is cut at ``end_date``.
+
+    Raises:
+        ValueError: The range is shorter than one in-sample period plus a day
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    windows: List[Window] = []
+    while True:
+        in_sample_start = _add_months(start, len(windows) * out_of_sample_months)
+        out_of_sample_start = _add_months(in_sample_start, in_sample_months)
+        if out_of_sample_start > end:
+            break
+        out_of_sample_end = min(_add_months(out_of_sample_start, out_of_sample_months) - timedelta(days=1), end)
+        windows.append(Window(
+            len(windows), in_sample_start, out_of_sample_start - timedelta(days=1), out_of_sample_start, out_of_sample_end,
+        ))
+    if not windows:
+        raise ValueError(f"{start_date}..{end_date} is too short for {in_sample_months} in-sample months")
+    return windows
+
+
+# The worker process's combinations and ranking (set by _init_worker)
+_plan: Optional[Tuple[List[Dict[str, Any]], str]] = None
+
+
+def _init_worker(*args: Any) -> None:
+    global _plan
+    *sweep_args, _plan = args
+    sweep_module._init_worker(*sweep_args)
+
+
+def _run_window(
+    engine: Any,
+    job: Tuple[str, Dict[str, Any], Optional[float]],
+    plan: Tuple[List[Dict[str, Any]], str],
+    window: Window,
+) -> Dict[str, Any]:
+    """Optimize on the window's in-sample dates and replay the winner out of sample."""
+    strategy = job[0]
+    combos, rank_by = plan
+    rows = [
+        sweep_module._evaluate(engine, job, task, start=window.in_sample_start, end=window.in_sample_end)
+        for task in enumerate(combos)
+    ]
+    best = rank_rows(rows, rank_by)[0]
+    params = combos[best["index"]]
+    result = engine.evaluate(
+        strategy_params={strategy: params}, start=window.out_of_sample_start, end=window.out_of_sample_end,
+    )
+    metrics = result.overall_metrics
+    return {
+        "window": window.to_dict(),
+        "params": params,
+        "in_sample_metrics": {name: best[name] for name in sweep_module.METRIC_COLUMNS},
+        "out_of_sample_metrics": {name: metrics.get(name, 0) for name in sweep_module.METRIC_COLUMNS if name in metrics},
+        "trades": result.trades,
+        "equity_curve": result.equity_curve,
+        "bars": engine.bar_index,
+        "signals": engine.signals_generated,
+        "rejected_intents": dict(engine.rejected_intents),
+        "strategy_errors": dict(engine.strategy_errors),
+    }
+
+
+def _run_window_task(window: Window) -> Dict[str, Any]:
+    return _run_window(sweep_module._engine, sweep_module._job, _plan, window)
+
+
+def stitch_windows(engine: Any, window_results: List[Dict[str, Any]]) -> None:
+    """
+    Append each window's out-of-sample trades and equity snapshots to
+    ``engine`` in window order, carrying earlier windows' realized P&L.
+    """
+    equity = engine.state["equity"]
+    initial_equity = engine.bt_config.initial_equity
+    for window_result in window_results:
+        index = window_result["window"]["index"]
+        offset = engine.bar_index
+        carried = equity["cash"] - initial_equity
+        for trade in window_result["trades"]:
+            trade["bar_index"] += offset
+            trade["window"] = index
+            engine.trades.append(trade)
+            engine._journal_trade(trade)
+        for snapshot in window_result["equity_curve"]:
+            snapshot["bar_index"] += offset
+            snapshot["cash"] += carried
+            snapshot["equity"] += carried
+            engine.equity_history.append(snapshot)
+
+        # Every position is closed at the end of the window
+        realized = sum(trade["pnl"] for trade in window_result["trades"] if trade["position_qty"] == 0)
+        equity["cash"] += realized
+        equity["realized_pnl"] += realized
+        engine.bar_index += window_result["bars"]
+        engine.signals_generated += window_result["signals"]
+        for counts, merged in (
+            (window_result["rejected_intents"], engine.rejected_intents),
+            (window_result["strategy_errors"], engine.strategy_errors),
+        ):
+            for key, count in counts.items():
+                merged[key] = merged.get(key, 0) + count
+
+
+def run_walk_forward(
+    bt_config: Any,
+    config: Dict[str, Any],
+    walk_forward: WalkForwardConfig,
+    run_id: Optional[str] = None,
+    output_dir: Optional[Path] = None,
+    data_dir: Optional[Path] = None,
+    start_method: Optional[str] = None,
+) -> Any:
+    """
+    Run the walk-forward windows and save the stitched out-of-sample result.
+
+    Args:
+        bt_config: Symbols, full date range and sizing (only
+            ``walk_forward.sweep.strategy`` runs)
+        config: Main application config (YAML)
+        walk_forward: Windows and sweep settings; ``sweep.workers``
+            windows run at a time
+        run_id: Run identifier (generated if None)
+        output_dir: Run directory (default artifacts/backtests/<strategy>/<run_id>)
+        data_dir: Market data directory (default: the data loader's)
+        start_method: multiprocessing start method (platform default if None)
+
+    Returns:
+        BacktestResult of the stitched out-of-sample replays
+
+    Raises:
+        ValueError: Unknown strategy, or a date range shorter than one window
+    """
+    sweep = walk_forward.sweep
+    windows = plan_windows(
+        bt_config.start_date, bt_config.end_date, walk_forward.in_sample_months, walk_forward.out_of_sample_months,
+    )
+    run_id = run_id or f"wf_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    output_dir = Path(output_dir) if output_dir else (
+        Path(__file__).resolve().parents[1] / "artifacts" / "backtests" / sweep.strategy / run_id
+    )
+    bt_config, engine, job, combos, periods = sweep_module._prepare(bt_config, config, sweep, run_id, output_dir, data_dir)
+    plan = (combos, sweep.rank_by)
+    workers = max(1, min(sweep.workers, len(windows)))
+    logger.info(
+        "Walk-forward %s: %d windows (%d+%d months), %d combinations of %s, %d workers",
+        run_id, len(windows), walk_forward.in_sample_months, walk_forward.out_of_sample_months,
+        len(combos), sweep.strategy, workers,
+    )
+    engine._started_at = time.perf_counter()
+
+    with SharedBarStore.create(engine.bar_store, bt_config.symbols, periods) as store:
+        if workers == 1:
+            bar_store, engine.bar_store = engine.bar_store, store
+            window_results = [_run_window(engine, job, plan, window) for window in windows]
+            engine.bar_store = bar_store
+        else:
+            ctx = multiprocessing.get_context(start_method)
+            init_args = (bt_config, config, run_id, output_dir, store.spec, job, plan)
+            with ctx.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+                window_results = list(pool.imap(_run_window_task, windows))
+
+    # Stitch into a fresh engine state (the in-process path used it for evaluations)
+    started_at = engine._started_at
+    engine._reset_run_state()
+    engine._journal_enabled = True
+    engine._started_at = started_at
+    stitch_windows(engine, window_results)
+    result = engine._compute_results()
+    result.overall_metrics["walk_forward"] = {
+        "in_sample_months": walk_forward.in_sample_months,
+        "out_of_sample_months": walk_forward.out_of_sample_months,
+        "sweep": dataclasses.asdict(sweep),
+        "windows": [
+            {**window_result["window"], **{key: window_result[key] for key in ("params", "in_sample_metrics", "out_of_sample_metrics")}}
+            for window_result in window_results
+        ],
+    }
+
+    with (engine.backtest_dir / "config.json").open("w") as f:
+        json.dump(bt_config.to_dict(), f, indent=2)
+    engine._save_results(result)
+    logger.info("Walk-forward %s complete: %d windows -> %s", run_id, len(windows), engine.backtest_dir)
+    return result
@@ -18,6 +18,7 @@ from core.kite_ticker import make_kite_ticker
 
 from broker.auth import make_kite_client_from_env, token_is_valid
 from core.kite_http import kite_request
+from core.tick_recorder import TickRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,12 @@ class KiteBroker:
         self._on_tick_callback: Optional[Callable] = None
         self._subscribed_instruments: List[int] = []
         
+        # Optional raw tick recording for offline replay (data.record_ticks)
+        self.tick_recorder: Optional[TickRecorder] = None
+        data_cfg = (config or {}).get("data") or {}
+        if data_cfg.get("record_ticks"):
+            self.tick_recorder = TickRecorder(data_cfg.get("replay_dir"))
+        
     def ensure_logged_in(self) -> bool:
         """
         Ensure we have a valid Kite session.
@@ -405,14 +412,23 @@ class KiteBroker:
         """Internal: Handle incoming ticks from WebSocket."""
         if not self._on_tick_callback:
             return
-            
+        
+        recorded = [] if self.tick_recorder else None
         for tick in ticks:
             try:
                 # Normalize tick to consistent format
                 normalized = self._normalize_tick(tick)
+                if recorded is not None:
+                    recorded.append(normalized)
                 self._on_tick_callback(normalized)
             except Exception as exc:
                 self.logger.error("Error in tick callback: %s", exc)
+        
+        if recorded:
+            try:
+                self.tick_recorder.record(recorded)
+            except Exception as exc:
+                self.logger.error("Failed to record ticks: %s", exc)
     
     def _normalize_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -469,3 +485,5 @@ class KiteBroker:
                 pass
             self.ticker = None
             self.logger.info("WebSocket ticker stopped")
+        if self.tick_recorder:
+            self.tick_recorder.close()
@@ -5,6 +5,11 @@ This module provides functions to:
 - List all available backtest runs from the artifacts directory
 - Load summary data for specific runs
 - Reconstruct equity curves from fills.csv or orders.csv
+
+Runs saved by BacktestEngineV3 (summary.json in the BacktestResult schema,
+e.g. walk-forward runs under artifacts/backtests/<strategy>/<run_id>) are
+read too: their summary comes from overall_metrics and trades, and their
+equity curve from equity_curve.json.
 """
 
 from __future__ import annotations
@@ -18,6 +23,18 @@ from typing import Any, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 
+def _result_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """total_pnl / win_rate (%) / total_trades of a BacktestResult-schema file (closed trades)."""
+    metrics = data.get("overall_metrics") or {}
+    closed = [trade for trade in data.get("trades") or [] if trade.get("position_qty") == 0]
+    wins = sum(1 for trade in closed if float(trade.get("pnl", 0.0)) > 0)
+    return {
+        "total_pnl": metrics.get("realized_pnl", 0.0),
+        "win_rate": 100.0 * wins / len(closed) if closed else 0.0,
+        "total_trades": len(closed),
+    }
+
+
 def list_backtest_runs(base_dir: str = "artifacts/backtests") -> List[Dict[str, Any]]:
     """
     Discover all backtest runs in the artifacts/backtests directory.
@@ -72,16 +89,21 @@ def list_backtest_runs(base_dir: str = "artifacts/backtests") -> List[Dict[str,
                     data = json.load(f)
                 
                 # Extract summary information
-                summary = data.get("summary", {})
                 config = data.get("config", {})
+                if "summary" in data:
+                    summary = data["summary"]
+                elif "overall_metrics" in data:
+                    summary = _result_summary(data)
+                else:
+                    summary = {}
                 
                 # Get symbols (may be a list)
                 symbols = config.get("symbols", [])
                 symbol = symbols[0] if isinstance(symbols, list) and symbols else "N/A"
                 
-                # Extract dates
-                date_from = config.get("from", "N/A")
-                date_to = config.get("to", "N/A")
+                # Extract dates (BacktestConfig names them start_date / end_date)
+                date_from = config.get("from", config.get("start_date", "N/A"))
+                date_to = config.get("to", config.get("end_date", "N/A"))
                 
                 # Extract metrics
                 net_pnl = summary.get("total_pnl", 0.0)
@@ -173,7 +195,8 @@ def load_backtest_equity_curve(
     base_dir: str = "artifacts/backtests",
 ) -> List[Dict[str, Any]]:
     """
-    Reconstruct the equity curve from fills.csv or orders.csv.
+    Reconstruct the equity curve from fills.csv or orders.csv (or read a
+    BacktestEngineV3 run's equity_curve.json).
     
     Args:
         run_id: Full path to run, e.g., "ema20_50_intraday/2025-11-14_1545"
@@ -214,13 +237,15 @@ def load_backtest_equity_curve(
         try:
             with summary_path.open("r", encoding="utf-8") as f:
                 data = json.load(f)
-                starting_capital = float(data.get("config", {}).get("capital", starting_capital))
+                config = data.get("config", {})
+                starting_capital = float(config.get("capital", config.get("initial_equity", starting_capital)))
         except Exception:
             pass
     
     # Try fills.csv first (more accurate for equity curve)
     fills_path = run_dir / "fills.csv"
     orders_path = run_dir / "orders.csv"
+    equity_path = run_dir / "equity_curve.json"
     
     curve: List[Dict[str, Any]] = []
     cumulative_pnl = 0.0
@@ -276,6 +301,19 @@ def load_backtest_equity_curve(
                     })
         except Exception as exc:
             logger.warning("Failed to parse orders.csv from %s: %s", orders_path, exc)
+    elif equity_path.exists():
+        # BacktestEngineV3 snapshots: equity marked to market on every bar
+        try:
+            with equity_path.open("r", encoding="utf-8") as f:
+                for point in json.load(f):
+                    equity = float(point.get("equity", starting_capital))
+                    curve.append({
+                        "ts": point.get("timestamp", ""),
+                        "equity": equity,
+                        "pnl": equity - starting_capital,
+                    })
+        except Exception as exc:
+            logger.warning("Failed to parse equity_curve.json from %s: %s", equity_path, exc)
     else:
         logger.warning("Neither fills.csv nor orders.csv found in %s", run_dir)
     
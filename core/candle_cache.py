@@ -0,0 +1,383 @@
+"""
+On-disk Candle Cache Backends
+
+Storage for the historical candle cache kept by MarketDataEngine, one file per
+(symbol, timeframe) under ``artifacts/market_data``:
+
+- ``JsonCandleCache``: the original format, a pretty-printed JSON list that is
+  re-sorted and rewritten in full on every save.
+- ``BinaryCandleCache``: fixed-width little-endian records in an append-only
+  ``.bin`` file, memory-mapped for reads. A merge only rewrites the records
+  from the first overlapping timestamp onwards (normally just the bar that
+  was still forming) and appends the rest, and ``tail(n)`` decodes only the
+  last ``n`` records.
+
+Both expose the same interface and return candles as dicts with
+ts/open/high/low/close/volume keys, ``ts`` as an ISO-8601 string.
+
+Existing JSON caches are imported by ``BinaryCandleCache`` the first time a
+key is read, or all at once with ``migrate_json_cache()``
+(see scripts/migrate_market_cache.py).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKENDS = ("binary", "json")
+DEFAULT_CACHE_BACKEND = "binary"
+
+# File layout: 8-byte magic header followed by RECORD_DTYPE records
+BINARY_MAGIC = b"KCANDL01"
+HEADER_SIZE = len(BINARY_MAGIC)
+RECORD_DTYPE = np.dtype(
+    [
+        ("epoch", "<i8"),  # bar start, seconds since the Unix epoch
+        ("utcoffset", "<i8"),  # offset of the original ISO timestamp, seconds
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+_PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def cache_file_stem(symbol: str, timeframe: str) -> str:
+    """File name stem shared by all backends, e.g. ``NIFTY24DECFUT_5m``."""
+    safe_symbol = symbol.replace(":", "_").replace("/", "_").upper()
+    safe_tf = (timeframe or "1m").replace(" ", "").lower()
+    return f"{safe_symbol}_{safe_tf}"
+
+
+class JsonCandleCache:
+    """Pretty-printed JSON list per (symbol, timeframe), cached in memory."""
+
+    suffix = ".json"
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self._memory: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.cache_dir / f"{cache_file_stem(symbol, timeframe)}{self.suffix}"
+
+    def load(self, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
+        key = (symbol.upper(), timeframe)
+        if key in self._memory:
+            return list(self._memory[key])
+        path = self.path(symbol, timeframe)
+        candles = read_json_candles(path) if path.exists() else []
+        self._memory[key] = candles
+        return list(candles)
+
+    def tail(self, symbol: str, timeframe: str, n: int) -> List[Dict[str, Any]]:
+        if n <= 0:
+            return []
+        return self.load(symbol, timeframe)[-n:]
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        key = (symbol.upper(), timeframe)
+        if key not in self._memory:
+            self.load(symbol, timeframe)
+        return len(self._memory[key])
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """(symbol, timeframe) pairs read or written by this process."""
+        return list(self._memory)
+
+    def save(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> None:
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        candles_sorted = sorted(candles, key=lambda c: c.get("ts") or "")
+        path.write_text(json.dumps(candles_sorted, indent=2), encoding="utf-8")
+        self._memory[(symbol.upper(), timeframe)] = candles_sorted
+
+    def merge(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> None:
+        """Upsert candles by timestamp and rewrite the file."""
+        existing = self.load(symbol, timeframe)
+        merged: Dict[str, Dict[str, Any]] = {entry["ts"]: entry for entry in existing if entry.get("ts")}
+        for candle in candles:
+            merged[candle["ts"]] = candle
+        self.save(symbol, timeframe, sorted(merged.values(), key=lambda c: c["ts"]))
+
+
+class BinaryCandleCache:
+    """
+    Append-only fixed-width candle records per (symbol, timeframe).
+
+    Records are kept sorted by bar start. Reads go through a read-only
+    ``np.memmap`` that is re-opened when the file grows, so other processes
+    appending to the same cache (e.g. the refresh script) are picked up.
+    Files never shrink, which keeps maps held by concurrent readers valid.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, cache_dir: Path, import_json: bool = True) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.import_json = import_json
+        self._maps: Dict[Path, Tuple[int, np.ndarray]] = {}
+        self._keys: Dict[Tuple[str, str], None] = {}
+        self._suffix_cache: Dict[int, str] = {}
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.cache_dir / f"{cache_file_stem(symbol, timeframe)}{self.suffix}"
+
+    # -- reads ---------------------------------------------------------------
+
+    def records(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Memory-mapped structured array of all records (read-only)."""
+        self._keys[(symbol.upper(), timeframe)] = None
+        path = self.path(symbol, timeframe)
+        if not path.exists() and self.import_json:
+            self._import_json(symbol, timeframe)
+        return self._map(path)
+
+    def load(self, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
+        return self._to_dicts(self.records(symbol, timeframe))
+
+    def tail(self, symbol: str, timeframe: str, n: int) -> List[Dict[str, Any]]:
+        if n <= 0:
+            return []
+        return self._to_dicts(self.records(symbol, timeframe)[-n:])
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        return len(self.records(symbol, timeframe))
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """(symbol, timeframe) pairs read or written by this process."""
+        return list(self._keys)
+
+    # -- writes --------------------------------------------------------------
+
+    def save(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> None:
+        """Replace the stored candles (the only path that rewrites the whole file)."""
+        path = self.path(symbol, timeframe)
+        self._keys[(symbol.upper(), timeframe)] = None
+        self._maps.pop(path, None)
+        write_records(path, encode_candles(candles))
+
+    def merge(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> None:
+        """
+        Upsert candles by bar start.
+
+        Stored records before the earliest incoming bar are left untouched;
+        the overlapping suffix is merged with the new rows and written back
+        in place, with any extra records appended.
+        """
+        rows = encode_candles(candles)
+        if rows.size == 0:
+            return
+        path = self.path(symbol, timeframe)
+        stored = self.records(symbol, timeframe)
+        if stored.size == 0:
+            self.save(symbol, timeframe, candles)
+            return
+
+        start = int(np.searchsorted(stored["epoch"], rows["epoch"][0], side="left"))
+        suffix = np.array(stored[start:])
+        if suffix.size:
+            # np.unique keeps the first occurrence, so new rows win on equal timestamps
+            combined = np.concatenate([rows, suffix])
+            _, first = np.unique(combined["epoch"], return_index=True)
+            rows = combined[first]
+
+        with open(path, "r+b") as fh:
+            fh.seek(HEADER_SIZE + start * RECORD_SIZE)
+            fh.write(rows.tobytes())
+
+    # -- internals -----------------------------------------------------------
+
+    def _map(self, path: Path) -> np.ndarray:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            self._maps.pop(path, None)
+            return np.empty(0, dtype=RECORD_DTYPE)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        n = max(0, (size - HEADER_SIZE) // RECORD_SIZE)
+        if n == 0:
+            records = np.empty(0, dtype=RECORD_DTYPE)
+        else:
+            with open(path, "rb") as fh:
+                magic = fh.read(HEADER_SIZE)
+            if magic != BINARY_MAGIC:
+                logger.warning("Ignoring candle cache %s: unrecognised header", path)
+                records = np.empty(0, dtype=RECORD_DTYPE)
+            else:
+                records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+        self._maps[path] = (size, records)
+        return records
+
+    def _import_json(self, symbol: str, timeframe: str) -> None:
+        json_path = self.cache_dir / f"{cache_file_stem(symbol, timeframe)}{JsonCandleCache.suffix}"
+        if not json_path.exists():
+            return
+        candles = read_json_candles(json_path)
+        if candles:
+            self.save(symbol, timeframe, candles)
+            logger.info("Imported %d candles from %s", len(candles), json_path.name)
+
+    def _to_dicts(self, records: np.ndarray) -> List[Dict[str, Any]]:
+        if records.size == 0:
+            return []
+        # Format wall-clock times in one vectorised call, then add each offset suffix
+        offsets = records["utcoffset"]
+        local = (records["epoch"] + offsets).astype("datetime64[s]")
+        wall_clock = np.datetime_as_string(local, unit="s").tolist()
+        suffix_cache = self._suffix_cache
+        result: List[Dict[str, Any]] = []
+        for wall, offset, open_, high, low, close, volume in zip(
+            wall_clock,
+            offsets.tolist(),
+            records["open"].tolist(),
+            records["high"].tolist(),
+            records["low"].tolist(),
+            records["close"].tolist(),
+            records["volume"].tolist(),
+        ):
+            suffix = suffix_cache.get(offset)
+            if suffix is None:
+                suffix = suffix_cache[offset] = _offset_suffix(offset)
+            result.append(
+                {
+                    "ts": wall + suffix,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume,
+                }
+            )
+        return result
+
+
+def _offset_suffix(offset: int) -> str:
+    """ISO-8601 UTC offset suffix matching datetime.isoformat(), e.g. ``+05:30``."""
+    return datetime(2000, 1, 1, tzinfo=timezone(timedelta(seconds=offset))).isoformat()[19:]
+
+
+def encode_candles(candles: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Build a sorted, de-duplicated record array (last candle wins per ts)."""
+    by_epoch: Dict[int, Tuple[Any, ...]] = {}
+    for candle in candles:
+        parsed = _parse_iso(candle.get("ts"))
+        if parsed is None:
+            continue
+        try:
+            by_epoch[parsed[0]] = parsed + tuple(float(candle.get(f, 0.0) or 0.0) for f in _PRICE_FIELDS)
+        except (TypeError, ValueError):
+            continue
+    return np.array([by_epoch[k] for k in sorted(by_epoch)], dtype=RECORD_DTYPE)
+
+
+def write_records(path: Path, rows: np.ndarray) -> None:
+    """Atomically write a complete binary cache file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(BINARY_MAGIC)
+        fh.write(rows.tobytes())
+    os.replace(tmp_path, path)
+
+
+def _parse_iso(ts: Any) -> Optional[Tuple[int, int]]:
+    """Return (epoch seconds, utc offset seconds) for an ISO timestamp; naive means UTC."""
+    if isinstance(ts, datetime):
+        dt = ts
+    elif isinstance(ts, str) and ts:
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    offset = dt.utcoffset()
+    return int(dt.timestamp()), (int(offset.total_seconds()) if offset else 0)
+
+
+def read_json_candles(path: Path) -> List[Dict[str, Any]]:
+    """Read and normalise a JSON candle file (empty list on decode errors)."""
+    try:
+        candles = json.loads(Path(path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        logger.warning("Failed to decode market cache %s: %s", path, exc)
+        return []
+    if not isinstance(candles, list):
+        return []
+    normalized = [normalize_candle(entry) for entry in candles if isinstance(entry, dict)]
+    return [c for c in normalized if c]
+
+
+def normalize_candle(candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not isinstance(candle, dict):
+        return None
+    ts = candle.get("ts") or candle.get("timestamp") or candle.get("date")
+    if isinstance(ts, datetime):
+        ts_iso = ts.replace(tzinfo=timezone.utc).isoformat()
+    else:
+        ts_iso = str(ts)
+    try:
+        entry = {
+            "ts": ts_iso,
+            "open": float(candle.get("open", 0.0)),
+            "high": float(candle.get("high", 0.0)),
+            "low": float(candle.get("low", 0.0)),
+            "close": float(candle.get("close", 0.0)),
+            "volume": float(candle.get("volume", 0.0)),
+        }
+    except (TypeError, ValueError):
+        return None
+    return entry
+
+
+def make_candle_cache(backend: str, cache_dir: Path) -> JsonCandleCache | BinaryCandleCache:
+    """Build the cache backend named by ``data.cache_backend`` ("binary" or "json")."""
+    name = (backend or DEFAULT_CACHE_BACKEND).lower()
+    if name == "json":
+        return JsonCandleCache(cache_dir)
+    if name != "binary":
+        raise ValueError(f"Unknown candle cache backend {backend!r}; expected one of {CACHE_BACKENDS}")
+    return BinaryCandleCache(cache_dir)
+
+
+def migrate_json_cache(cache_dir: Path, remove_json: bool = False, overwrite: bool = False) -> int:
+    """
+    Convert every ``*.json`` candle file in ``cache_dir`` to the binary format.
+
+    Existing ``.bin`` files are kept unless ``overwrite`` is set. Returns the
+    number of files converted.
+    """
+    cache_dir = Path(cache_dir)
+    converted = 0
+    for json_path in sorted(cache_dir.glob(f"*{JsonCandleCache.suffix}")):
+        bin_path = json_path.with_suffix(BinaryCandleCache.suffix)
+        if bin_path.exists() and not overwrite:
+            continue
+        candles = read_json_candles(json_path)
+        if not candles:
+            continue
+        write_records(bin_path, encode_candles(candles))
+        converted += 1
+        if remove_json:
+            json_path.unlink()
+    return converted
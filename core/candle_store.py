@@ -0,0 +1,184 @@
+"""
+Columnar Candle Store
+
+Fixed-capacity, NumPy-backed ring buffers for OHLCV bars, used by
+MarketDataEngineV2 to hold closed candles per (symbol, timeframe).
+
+Each buffer keeps parallel float64 columns (open, high, low, close, volume)
+plus a timestamp column. Every value is written twice, at slot ``i`` and
+``i + capacity``, so the most recent ``n`` bars are always one contiguous
+slice and window reads return array views without copying.
+
+Views alias the buffer: they stay valid until ``capacity - n`` further bars
+are appended. Copy them (``np.array(view)``) if they must outlive that.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Column order inside the (5, 2 * capacity) float matrix
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+_FIELD_INDEX = {name: i for i, name in enumerate(OHLCV_FIELDS)}
+
+# Short bar keys used by MarketDataEngineV2 bar dicts
+_SHORT_KEYS = ("o", "h", "l", "c", "v")
+
+
+class CandleSeries(Mapping):
+    """
+    Read-only mapping of column name -> array view for a window of bars.
+
+    Behaves like the ``{"open": [...], "high": [...], ...}`` series dicts the
+    strategy engines already consume, but the values are NumPy views into the
+    owning CandleRingBuffer. ``ts`` holds the ISO bar timestamps.
+    """
+
+    __slots__ = ("_columns", "_ts")
+
+    def __init__(self, columns: np.ndarray, ts: np.ndarray) -> None:
+        self._columns = columns
+        self._ts = ts
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        if key == "ts":
+            return self._ts
+        return self._columns[_FIELD_INDEX[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from OHLCV_FIELDS
+        yield "ts"
+
+    def __len__(self) -> int:
+        return len(OHLCV_FIELDS) + 1
+
+    @property
+    def num_bars(self) -> int:
+        """Number of bars in this window."""
+        return self._columns.shape[1]
+
+    def to_lists(self) -> Dict[str, List[float]]:
+        """Return a plain dict of Python lists (one C-level copy per column)."""
+        result: Dict[str, List[Any]] = {
+            name: self._columns[i].tolist() for i, name in enumerate(OHLCV_FIELDS)
+        }
+        result["ts"] = self._ts.tolist()
+        return result
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity circular buffer of OHLCV bars for one (symbol, timeframe).
+
+    Supports the subset of the ``deque`` API MarketDataEngineV2 relied on
+    (``append``, ``len``, indexing, iteration), returning bar dicts with the
+    engine's short keys (ts, o, h, l, c, v), plus zero-copy column access via
+    ``series()``.
+    """
+
+    __slots__ = ("capacity", "_values", "_ts", "_head", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = int(capacity)
+        self._values = np.zeros((len(OHLCV_FIELDS), 2 * self.capacity), dtype=np.float64)
+        self._ts = np.empty(2 * self.capacity, dtype=object)
+        self._head = 0  # next write slot in [0, capacity)
+        self._size = 0
+
+    def append(self, bar: Dict[str, Any]) -> None:
+        """Append one closed bar (short or long key names)."""
+        self.append_values(
+            bar.get("ts"),
+            float(bar.get("o", bar.get("open", 0.0)) or 0.0),
+            float(bar.get("h", bar.get("high", 0.0)) or 0.0),
+            float(bar.get("l", bar.get("low", 0.0)) or 0.0),
+            float(bar.get("c", bar.get("close", 0.0)) or 0.0),
+            float(bar.get("v", bar.get("volume", 0.0)) or 0.0),
+        )
+
+    def append_values(
+        self,
+        ts: Any,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        """Append one bar from scalar values without building a dict."""
+        i = self._head
+        j = i + self.capacity
+        values = self._values
+        values[0, i] = values[0, j] = open_
+        values[1, i] = values[1, j] = high
+        values[2, i] = values[2, j] = low
+        values[3, i] = values[3, j] = close
+        values[4, i] = values[4, j] = volume
+        self._ts[i] = self._ts[j] = ts
+
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def _window_bounds(self, n: Optional[int]) -> tuple[int, int]:
+        """Return [start, end) into the doubled arrays for the newest n bars."""
+        count = self._size if n is None else max(0, min(int(n), self._size))
+        end = self._head + self.capacity
+        return end - count, end
+
+    def series(self, n: Optional[int] = None) -> CandleSeries:
+        """Return zero-copy column views for the newest ``n`` bars (all if None)."""
+        start, end = self._window_bounds(n)
+        return CandleSeries(self._values[:, start:end], self._ts[start:end])
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Return a zero-copy view of one column for the newest ``n`` bars."""
+        start, end = self._window_bounds(n)
+        return self._values[_FIELD_INDEX[name], start:end]
+
+    def _bar_at(self, pos: int) -> Dict[str, Any]:
+        values = self._values
+        return {
+            "ts": self._ts[pos],
+            "o": float(values[0, pos]),
+            "h": float(values[1, pos]),
+            "l": float(values[2, pos]),
+            "c": float(values[3, pos]),
+            "v": float(values[4, pos]),
+        }
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if not isinstance(index, int):
+            raise TypeError("CandleRingBuffer indices must be integers; use tail() for windows")
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("CandleRingBuffer index out of range")
+        start, _ = self._window_bounds(None)
+        return self._bar_at(start + index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        start, end = self._window_bounds(None)
+        for pos in range(start, end):
+            yield self._bar_at(pos)
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """Return the newest ``n`` bars as short-key dicts (oldest first)."""
+        start, end = self._window_bounds(n)
+        return [self._bar_at(pos) for pos in range(start, end)]
+
+    def clear(self) -> None:
+        """Drop all bars."""
+        self._head = 0
+        self._size = 0
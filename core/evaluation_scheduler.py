@@ -0,0 +1,159 @@
+"""
+Dirty-symbol scheduler for strategy evaluation.
+
+The paper engine loop runs far more often than bars close. Re-running the
+indicator stack and strategy logic for a (symbol, timeframe) whose inputs
+have not changed only reproduces the previous decision, so the loop asks
+the EvaluationScheduler first:
+
+    scheduler = EvaluationScheduler(price_move_pct=0.002)
+    mde_v2.register_on_candle_close(scheduler.on_candle_close)
+
+    if scheduler.should_evaluate(symbol, "5m", ltp, bar_ts=latest_bar["ts"]):
+        ...  # compute indicators, evaluate strategies
+
+A key is dirty when:
+
+- it has never been evaluated;
+- MarketDataEngineV2 closed a bar for it (on_candle_close);
+- the latest bar timestamp passed to should_evaluate differs from the one
+  seen at the previous evaluation (bars closed through the historical
+  cache refresh of MarketDataEngine);
+- the price moved at least ``price_move_pct`` (relative) away from the
+  price at the previous evaluation, so large intra-bar moves are not
+  ignored until the bar closes.
+
+Everything else is skipped. Stop/target enforcement does not go through
+the scheduler and keeps running on every tick.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# Default intra-bar move (0.2%) that forces a re-evaluation before the bar closes
+DEFAULT_PRICE_MOVE_PCT = 0.002
+
+
+@dataclass
+class _KeyState:
+    dirty: bool = True
+    reason: str = "first_eval"
+    price: Optional[float] = None
+    bar_ts: Any = None
+
+
+class EvaluationScheduler:
+    """
+    Tracks which (symbol, timeframe) keys need a strategy evaluation.
+
+    Attributes:
+        price_move_pct: Relative price move since the last evaluation that
+            marks a key dirty (0 or None disables the price trigger)
+        enabled: When False every key is always evaluated (the scheduler
+            only counts)
+        stats: Counters: executed, skipped, and executions per trigger
+            (first_eval, bar_close, new_bar, price_move, always)
+    """
+
+    def __init__(self, price_move_pct: Optional[float] = DEFAULT_PRICE_MOVE_PCT, enabled: bool = True) -> None:
+        self.price_move_pct = float(price_move_pct) if price_move_pct else 0.0
+        self.enabled = bool(enabled)
+        self._keys: Dict[Tuple[str, str], _KeyState] = {}
+        # Bar closes arrive on the MDE v2 ticker thread
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "executed": 0,
+            "skipped": 0,
+            "first_eval": 0,
+            "bar_close": 0,
+            "new_bar": 0,
+            "price_move": 0,
+            "always": 0,
+        }
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "EvaluationScheduler":
+        """Build from a ``strategy_engine.scheduler`` config block."""
+        cfg = cfg or {}
+        return cls(
+            price_move_pct=cfg.get("price_move_pct", DEFAULT_PRICE_MOVE_PCT),
+            enabled=cfg.get("enabled", True),
+        )
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> Tuple[str, str]:
+        return (symbol.upper(), timeframe or "")
+
+    def mark_dirty(self, symbol: str, timeframe: str, reason: str = "bar_close") -> None:
+        """Force the next should_evaluate() for this key to run."""
+        with self._lock:
+            state = self._keys.setdefault(self._key(symbol, timeframe), _KeyState())
+            if not state.dirty:
+                state.dirty = True
+                state.reason = reason
+
+    def on_candle_close(self, symbol: str, timeframe: str, candle: Dict[str, Any]) -> None:
+        """MarketDataEngineV2 candle-close handler."""
+        self.mark_dirty(symbol, timeframe, "bar_close")
+
+    def should_evaluate(
+        self,
+        symbol: str,
+        timeframe: str,
+        price: Optional[float],
+        bar_ts: Any = None,
+    ) -> bool:
+        """
+        Decide whether to evaluate this key now.
+
+        Returning True counts as an evaluation: the key is marked clean and
+        price / bar_ts become the reference for the next call.
+        """
+        with self._lock:
+            state = self._keys.setdefault(self._key(symbol, timeframe), _KeyState())
+            reason = None
+            if not self.enabled:
+                reason = "always"
+            elif state.dirty:
+                reason = state.reason
+            elif bar_ts is not None and bar_ts != state.bar_ts:
+                reason = "new_bar"
+            elif (
+                self.price_move_pct
+                and price is not None
+                and state.price
+                and abs(price - state.price) >= self.price_move_pct * abs(state.price)
+            ):
+                reason = "price_move"
+
+            if reason is None:
+                self.stats["skipped"] += 1
+                return False
+
+            self.stats["executed"] += 1
+            self.stats[reason] = self.stats.get(reason, 0) + 1
+            state.dirty = False
+            state.price = price
+            if bar_ts is not None:
+                state.bar_ts = bar_ts
+            return True
+
+    def forget(self, symbol: str, timeframe: Optional[str] = None) -> None:
+        """Drop a symbol's keys (universe changes); they are evaluated again on next sight."""
+        sym = symbol.upper()
+        with self._lock:
+            for key in [k for k in self._keys if k[0] == sym and (timeframe is None or k[1] == timeframe)]:
+                del self._keys[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus the executed share of all evaluation requests."""
+        with self._lock:
+            total = self.stats["executed"] + self.stats["skipped"]
+            return {
+                **self.stats,
+                "execute_rate": self.stats["executed"] / total if total else 0.0,
+                "keys": len(self._keys),
+            }
@@ -0,0 +1,245 @@
+"""
+Rate-limited concurrent fetcher for Kite historical candles.
+
+Kite caps the historical API at a few requests per second per API key and
+limits how many days one request may span for each interval. This module
+gives every caller (backfill script, history loader, MarketDataEngine) one
+way to respect both:
+
+- ``TokenBucket`` enforces the request rate. A single bucket is shared by
+  every fetcher in the process, so concurrent callers draw from the same
+  quota.
+- ``HistoricalFetcher`` splits long date ranges into the largest chunks
+  Kite allows. It runs the chunks on a thread pool and retries each chunk
+  through ``kite_request``. Every attempt takes a token from the bucket.
+
+Only ``kite.historical_data`` is called, so any object with that method
+works (see tests/test_historical_fetcher.py for a local fake).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from core.kite_http import DEFAULT_DELAYS, kite_request
+
+logger = logging.getLogger(__name__)
+
+# Kite historical API: requests per second per API key
+HISTORICAL_RATE_PER_SEC = 3.0
+DEFAULT_FETCH_WORKERS = 4
+
+# Longest date range (in days) Kite accepts in one request, per interval
+MAX_DAYS_PER_REQUEST: Dict[str, int] = {
+    "minute": 60,
+    "3minute": 100,
+    "5minute": 100,
+    "10minute": 100,
+    "15minute": 200,
+    "30minute": 200,
+    "60minute": 400,
+    "day": 2000,
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available and take them. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # Small tolerance so float rounding in the refill cannot stall a waiter
+                if self._tokens >= tokens - 1e-9:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+_shared_bucket: Optional[TokenBucket] = None
+_shared_bucket_lock = threading.Lock()
+
+
+def shared_historical_bucket() -> TokenBucket:
+    """Process-wide bucket sized to the Kite historical API quota."""
+    global _shared_bucket
+    with _shared_bucket_lock:
+        if _shared_bucket is None:
+            _shared_bucket = TokenBucket(HISTORICAL_RATE_PER_SEC)
+        return _shared_bucket
+
+
+@dataclass(frozen=True)
+class HistoricalRequest:
+    """One instrument/interval/date-range to fetch; ``key`` identifies it in results."""
+
+    key: Hashable
+    instrument_token: int
+    interval: str
+    from_date: datetime
+    to_date: datetime
+
+
+def chunk_date_range(interval: str, from_date: datetime, to_date: datetime) -> List[Tuple[datetime, datetime]]:
+    """Split [from_date, to_date] into consecutive ranges no longer than Kite allows."""
+    if to_date <= from_date:
+        return [(from_date, to_date)]
+    span = timedelta(days=MAX_DAYS_PER_REQUEST.get(interval, MAX_DAYS_PER_REQUEST["minute"]))
+    chunks: List[Tuple[datetime, datetime]] = []
+    start = from_date
+    while start < to_date:
+        end = min(start + span, to_date)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+class HistoricalFetcher:
+    """
+    Fetch Kite historical candles in rate-limited, chunked, concurrent requests.
+    """
+
+    def __init__(
+        self,
+        kite: Any,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+        bucket: Optional[TokenBucket] = None,
+        delays: Iterable[int] = DEFAULT_DELAYS,
+    ) -> None:
+        self.kite = kite
+        self.max_workers = max(1, int(max_workers))
+        self.bucket = bucket or shared_historical_bucket()
+        self.delays = tuple(delays)
+        self.errors: Dict[Hashable, Exception] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "chunks": 0, "calls": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def fetch(
+        self,
+        instrument_token: int,
+        interval: str,
+        from_date: datetime,
+        to_date: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one range (chunked as needed). Raises the chunk's exception if
+        any chunk still fails after retries.
+        """
+        request = HistoricalRequest(None, instrument_token, interval, from_date, to_date)
+        chunks = chunk_date_range(interval, from_date, to_date)
+        with self._stats_lock:
+            self.stats["requests"] += 1
+        if len(chunks) == 1:
+            return self._dedupe([self._fetch_chunk(request, *chunks[0])])
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            parts = list(pool.map(lambda chunk: self._fetch_chunk(request, *chunk), chunks))
+        return self._dedupe(parts)
+
+    def fetch_many(self, requests: Sequence[HistoricalRequest]) -> Dict[Hashable, List[Dict[str, Any]]]:
+        """
+        Fetch many ranges concurrently.
+
+        Returns candles per request key, oldest first. Requests whose chunks
+        fail after retries are left out of the result and recorded in
+        ``self.errors``.
+        """
+        jobs: List[Tuple[HistoricalRequest, int, datetime, datetime]] = []
+        for request in requests:
+            for index, (start, end) in enumerate(chunk_date_range(request.interval, request.from_date, request.to_date)):
+                jobs.append((request, index, start, end))
+        with self._stats_lock:
+            self.stats["requests"] += len(requests)
+        if not jobs:
+            return {}
+
+        def run(job: Tuple[HistoricalRequest, int, datetime, datetime]) -> Tuple[Hashable, int, Any]:
+            request, index, start, end = job
+            try:
+                return request.key, index, self._fetch_chunk(request, start, end)
+            except Exception as exc:  # noqa: BLE001
+                return request.key, index, exc
+
+        parts: Dict[Hashable, Dict[int, List[Dict[str, Any]]]] = {}
+        failed: Dict[Hashable, Exception] = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            for key, index, outcome in pool.map(run, jobs):
+                if isinstance(outcome, Exception):
+                    failed.setdefault(key, outcome)
+                else:
+                    parts.setdefault(key, {})[index] = outcome
+
+        results: Dict[Hashable, List[Dict[str, Any]]] = {}
+        for request in requests:
+            if request.key in failed:
+                logger.warning("Historical fetch failed for %s: %s", request.key, failed[request.key])
+                continue
+            chunks = parts.get(request.key, {})
+            results[request.key] = self._dedupe([chunks[i] for i in sorted(chunks)])
+        self.errors.update(failed)
+        with self._stats_lock:
+            self.stats["failed"] += len(failed)
+        return results
+
+    def _fetch_chunk(self, request: HistoricalRequest, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        with self._stats_lock:
+            self.stats["chunks"] += 1
+        candles = kite_request(
+            self._rate_limited_call,
+            instrument_token=request.instrument_token,
+            from_date=start,
+            to_date=end,
+            interval=request.interval,
+            continuous=False,
+            oi=False,
+            delays=self.delays,
+        )
+        return list(candles or [])
+
+    def _rate_limited_call(self, **kwargs: Any) -> Any:
+        # Called once per attempt, so retries also draw from the quota
+        self.bucket.acquire()
+        with self._stats_lock:
+            self.stats["calls"] += 1
+        return self.kite.historical_data(**kwargs)
+
+    @staticmethod
+    def _dedupe(parts: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Concatenate chunk results, dropping bars repeated at chunk edges."""
+        if len(parts) == 1:
+            return parts[0]
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for part in parts:
+            for candle in part:
+                merged[candle.get("date")] = candle
+        return list(merged.values())
@@ -3,11 +3,12 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Literal, Optional
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
 
 import pandas as pd
 from kiteconnect import KiteConnect
 
+from core.historical_fetcher import HistoricalFetcher, HistoricalRequest
 from core.kite_http import kite_request
 
 
@@ -90,21 +91,55 @@ def fetch_and_store_history(
     from_dt: datetime,
     to_dt: datetime,
     out_path: Optional[Path] = None,
+    fetcher: Optional[HistoricalFetcher] = None,
 ) -> None:
     """
     Fetch historical candles from Kite and persist them under artifacts/history.
+
+    Long ranges are split into the largest chunks Kite allows and fetched
+    under the shared historical rate limit.
     """
     out_path = out_path or _default_history_path(symbol, interval)
     token = _resolve_instrument_token(kite, symbol)
-    candles = kite_request(
-        kite.historical_data,
-        instrument_token=token,
-        from_date=from_dt,
-        to_date=to_dt,
-        interval=interval,
-        continuous=False,
-        oi=False,
-    )
+    fetcher = fetcher or HistoricalFetcher(kite)
+    candles = fetcher.fetch(token, interval, from_dt, to_dt)
+    _store_history(out_path, candles)
+
+
+def fetch_and_store_history_many(
+    kite: KiteConnect,
+    symbols: Iterable[str],
+    intervals: Iterable[str],
+    from_dt: datetime,
+    to_dt: datetime,
+    fetcher: Optional[HistoricalFetcher] = None,
+) -> Dict[Tuple[str, str], int]:
+    """
+    Fetch and persist history for every symbol x interval concurrently.
+
+    Returns the number of candles stored per (symbol, interval). Pairs whose
+    token cannot be resolved or whose fetch fails are left out (failures
+    are in ``fetcher.errors``).
+    """
+    fetcher = fetcher or HistoricalFetcher(kite)
+    intervals = list(intervals)
+    requests: List[HistoricalRequest] = []
+    for symbol in symbols:
+        try:
+            token = _resolve_instrument_token(kite, symbol)
+        except KeyError:
+            continue
+        for interval in intervals:
+            requests.append(HistoricalRequest((symbol, interval), token, interval, from_dt, to_dt))
+
+    stored: Dict[Tuple[str, str], int] = {}
+    for (symbol, interval), candles in fetcher.fetch_many(requests).items():
+        _store_history(_default_history_path(symbol, interval), candles)
+        stored[(symbol, interval)] = len(candles)
+    return stored
+
+
+def _store_history(out_path: Path, candles: List[Dict[str, Any]]) -> None:
     if not candles:
         out_path.touch(exist_ok=True)
         return
@@ -0,0 +1,231 @@
+"""
+Per-bar indicator cache shared across consumers.
+
+StrategyEngineV2/V3, RegimeEngine and the HTF trend filter often compute
+the same EMA/ATR/RSI for the same symbol and bar within one loop. They all read through one process-wide IndicatorCache:
+
+    cache = get_indicator_cache()
+    atr14 = cache.get(symbol, "5m", bar_key(series), ("atr", 14, n),
+                      lambda: indicators.atr(high, low, close, 14))
+
+Entries are keyed by (symbol, timeframe, bar key, spec):
+
+- the bar key identifies the last bar of the input window: its timestamp
+  plus its close, so a still-forming bar whose close moves is recomputed
+  rather than served stale;
+- the spec names the indicator and everything else its value depends on,
+  including the window length (an EMA seeded 100 bars back differs from
+  one seeded 200 bars back). Bundle specs also name how the bundle was
+  computed ("batch" or "stream") and its config (``config_key``).
+
+Only batch bundles publish their components, so per-indicator consumers
+always read ``core.indicators`` values.
+
+Each (symbol, timeframe) only keeps the entries of its most recent bar keys;
+when a new bar closes the older bars are dropped. Consumers that share the
+same window share entries; the hit/miss counters show how often that happens.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# compute_bundle keys that are also published as individual entries so
+# per-indicator consumers (regime, HTF trend) can hit on a bundle's work
+BUNDLE_COMPONENTS: Dict[str, Tuple[str, int]] = {
+    "ema9": ("ema", 9),
+    "ema20": ("ema", 20),
+    "ema50": ("ema", 50),
+    "ema100": ("ema", 100),
+    "ema200": ("ema", 200),
+    "sma20": ("sma", 20),
+    "sma50": ("sma", 50),
+    "rsi14": ("rsi", 14),
+    "atr14": ("atr", 14),
+    "slope10": ("slope", 10),
+}
+
+
+def bar_key(series: Mapping[str, Any]) -> Optional[Tuple[Any, float]]:
+    """
+    Identify the last bar of a series dict (``ts`` + ``close`` columns).
+
+    Returns None when the series carries no usable timestamp; callers then
+    compute without caching.
+    """
+    try:
+        ts = series.get("ts")
+        close = series.get("close")
+        if ts is None or close is None or not len(ts) or len(ts) != len(close):
+            return None
+        last_ts = ts[-1]
+        if last_ts is None:
+            return None
+        if hasattr(last_ts, "item"):  # NumPy scalar
+            last_ts = last_ts.item()
+        return (last_ts, float(close[-1]))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def config_key(config: Optional[Mapping[str, Any]]) -> Optional[str]:
+    """Hashable form of an indicator config for use in a spec (None when empty)."""
+    if not config:
+        return None
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+class IndicatorCache:
+    """
+    Memo of indicator values per (symbol, timeframe, bar key, spec).
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that computed and stored a value
+        uncached: Lookups without a symbol or bar key (computed, not stored)
+        evictions: Bar keys dropped because a newer bar arrived
+    """
+
+    def __init__(self, bars_per_series: int = 2) -> None:
+        # Keeping more than one bar key lets a closed-bar consumer and a
+        # forming-bar consumer of the same series alternate without thrashing
+        self.bars_per_series = max(1, int(bars_per_series))
+        self._series: Dict[Tuple[str, str], "OrderedDict[Hashable, Dict[Hashable, Any]]"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.evictions = 0
+
+    def _bar_entries(self, symbol: str, timeframe: Optional[str], key: Hashable) -> Dict[Hashable, Any]:
+        """Entries of one bar, creating them (and evicting old bars) as needed. Lock held."""
+        bars = self._series.setdefault((symbol.upper(), timeframe or ""), OrderedDict())
+        entries = bars.get(key)
+        if entries is None:
+            entries = bars[key] = {}
+            while len(bars) > self.bars_per_series:
+                bars.popitem(last=False)
+                self.evictions += 1
+        else:
+            bars.move_to_end(key)
+        return entries
+
+    def get(
+        self,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        key: Optional[Hashable],
+        spec: Hashable,
+        compute: Callable[[], T],
+    ) -> T:
+        """
+        Return the cached value for spec on this bar, computing it on a miss.
+
+        Exceptions from compute propagate and nothing is stored, so warmup
+        errors keep surfacing to the caller as before.
+        """
+        if not symbol or key is None:
+            with self._lock:
+                self.uncached += 1
+            return compute()
+
+        with self._lock:
+            entries = self._bar_entries(symbol, timeframe, key)
+            if spec in entries:
+                self.hits += 1
+                return entries[spec]
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._bar_entries(symbol, timeframe, key)[spec] = value
+        return value
+
+    def bundle(
+        self,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        key: Optional[Hashable],
+        spec: Hashable,
+        num_bars: int,
+        compute: Callable[[], Dict[str, Any]],
+        publish_components: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Cached indicator bundle (a dict of latest values).
+
+        On a miss the bundle's BUNDLE_COMPONENTS are also stored as
+        ``(name, period, num_bars)`` entries, unless ``publish_components``
+        is False (bundles not computed by ``core.indicators``). Callers get
+        their own copy.
+        """
+        if not symbol or key is None:
+            return self.get(symbol, timeframe, key, spec, compute)
+
+        with self._lock:
+            entries = self._bar_entries(symbol, timeframe, key)
+            cached = entries.get(spec)
+            if cached is not None:
+                self.hits += 1
+                return dict(cached)
+
+        result = compute()
+        with self._lock:
+            self.misses += 1
+            entries = self._bar_entries(symbol, timeframe, key)
+            entries[spec] = dict(result)
+            if publish_components:
+                for name, (kind, period) in BUNDLE_COMPONENTS.items():
+                    if name in result:
+                        entries.setdefault((kind, period, num_bars), result[name])
+        return result
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> None:
+        """Drop cached entries for a symbol (optionally one timeframe), or everything."""
+        with self._lock:
+            if symbol is None:
+                self._series.clear()
+                return
+            sym = symbol.upper()
+            for series_key in [k for k in self._series if k[0] == sym and (timeframe is None or k[1] == timeframe)]:
+                del self._series[series_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the current number of cached values."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = sum(len(e) for bars in self._series.values() for e in bars.values())
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+
+_cache: Optional[IndicatorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Process-wide IndicatorCache shared by all consumers."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = IndicatorCache()
+    return _cache
+
+
+def reset_indicator_cache() -> None:
+    """Drop the process-wide cache (tests, session restarts)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
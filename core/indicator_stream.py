@@ -0,0 +1,830 @@
+"""
+Streaming (incremental) versions of the core/indicators functions.
+
+The batch functions in core/indicators recompute every indicator from the
+first bar on each call. The classes here keep running state instead, so a
+closed bar costs O(1). Windowed indicators (SMA, Bollinger, slope) cost
+O(period) per bar, independent of history length. Each class has:
+
+- ``update(...)``: feed a closed bar, returning the new value;
+- ``peek(...)``: the value if the given in-progress bar closed now,
+  without changing state.
+
+Fed the same bars, every indicator returns the same value as its batch
+counterpart for the last bar (``None`` while the batch function would raise
+IndicatorWarmupError).
+
+``StreamingIndicatorEngine`` keeps one ``IndicatorStream`` per
+(symbol, timeframe). Its ``compute_bundle()`` mirrors
+``indicators.compute_bundle()``. Given series with a ``ts`` list, it
+detects which bars are new since the previous call and only feeds those.
+The last bar of the series is treated as in progress. Results equal the
+batch bundle of the window passed in, also once the window slides:
+
+- EMA, RSI and ATR are linear recursions, so the value seeded at the
+  window's first bar is the running value minus the decayed difference
+  between the two seeds at that bar;
+- VWAP sums volume and price * volume over the window only;
+- SMA, Bollinger and slope only look at their last ``period`` bars anyway;
+- SuperTrend is the exception: its bands ratchet (each depends on which
+  earlier bar last reset it), so there is no running value to rebase.
+  Once the window has slid it is replayed over the window from the kept
+  per-bar values, which costs O(window) per call. For a 200-bar window
+  that is roughly 0.14 ms, against 0.36 ms for ``indicators.supertrend``
+  on the same window and 0.1 ms for the rest of the bundle.
+
+The per-bar running values this needs are kept from the window's first
+bar on.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from core import indicators
+
+logger = logging.getLogger(__name__)
+
+Bar = Dict[str, Any]
+
+
+class StreamingEMA:
+    """Exponential moving average seeded with the first value (as ``indicators.ema``)."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.alpha = 2.0 / (period + 1.0)
+        self.count = 0
+        self.value: Optional[float] = None
+
+    def _next(self, x: float) -> float:
+        if self.value is None or self.period <= 1:
+            return x
+        return self.alpha * x + (1.0 - self.alpha) * self.value
+
+    def update(self, x: float) -> Optional[float]:
+        self.value = self._next(x)
+        self.count += 1
+        return self.value if self.count >= self.period else None
+
+    def peek(self, x: float) -> Optional[float]:
+        return self._next(x) if self.count + 1 >= self.period else None
+
+
+class StreamingSMA:
+    """Simple moving average over the last ``period`` values."""
+
+    def __init__(self, period: int) -> None:
+        self.period = max(1, period)
+        self.window: Deque[float] = deque(maxlen=self.period)
+        self.count = 0
+
+    def update(self, x: float) -> Optional[float]:
+        self.window.append(x)
+        self.count += 1
+        return self.current()
+
+    def current(self) -> Optional[float]:
+        if self.count < self.period:
+            return None
+        return sum(self.window) / self.period
+
+    def peek(self, x: float) -> Optional[float]:
+        if self.count + 1 < self.period:
+            return None
+        window = list(self.window)[1:] if len(self.window) == self.period else list(self.window)
+        window.append(x)
+        return sum(window) / self.period
+
+
+class StreamingRSI:
+    """RSI with Wilder smoothing (as ``indicators.rsi``)."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.changes = 0
+        self.sum_gain = 0.0
+        self.sum_loss = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def _next(self, x: float) -> Tuple[int, float, float, float, float, Optional[float]]:
+        changes, sum_gain, sum_loss = self.changes, self.sum_gain, self.sum_loss
+        avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        if self.prev_close is None:
+            return changes, sum_gain, sum_loss, avg_gain, avg_loss, None
+        change = x - self.prev_close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        p = self.period
+        if changes < p:
+            sum_gain += gain
+            sum_loss += loss
+            if changes == p - 1:
+                avg_gain, avg_loss = sum_gain / p, sum_loss / p
+        else:
+            avg_gain = (avg_gain * (p - 1) + gain) / p
+            avg_loss = (avg_loss * (p - 1) + loss) / p
+        changes += 1
+        if changes < p:
+            value = None
+        elif avg_loss == 0:
+            value = 100.0
+        else:
+            value = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+        return changes, sum_gain, sum_loss, avg_gain, avg_loss, value
+
+    def update(self, x: float) -> Optional[float]:
+        self.changes, self.sum_gain, self.sum_loss, self.avg_gain, self.avg_loss, value = self._next(x)
+        self.prev_close = x
+        return value
+
+    def peek(self, x: float) -> Optional[float]:
+        return self._next(x)[-1]
+
+
+def _true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class StreamingATR:
+    """Average true range: simple average of the first ``period`` TRs, then Wilder smoothing."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.count = 0
+        self.tr_sum = 0.0
+        self.value: Optional[float] = None
+
+    def _next(self, high: float, low: float) -> Tuple[float, Optional[float]]:
+        tr = _true_range(high, low, self.prev_close)
+        p = self.period
+        if self.count < p:
+            tr_sum = self.tr_sum + tr
+            return tr_sum, (tr_sum / p if self.count == p - 1 else None)
+        return self.tr_sum, (self.value * (p - 1) + tr) / p
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        self.tr_sum, self.value = self._next(high, low)
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def peek(self, high: float, low: float) -> Optional[float]:
+        return self._next(high, low)[1]
+
+
+class StreamingSupertrend:
+    """
+    SuperTrend (as ``indicators.supertrend``).
+
+    The batch version uses the first full ATR for the first ``period`` bars,
+    so those bars are buffered and replayed once that ATR is known.
+    """
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0) -> None:
+        self.period = period
+        self.multiplier = multiplier
+        self.atr = StreamingATR(period)
+        self._pending: List[Tuple[float, float, float]] = []
+        self._state: Optional[Tuple[float, float, float]] = None  # final_upper, final_lower, prev_close
+        self.value: Optional[Dict[str, Any]] = None
+
+    def _step(
+        self,
+        state: Optional[Tuple[float, float, float]],
+        high: float,
+        low: float,
+        close: float,
+        atr_val: float,
+    ) -> Tuple[Tuple[float, float, float], Dict[str, Any]]:
+        hl2 = (high + low) / 2.0
+        basic_upper = hl2 + self.multiplier * atr_val
+        basic_lower = hl2 - self.multiplier * atr_val
+        if state is None:
+            final_upper, final_lower = basic_upper, basic_lower
+            st_value, direction = final_lower, 1
+        else:
+            prev_upper, prev_lower, prev_close = state
+            if basic_upper < prev_upper or prev_close > prev_upper:
+                final_upper = basic_upper
+            else:
+                final_upper = prev_upper
+            if basic_lower > prev_lower or prev_close < prev_lower:
+                final_lower = basic_lower
+            else:
+                final_lower = prev_lower
+            if close <= final_upper:
+                st_value, direction = final_upper, -1
+            else:
+                st_value, direction = final_lower, 1
+        value = {
+            "supertrend": st_value,
+            "direction": direction,
+            "upper_band": final_upper,
+            "lower_band": final_lower,
+        }
+        return (final_upper, final_lower, close), value
+
+    def _replay(self, bars: Sequence[Tuple[float, float, float]], atr_val: float):
+        state, value = None, None
+        for high, low, close in bars:
+            state, value = self._step(state, high, low, close, atr_val)
+        return state, value
+
+    def update(self, high: float, low: float, close: float) -> Optional[Dict[str, Any]]:
+        atr_val = self.atr.update(high, low, close)
+        if self._state is None:
+            self._pending.append((high, low, close))
+            if atr_val is None:
+                return None
+            self._state, self.value = self._replay(self._pending, atr_val)
+            self._pending = []
+        else:
+            self._state, self.value = self._step(self._state, high, low, close, atr_val)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[Dict[str, Any]]:
+        atr_val = self.atr.peek(high, low)
+        if atr_val is None:
+            return None
+        if self._state is None:
+            return self._replay(self._pending + [(high, low, close)], atr_val)[1]
+        return self._step(self._state, high, low, close, atr_val)[1]
+
+
+class StreamingBollinger:
+    """Bollinger bands over the last ``period`` closes (population std, as ``indicators.bollinger``)."""
+
+    def __init__(self, period: int = 20, stddev: float = 2.0) -> None:
+        self.sma = StreamingSMA(period)
+        self.stddev = stddev
+
+    def _bands(self, window: Sequence[float], middle: float) -> Dict[str, float]:
+        std = math.sqrt(sum((x - middle) ** 2 for x in window) / self.sma.period)
+        return {"middle": middle, "upper": middle + self.stddev * std, "lower": middle - self.stddev * std}
+
+    def update(self, x: float) -> Optional[Dict[str, float]]:
+        middle = self.sma.update(x)
+        return None if middle is None else self._bands(self.sma.window, middle)
+
+    def peek(self, x: float) -> Optional[Dict[str, float]]:
+        middle = self.sma.peek(x)
+        if middle is None:
+            return None
+        window = list(self.sma.window)[1:] if len(self.sma.window) == self.sma.period else list(self.sma.window)
+        window.append(x)
+        return self._bands(window, middle)
+
+
+class StreamingVWAP:
+    """Cumulative volume-weighted average price."""
+
+    def __init__(self) -> None:
+        self.cum_pv = 0.0
+        self.cum_vol = 0.0
+
+    def _value(self, cum_pv: float, cum_vol: float, close: float) -> float:
+        return cum_pv / cum_vol if cum_vol > 0 else close
+
+    def update(self, close: float, volume: float) -> float:
+        self.cum_pv += close * volume
+        self.cum_vol += volume
+        return self._value(self.cum_pv, self.cum_vol, close)
+
+    def peek(self, close: float, volume: float) -> float:
+        return self._value(self.cum_pv + close * volume, self.cum_vol + volume, close)
+
+
+class StreamingSlope:
+    """Least-squares slope over the last ``period`` values."""
+
+    def __init__(self, period: int) -> None:
+        self.period = max(1, period)
+        self.window: Deque[float] = deque(maxlen=self.period)
+
+    def _slope(self, window: Sequence[float]) -> float:
+        n = len(window)
+        sum_x = n * (n - 1) / 2
+        sum_y = sum(window)
+        sum_xy = sum(j * window[j] for j in range(n))
+        sum_x2 = n * (n - 1) * (2 * n - 1) / 6
+        denominator = n * sum_x2 - sum_x * sum_x
+        return (n * sum_xy - sum_x * sum_y) / denominator if denominator != 0 else 0.0
+
+    def update(self, x: float) -> Optional[float]:
+        self.window.append(x)
+        return self._slope(list(self.window)) if len(self.window) == self.period else None
+
+    def peek(self, x: float) -> Optional[float]:
+        window = list(self.window)[1:] if len(self.window) == self.period else list(self.window)
+        window.append(x)
+        return self._slope(window) if len(window) == self.period else None
+
+
+def _bar_values(bar: Bar) -> Tuple[float, float, float, float]:
+    close = float(bar["close"])
+    high = float(bar.get("high", close))
+    low = float(bar.get("low", close))
+    volume = bar.get("volume")
+    return high, low, close, float(volume) if volume is not None else 0.0
+
+
+class _BarState(NamedTuple):
+    """Running values of an ``IndicatorStream`` right after one bar."""
+
+    close: float
+    high: float
+    low: float
+    emas: Tuple[Optional[float], ...]  # IndicatorStream.EMA_PERIODS order
+    gain: float
+    loss: float
+    avg_gain: float
+    avg_loss: float
+    true_range: float
+    atr: Optional[float]
+    cum_pv: float
+    cum_vol: float
+
+
+# Layout of IndicatorStream.to_state(); bump when it changes so older
+# warm-start snapshots are skipped instead of restored into the wrong fields
+STREAM_STATE_VERSION = 1
+
+
+def _atr_state(atr: StreamingATR) -> Tuple[Any, ...]:
+    return (atr.prev_close, atr.count, atr.tr_sum, atr.value)
+
+
+def _set_atr_state(atr: StreamingATR, state: Sequence[Any]) -> None:
+    atr.prev_close, atr.count, atr.tr_sum, atr.value = state
+
+
+class IndicatorStream:
+    """
+    The ``compute_bundle`` indicator set for one symbol/timeframe, updated bar by bar.
+
+    ``snapshot()`` returns the same keys ``indicators.compute_bundle`` would
+    for the bars fed so far (plus the in-progress bar if given). With
+    ``include_supertrend`` it also returns the SuperTrend keys that
+    ``StrategyEngineV2.compute_indicators`` adds.
+
+    With ``history`` the running values of up to that many recent bars are
+    kept, so ``snapshot(start=...)`` can compute over a window that starts
+    after the first bar fed.
+    """
+
+    EMA_PERIODS = (9, 20, 50, 100, 200)
+    SMA_PERIODS = (20, 50)
+
+    def __init__(self, include_supertrend: bool = False, history: int = 0) -> None:
+        self.include_supertrend = include_supertrend
+        self.count = 0
+        self.last_ts: Any = None
+        self.last_close: Optional[float] = None
+        self.last_high: Optional[float] = None
+        self.last_low: Optional[float] = None
+        self.emas = {p: StreamingEMA(p) for p in self.EMA_PERIODS}
+        self.smas = {p: StreamingSMA(p) for p in self.SMA_PERIODS}
+        self.rsi14 = StreamingRSI(14)
+        self.atr14 = StreamingATR(14)
+        self.bollinger = StreamingBollinger(20, 2.0)
+        self.vwap = StreamingVWAP()
+        self.slope10 = StreamingSlope(10)
+        self.supertrend = StreamingSupertrend(10, 3.0) if include_supertrend else None
+        self.history: Optional[Deque[_BarState]] = deque(maxlen=history) if history > 0 else None
+        self.history_start = 0  # index of history[0] among the bars fed
+
+    def update(self, bar: Bar, ts: Any = None) -> None:
+        """Feed one closed bar (dict with open/high/low/close/volume)."""
+        high, low, close, volume = _bar_values(bar)
+        prev_close = self.last_close
+        for ind in self.emas.values():
+            ind.update(close)
+        for ind in self.smas.values():
+            ind.update(close)
+        self.rsi14.update(close)
+        self.atr14.update(high, low, close)
+        self.bollinger.update(close)
+        self.vwap.update(close, volume)
+        self.slope10.update(close)
+        if self.supertrend is not None:
+            self.supertrend.update(high, low, close)
+        if self.history is not None:
+            if len(self.history) == self.history.maxlen:
+                self.history_start += 1
+            change = close - prev_close if prev_close is not None else 0.0
+            self.history.append(_BarState(
+                close,
+                high,
+                low,
+                tuple(ind.value for ind in self.emas.values()),
+                max(change, 0.0),
+                max(-change, 0.0),
+                self.rsi14.avg_gain,
+                self.rsi14.avg_loss,
+                _true_range(high, low, prev_close),
+                self.atr14.value,
+                self.vwap.cum_pv,
+                self.vwap.cum_vol,
+            ))
+        self.count += 1
+        self.last_ts = ts if ts is not None else bar.get("ts")
+        self.last_close, self.last_high, self.last_low = close, high, low
+
+    def to_state(self) -> Dict[str, Any]:
+        """Running state as plain data (tuples, lists, floats), for from_state()."""
+        r, st = self.rsi14, self.supertrend
+        return {
+            "count": self.count,
+            "last_ts": self.last_ts,
+            "last_bar": (self.last_close, self.last_high, self.last_low),
+            "emas": [(ind.count, ind.value) for ind in self.emas.values()],
+            "smas": [(ind.count, list(ind.window)) for ind in self.smas.values()],
+            "rsi14": (r.prev_close, r.changes, r.sum_gain, r.sum_loss, r.avg_gain, r.avg_loss),
+            "atr14": _atr_state(self.atr14),
+            "bollinger": (self.bollinger.sma.count, list(self.bollinger.sma.window)),
+            "vwap": (self.vwap.cum_pv, self.vwap.cum_vol),
+            "slope10": list(self.slope10.window),
+            "supertrend": None if st is None else {
+                "atr": _atr_state(st.atr),
+                "pending": list(st._pending),
+                "state": st._state,
+                "value": dict(st.value) if st.value is not None else None,
+            },
+            "history": None if self.history is None else (self.history_start, [tuple(s) for s in self.history]),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], include_supertrend: bool = False, history: int = 0) -> "IndicatorStream":
+        """
+        Rebuild a stream from to_state() output.
+
+        Raises KeyError, TypeError or ValueError if ``state`` does not fit
+        this layout. Saved history beyond ``history`` bars is dropped.
+        """
+        stream = cls(include_supertrend, history)
+        stream.count = int(state["count"])
+        stream.last_ts = state["last_ts"]
+        stream.last_close, stream.last_high, stream.last_low = state["last_bar"]
+        if len(state["emas"]) != len(stream.emas) or len(state["smas"]) != len(stream.smas):
+            raise ValueError("saved EMA/SMA periods do not match")
+        for ind, (count, value) in zip(stream.emas.values(), state["emas"]):
+            ind.count, ind.value = count, value
+        for ind, (count, window) in zip(stream.smas.values(), state["smas"]):
+            ind.count = count
+            ind.window.extend(window)
+        r = stream.rsi14
+        r.prev_close, r.changes, r.sum_gain, r.sum_loss, r.avg_gain, r.avg_loss = state["rsi14"]
+        _set_atr_state(stream.atr14, state["atr14"])
+        stream.bollinger.sma.count, window = state["bollinger"]
+        stream.bollinger.sma.window.extend(window)
+        stream.vwap.cum_pv, stream.vwap.cum_vol = state["vwap"]
+        stream.slope10.window.extend(state["slope10"])
+        saved_st = state["supertrend"]
+        if (saved_st is None) != (stream.supertrend is None):
+            raise ValueError("supertrend state does not match include_supertrend")
+        if saved_st is not None:
+            st = stream.supertrend
+            _set_atr_state(st.atr, saved_st["atr"])
+            st._pending = [tuple(bar) for bar in saved_st["pending"]]
+            st._state = tuple(saved_st["state"]) if saved_st["state"] is not None else None
+            st.value = dict(saved_st["value"]) if saved_st["value"] is not None else None
+        if stream.history is not None and state["history"] is not None:
+            history_start, states = state["history"]
+            kept = states[-stream.history.maxlen:]
+            stream.history.extend(_BarState(*values) for values in kept)
+            stream.history_start = history_start + len(states) - len(kept)
+        return stream
+
+    def has_window(self, start: int) -> bool:
+        """Whether ``snapshot(start=start)`` can be computed from the bars kept."""
+        if start == 0:
+            return True
+        return self.history is not None and self.history_start <= start - 1 and start < self.count
+
+    def trim_history(self, start: int) -> None:
+        """Drop running values no window starting at ``start`` or later needs."""
+        if self.history is None:
+            return
+        while self.history and self.history_start < start - 1:
+            self.history.popleft()
+            self.history_start += 1
+
+    def snapshot(self, bar: Optional[Bar] = None, with_vwap: bool = True, start: int = 0) -> Dict[str, Any]:
+        """
+        Indicator bundle as of the last closed bar, or as if ``bar`` (the
+        in-progress bar) closed now. State is not changed.
+
+        ``start`` is the index (among the bars fed) of the window's first
+        bar, and must satisfy ``has_window()``; the bundle is the batch
+        bundle of that window.
+        """
+        if bar is None:
+            bundle = self._closed_snapshot(with_vwap, self.count - start)
+        else:
+            bundle = self._preview_snapshot(bar, with_vwap, self.count + 1 - start)
+        if bundle and start > 0:
+            self._rebase(bundle, bar, start)
+        return self._finish(bundle)
+
+    def _preview_snapshot(self, bar: Bar, with_vwap: bool, n: int) -> Dict[str, Any]:
+        high, low, close, volume = _bar_values(bar)
+        if n < 20:
+            return {}
+        bundle: Dict[str, Any] = {}
+        for period, ind in self.emas.items():
+            if n >= period:
+                bundle[f"ema{period}"] = ind.peek(close)
+        for period, ind in self.smas.items():
+            if n >= period:
+                bundle[f"sma{period}"] = ind.peek(close)
+        bundle["rsi14"] = self.rsi14.peek(close)
+        bundle["atr14"] = self.atr14.peek(high, low)
+        bb = self.bollinger.peek(close)
+        bundle["bb_upper"], bundle["bb_middle"], bundle["bb_lower"] = bb["upper"], bb["middle"], bb["lower"]
+        if self.supertrend is not None:
+            st = self.supertrend.peek(high, low, close)
+            bundle["supertrend"], bundle["supertrend_direction"] = st["supertrend"], st["direction"]
+        if with_vwap:
+            bundle["vwap"] = self.vwap.peek(close, volume)
+        bundle["slope10"] = self.slope10.peek(close)
+        bundle["hl2"] = (high + low) / 2.0
+        bundle["hl3"] = (high + low + close) / 3.0
+        return bundle
+
+    def _closed_snapshot(self, with_vwap: bool, n: int) -> Dict[str, Any]:
+        if n < 20:
+            return {}
+        bundle: Dict[str, Any] = {}
+        for period, ind in self.emas.items():
+            if n >= period:
+                bundle[f"ema{period}"] = ind.value
+        for period, ind in self.smas.items():
+            if n >= period:
+                bundle[f"sma{period}"] = ind.current()
+        r = self.rsi14
+        if r.avg_loss == 0:
+            bundle["rsi14"] = 100.0
+        else:
+            bundle["rsi14"] = 100.0 - (100.0 / (1.0 + r.avg_gain / r.avg_loss))
+        bundle["atr14"] = self.atr14.value
+        window = self.bollinger.sma.window
+        bb = self.bollinger._bands(window, self.bollinger.sma.current())
+        bundle["bb_upper"], bundle["bb_middle"], bundle["bb_lower"] = bb["upper"], bb["middle"], bb["lower"]
+        if self.supertrend is not None:
+            st = self.supertrend.value
+            bundle["supertrend"], bundle["supertrend_direction"] = st["supertrend"], st["direction"]
+        if with_vwap:
+            bundle["vwap"] = self.vwap._value(self.vwap.cum_pv, self.vwap.cum_vol, self.last_close)
+        bundle["slope10"] = self.slope10._slope(list(self.slope10.window))
+        bundle["hl2"] = (self.last_high + self.last_low) / 2.0
+        bundle["hl3"] = (self.last_high + self.last_low + self.last_close) / 3.0
+        return bundle
+
+    def _state(self, index: int) -> _BarState:
+        return self.history[index - self.history_start]
+
+    def _rebase(self, bundle: Dict[str, Any], bar: Optional[Bar], start: int) -> None:
+        """Turn running values into values over the bars from ``start`` on (bundle has >= 20 bars)."""
+        last = self.count if bar is not None else self.count - 1
+        first = self._state(start)
+
+        # EMA: both seeds follow the same recursion, so their gap decays by (1 - alpha) per bar
+        for i, (period, ind) in enumerate(self.emas.items()):
+            key = f"ema{period}"
+            if key in bundle:
+                bundle[key] -= (1.0 - ind.alpha) ** (last - start) * (first.emas[i] - first.close)
+
+        # RSI: Wilder averages seeded with the mean of the window's first ``period`` changes
+        r = self.rsi14
+        p = r.period
+        seeded = self._state(start + p)
+        changes = [self._state(k) for k in range(start + 1, start + p + 1)]
+        if bar is not None:
+            avg_gain, avg_loss = r._next(_bar_values(bar)[2])[3:5]
+        else:
+            avg_gain, avg_loss = r.avg_gain, r.avg_loss
+        decay = ((p - 1) / p) ** (last - start - p)
+        avg_gain -= decay * (seeded.avg_gain - sum(s.gain for s in changes) / p)
+        avg_loss -= decay * (seeded.avg_loss - sum(s.loss for s in changes) / p)
+        bundle["rsi14"] = 100.0 if avg_loss == 0 else 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+        # ATR: the window's first true range has no previous close
+        p = self.atr14.period
+        seeded = self._state(start + p - 1)
+        true_ranges = [first.high - first.low] + [self._state(k).true_range for k in range(start + 1, start + p)]
+        decay = ((p - 1) / p) ** (last - start - p + 1)
+        bundle["atr14"] -= decay * (seeded.atr - sum(true_ranges) / p)
+
+        if "vwap" in bundle:
+            before = self._state(start - 1)
+            cum_pv, cum_vol = self.vwap.cum_pv, self.vwap.cum_vol
+            close = self.last_close
+            if bar is not None:
+                _, _, close, volume = _bar_values(bar)
+                cum_pv, cum_vol = cum_pv + close * volume, cum_vol + volume
+            bundle["vwap"] = self.vwap._value(cum_pv - before.cum_pv, cum_vol - before.cum_vol, close)
+
+        if "supertrend" in bundle:
+            bundle["supertrend"], bundle["supertrend_direction"] = self._window_supertrend(bar, start)
+
+    def _window_supertrend(self, bar: Optional[Bar], start: int) -> Tuple[float, int]:
+        """(value, direction) of SuperTrend over the bars from ``start`` on, as ``indicators.supertrend``."""
+        bars = [(s.high, s.low, s.close, s.true_range) for s in islice(self.history, start - self.history_start, None)]
+        if bar is not None:
+            high, low, close, _ = _bar_values(bar)
+            bars.append((high, low, close, _true_range(high, low, self.last_close)))
+        p, multiplier = self.supertrend.period, self.supertrend.multiplier
+        # The window's first true range has no previous close; the first p bars use the first full ATR
+        atr_val = sum([bars[0][0] - bars[0][1]] + [b[3] for b in bars[1:p]]) / p
+        final_upper = final_lower = prev_close = 0.0
+        st_value, direction = 0.0, 1
+        for i, (high, low, close, true_range) in enumerate(bars):
+            if i >= p:
+                atr_val = (atr_val * (p - 1) + true_range) / p
+            hl2 = (high + low) / 2.0
+            basic_upper = hl2 + multiplier * atr_val
+            basic_lower = hl2 - multiplier * atr_val
+            if i == 0:
+                final_upper, final_lower = basic_upper, basic_lower
+                st_value, direction = final_lower, 1
+            else:
+                if basic_upper < final_upper or prev_close > final_upper:
+                    final_upper = basic_upper
+                if basic_lower > final_lower or prev_close < final_lower:
+                    final_lower = basic_lower
+                if close <= final_upper:
+                    st_value, direction = final_upper, -1
+                else:
+                    st_value, direction = final_lower, 1
+            prev_close = close
+        return st_value, direction
+
+    @staticmethod
+    def _finish(bundle: Dict[str, Any]) -> Dict[str, Any]:
+        if "ema20" in bundle and "ema50" in bundle:
+            bundle["trend"] = "up" if bundle["ema20"] > bundle["ema50"] else "down"
+        return bundle
+
+
+class StreamingIndicatorEngine:
+    """
+    ``IndicatorStream`` per (symbol, timeframe) behind a ``compute_bundle`` facade.
+
+    Engines can call ``compute_bundle(series, symbol=..., timeframe=...)``
+    with the same candle window they pass to ``indicators.compute_bundle``,
+    plus a ``ts`` list. Series without timestamps or a symbol fall back to
+    the batch functions. Windows longer than ``max_window`` bars that have
+    slid re-seed on every call.
+    """
+
+    def __init__(self, include_supertrend: bool = False, max_window: int = 5000) -> None:
+        self.include_supertrend = include_supertrend
+        self.max_window = max_window
+        self.streams: Dict[Tuple[str, str], IndicatorStream] = {}
+        self.stats: Dict[str, int] = {"bars": 0, "reseeds": 0, "batch_fallbacks": 0}
+
+    def stream(self, symbol: str, timeframe: str) -> IndicatorStream:
+        key = (symbol, timeframe)
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = self.streams[key] = IndicatorStream(self.include_supertrend, self.max_window)
+        return stream
+
+    def update(self, symbol: str, timeframe: str, bar: Bar) -> None:
+        """Feed one closed bar for (symbol, timeframe)."""
+        self.stream(symbol, timeframe).update(bar)
+        self.stats["bars"] += 1
+
+    def snapshot(self, symbol: str, timeframe: str, bar: Optional[Bar] = None) -> Dict[str, Any]:
+        """Bundle for (symbol, timeframe), optionally including the in-progress ``bar``."""
+        return self.stream(symbol, timeframe).snapshot(bar)
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> None:
+        for key in list(self.streams):
+            if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                del self.streams[key]
+
+    def export_state(self) -> Dict[str, Any]:
+        """Streams with a known last bar as plain data, for a warm-start snapshot."""
+        return {
+            "version": STREAM_STATE_VERSION,
+            "include_supertrend": self.include_supertrend,
+            "streams": {key: s.to_state() for key, s in self.streams.items() if s.last_ts is not None},
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> int:
+        """
+        Rebuild streams from export_state(); returns how many were taken.
+
+        State from another STREAM_STATE_VERSION is ignored, as is any stream
+        that does not fit the current layout. A restored stream only
+        continues if compute_bundle() finds its last bar (same ts and close)
+        in the next window; otherwise it re-seeds. Keys that already have a
+        stream are left alone.
+        """
+        if not state or state.get("version") != STREAM_STATE_VERSION:
+            return 0
+        if state.get("include_supertrend") != self.include_supertrend:
+            return 0
+        restored = 0
+        for key, saved in (state.get("streams") or {}).items():
+            if key in self.streams:
+                continue
+            try:
+                stream = IndicatorStream.from_state(saved, self.include_supertrend, self.max_window)
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.debug("Skipping saved indicator stream %s: %s", key, exc)
+                continue
+            if stream.last_ts is not None:
+                self.streams[key] = stream
+                restored += 1
+        return restored
+
+    def compute_bundle(
+        self,
+        series: Dict[str, Sequence[Any]],
+        config: Optional[Dict[str, Any]] = None,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Drop-in for ``indicators.compute_bundle`` that only processes new bars."""
+        close = series.get("close", [])
+        ts = series.get("ts")
+        if symbol is None or ts is None or len(ts) != len(close):
+            self.stats["batch_fallbacks"] += 1
+            return batch_bundle(series, config, self.include_supertrend)
+        n = len(close)
+        if n == 0:
+            return {}
+        # Columns may be NumPy views (MDE v2 CandleSeries), so no truthiness tests
+        high = series.get("high")
+        if high is None or len(high) != n:
+            high = close
+        low = series.get("low")
+        if low is None or len(low) != n:
+            low = close
+        has_range = high is not close and low is not close
+        volume = series.get("volume")
+        with_vwap = volume is not None and len(volume) > 0 and len(volume) == n
+
+        def bar(i: int) -> Bar:
+            return {
+                "high": high[i],
+                "low": low[i],
+                "close": close[i],
+                "volume": volume[i] if with_vwap else 0.0,
+            }
+
+        key = (symbol, timeframe or "")
+        stream = self.streams.get(key)
+        start = None
+        if stream is not None and stream.last_ts is not None:
+            for i in range(n - 1, -1, -1):
+                if ts[i] == stream.last_ts:
+                    if float(close[i]) == stream.last_close:
+                        start = i + 1
+                    break
+        # Index of the window's first bar among the bars the stream was fed
+        window_start = stream.count - start if start is not None else 0
+        if start is None or window_start < 0 or not stream.has_window(window_start):
+            # First call, a gap, revised history or a window reaching back
+            # past the bars kept: seed from this window
+            if stream is not None:
+                self.stats["reseeds"] += 1
+            stream = self.streams[key] = IndicatorStream(self.include_supertrend, self.max_window)
+            start = window_start = 0
+        stream.trim_history(window_start)
+        for i in range(start, n - 1):
+            stream.update(bar(i), ts[i])
+            self.stats["bars"] += 1
+        bundle = stream.snapshot(bar(n - 1), with_vwap=with_vwap, start=window_start)
+        if not has_range:
+            # As batch_bundle, which needs high/low columns for SuperTrend
+            bundle.pop("supertrend", None)
+            bundle.pop("supertrend_direction", None)
+        return bundle
+
+
+def batch_bundle(
+    series: Dict[str, Sequence[Any]],
+    config: Optional[Dict[str, Any]] = None,
+    include_supertrend: bool = False,
+) -> Dict[str, Any]:
+    """``indicators.compute_bundle`` plus the optional SuperTrend keys."""
+    bundle = indicators.compute_bundle(series, config)
+    if include_supertrend and bundle:
+        high, low, close = series.get("high", []), series.get("low", []), series.get("close", [])
+        if len(high) >= 10 and len(low) >= 10:
+            st = indicators.supertrend(high, low, close, 10, 3.0)
+            bundle["supertrend"] = st["supertrend"]
+            bundle["supertrend_direction"] = st["direction"]
+    return bundle
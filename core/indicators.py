@@ -4,6 +4,10 @@ Unified Indicator Library for Strategy Engine v2
 Provides vectorized, efficient indicator calculations for technical analysis.
 Accepts lists or numpy arrays, returns both latest values and full series.
 Dependency-light implementation (no pandas required for core calculations).
+
+When NumPy is installed, array inputs and lists of at least
+VECTORIZE_MIN_LENGTH values are computed by core.indicators_np. Array
+inputs get arrays back; list inputs keep getting lists.
 """
 
 from __future__ import annotations
@@ -42,6 +46,36 @@ def _ensure_list(series: Any) -> List[float]:
     return [float(x) for x in series]
 
 
+try:
+    import numpy as _np
+    from core import indicators_np as _vectorized
+except ImportError:  # pragma: no cover - NumPy is optional here
+    _np = None
+    _vectorized = None
+
+# Plain lists at least this long go through the NumPy backend as well;
+# shorter ones are cheaper in pure Python than the array round trip.
+VECTORIZE_MIN_LENGTH = 512
+
+
+def _is_array(series: Any) -> bool:
+    return _np is not None and (isinstance(series, _np.ndarray) or hasattr(series, "to_numpy"))
+
+
+def _use_vectorized(series: Any) -> bool:
+    """True when `series` should be computed by the NumPy backend."""
+    if _vectorized is None or series is None:
+        return False
+    return _is_array(series) or len(series) >= VECTORIZE_MIN_LENGTH
+
+
+def _from_vectorized(result: Any, series: Any) -> Any:
+    """Arrays back to lists when the caller passed a plain sequence."""
+    if isinstance(result, _np.ndarray) and not _is_array(series):
+        return result.tolist()
+    return result
+
+
 def _validate_series(series: NumericSeries, min_length: int = 1, indicator_name: str = "Indicator") -> None:
     """
     Validate that series has sufficient data.
@@ -54,8 +88,9 @@ def _validate_series(series: NumericSeries, min_length: int = 1, indicator_name:
     Raises:
         IndicatorWarmupError: When series length is less than min_length (warmup condition)
     """
-    if not series or len(series) < min_length:
-        actual_len = len(series) if series else 0
+    # len() rather than truthiness so NumPy arrays are accepted
+    if series is None or len(series) < min_length:
+        actual_len = len(series) if series is not None else 0
         raise IndicatorWarmupError(indicator_name, min_length, actual_len)
 
 
@@ -71,6 +106,8 @@ def ema(series: NumericSeries, period: int, return_series: bool = False) -> Unio
     Returns:
         Latest EMA value (float) or full EMA series (list)
     """
+    if _use_vectorized(series):
+        return _from_vectorized(_vectorized.ema(series, period, return_series), series)
     _validate_series(series, period, f"EMA({period})")
     data = _ensure_list(series)
     
@@ -104,6 +141,8 @@ def sma(series: NumericSeries, period: int, return_series: bool = False) -> Unio
     Returns:
         Latest SMA value (float) or full SMA series (list)
     """
+    if _use_vectorized(series):
+        return _from_vectorized(_vectorized.sma(series, period, return_series), series)
     _validate_series(series, period, f"SMA({period})")
     data = _ensure_list(series)
     
@@ -136,6 +175,8 @@ def rsi(series: NumericSeries, period: int = 14, return_series: bool = False) ->
     Returns:
         Latest RSI value (float) or full RSI series (list)
     """
+    if _use_vectorized(series):
+        return _from_vectorized(_vectorized.rsi(series, period, return_series), series)
     _validate_series(series, period + 1, f"RSI({period})")
     data = _ensure_list(series)
     
@@ -190,6 +231,8 @@ def atr(high: NumericSeries, low: NumericSeries, close: NumericSeries,
     Returns:
         Latest ATR value (float) or full ATR series (list)
     """
+    if _use_vectorized(close):
+        return _from_vectorized(_vectorized.atr(high, low, close, period, return_series), close)
     _validate_series(high, period, f"ATR({period})")
     _validate_series(low, period, f"ATR({period})")
     _validate_series(close, period, f"ATR({period})")
@@ -248,8 +291,25 @@ def supertrend(high: NumericSeries, low: NumericSeries, close: NumericSeries,
     
     Returns:
         Dict with 'supertrend', 'direction' (+1 for uptrend, -1 for downtrend), 'upper_band', 'lower_band'
-        or list of such dicts if return_series=True
+        or list of such dicts if return_series=True (a dict of arrays for array input)
     """
+    if _use_vectorized(close):
+        result = _vectorized.supertrend(high, low, close, period, multiplier, return_series)
+        if not return_series or _is_array(close):
+            return result
+        columns = {key: values.tolist() for key, values in result.items()}
+        return [
+            {
+                'supertrend': st,
+                'direction': d,
+                'upper_band': up,
+                'lower_band': lo,
+                'final_upper': up,
+                'final_lower': lo,
+            }
+            for st, d, up, lo in zip(columns['supertrend'], columns['direction'],
+                                     columns['upper_band'], columns['lower_band'])
+        ]
     _validate_series(high, period, f"SuperTrend(period={period})")
     _validate_series(low, period, f"SuperTrend(period={period})")
     _validate_series(close, period, f"SuperTrend(period={period})")
@@ -334,7 +394,16 @@ def bollinger(close: NumericSeries, period: int = 20, stddev: float = 2.0,
     
     Returns:
         Dict with 'middle', 'upper', 'lower' or list of such dicts if return_series=True
+        (a dict of arrays for array input)
     """
+    if _use_vectorized(close):
+        result = _vectorized.bollinger(close, period, stddev, return_series)
+        if not return_series or _is_array(close):
+            return result
+        return [
+            {'middle': m, 'upper': u, 'lower': l}
+            for m, u, l in zip(result['middle'].tolist(), result['upper'].tolist(), result['lower'].tolist())
+        ]
     _validate_series(close, period, f"Bollinger({period})")
     data = _ensure_list(close)
     
@@ -383,6 +452,8 @@ def vwap(close: NumericSeries, volume: NumericSeries,
     Returns:
         Latest VWAP value (float) or full VWAP series (list)
     """
+    if _use_vectorized(close):
+        return _from_vectorized(_vectorized.vwap(close, volume, return_series), close)
     _validate_series(close, 1, "VWAP")
     _validate_series(volume, 1, "VWAP")
     
@@ -422,6 +493,8 @@ def slope(series: NumericSeries, period: int,
     Returns:
         Latest slope value (float) or full slope series (list)
     """
+    if _use_vectorized(series):
+        return _from_vectorized(_vectorized.slope(series, period, return_series), series)
     _validate_series(series, period, f"Slope({period})")
     data = _ensure_list(series)
     
@@ -467,6 +540,8 @@ def hl2(high: NumericSeries, low: NumericSeries,
     Returns:
         Latest HL2 value (float) or full HL2 series (list)
     """
+    if _use_vectorized(high):
+        return _from_vectorized(_vectorized.hl2(high, low, return_series), high)
     _validate_series(high, 1, "HL2")
     _validate_series(low, 1, "HL2")
     
@@ -495,6 +570,8 @@ def hl3(high: NumericSeries, low: NumericSeries, close: NumericSeries,
     Returns:
         Latest HL3 value (float) or full HL3 series (list)
     """
+    if _use_vectorized(high):
+        return _from_vectorized(_vectorized.hl3(high, low, close, return_series), high)
     _validate_series(high, 1, "HL3")
     _validate_series(low, 1, "HL3")
     _validate_series(close, 1, "HL3")
@@ -543,8 +620,12 @@ def compute_bundle(
     low = series.get("low", [])
     volume = series.get("volume", [])
     
-    if not close or len(close) < 20:
+    if len(close) < 20:
         return {}
+
+    if _use_vectorized(close):
+        # Convert once so every indicator below takes the array path
+        close, high, low, volume = (_vectorized.as_array(s) for s in (close, high, low, volume))
     
     bundle = {}
     
@@ -583,7 +664,7 @@ def compute_bundle(
             bundle["bb_lower"] = bb["lower"]
         
         # VWAP
-        if volume and len(volume) == len(close):
+        if len(volume) and len(volume) == len(close):
             bundle["vwap"] = vwap(close, volume)
         
         # Slope
@@ -591,7 +672,7 @@ def compute_bundle(
             bundle["slope10"] = slope(close, 10)
         
         # HL2/HL3
-        if high and low:
+        if len(high) and len(low):
             bundle["hl2"] = hl2(high, low)
             bundle["hl3"] = hl3(high, low, close)
         
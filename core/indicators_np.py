@@ -0,0 +1,267 @@
+"""
+NumPy backend for the indicator library.
+
+Same functions, arguments and warmup rules as core/indicators.py, but the
+math runs on float64 arrays: SMA from cumulative sums, Bollinger and slope
+from sliding windows, and EMA / Wilder smoothing as a blocked linear
+recurrence. Series results are returned as arrays (supertrend and bollinger
+series as dicts of arrays); latest values are plain floats.
+
+core.indicators dispatches here automatically for NumPy inputs and long
+lists, so most callers never import this module directly.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.indicators import IndicatorWarmupError
+
+Array = np.ndarray
+
+# Largest growth factor c**-k allowed inside one block of linear_recurrence
+_MAX_BLOCK_GAIN = 1e150
+
+
+def as_array(series: Any) -> Array:
+    """Return series as a contiguous float64 array (no copy when it already is one)."""
+    if hasattr(series, "to_numpy"):  # pandas Series
+        series = series.to_numpy()
+    return np.ascontiguousarray(series, dtype=np.float64)
+
+
+def _validate(series: Any, min_length: int, indicator_name: str) -> Array:
+    if series is None or len(series) < min_length:
+        raise IndicatorWarmupError(indicator_name, min_length, len(series) if series is not None else 0)
+    return as_array(series)
+
+
+def linear_recurrence(b: Array, c: float, y0: Union[float, Array]) -> Array:
+    """
+    Solve y[k] = c * y[k-1] + b[k] with y[-1] = y0, for 0 < c < 1.
+
+    Runs along the last axis, so a (symbols x bars) matrix with one seed per
+    row is handled in the same pass. Within a block
+    y[k] = c**k * (c*y0 + cumsum(b[j] * c**-j)); blocks are sized so c**-k
+    stays finite and the prefix sums keep full precision.
+    """
+    n = b.shape[-1]
+    out = np.empty(b.shape, dtype=np.float64)
+    if n == 0:
+        return out
+    block = max(1, min(n, int(math.log(_MAX_BLOCK_GAIN) / -math.log(c))))
+    k = np.arange(block, dtype=np.float64)
+    grow = c ** -k
+    decay = c ** k
+    prev = np.asarray(y0, dtype=np.float64)
+    for start in range(0, n, block):
+        chunk = b[..., start:start + block]
+        m = chunk.shape[-1]
+        acc = np.cumsum(chunk * grow[:m], axis=-1)
+        acc += (c * prev)[..., None]
+        acc *= decay[:m]
+        out[..., start:start + m] = acc
+        prev = acc[..., -1]
+    return out
+
+
+def _rolling_sum(data: Array, period: int) -> Array:
+    """Sum over each trailing window of `period` values (len(data) - period + 1 entries)."""
+    csum = np.cumsum(data)
+    out = csum[period - 1:].copy()
+    out[1:] -= csum[:-period]
+    return out
+
+
+def _latest(values: Array, return_series: bool) -> Union[float, Array]:
+    return values if return_series else float(values[-1])
+
+
+def ema(series: Any, period: int, return_series: bool = False) -> Union[float, Array]:
+    """Exponential Moving Average seeded with the first value."""
+    data = _validate(series, period, f"EMA({period})")
+    if period <= 1:
+        return _latest(data, return_series)
+    alpha = 2.0 / (period + 1.0)
+    values = np.empty_like(data)
+    values[0] = data[0]
+    values[1:] = linear_recurrence(alpha * data[1:], 1.0 - alpha, data[0])
+    return _latest(values, return_series)
+
+
+def sma(series: Any, period: int, return_series: bool = False) -> Union[float, Array]:
+    """Simple Moving Average; the first period-1 values average what is available."""
+    data = _validate(series, period, f"SMA({period})")
+    if period <= 1:
+        return _latest(data, return_series)
+    if not return_series:
+        return float(data[-period:].sum() / period)
+    csum = np.cumsum(data)
+    values = np.empty_like(data)
+    values[:period - 1] = csum[:period - 1] / np.arange(1, period)
+    values[period - 1:] = _rolling_sum(data, period) / period
+    return values
+
+
+def rsi(series: Any, period: int = 14, return_series: bool = False) -> Union[float, Array]:
+    """Relative Strength Index with Wilder smoothing (len(series) - 1 values)."""
+    data = _validate(series, period + 1, f"RSI({period})")
+    change = np.diff(data)
+    gains = np.maximum(change, 0.0)
+    losses = np.maximum(-change, 0.0)
+
+    c = (period - 1) / period
+    avg_gain = np.empty_like(gains)
+    avg_loss = np.empty_like(losses)
+    avg_gain[period - 1] = gains[:period].sum() / period
+    avg_loss[period - 1] = losses[:period].sum() / period
+    avg_gain[period:] = linear_recurrence(gains[period:] / period, c, avg_gain[period - 1])
+    avg_loss[period:] = linear_recurrence(losses[period:] / period, c, avg_loss[period - 1])
+
+    values = np.full_like(gains, 50.0)
+    g, l = avg_gain[period - 1:], avg_loss[period - 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values[period - 1:] = np.where(l == 0, 100.0, 100.0 - 100.0 / (1.0 + g / l))
+    return _latest(values, return_series)
+
+
+def true_range(high: Array, low: Array, close: Array) -> Array:
+    """True range per bar; the first bar is high - low."""
+    tr = high - low
+    if len(close) > 1:
+        prev = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+    return tr
+
+
+def atr(high: Any, low: Any, close: Any, period: int = 14,
+        return_series: bool = False) -> Union[float, Array]:
+    """Average True Range: simple average seed, Wilder smoothing afterwards."""
+    name = f"ATR({period})"
+    h, l, c = _validate(high, period, name), _validate(low, period, name), _validate(close, period, name)
+    if not (len(h) == len(l) == len(c)):
+        raise ValueError("high, low, and close series must have same length")
+    tr = true_range(h, l, c)
+    values = np.empty_like(tr)
+    values[:period] = tr[:period].sum() / period
+    if period > 1:
+        values[period:] = linear_recurrence(tr[period:] / period, (period - 1) / period, values[period - 1])
+    else:
+        values[period:] = tr[period:]
+    return _latest(values, return_series)
+
+
+def supertrend(high: Any, low: Any, close: Any, period: int = 10, multiplier: float = 3.0,
+               return_series: bool = False) -> Dict[str, Any]:
+    """
+    SuperTrend. The band ratchet depends on the previous final band, so that
+    part is a loop over plain floats; ATR and the basic bands are vectorized.
+    """
+    name = f"SuperTrend(period={period})"
+    h, l, c = _validate(high, period, name), _validate(low, period, name), _validate(close, period, name)
+    atr_values = atr(h, l, c, period, return_series=True)
+    hl2_values = (h + l) / 2.0
+    basic_upper = (hl2_values + multiplier * atr_values).tolist()
+    basic_lower = (hl2_values - multiplier * atr_values).tolist()
+    closes = c.tolist()
+
+    n = len(closes)
+    upper = [0.0] * n
+    lower = [0.0] * n
+    st = [0.0] * n
+    direction = [1] * n
+    upper[0], lower[0], st[0] = basic_upper[0], basic_lower[0], basic_lower[0]
+    for i in range(1, n):
+        prev_close = closes[i - 1]
+        prev_upper, prev_lower = upper[i - 1], lower[i - 1]
+        fu = basic_upper[i] if (basic_upper[i] < prev_upper or prev_close > prev_upper) else prev_upper
+        fl = basic_lower[i] if (basic_lower[i] > prev_lower or prev_close < prev_lower) else prev_lower
+        upper[i], lower[i] = fu, fl
+        if closes[i] <= fu:
+            st[i], direction[i] = fu, -1
+        else:
+            st[i], direction[i] = fl, 1
+
+    if return_series:
+        return {
+            "supertrend": np.array(st),
+            "direction": np.array(direction),
+            "upper_band": np.array(upper),
+            "lower_band": np.array(lower),
+        }
+    return {"supertrend": st[-1], "direction": direction[-1], "upper_band": upper[-1], "lower_band": lower[-1]}
+
+
+def bollinger(close: Any, period: int = 20, stddev: float = 2.0,
+              return_series: bool = False) -> Dict[str, Any]:
+    """Bollinger Bands (population std around the SMA); series as a dict of arrays."""
+    data = _validate(close, period, f"Bollinger({period})")
+    if not return_series:
+        window = data[-period:]
+        middle = float(window.sum() / period)
+        std = math.sqrt(float(((window - middle) ** 2).sum() / period))
+        return {"middle": middle, "upper": middle + stddev * std, "lower": middle - stddev * std}
+
+    middle = sma(data, period, return_series=True)
+    # Deviations around each window's own mean; cumulative sums of squares
+    # lose too much precision at index price levels.
+    windows = sliding_window_view(data, period)
+    dev = windows - middle[period - 1:, None]
+    std = np.zeros_like(data)
+    std[period - 1:] = np.sqrt((dev * dev).sum(axis=1) / period)
+    return {"middle": middle, "upper": middle + stddev * std, "lower": middle - stddev * std}
+
+
+def vwap(close: Any, volume: Any, return_series: bool = False) -> Union[float, Array]:
+    """Cumulative VWAP; falls back to the close while cumulative volume is zero."""
+    c, v = _validate(close, 1, "VWAP"), _validate(volume, 1, "VWAP")
+    if len(c) != len(v):
+        raise ValueError("close and volume series must have same length")
+    if not return_series:
+        total = float(v.sum())
+        return float((c * v).sum() / total) if total > 0 else float(c[-1])
+    cum_vol = np.cumsum(v)
+    cum_pv = np.cumsum(c * v)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_vol > 0, cum_pv / cum_vol, c)
+
+
+def slope(series: Any, period: int, return_series: bool = False) -> Union[float, Array]:
+    """Least-squares slope of each trailing window against x = 0..period-1."""
+    data = _validate(series, period, f"Slope({period})")
+    n = period
+    sum_x = n * (n - 1) / 2
+    sum_x2 = n * (n - 1) * (2 * n - 1) / 6
+    denominator = n * sum_x2 - sum_x * sum_x
+    x = np.arange(n, dtype=np.float64)
+    if not return_series:
+        if denominator == 0:
+            return 0.0
+        window = data[-n:]
+        return float((n * float(window @ x) - sum_x * float(window.sum())) / denominator)
+
+    values = np.zeros_like(data)
+    if denominator != 0:
+        windows = sliding_window_view(data, n)
+        values[n - 1:] = (n * (windows @ x) - sum_x * windows.sum(axis=1)) / denominator
+    return values
+
+
+def hl2(high: Any, low: Any, return_series: bool = False) -> Union[float, Array]:
+    """Average of high and low."""
+    h, l = _validate(high, 1, "HL2"), _validate(low, 1, "HL2")
+    if len(h) != len(l):
+        raise ValueError("high and low series must have same length")
+    return _latest((h + l) / 2.0, return_series)
+
+
+def hl3(high: Any, low: Any, close: Any, return_series: bool = False) -> Union[float, Array]:
+    """Typical price: average of high, low and close."""
+    h, l, c = _validate(high, 1, "HL3"), _validate(low, 1, "HL3"), _validate(close, 1, "HL3")
+    if not (len(h) == len(l) == len(c)):
+        raise ValueError("high, low, and close series must have same length")
+    return _latest((h + l + c) / 3.0, return_series)
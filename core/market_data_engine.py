@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import json
 import logging
+import math
 import threading
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Generator, Iterable, List, Optional
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional
 
 from kiteconnect import KiteConnect
 
 from analytics.telemetry_bus import publish_engine_health
-from core.kite_http import kite_request
+from core.candle_cache import DEFAULT_CACHE_BACKEND, JsonCandleCache, make_candle_cache, normalize_candle
+from core.historical_fetcher import HistoricalFetcher, HistoricalRequest
 from core.universe_builder import load_universe
 from data.instruments import get_instrument_token
 
@@ -34,6 +35,82 @@ TIMEFRAME_TO_INTERVAL = {
     "1d": "day",
 }
 
+# Kite bars are aligned to exchange (IST) wall-clock boundaries
+IST = timezone(timedelta(hours=5, minutes=30))
+DEFAULT_REFRESH_GRACE_SEC = 3.0
+
+
+class RefreshScheduler:
+    """
+    Decides when a (symbol, timeframe) candle cache needs a historical refresh.
+
+    A key is due once a bar boundary has passed since its last refresh (plus a
+    small grace period for the broker to publish the closed bar). Keys that
+    have never been refreshed are always due. Boundaries are computed on the
+    wall clock rather than from cached bar timestamps, so they do not depend
+    on how those timestamps were labelled.
+    """
+
+    def __init__(
+        self,
+        grace_sec: float = DEFAULT_REFRESH_GRACE_SEC,
+        max_per_loop: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.grace_sec = float(grace_sec)
+        self.max_per_loop = int(max_per_loop) if max_per_loop else None
+        self._clock = clock
+        self._last_refresh: Dict[tuple[str, str], float] = {}
+        self.stats: Dict[str, int] = {"refreshed": 0, "skipped": 0, "deferred": 0}
+
+    def now(self) -> float:
+        return self._clock()
+
+    @staticmethod
+    def bar_seconds(timeframe: str) -> int:
+        tf = (timeframe or "1m").lower()
+        if tf in {"day", "1d"}:
+            return 86400
+        if tf.endswith("h"):
+            return int(tf.rstrip("h") or "1") * 3600
+        if tf.endswith("m"):
+            return int(tf.rstrip("m") or "1") * 60
+        return 60
+
+    def next_boundary(self, timeframe: str, after: float) -> float:
+        """Epoch seconds of the first bar boundary strictly after ``after``."""
+        seconds = self.bar_seconds(timeframe)
+        offset = IST.utcoffset(None).total_seconds()
+        return ((after + offset) // seconds + 1) * seconds - offset
+
+    def last_refresh(self, key: tuple[str, str]) -> Optional[float]:
+        return self._last_refresh.get(key)
+
+    def seed(self, key: tuple[str, str], refreshed_at: float) -> None:
+        """Record a refresh time learned from elsewhere (e.g. cache mtime) if unknown."""
+        self._last_refresh.setdefault(key, refreshed_at)
+
+    def overdue_by(self, key: tuple[str, str], timeframe: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds since the key became due, ``inf`` if never refreshed, or None
+        if no bar boundary has passed yet.
+        """
+        last = self._last_refresh.get(key)
+        if last is None:
+            return float("inf")
+        now = self.now() if now is None else now
+        due_at = self.next_boundary(timeframe, last) + self.grace_sec
+        if now < due_at:
+            return None
+        return now - due_at
+
+    def is_due(self, key: tuple[str, str], timeframe: str, now: Optional[float] = None) -> bool:
+        return self.overdue_by(key, timeframe, now) is not None
+
+    def mark_refreshed(self, key: tuple[str, str], now: Optional[float] = None) -> None:
+        self._last_refresh[key] = self.now() if now is None else now
+        self.stats["refreshed"] += 1
+
 
 class MarketDataEngine:
     """
@@ -46,15 +123,31 @@ class MarketDataEngine:
         universe: Optional[Dict[str, Any]] = None,
         cache_dir: Optional[Path] = None,
         enable_telemetry: bool = True,
+        refresh_grace_sec: float = DEFAULT_REFRESH_GRACE_SEC,
+        max_refreshes_per_loop: Optional[int] = None,
+        cache_backend: str = DEFAULT_CACHE_BACKEND,
+        historical_fetcher: Optional[HistoricalFetcher] = None,
     ) -> None:
         self.kite = kite_client
         self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         universe_data = universe or load_universe()
         self.meta = (universe_data.get("meta") or {}) if isinstance(universe_data, dict) else {}
-        self._cache: Dict[tuple[str, str], List[Dict[str, Any]]] = {}
+        # On-disk candle storage: "binary" (append-only, mmap) or "json"
+        self.candle_cache = make_candle_cache(cache_backend, self.cache_dir)
+        # Rate-limited, chunked historical requests (shares the process-wide quota)
+        self.historical_fetcher = historical_fetcher or HistoricalFetcher(kite_client)
         self._warned_missing_token: set[str] = set()  # Track symbols already warned about
         self._lookup_failures: set[str] = set()  # Track lookup failures for telemetry
+        self._historical_calls = 0  # kite.historical_data requests issued
+        # Keys the last refresh_due() call could not refresh, with the reason
+        self.refresh_failures: Dict[tuple[str, str], str] = {}
+        
+        # Only refetch history once a new bar has closed
+        self.refresh_scheduler = RefreshScheduler(
+            grace_sec=refresh_grace_sec,
+            max_per_loop=max_refreshes_per_loop,
+        )
         
         # Telemetry support
         self._enable_telemetry = enable_telemetry
@@ -69,87 +162,134 @@ class MarketDataEngine:
     # ------------------------------------------------------------------
 
     def load_cache(self, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
-        key = self._cache_key(symbol, timeframe)
-        if key in self._cache:
-            return list(self._cache[key])
-        path = self._cache_path(symbol, timeframe)
-        if not path.exists():
-            self._cache[key] = []
-            return []
-        try:
-            candles = json.loads(path.read_text(encoding="utf-8"))
-            if isinstance(candles, list):
-                normalized = [self._normalize_candle(entry) for entry in candles if isinstance(entry, dict)]
-                normalized = [c for c in normalized if c]
-                self._cache[key] = normalized
-                return list(normalized)
-        except json.JSONDecodeError as exc:
-            logger.warning("Failed to decode market cache %s: %s", path, exc)
-        self._cache[key] = []
-        return []
+        symbol, timeframe = self._cache_key(symbol, timeframe)
+        return self.candle_cache.load(symbol, timeframe)
 
     def save_cache(self, symbol: str, timeframe: str, candles: List[Dict[str, Any]]) -> None:
-        key = self._cache_key(symbol, timeframe)
-        path = self._cache_path(symbol, timeframe)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        candles_sorted = sorted(candles, key=lambda c: c.get("ts") or "")
-        path.write_text(json.dumps(candles_sorted, indent=2), encoding="utf-8")
-        self._cache[key] = candles_sorted
+        symbol, timeframe = self._cache_key(symbol, timeframe)
+        self.candle_cache.save(symbol, timeframe, candles)
 
     def fetch_historical(self, symbol: str, timeframe: str, count: int = 200) -> List[Dict[str, Any]]:
-        if not self.kite:
-            logger.debug("No Kite client; cannot fetch historical for %s/%s", symbol, timeframe)
+        request = self._historical_request(symbol, timeframe, count)
+        if request is None:
             return []
-        interval = self._map_timeframe(timeframe)
-        if not interval:
-            logger.warning("Unsupported timeframe=%s; cannot fetch historical.", timeframe)
-            return []
-        span = self._timeframe_delta(timeframe, count)
-        to_dt = datetime.utcnow().replace(tzinfo=timezone.utc)
-        from_dt = to_dt - span
-        token = self._resolve_token(symbol)
-        if token is None:
-            return []
-        try:
-            candles = kite_request(
-                self.kite.historical_data,
-                instrument_token=token,
-                from_date=from_dt,
-                to_date=to_dt,
-                interval=interval,
-                continuous=False,
-                oi=False,
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Historical fetch failed for %s/%s: %s", symbol, timeframe, exc)
-            return []
-        results: List[Dict[str, Any]] = []
-        for candle in candles or []:
-            entry = self._normalize_candle(candle)
-            if entry:
-                results.append(entry)
-        return results
+        return self._fetch_request(request) or []
 
     def fetch_latest(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
         candles = self.fetch_historical(symbol, timeframe, count=1)
         return candles[-1] if candles else None
 
-    def update_cache(self, symbol: str, timeframe: str, count: int = 200) -> None:
+    def update_cache(self, symbol: str, timeframe: str, count: int = 200, force: bool = False) -> bool:
+        """
+        Refresh the cached candles for symbol/timeframe from Kite.
+
+        Skips the request unless a bar boundary has passed since the last
+        refresh (``force`` bypasses the check). When the cache is already
+        populated only the bars from its latest cached bar onwards are
+        requested. A failed request leaves the key due, so the next call
+        retries from the same cached bar.
+
+        Returns:
+            True if a historical request was issued.
+        """
         symbol = symbol.upper()
         timeframe = timeframe or "1m"
-        existing = self.load_cache(symbol, timeframe)
-        latest_ts = existing[-1]["ts"] if existing else None
-        new_candles = self.fetch_historical(symbol, timeframe, count=count)
-        if not new_candles:
-            return
-        merged: Dict[str, Dict[str, Any]] = {entry["ts"]: entry for entry in existing if entry.get("ts")}
-        for candle in new_candles:
-            merged[candle["ts"]] = candle
-        merged_list = sorted(merged.values(), key=lambda c: c["ts"])
-        self.save_cache(symbol, timeframe, merged_list)
+        key = self._cache_key(symbol, timeframe)
+        scheduler = self.refresh_scheduler
+        now = scheduler.now()
+        self._seed_refresh_time(key, symbol, timeframe)
+        if not force and not scheduler.is_due(key, timeframe, now):
+            scheduler.stats["skipped"] += 1
+            return False
+        request = self._historical_request(symbol, timeframe, self._refresh_count(key, count, force, now))
+        if request is None:
+            return False
+        new_candles = self._fetch_request(request)
+        if new_candles is None:
+            return True
+        scheduler.mark_refreshed(key, now)
+        if new_candles:
+            self.candle_cache.merge(symbol, timeframe, new_candles)
+        return True
+
+    def refresh_due(
+        self,
+        requests: Iterable[tuple[str, str]],
+        count: int = 200,
+        max_refreshes: Optional[int] = None,
+        force: bool = False,
+    ) -> int:
+        """
+        Refresh every (symbol, timeframe) whose bar boundary has passed.
+
+        Most-overdue keys go first. At most ``max_refreshes`` requests are
+        issued per call (default: the scheduler's ``max_per_loop``), and the
+        rest are deferred to later loops, so a boundary that makes the whole
+        universe due is spread over several loops. The selected requests are
+        fetched concurrently through ``historical_fetcher``; ``force`` treats
+        every key as due and fetches the full ``count``.
+
+        Only keys whose fetch succeeded are marked refreshed. Keys with no
+        request (e.g. an unresolved token) or a failed fetch stay due and are
+        listed in ``refresh_failures``.
+
+        Returns:
+            Number of historical requests issued.
+        """
+        scheduler = self.refresh_scheduler
+        budget = max_refreshes if max_refreshes is not None else scheduler.max_per_loop
+        now = scheduler.now()
+
+        due: List[tuple[float, str, str]] = []
+        seen: set[tuple[str, str]] = set()
+        for symbol, timeframe in requests:
+            timeframe = timeframe or "1m"
+            key = self._cache_key(symbol, timeframe)
+            if key in seen:
+                continue
+            seen.add(key)
+            self._seed_refresh_time(key, symbol, timeframe)
+            lateness = float("inf") if force else scheduler.overdue_by(key, timeframe, now)
+            if lateness is None:
+                scheduler.stats["skipped"] += 1
+                continue
+            due.append((lateness, key[0], timeframe))
+
+        due.sort(key=lambda item: item[0], reverse=True)
+        self.refresh_failures = {}
+        fetches: List[HistoricalRequest] = []
+        for index, (_, symbol, timeframe) in enumerate(due):
+            # Keys with no request do not use up the budget
+            if budget is not None and len(fetches) >= budget:
+                scheduler.stats["deferred"] += len(due) - index
+                break
+            key = self._cache_key(symbol, timeframe)
+            request = self._historical_request(symbol, timeframe, self._refresh_count(key, count, force, now))
+            if request is None:
+                self.refresh_failures[key] = "no historical request (unresolved token or timeframe)"
+                continue
+            fetches.append(request)
+        self._historical_calls += len(fetches)
+        results = self.historical_fetcher.fetch_many(fetches) if fetches else {}
+
+        for request in fetches:
+            key = request.key
+            if key not in results:
+                # Failed after retries (see historical_fetcher.errors); stays due
+                self.refresh_failures[key] = str(self.historical_fetcher.errors.get(key, "fetch failed"))
+                continue
+            scheduler.mark_refreshed(key, now)
+            new_candles = self._normalize_candles(results[key])
+            if not new_candles:
+                continue
+            try:
+                self.candle_cache.merge(*key, new_candles)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Market data cache update failed for %s/%s: %s", *key, exc)
+        return len(fetches)
 
     def get_latest_candle(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
-        cache = self.load_cache(symbol, timeframe)
+        cache = self.candle_cache.tail(*self._cache_key(symbol, timeframe), 1)
         if cache:
             return cache[-1]
         # cache empty -> attempt fetch
@@ -159,11 +299,11 @@ class MarketDataEngine:
         return latest
 
     def get_window(self, symbol: str, timeframe: str, window_size: int) -> List[Dict[str, Any]]:
-        cache = self.load_cache(symbol, timeframe)
-        if not cache:
+        symbol, timeframe = self._cache_key(symbol, timeframe)
+        if not self.candle_cache.count(symbol, timeframe):
             self.update_cache(symbol, timeframe, count=max(window_size, 200))
-            cache = self.load_cache(symbol, timeframe)
-        return cache[-window_size:]
+        # Reads only the last window_size candles from the cache
+        return self.candle_cache.tail(symbol, timeframe, window_size)
 
     def log_token_summary(self) -> None:
         """
@@ -209,31 +349,77 @@ class MarketDataEngine:
     def _cache_key(self, symbol: str, timeframe: str) -> tuple[str, str]:
         return (symbol.upper(), timeframe or "1m")
 
-    def _cache_path(self, symbol: str, timeframe: str) -> Path:
-        safe_symbol = symbol.replace(":", "_").replace("/", "_").upper()
-        safe_tf = (timeframe or "1m").replace(" ", "").lower()
-        return self.cache_dir / f"{safe_symbol}_{safe_tf}.json"
-
-    def _normalize_candle(self, candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        if not isinstance(candle, dict):
+    def _historical_request(self, symbol: str, timeframe: str, count: int) -> Optional[HistoricalRequest]:
+        """Build the request for the last ``count`` bars ending now (None if not fetchable)."""
+        if not self.kite:
+            logger.debug("No Kite client; cannot fetch historical for %s/%s", symbol, timeframe)
+            return None
+        interval = self._map_timeframe(timeframe)
+        if not interval:
+            logger.warning("Unsupported timeframe=%s; cannot fetch historical.", timeframe)
             return None
-        ts = candle.get("ts") or candle.get("timestamp") or candle.get("date")
-        if isinstance(ts, datetime):
-            ts_iso = ts.replace(tzinfo=timezone.utc).isoformat()
-        else:
-            ts_iso = str(ts)
+        span = self._timeframe_delta(timeframe, count)
+        # Kite reads from/to as exchange-local wall-clock time
+        to_dt = datetime.fromtimestamp(self.refresh_scheduler.now(), IST)
+        from_dt = to_dt - span
+        token = self._resolve_token(symbol)
+        if token is None:
+            return None
+        return HistoricalRequest(self._cache_key(symbol, timeframe), token, interval, from_dt, to_dt)
+
+    def _fetch_request(self, request: HistoricalRequest) -> Optional[List[Dict[str, Any]]]:
+        """Run one historical request; None if it failed."""
+        self._historical_calls += 1
         try:
-            entry = {
-                "ts": ts_iso,
-                "open": float(candle.get("open", 0.0)),
-                "high": float(candle.get("high", 0.0)),
-                "low": float(candle.get("low", 0.0)),
-                "close": float(candle.get("close", 0.0)),
-                "volume": float(candle.get("volume", 0.0)),
-            }
-        except (TypeError, ValueError):
+            candles = self.historical_fetcher.fetch(
+                request.instrument_token,
+                request.interval,
+                request.from_date,
+                request.to_date,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Historical fetch failed for %s/%s: %s", *request.key, exc)
             return None
-        return entry
+        return self._normalize_candles(candles)
+
+    def _refresh_count(self, key: tuple[str, str], count: int, force: bool, now: float) -> int:
+        """Bars to request for a refresh: the full count, or those from the latest cached bar on."""
+        if force:
+            return count
+        latest = self.candle_cache.tail(*key, 1)
+        if not latest:
+            return count
+        start = self._exchange_epoch(latest[-1].get("ts"))
+        if start is None:
+            return count
+        # The latest cached bar may have been stored while forming, so it is requested again
+        elapsed = math.ceil((now - start) / self.refresh_scheduler.bar_seconds(key[1]))
+        return max(2, min(count, elapsed + 1))
+
+    def _normalize_candles(self, candles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for candle in candles:
+            entry = self._normalize_candle(candle)
+            if entry:
+                results.append(entry)
+        return results
+
+    def _seed_refresh_time(self, key: tuple[str, str], symbol: str, timeframe: str) -> None:
+        """Use the cache file's mtime as the last refresh time after a restart."""
+        if self.refresh_scheduler.last_refresh(key) is not None:
+            return
+        path = self.candle_cache.path(*key)
+        try:
+            self.refresh_scheduler.seed(key, path.stat().st_mtime)
+        except OSError:
+            pass
+
+    def _cache_path(self, symbol: str, timeframe: str) -> Path:
+        """Path of the JSON cache file (the binary backend imports it on first read)."""
+        return JsonCandleCache(self.cache_dir).path(symbol, timeframe)
+
+    def _normalize_candle(self, candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return normalize_candle(candle)
 
     def _map_timeframe(self, timeframe: str) -> Optional[str]:
         tf = (timeframe or "1m").lower()
@@ -328,13 +514,15 @@ class MarketDataEngine:
         """Publish current MDE status to telemetry bus."""
         try:
             # Get cache statistics
-            total_symbols = len(self._cache)
-            total_candles = sum(len(candles) for candles in self._cache.values())
+            cached_keys = self.candle_cache.keys()
+            total_symbols = len(cached_keys)
+            total_candles = sum(self.candle_cache.count(*key) for key in cached_keys)
             
             # Get stale symbol information (symbols with no recent data)
             stale_symbols = []
             now = datetime.now(timezone.utc)
-            for (symbol, timeframe), candles in self._cache.items():
+            for symbol, timeframe in cached_keys:
+                candles = self.candle_cache.tail(symbol, timeframe, 1)
                 if candles:
                     last_candle_ts = self._parse_ts(candles[-1].get("ts"))
                     if last_candle_ts:
@@ -354,6 +542,9 @@ class MarketDataEngine:
                 "total_candles": total_candles,
                 "meta_entries": len(self.meta),
                 "lookup_failures": len(self._lookup_failures),
+                "historical_calls": self._historical_calls,
+                "refresh_skipped": self.refresh_scheduler.stats["skipped"],
+                "refresh_deferred": self.refresh_scheduler.stats["deferred"],
                 "stale_symbols_count": len(stale_symbols),
                 "has_kite_client": self.kite is not None,
             }
@@ -382,6 +573,20 @@ class MarketDataEngine:
             self._telemetry_thread.join(timeout=5.0)
             logger.debug("MarketDataEngine telemetry thread stopped")
 
+    @classmethod
+    def _exchange_epoch(cls, value: Any) -> Optional[float]:
+        """
+        Epoch seconds of a cached bar timestamp, read as IST wall-clock time.
+
+        normalize_candle relabels Kite's IST datetimes as UTC without shifting
+        them, so the stored offset is ignored. A timestamp that really was UTC
+        reads 5h30m early this way, which only widens the refresh request.
+        """
+        ts = cls._parse_ts(value)
+        if ts is None:
+            return None
+        return ts.replace(tzinfo=IST).timestamp()
+
     @staticmethod
     def _parse_ts(value: Any) -> Optional[datetime]:
         if value in (None, ""):
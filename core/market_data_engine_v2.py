@@ -9,7 +9,8 @@ Unified market data engine that provides:
 
 Key Features:
 - Supports both "kite" (live) and "replay" modes
-- Multi-timeframe candle building (1m, 5m, etc.)
+- Multi-timeframe candle building (1m, 5m, etc.), either per tick or rolled
+  up from closed base-timeframe bars (cfg "candle_rollup")
 - Instrument token mapping with fallback
 - Data health monitoring and staleness detection
 - Minimal logging with deduplication
@@ -18,11 +19,13 @@ Key Features:
 from __future__ import annotations
 
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 import threading
 
+from core.candle_store import CandleRingBuffer, CandleSeries
+
 logger = logging.getLogger(__name__)
 
 # Timeframe to minutes mapping
@@ -79,26 +82,45 @@ class MarketDataEngineV2:
         # Timeframes to build candles for
         self.timeframes: List[str] = cfg.get("timeframes", ["1m", "5m"])
         
+        # Roll-up mode: ticks only update the base (smallest) timeframe and
+        # higher timeframes are aggregated from closed base bars.
+        self.candle_rollup: bool = bool(cfg.get("candle_rollup", False))
+        self.base_timeframe: str = min(
+            self.timeframes, key=lambda tf: TIMEFRAME_MINUTES.get(tf, 1), default="1m"
+        )
+        
         # Track symbols with missing tokens (log warning once)
         self._warned_missing: set[str] = set()
         
-        # Build symbol->token mapping
+        # Build symbol->token mapping plus the reverse token->symbol index
         self.symbol_tokens: Dict[str, int] = self._build_symbol_tokens()
+        self._token_symbols: Dict[int, str] = {}
+        # Per-symbol precomputed ((symbol, timeframe), bucket_seconds) pairs
+        self._symbol_bar_keys: Dict[str, List[tuple[tuple[str, str], int]]] = {}
+        # Roll-up targets per base key: {(symbol, base_tf): [((symbol, tf), seconds)]}
+        self._rollup_keys: Dict[tuple[str, str], List[tuple[tuple[str, str], int]]] = {}
+        self._rebuild_token_index()
         
         # LTP tracking: {symbol: price}
         self.ltp: Dict[str, float] = {}
         self.ltp_timestamp: Dict[str, datetime] = {}
         
-        # Candle storage: {(symbol, timeframe): deque[dict]}
+        # Candle storage: {(symbol, timeframe): CandleRingBuffer}
         max_history = cfg.get("history_lookback", 500)
-        self.candles: Dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=max_history))
+        self.candles: Dict[tuple[str, str], CandleRingBuffer] = defaultdict(
+            lambda: CandleRingBuffer(max_history)
+        )
         
         # Current (incomplete) candles being built: {(symbol, timeframe): dict}
+        # "ts" stays None until the bar closes (see _update_bar).
         self.current_bars: Dict[tuple[str, str], dict] = {}
+        # Epoch bucket and tzinfo of each open bar: {(symbol, timeframe): (bucket, tz)}
+        self._open_buckets: Dict[tuple[str, str], tuple[int, Any]] = {}
         
-        # Replay state
+        # Replay state (recorded tick files, see core.tick_recorder)
         self.replay_thread: Optional[threading.Thread] = None
         self.replay_speed = cfg.get("replay_speed", 1.0)
+        self.replayer: Optional[Any] = None
         
         # Candle close event handlers
         self.on_candle_close_handlers: List[Any] = []
@@ -144,6 +166,61 @@ class MarketDataEngineV2:
         
         return tokens
     
+    def _rebuild_token_index(self) -> None:
+        """Rebuild token->symbol and per-symbol bar-key lookups from symbol_tokens."""
+        self._token_symbols = {int(token): symbol for symbol, token in self.symbol_tokens.items()}
+        
+        tick_timeframes = list(self.timeframes)
+        rollup_timeframes: List[str] = []
+        if self.candle_rollup:
+            base_seconds = TIMEFRAME_MINUTES.get(self.base_timeframe, 1) * 60
+            for timeframe in self.timeframes:
+                seconds = TIMEFRAME_MINUTES.get(timeframe, 1) * 60
+                if timeframe == self.base_timeframe or seconds % base_seconds != 0:
+                    continue
+                rollup_timeframes.append(timeframe)
+                tick_timeframes.remove(timeframe)
+            for timeframe in tick_timeframes:
+                if timeframe != self.base_timeframe:
+                    self.logger.info(
+                        "MDEv2: %s is not a multiple of base %s; building it from ticks",
+                        timeframe,
+                        self.base_timeframe,
+                    )
+        
+        self._symbol_bar_keys = {
+            symbol: [
+                ((symbol, timeframe), TIMEFRAME_MINUTES.get(timeframe, 1) * 60)
+                for timeframe in tick_timeframes
+            ]
+            for symbol in self.symbol_tokens
+        }
+        self._rollup_keys = {}
+        if rollup_timeframes:
+            for symbol in self.symbol_tokens:
+                self._rollup_keys[(symbol, self.base_timeframe)] = [
+                    ((symbol, timeframe), TIMEFRAME_MINUTES.get(timeframe, 1) * 60)
+                    for timeframe in rollup_timeframes
+                ]
+
+    def set_universe(self, universe: List[str], meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Replace the tracked universe and re-resolve instrument tokens.
+
+        Keeps the token->symbol index in sync with symbol_tokens. Candle history
+        for symbols that remain in the universe is preserved.
+        """
+        self.universe = [s.upper() for s in universe]
+        if meta is not None:
+            self.meta = meta
+        self.symbol_tokens = self._build_symbol_tokens()
+        self._rebuild_token_index()
+        self.logger.info(
+            "MDEv2 universe updated: symbols=%d, tokens_resolved=%d",
+            len(self.universe),
+            len(self.symbol_tokens),
+        )
+
     def register_on_candle_close(self, handler) -> None:
         """
         Register a handler to be called when a candle closes.
@@ -169,16 +246,46 @@ class MarketDataEngineV2:
             # Engine will receive ticks via on_tick_batch()
             pass
         elif self.feed_mode == "replay":
-            # Replay mode: would start replay thread here
-            pass
+            # Replay mode: feed recorded ticks through on_tick_batch
+            self._start_replay()
     
     def stop(self) -> None:
         """Stop the market data engine."""
         self.logger.info("MDE v2 stopped")
         self.is_running = False
         
+        if self.replayer is not None:
+            self.replayer.stop()
         if self.replay_thread and self.replay_thread.is_alive():
             self.replay_thread.join(timeout=2.0)
+    
+    def _start_replay(self) -> None:
+        """
+        Start replaying recorded tick files on a background thread.
+        
+        Config: replay_dir (default artifacts/ticks), replay_date or
+        replay_dates (YYYY-MM-DD, default: every recorded day) and
+        replay_speed (multiple of real time; 0 = as fast as possible).
+        """
+        from core.tick_recorder import TickReplayer, resolve_replay_files
+        
+        days = self.cfg.get("replay_dates") or (
+            [self.cfg["replay_date"]] if self.cfg.get("replay_date") else None
+        )
+        paths = [p for p in resolve_replay_files(self.cfg.get("replay_dir"), days) if p.exists()]
+        if not paths:
+            self.logger.warning("MDE v2 replay: no recorded tick files found (days=%s)", days)
+            return
+        
+        self.replayer = TickReplayer(self.on_tick_batch, speed=self.replay_speed)
+        
+        def _run() -> None:
+            delivered = self.replayer.replay_files(paths)
+            self.logger.info("MDE v2 replay finished: %d ticks from %d files", delivered, len(paths))
+        
+        self.replay_thread = threading.Thread(target=_run, name="mde-v2-replay", daemon=True)
+        self.replay_thread.start()
+        self.logger.info("MDE v2 replay started: %d files at speed=%s", len(paths), self.replay_speed)
 
     # Adapter for StrategyEngineV2 expectations --------------------------------
     def get_window(self, symbol: str, timeframe: str, window_size: int):
@@ -189,16 +296,28 @@ class MarketDataEngineV2:
         time order. Falls back to an empty list if no data available.
         """
         key = (symbol.upper(), timeframe)
-        series = self.candles.get(key)  # deque of dict bars
+        series = self.candles.get(key)
         if not series:
             return []
 
         try:
-            # deque preserves order; convert tail window_size to list
-            data = list(series)[-window_size:]
+            data = series.tail(window_size)
         except Exception:
             data = []
         return data
+
+    def get_series(self, symbol: str, timeframe: str, window: Optional[int] = None) -> Optional[CandleSeries]:
+        """
+        Get zero-copy OHLCV column views for the most recent `window` bars.
+
+        Returns a CandleSeries mapping (open/high/low/close/volume/ts -> NumPy
+        views, oldest first), or None when no bars have closed yet. The views
+        alias the ring buffer, so consumers must not mutate them.
+        """
+        history = self.candles.get((symbol.upper(), timeframe))
+        if not history:
+            return None
+        return history.series(window)
     
     def on_tick_batch(self, ticks: List[Dict[str, Any]]) -> None:
         """
@@ -214,68 +333,155 @@ class MarketDataEngineV2:
         if not self.is_running:
             return
         
+        token_symbols = self._token_symbols
+        symbol_bar_keys = self._symbol_bar_keys
+        update_bar = self._update_bar
+        
         for tick in ticks:
             token = tick.get("instrument_token")
             ltp = tick.get("last_price")
-            ts = tick.get("timestamp") or tick.get("exchange_timestamp") or datetime.now(timezone.utc)
             
             if not token or not ltp:
                 continue
             
             # Map token -> symbol
-            symbol = self._token_to_symbol(token)
-            if not symbol:
+            symbol = token_symbols.get(token)
+            if symbol is None:
                 continue
             
+            ts = tick.get("timestamp") or tick.get("exchange_timestamp") or datetime.now(timezone.utc)
+            
             # Ensure timezone-aware timestamp
-            if isinstance(ts, datetime) and ts.tzinfo is None:
+            tz = ts.tzinfo
+            if tz is None:
                 ts = ts.replace(tzinfo=timezone.utc)
+                tz = timezone.utc
             
             # Update LTP
-            self.ltp[symbol] = float(ltp)
+            price = float(ltp)
+            self.ltp[symbol] = price
             self.ltp_timestamp[symbol] = ts
             
+            # Wall-clock seconds in the tick's own timezone, so buckets line up
+            # with the same boundaries _floor_to_timeframe would produce.
+            local_epoch = ts.timestamp() + ts.utcoffset().total_seconds()
+            
             # Update candles for all timeframes
-            for timeframe in self.timeframes:
-                self._update_candle(symbol, timeframe, float(ltp), ts)
+            for key, seconds in symbol_bar_keys[symbol]:
+                update_bar(key, int(local_epoch // seconds), seconds, price, tz)
     
     def _token_to_symbol(self, token: int) -> Optional[str]:
         """Map instrument token to symbol."""
-        for symbol, sym_token in self.symbol_tokens.items():
-            if sym_token == token:
-                return symbol
-        return None
+        return self._token_symbols.get(token)
     
     def _update_candle(self, symbol: str, timeframe: str, price: float, ts: datetime) -> None:
         """Update or create candle for symbol/timeframe."""
-        key = (symbol, timeframe)
-        
-        # Calculate bar start time (aligned to timeframe)
-        bar_start = self._floor_to_timeframe(ts, timeframe)
-        
-        # Get or create current bar
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        seconds = TIMEFRAME_MINUTES.get(timeframe, 1) * 60
+        local_epoch = ts.timestamp() + ts.utcoffset().total_seconds()
+        self._update_bar((symbol, timeframe), int(local_epoch // seconds), seconds, price, ts.tzinfo)
+    
+    def _update_bar(
+        self,
+        key: tuple[str, str],
+        bucket: int,
+        seconds: int,
+        price: float,
+        tz: Any,
+    ) -> None:
+        """Update or create the open bar for key, closing it on a bucket change."""
         current = self.current_bars.get(key)
         
-        if current is None or current.get("ts") != bar_start.isoformat():
-            # Close previous bar if exists
-            if current is not None:
-                self._close_bar(key, current)
-            
-            # Create new bar
-            current = {
-                "ts": bar_start.isoformat(),
-                "o": price,
-                "h": price,
-                "l": price,
-                "c": price,
-                "v": 0.0,
-            }
-            self.current_bars[key] = current
-        else:
+        if current is not None and self._open_buckets[key][0] == bucket:
             # Update current bar
-            current["h"] = max(current["h"], price)
-            current["l"] = min(current["l"], price)
+            if price > current["h"]:
+                current["h"] = price
+            elif price < current["l"]:
+                current["l"] = price
             current["c"] = price
+            return
+        
+        # Close previous bar if exists
+        if current is not None:
+            open_bucket, open_tz = self._open_buckets[key]
+            current["ts"] = self._bucket_to_iso(open_bucket, seconds, open_tz)
+            self._close_bar(key, current)
+            
+            targets = self._rollup_keys.get(key)
+            if targets:
+                self._roll_up(targets, current, open_bucket * seconds, seconds, open_tz)
+        
+        # Create new bar
+        self.current_bars[key] = {
+            "ts": None,
+            "o": price,
+            "h": price,
+            "l": price,
+            "c": price,
+            "v": 0.0,
+        }
+        self._open_buckets[key] = (bucket, tz)
+    
+    def _roll_up(
+        self,
+        targets: List[tuple[tuple[str, str], int]],
+        base_bar: dict,
+        base_start: int,
+        base_seconds: int,
+        tz: Any,
+    ) -> None:
+        """
+        Fold a closed base bar into its higher-timeframe bars.
+        
+        A higher-timeframe bar closes as soon as the base bar that ends its
+        period closes, so it fires at the same moment tick-built bars would.
+        If that last base bar never prints, the bar closes when the next
+        period's first base bar arrives.
+        """
+        base_end = base_start + base_seconds
+        for key, seconds in targets:
+            bucket = base_start // seconds
+            current = self.current_bars.get(key)
+            
+            if current is not None and self._open_buckets[key][0] == bucket:
+                if base_bar["h"] > current["h"]:
+                    current["h"] = base_bar["h"]
+                if base_bar["l"] < current["l"]:
+                    current["l"] = base_bar["l"]
+                current["c"] = base_bar["c"]
+                current["v"] += base_bar["v"]
+            else:
+                if current is not None:
+                    open_bucket, open_tz = self._open_buckets[key]
+                    current["ts"] = self._bucket_to_iso(open_bucket, seconds, open_tz)
+                    self._close_bar(key, current)
+                current = {
+                    "ts": None,
+                    "o": base_bar["o"],
+                    "h": base_bar["h"],
+                    "l": base_bar["l"],
+                    "c": base_bar["c"],
+                    "v": base_bar["v"],
+                }
+                self.current_bars[key] = current
+                self._open_buckets[key] = (bucket, tz)
+            
+            if base_end % seconds == 0:
+                # Base bar completed this period: close without waiting
+                current["ts"] = self._bucket_to_iso(bucket, seconds, tz)
+                del self.current_bars[key]
+                del self._open_buckets[key]
+                self._close_bar(key, current)
+    
+    @staticmethod
+    def _bucket_to_iso(bucket: int, seconds: int, tz: Any) -> str:
+        """Convert a local-time epoch bucket back to the bar's ISO start timestamp."""
+        local_start = datetime(1970, 1, 1) + timedelta(seconds=bucket * seconds)
+        if hasattr(tz, "localize"):
+            # pytz zones must attach via localize() to pick the right offset
+            return tz.localize(local_start).isoformat()
+        return local_start.replace(tzinfo=tz).isoformat()
     
     def _close_bar(self, key: tuple[str, str], bar: dict) -> None:
         """Close and store a completed bar."""
@@ -335,11 +541,12 @@ class MarketDataEngineV2:
             List of dicts with keys: ts, o, h, l, c, v (newest last)
         """
         key = (symbol.upper(), timeframe)
-        history = self.candles.get(key, deque())
+        history = self.candles.get(key)
+        if not history:
+            return []
         
         # Return last N candles
-        candles_list = list(history)
-        return candles_list[-limit:] if limit < len(candles_list) else candles_list
+        return history.tail(limit)
     
     def get_candles(self, symbol: str, timeframe: str, window: int) -> List[dict]:
         """
@@ -414,8 +621,8 @@ class MarketDataEngineV2:
                     is_stale = True
                 
                 # Get number of bars
-                history = self.candles.get(key, deque())
-                num_bars = len(history)
+                history = self.candles.get(key)
+                num_bars = len(history) if history is not None else 0
                 
                 health.append({
                     "symbol": symbol,
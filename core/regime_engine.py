@@ -21,6 +21,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from core import indicators
+from core.indicator_cache import IndicatorCache, bar_key, get_indicator_cache
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +87,9 @@ class RegimeEngine:
         self._cache: Dict[str, tuple[RegimeSnapshot, float]] = {}
         self._cache_ttl = 1.0  # 1 second cache TTL
         
+        # Per-bar indicator cache shared with the strategy engines
+        self.indicator_cache: IndicatorCache = get_indicator_cache()
+        
         if not self.enabled:
             self.logger.info("RegimeEngine: DISABLED (enabled=false in config)")
             return
@@ -117,10 +121,23 @@ class RegimeEngine:
             symbol: Symbol to fetch data for
             
         Returns:
-            Dict with 'close', 'high', 'low', 'open' lists or None
+            Dict with 'close', 'high', 'low', 'open' lists (plus 'ts' when the
+            source has bar timestamps) or None
         """
         try:
-            # Try MDE v2 first if available
+            # Prefer MDE v2 zero-copy columnar views when available
+            if callable(getattr(type(self.mde), 'get_series', None)):
+                series = self.mde.get_series(symbol, self.bar_period, 100)
+                if series is not None and len(series['close']) > 0:
+                    return {
+                        'close': series['close'],
+                        'high': series['high'],
+                        'low': series['low'],
+                        'open': series['open'],
+                        'ts': series['ts'],
+                    }
+            
+            # Try MDE v2 candle list API
             if hasattr(self.mde, 'get_candles'):
                 candles = self.mde.get_candles(symbol, self.bar_period, limit=100)
                 if candles and len(candles) > 0:
@@ -129,6 +146,7 @@ class RegimeEngine:
                         'high': [c.high for c in candles],
                         'low': [c.low for c in candles],
                         'open': [c.open for c in candles],
+                        'ts': [getattr(c, 'ts', None) for c in candles],
                     }
             
             # Fall back to MDE v1 API
@@ -147,7 +165,14 @@ class RegimeEngine:
             self.logger.warning("RegimeEngine: Failed to fetch data for %s: %s", symbol, e)
             return None
     
-    def _compute_volatility(self, close: list[float], high: list[float], low: list[float]) -> tuple[str, float]:
+    def _compute_volatility(
+        self,
+        close: list[float],
+        high: list[float],
+        low: list[float],
+        symbol: Optional[str] = None,
+        key: Optional[Any] = None,
+    ) -> tuple[str, float]:
         """
         Compute volatility regime based on ATR%.
         
@@ -155,6 +180,8 @@ class RegimeEngine:
             close: Close prices
             high: High prices
             low: Low prices
+            symbol: Symbol for the shared indicator cache (uncached if omitted)
+            key: Last-bar key from core.indicator_cache.bar_key
             
         Returns:
             Tuple of (volatility_level, atr_value)
@@ -164,7 +191,10 @@ class RegimeEngine:
                 return "medium", 0.0
             
             # Calculate ATR
-            atr_val = indicators.atr(high, low, close, period=self.atr_period)
+            atr_val = self.indicator_cache.get(
+                symbol, self.bar_period, key, ("atr", self.atr_period, len(close)),
+                lambda: indicators.atr(high, low, close, period=self.atr_period),
+            )
             if atr_val <= 0 or close[-1] <= 0:
                 return "medium", 0.0
             
@@ -183,12 +213,19 @@ class RegimeEngine:
             self.logger.debug("RegimeEngine: Volatility computation error: %s", e)
             return "medium", 0.0
     
-    def _compute_trend(self, close: list[float]) -> tuple[str, float, float]:
+    def _compute_trend(
+        self,
+        close: list[float],
+        symbol: Optional[str] = None,
+        key: Optional[Any] = None,
+    ) -> tuple[str, float, float]:
         """
         Compute trend regime based on EMA slope.
         
         Args:
             close: Close prices
+            symbol: Symbol for the shared indicator cache (uncached if omitted)
+            key: Last-bar key from core.indicator_cache.bar_key
             
         Returns:
             Tuple of (trend_direction, velocity, slope)
@@ -198,8 +235,12 @@ class RegimeEngine:
                 return "flat", 0.0, 0.0
             
             # Calculate EMA for trend following
-            ema_values = indicators.ema(close, period=self.slope_period, return_series=True)
-            if not ema_values or len(ema_values) < 2:
+            # Only the last two EMA values are used, so only those are cached
+            ema_values = self.indicator_cache.get(
+                symbol, self.bar_period, key, ("ema_tail", self.slope_period, len(close)),
+                lambda: indicators.ema(close, period=self.slope_period, return_series=True)[-2:],
+            )
+            if ema_values is None or len(ema_values) < 2:
                 return "flat", 0.0, 0.0
             
             # Calculate slope (rate of change) of EMA
@@ -208,11 +249,12 @@ class RegimeEngine:
             slope_val = current_ema - prev_ema
             
             # Calculate velocity (normalized slope relative to price)
-            velocity = (slope_val / close[-1]) * 100.0 if close[-1] > 0 else 0.0
+            last_close = float(close[-1])
+            velocity = (slope_val / last_close) * 100.0 if last_close > 0 else 0.0
             
             # Determine trend direction
             # Also check if price is above/below EMA for confirmation
-            price_vs_ema = close[-1] - current_ema
+            price_vs_ema = last_close - current_ema
             
             if slope_val > 0 and price_vs_ema > 0:
                 return "up", velocity, slope_val
@@ -329,8 +371,11 @@ class RegimeEngine:
                 )
             
             # Compute regime components
-            volatility, atr_val = self._compute_volatility(data['close'], data['high'], data['low'])
-            trend, velocity, slope_val = self._compute_trend(data['close'])
+            key = bar_key(data)
+            volatility, atr_val = self._compute_volatility(
+                data['close'], data['high'], data['low'], symbol=symbol, key=key
+            )
+            trend, velocity, slope_val = self._compute_trend(data['close'], symbol=symbol, key=key)
             structure = self._compute_structure(data['close'], data['high'], data['low'], atr_val)
             
             # Create snapshot
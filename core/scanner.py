@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from core.universe import load_equity_universe
+from data.instrument_snapshot import get_instrument_snapshot
 from data.universe.nifty_lists import get_equity_universe_from_indices
 
 logger = logging.getLogger(__name__)
@@ -142,6 +143,7 @@ class MarketScanner:
         self.artifacts_dir = artifacts_dir or ARTIFACTS_DIR
         self.scanner_root = self.artifacts_dir / "scanner"
         self.scanner_root.mkdir(parents=True, exist_ok=True)
+        self.instruments_root = self.artifacts_dir / "instruments"
 
     # ------------------------------------------------------------------ public
     def scan(self) -> Dict[str, Any]:
@@ -179,10 +181,8 @@ class MarketScanner:
 
     def _scan_fno_futures(self) -> tuple[List[str], Dict[str, Dict[str, Any]]]:
         """Scan NFO for index futures."""
-        try:
-            instruments = self.kite.instruments("NFO")
-        except Exception as exc:  # noqa: BLE001
-            logger.error("MarketScanner: unable to fetch NFO instruments from Kite: %s", exc)
+        snapshot = self._instrument_snapshot("NFO")
+        if snapshot is None:
             return [], {}
 
         targets = ("NIFTY", "BANKNIFTY")
@@ -190,7 +190,7 @@ class MarketScanner:
         meta: Dict[str, Dict[str, Any]] = {}
 
         for target in targets:
-            inst = self._select_nearest_future(instruments, target)
+            inst = self._select_nearest_future(snapshot.futures(target), target)
             if not inst:
                 logger.warning("MarketScanner: no future found for %s", target)
                 continue
@@ -233,26 +233,15 @@ class MarketScanner:
         
         logger.info("MarketScanner: scanning %d enabled equity symbols", len(enabled_symbols))
         
-        # Fetch NSE instruments
-        try:
-            instruments = self.kite.instruments("NSE")
-        except Exception as exc:  # noqa: BLE001
-            logger.error("MarketScanner: unable to fetch NSE instruments from Kite: %s", exc)
+        snapshot = self._instrument_snapshot("NSE")
+        if snapshot is None:
             return [], {}
 
-        # Build lookup by tradingsymbol
-        nse_instruments_map = {}
-        for inst in instruments:
-            symbol = inst.get("tradingsymbol")
-            if symbol:
-                nse_instruments_map[symbol.upper()] = inst
-
         selected: List[str] = []
         meta: Dict[str, Dict[str, Any]] = {}
 
         for symbol in enabled_symbols:
-            symbol_upper = symbol.upper()
-            inst = nse_instruments_map.get(symbol_upper)
+            inst = snapshot.instrument("NSE", symbol.upper())
             
             if not inst:
                 logger.warning("MarketScanner: NSE instrument not found for symbol=%s", symbol)
@@ -278,6 +267,18 @@ class MarketScanner:
         logger.info("MarketScanner: validated %d/%d equity symbols", len(selected), len(enabled_symbols))
         return selected, meta
 
+    def _instrument_snapshot(self, exchange: str):
+        """Today's shared instrument snapshot, or None if ``exchange`` could not be loaded."""
+        try:
+            snapshot = get_instrument_snapshot(self.kite, snapshot_dir=self.instruments_root)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("MarketScanner: unable to load instrument snapshot: %s", exc)
+            return None
+        if not snapshot.covers([exchange]):
+            logger.error("MarketScanner: unable to fetch %s instruments from Kite", exchange)
+            return None
+        return snapshot
+
     def _is_valid_equity_instrument(self, inst: Dict[str, Any], symbol: str) -> bool:
         """
         Validate equity instrument meets criteria:
@@ -323,7 +323,7 @@ class JournalStateStore:
             return None
         path = self.latest_journal_path_for_today()
         file_exists = path.exists()
-        desired_fields = list(dict.fromkeys(JOURNAL_FIELD_ORDER + tuple(rows[0].keys())))
+        desired_fields = list(dict.fromkeys(JOURNAL_FIELD_ORDER + list(rows[0].keys())))
 
         fieldnames: List[str]
         write_header = not file_exists
@@ -14,12 +14,15 @@ import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from analytics.telemetry_bus import publish_engine_health, publish_decision_trace, publish_signal_event, publish_indicator_event
 from core import indicators
+from core.indicator_cache import IndicatorCache, bar_key, config_key, get_indicator_cache
+from core.indicator_stream import StreamingIndicatorEngine
 from core.market_data_engine import MarketDataEngine
 from core.risk_engine import RiskAction, RiskConfig, RiskDecision, TradeContext
+from core.strategy_latency import StrategyLatencyTracker
 from strategies.base import Decision
 
 logger = logging.getLogger(__name__)
@@ -418,6 +421,18 @@ class StrategyEngineV2:
         # to log warmup only once per combination
         self._indicator_warmup_logged: set = set()
         
+        # Optional incremental indicators keyed by (symbol, timeframe)
+        self.streaming_indicators: Optional[StreamingIndicatorEngine] = None
+        if self.config.get("streaming_indicators", False):
+            self.streaming_indicators = StreamingIndicatorEngine(include_supertrend=True)
+        
+        # Per-bar indicator cache shared with V3, RegimeEngine and the HTF filter
+        self.indicator_cache: IndicatorCache = get_indicator_cache()
+        
+        # Strategy call timings and the optional per-call budget:
+        # {"budget_ms", "skip_over_budget", "skip_evaluations", "warn_interval_sec"}
+        self.latency = StrategyLatencyTracker.from_config(self.config.get("latency"))
+        
         self.logger.info("StrategyEngineV2 initialized with %d strategies", len(self.enabled_strategies))
         if self.regime_engine:
             self.logger.info("StrategyEngineV2: RegimeEngine enabled")
@@ -641,12 +656,28 @@ class StrategyEngineV2:
         
         strategy = self.strategies[strategy_id]
         
+        if self.latency.should_skip(strategy_id, symbol):
+            # Primary strategy overran its latency budget recently
+            intent = OrderIntent(
+                signal="HOLD",
+                side="FLAT",
+                logical=logical,
+                symbol=symbol,
+                timeframe=timeframe,
+                strategy_id=strategy_id,
+                confidence=0.0,
+                reason="latency_budget_skip",
+            )
+            return intent, debug_payload
+        
+        start = self.latency.clock()
         try:
             # Build series dict (empty for now - strategies should use indicators)
             series = {}
             
             # Call strategy's generate_signal method with context
-            decision = strategy.generate_signal(candle, series, indicators, context)
+            with self.latency.measure(strategy_id, symbol):
+                decision = strategy.generate_signal(candle, series, indicators, context)
             
             # Convert Decision to OrderIntent
             if decision and decision.action and decision.action != "HOLD":
@@ -730,6 +761,9 @@ class StrategyEngineV2:
             debug_payload["error"] = str(exc)
             
             return intent, debug_payload
+        
+        finally:
+            self.latency.record_call("evaluate", symbol, self.latency.clock() - start)
     
     def register_strategy(self, strategy_code: str, strategy: BaseStrategy):
         """Register a strategy instance."""
@@ -884,6 +918,40 @@ class StrategyEngineV2:
         Returns:
             Dict of computed indicators
         """
+        close = series.get("close", [])
+        if len(close) < 20:
+            return {}
+        
+        # Served from the shared cache when this window's last bar was already computed
+        streaming = self._streams_indicators(series, symbol)
+        return self.indicator_cache.bundle(
+            symbol,
+            timeframe,
+            bar_key(series),
+            ("strategy_v2", len(close), "stream" if streaming else "batch", config_key(config)),
+            len(close),
+            lambda: self._compute_indicators(series, config, symbol, timeframe),
+            publish_components=not streaming,
+        )
+    
+    def _streams_indicators(self, series: Dict[str, List[float]], symbol: Optional[str]) -> bool:
+        """Whether _compute_indicators() takes the streaming path for this series."""
+        # Below 50 bars the batch path's warmup handling applies
+        return (
+            self.streaming_indicators is not None
+            and bool(symbol)
+            and "ts" in series
+            and len(series.get("close", [])) >= 50
+        )
+    
+    def _compute_indicators(
+        self,
+        series: Dict[str, List[float]],
+        config: Optional[Dict[str, Any]],
+        symbol: Optional[str],
+        timeframe: Optional[str],
+    ) -> Dict[str, Any]:
+        """Compute the compute_indicators() bundle without consulting the cache."""
         from core.indicators import IndicatorWarmupError
         
         close = series.get("close", [])
@@ -891,8 +959,12 @@ class StrategyEngineV2:
         low = series.get("low", [])
         volume = series.get("volume", [])
         
-        if not close or len(close) < 20:
-            return {}
+        # Streaming path: only bars new since the last call are processed
+        if self._streams_indicators(series, symbol):
+            try:
+                return self.streaming_indicators.compute_bundle(series, config, symbol=symbol, timeframe=timeframe)
+            except Exception as e:
+                self.logger.warning("Streaming indicator error for %s (%s), using batch: %s", symbol, timeframe, e)
         
         ind = {}
         
@@ -932,7 +1004,7 @@ class StrategyEngineV2:
                 ind["supertrend_direction"] = st["direction"]
             
             # VWAP
-            if volume and len(volume) == len(close):
+            if len(volume) and len(volume) == len(close):
                 ind["vwap"] = indicators.vwap(close, volume)
             
             # Slope
@@ -940,7 +1012,7 @@ class StrategyEngineV2:
                 ind["slope10"] = indicators.slope(close, 10)
             
             # HL2/HL3
-            if high and low:
+            if len(high) and len(low):
                 ind["hl2"] = indicators.hl2(high, low)
                 ind["hl3"] = indicators.hl3(high, low, close)
             
@@ -993,6 +1065,8 @@ class StrategyEngineV2:
             
             close_15m = None
             close_1h = None
+            ts_15m = None
+            ts_1h = None
             
             # Fetch 15m candle data
             if "15m" in self.htf_timeframes:
@@ -1000,6 +1074,7 @@ class StrategyEngineV2:
                     window_15m = self.market_data.get_window(symbol, "15m", 100)
                     if window_15m and len(window_15m) >= 50:
                         close_15m = [c.get("close", 0.0) for c in window_15m]
+                        ts_15m = [c.get("ts") for c in window_15m]
                 except Exception as e:
                     self.logger.debug("Failed to get 15m data for %s: %s", symbol, e)
             
@@ -1009,6 +1084,7 @@ class StrategyEngineV2:
                     window_1h = self.market_data.get_window(symbol, "1h", 100)
                     if window_1h and len(window_1h) >= 50:
                         close_1h = [c.get("close", 0.0) for c in window_1h]
+                        ts_1h = [c.get("ts") for c in window_1h]
                 except Exception as e:
                     self.logger.debug("Failed to get 1h data for %s: %s", symbol, e)
             
@@ -1023,6 +1099,8 @@ class StrategyEngineV2:
                 close_1h=close_1h,
                 ema_fast_period=self.htf_ema_fast_period,
                 ema_slow_period=self.htf_ema_slow_period,
+                ts_15m=ts_15m,
+                ts_1h=ts_1h,
             )
             
             return htf_result.to_dict()
@@ -1064,8 +1142,13 @@ class StrategyEngineV2:
                 )
                 return []
         
+        if self.latency.should_skip(strategy_code, symbol):
+            self.logger.debug("[strategy-skip] %s: over latency budget for %s", strategy_code, symbol)
+            return []
+        
         strategy = self.strategies[strategy_code]
         
+        start = self.latency.clock()
         try:
             # Fetch windowed series from market data engine
             window = self.market_data.get_window(symbol, timeframe, self.window_size)
@@ -1081,6 +1164,7 @@ class StrategyEngineV2:
                 "low": [c["low"] for c in window],
                 "close": [c["close"] for c in window],
                 "volume": [c.get("volume", 0) for c in window],
+                "ts": [c.get("ts") for c in window],
             }
             
             # Get current candle
@@ -1112,7 +1196,7 @@ class StrategyEngineV2:
                     self.logger.debug("Failed to get regime snapshot for %s: %s", symbol, e)
             
             # Build context dict for strategy
-            context = {}
+            context = {"symbol": symbol}
             
             # Compute and add HTF trend to context if enabled
             if self.htf_filter_enabled:
@@ -1121,7 +1205,8 @@ class StrategyEngineV2:
                     context["htf_trend"] = htf_trend
             
             # Generate signal
-            decision = strategy.generate_signal(current_candle, series, ind, context)
+            with self.latency.measure(strategy_code, symbol):
+                decision = strategy.generate_signal(current_candle, series, ind, context)
             
             # Publish decision trace to telemetry
             if self._enable_telemetry and decision:
@@ -1179,6 +1264,9 @@ class StrategyEngineV2:
         except Exception as e:
             self.logger.exception("Strategy %s failed for %s: %s", strategy_code, symbol, e)
             return []
+        
+        finally:
+            self.latency.record_call("run_strategy", symbol, self.latency.clock() - start)
     
     def _get_market_regime(self) -> Dict[str, Any]:
         """
@@ -1600,42 +1688,44 @@ class StrategyEngineV2:
             candle.get("close", 0.0),
         )
         
+        # Series and indicators are shared by every strategy on this timeframe
+        series = None
+        indicators = None
+        
         # Run all registered strategies for this symbol/timeframe
         for strategy_code, strategy in self.strategies.items():
             # Check if strategy is interested in this timeframe
             strategy_tf = getattr(strategy, "timeframe", self.config.get("timeframe", "5m"))
             if strategy_tf != timeframe:
                 continue
+            
+            if self.latency.should_skip(strategy_code, symbol):
+                continue
                 
             try:
-                # Fetch candle window from MDE v2
-                candles = self.market_data_v2.get_candles(symbol, timeframe, self.window_size)
+                if series is None:
+                    # Fetch candle window from MDE v2
+                    series = self._load_series_v2(symbol, timeframe)
                 
-                if not candles or len(candles) < 20:
+                num_bars = len(series["close"]) if series else 0
+                if num_bars < 20:
                     # During warmup, MDE v2 may not have enough candles yet
                     # Skip signal generation until sufficient data is available
                     self.logger.debug(
                         "Warmup: insufficient candles for %s/%s (have %d, need >= 20). Skipping signal generation.",
                         symbol,
                         timeframe,
-                        len(candles) if candles else 0,
+                        num_bars,
                     )
                     continue
-                    
-                # Build series dict
-                series = {
-                    "open": [c["open"] for c in candles],
-                    "high": [c["high"] for c in candles],
-                    "low": [c["low"] for c in candles],
-                    "close": [c["close"] for c in candles],
-                    "volume": [c.get("volume", 0) for c in candles],
-                }
                 
-                # Compute indicators
-                indicators = self.compute_indicators(series, symbol=symbol, timeframe=timeframe)
+                if indicators is None:
+                    # Compute indicators
+                    indicators = self.compute_indicators(series, symbol=symbol, timeframe=timeframe)
                 
                 # Run strategy
-                decision = strategy.generate_signal(candle, series, indicators)
+                with self.latency.measure(strategy_code, symbol):
+                    decision = strategy.generate_signal(candle, series, indicators)
                 
                 # Process decision
                 if decision and decision.action in ["BUY", "SELL", "EXIT"]:
@@ -1664,6 +1754,42 @@ class StrategyEngineV2:
                     exc,
                 )
     
+    def _load_series_v2(self, symbol: str, timeframe: str) -> Optional[Mapping[str, Any]]:
+        """
+        Fetch the OHLCV series for symbol/timeframe from MDE v2.
+        
+        Uses the zero-copy columnar get_series() view when the engine provides
+        it, falling back to building lists from get_candles().
+        """
+        if callable(getattr(type(self.market_data_v2), "get_series", None)):
+            return self.market_data_v2.get_series(symbol, timeframe, self.window_size)
+        
+        candles = self.market_data_v2.get_candles(symbol, timeframe, self.window_size)
+        if not candles:
+            return None
+        return {
+            "open": [c["open"] for c in candles],
+            "high": [c["high"] for c in candles],
+            "low": [c["low"] for c in candles],
+            "close": [c["close"] for c in candles],
+            "volume": [c.get("volume", 0) for c in candles],
+        }
+    
+    def export_warm_state(self) -> Dict[str, Any]:
+        """Streaming indicator state for a warm-start snapshot (core.warm_start)."""
+        return {
+            "streaming_indicators": (
+                self.streaming_indicators.export_state() if self.streaming_indicators is not None else None
+            ),
+        }
+    
+    def import_warm_state(self, state: Dict[str, Any], saved_at: float) -> Dict[str, int]:
+        """Restore export_warm_state() output; returns restored counts."""
+        restored = {"indicator_streams": 0}
+        if self.streaming_indicators is not None and state.get("streaming_indicators"):
+            restored["indicator_streams"] = self.streaming_indicators.import_state(state["streaming_indicators"])
+        return restored
+    
     def _start_telemetry_thread(self) -> None:
         """Start background thread for publishing strategy health."""
         self._telemetry_stop.clear()
@@ -1715,6 +1841,10 @@ class StrategyEngineV2:
                 "avg_confidence": avg_confidence,
             }
             
+            # Latency histograms (per strategy, slowest symbols, engine calls)
+            latency = self.latency.snapshot()
+            metrics["latency"] = latency
+            
             # Add per-strategy metrics
             strategy_metrics = {}
             for strategy_code, state in self.strategy_states.items():
@@ -1734,6 +1864,7 @@ class StrategyEngineV2:
                     "last_signal": getattr(state, "last_signal", "HOLD"),
                     "last_signal_ts": getattr(state, "last_signal_ts", None).isoformat() if getattr(state, "last_signal_ts", None) else None,
                     "regime": getattr(state, "regime", None),
+                    "latency": latency["strategies"].get(strategy_code),
                 }
             
             metrics["strategies"] = strategy_metrics
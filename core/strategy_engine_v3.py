@@ -10,17 +10,25 @@ Features:
 - Signal fusion with confidence scoring
 - Setup classification (trend follow, pullback, breakout)
 - EventBus integration for signal logging
+- Optional process-pool evaluation of many symbols (evaluate_many)
+- Per-strategy latency histograms with an optional per-call budget
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from analytics.telemetry_bus import publish_engine_health
 from core import indicators
+from core.indicator_cache import IndicatorCache, bar_key, get_indicator_cache
+from core.indicator_stream import StreamingIndicatorEngine
 from core.strategy_engine_v2 import OrderIntent
 from core.strategies_v3 import StrategyV3Base
+from core.strategy_latency import StrategyLatencyTracker
+from core.strategy_pool_v3 import EvaluationRequest, StrategyPoolError, StrategyWorkerPool
 
 # Import strategy implementations
 from core.strategies_v3.ema20_50 import EMA2050Strategy
@@ -74,6 +82,29 @@ class StrategyEngineV3:
         # Load playbook definitions
         self.playbooks = cfg.get("playbooks", {})
         
+        # Optional incremental indicators keyed by (symbol, timeframe)
+        self.streaming_indicators: Optional[StreamingIndicatorEngine] = None
+        if cfg.get("streaming_indicators", False):
+            self.streaming_indicators = StreamingIndicatorEngine()
+        
+        # Per-bar indicator cache shared with V2, RegimeEngine and the HTF filter
+        self.indicator_cache: IndicatorCache = get_indicator_cache()
+        
+        # Optional worker pool for evaluate_many(): {"enabled", "workers",
+        # "fallback_inline", "start_method"}
+        parallel_cfg = cfg.get("parallel") or {}
+        self.parallel_enabled = bool(parallel_cfg.get("enabled", False))
+        self.parallel_workers = parallel_cfg.get("workers")
+        self.parallel_fallback_inline = bool(parallel_cfg.get("fallback_inline", True))
+        self.parallel_start_method = parallel_cfg.get("start_method")
+        self._pool: Optional[StrategyWorkerPool] = None
+        self._pool_failed = False
+        
+        # Strategy call timings and the optional per-call budget:
+        # {"budget_ms", "skip_over_budget", "skip_evaluations", "warn_interval_sec"}
+        self.latency = StrategyLatencyTracker.from_config(cfg.get("latency"))
+        self._last_health_publish: Optional[float] = None
+        
         # Load strategy registry
         self.strategies: List[StrategyV3Base] = []
         strategy_configs = cfg.get("strategies", [])
@@ -134,13 +165,22 @@ class StrategyEngineV3:
         Returns:
             Final fused OrderIntent (may be HOLD with reason)
         """
+        start = self.latency.clock()
+        try:
+            return self._evaluate(symbol, ts, price, md)
+        finally:
+            self.latency.record_call("evaluate", symbol, self.latency.clock() - start)
+    
+    def _evaluate(self, symbol: str, ts: str, price: float, md: Dict[str, Any]) -> OrderIntent:
         # Compute indicator bundle for primary timeframe
         primary_series = md.get("primary_series", {})
-        primary_bundle = self._compute_bundle(primary_series)
+        primary_bundle = self._compute_bundle(primary_series, symbol, self.primary_tf)
         
         # Compute indicator bundle for secondary timeframe (if available)
         secondary_series = md.get("secondary_series", {})
-        secondary_bundle = self._compute_bundle(secondary_series) if secondary_series else {}
+        secondary_bundle = (
+            self._compute_bundle(secondary_series, symbol, self.secondary_tf) if secondary_series else {}
+        )
         
         # Add HTF indicators to primary bundle with "htf_" prefix
         for key, value in secondary_bundle.items():
@@ -150,8 +190,12 @@ class StrategyEngineV3:
         candidates: List[OrderIntent] = []
         
         for strategy in self.strategies:
+            if self.latency.should_skip(strategy.id, symbol):
+                logger.debug("Strategy %s skipped for %s (over latency budget)", strategy.id, symbol)
+                continue
             try:
-                intent = strategy.generate(symbol, ts, price, md, primary_bundle)
+                with self.latency.measure(strategy.id, symbol):
+                    intent = strategy.generate(symbol, ts, price, md, primary_bundle)
                 if intent is not None:
                     candidates.append(intent)
                     logger.debug(
@@ -211,17 +255,178 @@ class StrategyEngineV3:
         
         return final_intent
     
-    def _compute_bundle(self, series: Dict[str, List[float]]) -> Dict[str, Any]:
+    def evaluate_many(self, requests: Sequence[EvaluationRequest]) -> List[Optional[OrderIntent]]:
+        """
+        Evaluate several symbols, in parallel when the worker pool is enabled.
+        
+        Args:
+            requests: (symbol, ts, price, md) tuples, as for evaluate()
+        
+        Returns:
+            One OrderIntent per request, in request order; None where the
+            evaluation raised (the error is logged).
+        """
+        if self.parallel_enabled and not self._pool_failed and requests:
+            try:
+                results = self._worker_pool().evaluate_many(requests)
+            except StrategyPoolError as exc:
+                self._pool_unavailable(exc)
+            else:
+                intents: List[Optional[OrderIntent]] = []
+                for (symbol, _, _, _), (intent, events, error, timings) in zip(requests, results):
+                    self.latency.merge(timings)
+                    if self.bus:
+                        for topic, payload in events:
+                            try:
+                                self.bus.publish(topic, payload)
+                            except Exception as e:
+                                logger.debug("Failed to publish %s: %s", topic, e)
+                    if error:
+                        logger.error("StrategyEngineV3 evaluation failed for %s: %s", symbol, error)
+                    intents.append(intent)
+                return intents
+        
+        intents = []
+        for symbol, ts, price, md in requests:
+            try:
+                intents.append(self.evaluate(symbol, ts, price, md))
+            except Exception as e:
+                logger.error("StrategyEngineV3 evaluation failed for %s: %s", symbol, e, exc_info=True)
+                intents.append(None)
+        return intents
+    
+    def export_warm_state(self) -> Dict[str, Any]:
+        """
+        Streaming indicator state for a warm-start snapshot (core.warm_start).
+        
+        While the worker pool runs, the streams live in the workers, so
+        theirs are collected and merged.
+        """
+        if self._pool is not None and self._pool.started:
+            try:
+                parts = self._pool.export_warm_state()
+            except StrategyPoolError as exc:
+                self._pool_unavailable(exc)
+            else:
+                merged: Optional[Dict[str, Any]] = None
+                for part in parts:
+                    streams_state = (part or {}).get("streaming_indicators")
+                    if not streams_state:
+                        continue
+                    if merged is None:
+                        merged = {**streams_state, "streams": dict(streams_state.get("streams") or {})}
+                    else:
+                        merged["streams"].update(streams_state.get("streams") or {})
+                return {"streaming_indicators": merged}
+        return {
+            "streaming_indicators": (
+                self.streaming_indicators.export_state() if self.streaming_indicators is not None else None
+            ),
+        }
+    
+    def import_warm_state(self, state: Dict[str, Any], saved_at: float) -> Dict[str, int]:
+        """
+        Restore export_warm_state() output; returns restored counts.
+        
+        With the worker pool enabled it is started here and each symbol's
+        streams go to the worker that will evaluate that symbol.
+        """
+        restored = {"indicator_streams": 0}
+        streams_state = state.get("streaming_indicators")
+        if not streams_state:
+            return restored
+        if self.parallel_enabled and not self._pool_failed:
+            try:
+                pool = self._worker_pool()
+                shards = [{**streams_state, "streams": {}} for _ in range(pool.workers)]
+                for key, stream in (streams_state.get("streams") or {}).items():
+                    shards[pool.worker_for(key[0])]["streams"][key] = stream
+                results = pool.import_warm_state([{"streaming_indicators": s} for s in shards], saved_at)
+            except StrategyPoolError as exc:
+                self._pool_unavailable(exc)
+            else:
+                restored["indicator_streams"] = sum(r["indicator_streams"] for r in results)
+                return restored
+        if self.streaming_indicators is not None:
+            restored["indicator_streams"] = self.streaming_indicators.import_state(streams_state)
+        return restored
+    
+    def publish_health(self, min_interval_sec: float = 5.0) -> bool:
+        """
+        Publish strategy latency histograms as an engine_health event.
+        
+        Rate-limited to one event per min_interval_sec; returns True when
+        an event was published.
+        """
+        now = time.monotonic()
+        if self._last_health_publish is not None and now - self._last_health_publish < min_interval_sec:
+            return False
+        self._last_health_publish = now
+        try:
+            publish_engine_health(
+                engine_name="StrategyEngineV3",
+                status="active",
+                metrics={"total_strategies": len(self.strategies), "latency": self.latency.snapshot()},
+            )
+        except Exception as e:
+            logger.debug("Failed to publish strategy health: %s", e)
+            return False
+        return True
+    
+    def close(self) -> None:
+        """Stop the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
+    def _worker_pool(self) -> StrategyWorkerPool:
+        if self._pool is None:
+            self._pool = StrategyWorkerPool(self.cfg, self.parallel_workers, self.parallel_start_method)
+        return self._pool
+    
+    def _pool_unavailable(self, exc: StrategyPoolError) -> None:
+        """Stop using the worker pool; re-raises unless fallback_inline is set."""
+        self.close()
+        self._pool_failed = True
+        if not self.parallel_fallback_inline:
+            raise exc
+        logger.warning("Strategy worker pool unavailable, evaluating in-process: %s", exc)
+    
+    def _compute_bundle(
+        self,
+        series: Dict[str, List[float]],
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Compute unified indicator bundle.
         
         Args:
-            series: Price series dictionary (open, high, low, close, volume)
+            series: Price series dictionary (open, high, low, close, volume,
+                optionally ts for streaming indicators)
+            symbol: Symbol the series belongs to
+            timeframe: Timeframe of the series
         
         Returns:
             Dictionary of computed indicators
         """
-        return indicators.compute_bundle(series)
+        streaming = self.streaming_indicators is not None and bool(symbol)
+        
+        def compute() -> Dict[str, Any]:
+            if streaming:
+                return self.streaming_indicators.compute_bundle(series, symbol=symbol, timeframe=timeframe)
+            return indicators.compute_bundle(series)
+        
+        num_bars = len(series.get("close", []))
+        return self.indicator_cache.bundle(
+            symbol,
+            timeframe,
+            bar_key(series),
+            ("compute_bundle", num_bars, "stream" if streaming else "batch"),
+            num_bars,
+            compute,
+            publish_components=not streaming,
+        )
     
     def _apply_filters(
         self,
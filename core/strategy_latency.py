@@ -0,0 +1,302 @@
+"""
+Per-strategy latency histograms and evaluation budget enforcement.
+
+Strategy engines time every strategy call with the monotonic
+performance counter and record it here, per strategy and per
+(strategy, symbol):
+
+    latency = StrategyLatencyTracker.from_config({"budget_ms": 50, "skip_over_budget": True})
+
+    if not latency.should_skip("trend", symbol):
+        with latency.measure("trend", symbol):
+            intent = strategy.generate(...)
+
+    latency.snapshot()  # p50/p95/p99/max in ms, overruns, skips
+
+- Histograms are log-bucketed (eight buckets per doubling, about 9%
+  resolution from 1 us up), so memory per key is bounded no matter how
+  long the engine runs; percentiles are read from the bucket edges.
+- ``budget_ms`` is the time one strategy call may take within an
+  evaluation loop. An overrun is counted and logged (at most once per
+  ``warn_interval_sec`` per strategy); with ``skip_over_budget`` the
+  strategy is skipped for that symbol on the next ``skip_evaluations``
+  loops, so one slow strategy cannot keep stretching every loop.
+- ``record_call`` times engine-level calls (a whole evaluate() or
+  run_strategy()) without applying the budget.
+
+Worker processes set ``sink`` to a list to capture raw samples, which
+the parent folds into its own tracker with ``merge``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Smallest bucket edge (seconds) and buckets per doubling
+_MIN_SECONDS = 1e-6
+_STEPS_PER_OCTAVE = 8
+# Slowest symbols listed per strategy in snapshot()
+DEFAULT_SYMBOL_LIMIT = 10
+
+# (kind, name, symbol, seconds); kind is "strategy", "call" or "skip"
+LatencySample = Tuple[str, str, str, Optional[float]]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with exact count, total and max."""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucket(seconds: float) -> int:
+        if seconds <= _MIN_SECONDS:
+            return 0
+        return math.ceil(math.log2(seconds / _MIN_SECONDS) * _STEPS_PER_OCTAVE)
+
+    def add(self, seconds: float) -> None:
+        index = self.bucket(seconds)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket edge holding the q-th quantile (0 < q <= 1), in seconds."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_MIN_SECONDS * 2 ** (index / _STEPS_PER_OCTAVE), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count plus mean / p50 / p95 / p99 / max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1e3,
+            "p95_ms": self.percentile(0.95) * 1e3,
+            "p99_ms": self.percentile(0.99) * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class _StrategyStats:
+    __slots__ = ("overall", "symbols", "overruns", "skipped")
+
+    def __init__(self) -> None:
+        self.overall = LatencyHistogram()
+        self.symbols: Dict[str, LatencyHistogram] = {}
+        self.overruns = 0
+        self.skipped = 0
+
+    def add(self, symbol: str, seconds: float) -> None:
+        self.overall.add(seconds)
+        hist = self.symbols.get(symbol)
+        if hist is None:
+            hist = self.symbols[symbol] = LatencyHistogram()
+        hist.add(seconds)
+
+
+class StrategyLatencyTracker:
+    """
+    Latency histograms per strategy and per symbol, plus the call budget.
+
+    Attributes:
+        budget_ms: Time one strategy call may take per loop (None or 0
+            disables the budget)
+        skip_over_budget: Skip a strategy for a symbol after it overran
+        skip_evaluations: Loops to skip the (strategy, symbol) for
+        warn_interval_sec: Minimum seconds between overrun warnings per
+            strategy
+        sink: When a list, every sample is also appended to it
+    """
+
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(
+        self,
+        budget_ms: Optional[float] = None,
+        skip_over_budget: bool = False,
+        skip_evaluations: int = 10,
+        warn_interval_sec: float = 60.0,
+    ) -> None:
+        self.budget_ms = float(budget_ms) if budget_ms else None
+        self.skip_over_budget = bool(skip_over_budget)
+        self.skip_evaluations = max(1, int(skip_evaluations))
+        self.warn_interval_sec = float(warn_interval_sec)
+        self.sink: Optional[List[LatencySample]] = None
+        self._strategies: Dict[str, _StrategyStats] = {}
+        self._calls: Dict[str, _StrategyStats] = {}
+        self._cooldown: Dict[Tuple[str, str], int] = {}
+        self._last_warning: Dict[str, float] = {}
+        # Recorded on the engine loop, read by telemetry threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "StrategyLatencyTracker":
+        """Build from a ``latency`` config block."""
+        cfg = cfg or {}
+        return cls(
+            budget_ms=cfg.get("budget_ms"),
+            skip_over_budget=cfg.get("skip_over_budget", False),
+            skip_evaluations=cfg.get("skip_evaluations", 10),
+            warn_interval_sec=cfg.get("warn_interval_sec", 60.0),
+        )
+
+    @property
+    def budget_seconds(self) -> Optional[float]:
+        return self.budget_ms / 1e3 if self.budget_ms else None
+
+    def should_skip(self, strategy: str, symbol: str) -> bool:
+        """True while the strategy is serving an over-budget skip for this symbol."""
+        if not self._cooldown:
+            return False
+        key = (strategy, symbol)
+        with self._lock:
+            remaining = self._cooldown.get(key)
+            if not remaining:
+                return False
+            if remaining > 1:
+                self._cooldown[key] = remaining - 1
+            else:
+                del self._cooldown[key]
+            self._stats(self._strategies, strategy).skipped += 1
+        if self.sink is not None:
+            self.sink.append(("skip", strategy, symbol, None))
+        return True
+
+    def record(self, strategy: str, symbol: str, seconds: float) -> bool:
+        """Record one strategy call; returns True when it overran the budget."""
+        budget = self.budget_seconds
+        over = budget is not None and seconds > budget
+        warn = False
+        with self._lock:
+            stats = self._stats(self._strategies, strategy)
+            stats.add(symbol, seconds)
+            if over:
+                stats.overruns += 1
+                if self.skip_over_budget:
+                    self._cooldown[(strategy, symbol)] = self.skip_evaluations
+                now = time.monotonic()
+                last = self._last_warning.get(strategy)
+                if last is None or now - last >= self.warn_interval_sec:
+                    self._last_warning[strategy] = now
+                    warn = True
+        if self.sink is not None:
+            self.sink.append(("strategy", strategy, symbol, seconds))
+        if warn:
+            logger.warning(
+                "Strategy %s took %.1f ms for %s (budget %.1f ms, %d overruns)%s",
+                strategy,
+                seconds * 1e3,
+                symbol,
+                self.budget_ms,
+                stats.overruns,
+                f"; skipping it for {self.skip_evaluations} evaluations" if self.skip_over_budget else "",
+            )
+        return over
+
+    def record_call(self, name: str, symbol: str, seconds: float) -> None:
+        """Record an engine-level call (no budget applied)."""
+        with self._lock:
+            self._stats(self._calls, name).add(symbol, seconds)
+        if self.sink is not None:
+            self.sink.append(("call", name, symbol, seconds))
+
+    @contextmanager
+    def measure(self, strategy: str, symbol: str) -> Iterator[None]:
+        """Time the enclosed strategy call (recorded even if it raises)."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(strategy, symbol, self.clock() - start)
+
+    def merge(self, samples: List[LatencySample]) -> None:
+        """
+        Fold samples captured by another tracker's sink into this one.
+
+        Budget decisions were already taken where the samples were
+        recorded, so only the counters are updated here.
+        """
+        budget = self.budget_seconds
+        with self._lock:
+            for kind, name, symbol, seconds in samples:
+                if kind == "skip":
+                    self._stats(self._strategies, name).skipped += 1
+                elif kind == "call":
+                    self._stats(self._calls, name).add(symbol, seconds)
+                else:
+                    stats = self._stats(self._strategies, name)
+                    stats.add(symbol, seconds)
+                    if budget is not None and seconds > budget:
+                        stats.overruns += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._strategies.clear()
+            self._calls.clear()
+            self._cooldown.clear()
+
+    def snapshot(self, symbol_limit: int = DEFAULT_SYMBOL_LIMIT) -> Dict[str, Any]:
+        """
+        Histogram summaries for telemetry.
+
+        Each strategy (and engine call) lists its overall summary, overrun
+        and skip counts, and the ``symbol_limit`` symbols with the highest
+        p95 under "symbols".
+        """
+        with self._lock:
+            return {
+                "budget_ms": self.budget_ms,
+                "skip_over_budget": self.skip_over_budget,
+                "strategies": {
+                    name: self._summarize(stats, symbol_limit) for name, stats in self._strategies.items()
+                },
+                "calls": {name: self._summarize(stats, symbol_limit) for name, stats in self._calls.items()},
+            }
+
+    @staticmethod
+    def _stats(table: Dict[str, _StrategyStats], name: str) -> _StrategyStats:
+        stats = table.get(name)
+        if stats is None:
+            stats = table[name] = _StrategyStats()
+        return stats
+
+    @staticmethod
+    def _summarize(stats: _StrategyStats, symbol_limit: int) -> Dict[str, Any]:
+        symbols = sorted(
+            stats.symbols.items(),
+            key=lambda item: (item[1].percentile(0.95), item[1].max),
+            reverse=True,
+        )[:symbol_limit]
+        return {
+            **stats.overall.summary(),
+            "overruns": stats.overruns,
+            "skipped": stats.skipped,
+            "symbols": {symbol: hist.summary() for symbol, hist in symbols},
+        }
@@ -0,0 +1,306 @@
+"""
+Process-pool evaluation for StrategyEngineV3.
+
+Indicator bundles, strategy generation, filters and fusion are CPU-bound
+Python, so evaluating a universe symbol by symbol keeps one core busy.
+StrategyWorkerPool runs a fixed set of worker processes, each owning its
+own StrategyEngineV3 built from the same config:
+
+    pool = StrategyWorkerPool(cfg, workers=4)
+    results = pool.evaluate_many([(symbol, ts, price, md), ...])
+
+- Symbols are sticky: the first time a symbol is seen it is assigned to
+  the worker with the fewest symbols and stays there, so any per-symbol
+  state inside a worker's strategies and indicator cache stays coherent.
+- Series in md are packed into one float64 (fields x bars) array plus a
+  timestamp array before crossing the process boundary, rather than
+  pickling dicts of Python lists; workers unpack them back into lists so
+  the evaluation itself is identical to the in-process path.
+- Results come back in request order. Events the worker engine publishes
+  (signals.raw / signals.fused) are returned with each result so the
+  parent can replay them on its own bus in that same order, together with
+  the worker's strategy latency samples for the parent's histograms.
+- Warm-start state (streaming indicators) lives in the workers, so
+  export_warm_state() / import_warm_state() run on every worker; the
+  engine merges and splits the state by each symbol's worker.
+
+StrategyEngineV3.evaluate_many() is the usual entry point; it creates the
+pool from the ``parallel`` config block and falls back to in-process
+evaluation when the pool cannot be used.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SERIES_KEYS = ("primary_series", "secondary_series")
+SERIES_FIELDS = ("open", "high", "low", "close", "volume")
+
+# (symbol, ts, price, md)
+EvaluationRequest = Tuple[str, str, float, Dict[str, Any]]
+# (intent or None, published events, error message or None, latency samples)
+EvaluationResult = Tuple[Optional[Any], List[Tuple[str, Dict[str, Any]]], Optional[str], List[Tuple]]
+
+
+class StrategyPoolError(RuntimeError):
+    """The worker pool could not start or a worker stopped responding."""
+
+
+class PackedSeries:
+    """
+    OHLCV series as one (len(fields) x bars) float64 array plus timestamps.
+
+    ASCII string timestamps travel as a fixed-width bytes array (one byte
+    per character instead of NumPy's four for unicode); anything else as
+    an object array.
+    """
+    __slots__ = ("fields", "values", "ts", "extra")
+
+    def __init__(self, fields: Tuple[str, ...], values: np.ndarray, ts: Optional[np.ndarray], extra: Dict[str, Any]):
+        self.fields = fields
+        self.values = values
+        self.ts = ts
+        self.extra = extra
+
+    def __getstate__(self):
+        return (self.fields, self.values, self.ts, self.extra)
+
+    def __setstate__(self, state):
+        self.fields, self.values, self.ts, self.extra = state
+
+    def unpack(self) -> Dict[str, Any]:
+        series: Dict[str, Any] = dict(self.extra)
+        for name, row in zip(self.fields, self.values):
+            series[name] = row.tolist()
+        if self.ts is not None:
+            ts = self.ts.tolist()
+            series["ts"] = [t.decode("ascii") for t in ts] if self.ts.dtype.kind == "S" else ts
+        return series
+
+
+def pack_series(series: Any) -> Any:
+    """
+    Pack a series dict for transport; anything that does not fit the
+    (equal-length numeric columns) layout is returned unchanged.
+    """
+    if not isinstance(series, dict):
+        return series
+    fields = tuple(f for f in SERIES_FIELDS if f in series)
+    if not fields:
+        return series
+    try:
+        values = np.array([series[f] for f in fields], dtype=np.float64)
+    except (TypeError, ValueError):
+        return series
+    if values.ndim != 2:
+        return series
+    ts = series.get("ts")
+    if ts is not None:
+        if len(ts) != values.shape[1]:
+            return series
+        ts = _pack_timestamps(ts)
+    extra = {k: v for k, v in series.items() if k not in fields and k != "ts"}
+    return PackedSeries(fields, values, ts, extra)
+
+
+def _pack_timestamps(ts: Any) -> np.ndarray:
+    if all(type(t) is str for t in ts):
+        try:
+            return np.array([t.encode("ascii") for t in ts], dtype=bytes)
+        except UnicodeEncodeError:
+            pass
+    packed = np.empty(len(ts), dtype=object)
+    packed[:] = list(ts)
+    return packed
+
+
+def pack_market_data(md: Dict[str, Any]) -> Dict[str, Any]:
+    packed = dict(md)
+    for key in SERIES_KEYS:
+        if key in packed:
+            packed[key] = pack_series(packed[key])
+    return packed
+
+
+def unpack_market_data(md: Dict[str, Any]) -> Dict[str, Any]:
+    unpacked = dict(md)
+    for key in SERIES_KEYS:
+        value = unpacked.get(key)
+        if isinstance(value, PackedSeries):
+            unpacked[key] = value.unpack()
+    return unpacked
+
+
+class _RecordingBus:
+    """Collects publish() calls so the parent process can replay them."""
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+
+    def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        self.events.append((topic, payload))
+
+
+def _run_command(engine: Any, command: Tuple[Any, ...]) -> Tuple[Any, Optional[str]]:
+    """(result, error message or None) of one non-evaluation request."""
+    name, *args = command
+    try:
+        if name == "export_warm_state":
+            return engine.export_warm_state(), None
+        if name == "import_warm_state":
+            return engine.import_warm_state(*args), None
+        return None, f"unknown command {name!r}"
+    except Exception as exc:  # noqa: BLE001
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def _worker_main(conn: Any, cfg: Dict[str, Any]) -> None:
+    """Worker loop: build an engine once, then evaluate batches until told to stop."""
+    from core.strategy_engine_v3 import StrategyEngineV3
+
+    bus = _RecordingBus()
+    # A worker's engine evaluates in-process; it never starts a pool of its own
+    engine = StrategyEngineV3({**cfg, "parallel": {"enabled": False}}, bus=bus)
+    while True:
+        try:
+            batch = conn.recv()
+        except EOFError:
+            break
+        if batch is None:
+            break
+        if isinstance(batch, tuple):
+            conn.send(_run_command(engine, batch))
+            continue
+        results = []
+        for index, symbol, ts, price, md in batch:
+            bus.events = []
+            engine.latency.sink = []
+            try:
+                intent = engine.evaluate(symbol, ts, price, unpack_market_data(md))
+                results.append((index, intent, bus.events, None, engine.latency.sink))
+            except Exception as exc:  # noqa: BLE001
+                results.append((index, None, bus.events, f"{type(exc).__name__}: {exc}", engine.latency.sink))
+        conn.send(results)
+    conn.close()
+
+
+class StrategyWorkerPool:
+    """
+    Persistent worker processes evaluating StrategyEngineV3 for symbol shards.
+
+    Args:
+        cfg: strategy_engine_v3 config; each worker builds its engine from it
+        workers: Number of worker processes (default: CPU count)
+        start_method: multiprocessing start method (default: platform default)
+    """
+
+    def __init__(self, cfg: Dict[str, Any], workers: Optional[int] = None, start_method: Optional[str] = None):
+        self.cfg = cfg
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.start_method = start_method
+        self._conns: List[Any] = []
+        self._procs: List[Any] = []
+        self._assignment: Dict[str, int] = {}
+        self._load = [0] * self.workers
+
+    @property
+    def started(self) -> bool:
+        return bool(self._procs)
+
+    def start(self) -> None:
+        if self.started:
+            return
+        try:
+            ctx = multiprocessing.get_context(self.start_method)
+            for i in range(self.workers):
+                parent, child = ctx.Pipe()
+                proc = ctx.Process(
+                    target=_worker_main,
+                    args=(child, self.cfg),
+                    name=f"strategy-v3-worker-{i}",
+                    daemon=True,
+                )
+                proc.start()
+                child.close()
+                self._conns.append(parent)
+                self._procs.append(proc)
+        except Exception as exc:  # noqa: BLE001
+            self.close()
+            raise StrategyPoolError(f"failed to start strategy workers: {exc}") from exc
+        logger.info("Started %d StrategyEngineV3 worker processes", self.workers)
+
+    def worker_for(self, symbol: str) -> int:
+        """Sticky worker index for a symbol (least-loaded worker on first sight)."""
+        worker = self._assignment.get(symbol)
+        if worker is None:
+            worker = min(range(self.workers), key=lambda i: (self._load[i], i))
+            self._assignment[symbol] = worker
+            self._load[worker] += 1
+        return worker
+
+    def evaluate_many(self, requests: Sequence[EvaluationRequest]) -> List[EvaluationResult]:
+        """Evaluate requests across the workers; results are in request order."""
+        self.start()
+        shards: List[List[Tuple[int, str, str, float, Dict[str, Any]]]] = [[] for _ in range(self.workers)]
+        for index, (symbol, ts, price, md) in enumerate(requests):
+            shards[self.worker_for(symbol)].append((index, symbol, ts, price, pack_market_data(md)))
+
+        results: List[EvaluationResult] = [(None, [], "not evaluated", [])] * len(requests)
+        busy = [i for i, shard in enumerate(shards) if shard]
+        try:
+            for i in busy:
+                self._conns[i].send(shards[i])
+            for i in busy:
+                for index, intent, events, error, timings in self._conns[i].recv():
+                    results[index] = (intent, events, error, timings)
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            self.close()
+            raise StrategyPoolError(f"strategy worker stopped responding: {exc}") from exc
+        return results
+
+    def export_warm_state(self) -> List[Any]:
+        """Each worker's StrategyEngineV3.export_warm_state(), in worker order."""
+        return self._call_all([("export_warm_state",)] * self.workers)
+
+    def import_warm_state(self, states: Sequence[Any], saved_at: float) -> List[Any]:
+        """Hand worker ``i`` ``states[i]`` (StrategyEngineV3.import_warm_state); returns each result."""
+        return self._call_all([("import_warm_state", state, saved_at) for state in states])
+
+    def _call_all(self, commands: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """Run one command per worker and return the results in worker order."""
+        self.start()
+        replies: List[Tuple[Any, Optional[str]]] = []
+        try:
+            for conn, command in zip(self._conns, commands):
+                conn.send(command)
+            for conn in self._conns:
+                replies.append(conn.recv())
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            self.close()
+            raise StrategyPoolError(f"strategy worker stopped responding: {exc}") from exc
+        errors = [error for _, error in replies if error]
+        if errors:
+            raise StrategyPoolError(f"strategy worker command {commands[0][0]} failed: {errors[0]}")
+        return [result for result, _ in replies]
+
+    def close(self) -> None:
+        """Stop the workers (idempotent)."""
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            conn.close()
+        for proc in self._procs:
+            proc.join(timeout=2.0)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns = []
+        self._procs = []
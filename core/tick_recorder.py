@@ -0,0 +1,401 @@
+"""
+Raw Tick Recorder and Replay Driver
+
+Records normalized websocket ticks to compact daily files and plays them back
+through MarketDataEngineV2.on_tick_batch(). Sessions can then be profiled
+and regression-tested offline with real market microstructure.
+
+File layout (``artifacts/ticks/YYYY-MM-DD.ticks.gz``, one per IST trading day):
+an 8-byte magic header followed by fixed-width TICK_DTYPE records. The file
+is gzip-compressed and append-only: every flush adds a new gzip member,
+which standard gzip readers concatenate. A crash can therefore lose at most
+the batches not yet flushed.
+
+The websocket thread only appends rows to a buffer. When the buffer is due
+it is handed to a background writer thread, which builds the record array
+and does the gzip write, so compression never stalls the tick callback.
+
+Each record keeps the websocket packet sequence number it arrived in. Replay
+delivers the same batches in the same order, either paced at a multiple of
+real time or as fast as possible against a simulated clock.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_TICK_DIR = BASE_DIR / "artifacts" / "ticks"
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+TICK_MAGIC = b"KTICKS01"
+TICK_DTYPE = np.dtype(
+    [
+        ("ts", "<f8"),  # exchange timestamp, epoch seconds (wall clock as UTC if naive)
+        ("utcoffset", "<i2"),  # minutes; NAIVE_OFFSET marks a naive timestamp
+        ("seq", "<u4"),  # websocket packet sequence number
+        ("token", "<u4"),
+        ("last_price", "<f8"),
+        ("volume", "<f8"),
+        ("last_qty", "<f8"),
+        ("oi", "<f8"),
+    ]
+)
+NAIVE_OFFSET = np.iinfo(np.int16).max
+
+
+def _resolve_dir(tick_dir: Optional[Path]) -> Path:
+    if not tick_dir:
+        return DEFAULT_TICK_DIR
+    path = Path(tick_dir)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def tick_file_path(tick_dir: Path, day: date) -> Path:
+    return Path(tick_dir) / f"{day.isoformat()}.ticks.gz"
+
+
+def _float_or_nan(value: Any) -> float:
+    if value is None:
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _first(tick: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = tick.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _encode_ts(ts: Any, fallback: datetime) -> Tuple[float, int]:
+    if not isinstance(ts, datetime):
+        ts = fallback
+    offset = ts.utcoffset()
+    if offset is None:
+        # Kite sends naive exchange-local times; keep them naive on replay
+        return ts.replace(tzinfo=timezone.utc).timestamp(), NAIVE_OFFSET
+    return ts.timestamp(), int(offset.total_seconds() // 60)
+
+
+class TickRecorder:
+    """
+    Buffer normalized ticks and append them to daily compressed files.
+
+    Thread-safe: ``record()`` may be called from the websocket thread while
+    another thread calls ``flush()`` or ``close()``. Due buffers are written
+    by a background thread; ``flush()`` and ``close()`` write on the calling
+    thread and return once everything recorded so far is on disk.
+    """
+
+    def __init__(
+        self,
+        tick_dir: Optional[Path] = None,
+        flush_every: int = 5000,
+        flush_interval_sec: float = 2.0,
+        compresslevel: int = 6,
+    ) -> None:
+        self.tick_dir = _resolve_dir(tick_dir)
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval_sec = float(flush_interval_sec)
+        self.compresslevel = compresslevel
+        self._buffer: List[Tuple[Any, ...]] = []
+        self._seq = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        # Swapped-out buffers waiting for the writer, oldest first
+        self._pending: Deque[List[Tuple[Any, ...]]] = deque()
+        # Held while writing so batches reach each file in recorded order
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.ticks_recorded = 0
+
+    def record(self, ticks: Iterable[Dict[str, Any]]) -> None:
+        """Buffer one websocket packet of ticks (flushes when the buffer is due)."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            if self._closed:
+                return
+            self._seq += 1
+            seq = self._seq
+            buffer = self._buffer
+            for tick in ticks:
+                token = tick.get("instrument_token")
+                if not token:
+                    continue
+                ts, offset = _encode_ts(tick.get("timestamp") or tick.get("exchange_timestamp"), now)
+                buffer.append(
+                    (
+                        ts,
+                        offset,
+                        seq,
+                        int(token),
+                        _float_or_nan(tick.get("last_price")),
+                        _float_or_nan(_first(tick, "volume", "volume_traded")),
+                        _float_or_nan(_first(tick, "last_traded_quantity", "last_quantity")),
+                        _float_or_nan(tick.get("oi")),
+                    )
+                )
+            due = (
+                len(buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval_sec
+            )
+            if due:
+                self._swap_buffer()
+                self._cond.notify()
+        if due and self._thread is None:
+            self._start()
+
+    def flush(self) -> int:
+        """Write buffered ticks to their day files. Returns the number written."""
+        with self._lock:
+            self._swap_buffer()
+        return self._drain()
+
+    def close(self) -> None:
+        """Stop the writer thread and write everything recorded so far."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self.flush()
+
+    def _swap_buffer(self) -> None:
+        # Caller holds _lock
+        rows, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        if rows:
+            self._pending.append(rows)
+
+    def _start(self) -> None:
+        with self._cond:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="tick-recorder-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                closed = self._closed
+            try:
+                self._drain()
+            except Exception as exc:
+                logger.error("Tick recorder failed to write ticks: %s", exc)
+            if closed:
+                return
+
+    def _drain(self) -> int:
+        with self._io_lock:
+            with self._lock:
+                batches = list(self._pending)
+                self._pending.clear()
+            written = 0
+            for rows in batches:
+                records = np.array(rows, dtype=TICK_DTYPE)
+                for day, chunk in self._split_by_day(records):
+                    self._append(tick_file_path(self.tick_dir, day), chunk)
+                written += len(records)
+            self.ticks_recorded += written
+            return written
+
+    @staticmethod
+    def _split_by_day(records: np.ndarray) -> Iterator[Tuple[date, np.ndarray]]:
+        # Trading day in IST (naive timestamps are already exchange-local)
+        offsets = np.where(records["utcoffset"] == NAIVE_OFFSET, 0, IST.utcoffset(None).total_seconds())
+        days = ((records["ts"] + offsets) // 86400).astype(np.int64)
+        for day_number in np.unique(days):
+            yield date(1970, 1, 1) + timedelta(days=int(day_number)), records[days == day_number]
+
+    def _append(self, path: Path, records: np.ndarray) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = records.tobytes()
+        if not path.exists() or path.stat().st_size == 0:
+            payload = TICK_MAGIC + payload
+        with gzip.open(path, "ab", compresslevel=self.compresslevel) as fh:
+            fh.write(payload)
+
+
+def read_ticks(path: Path) -> np.ndarray:
+    """
+    Load every tick record in a day file.
+
+    A truncated trailing member (e.g. after a crash mid-flush) is ignored.
+    """
+    path = Path(path)
+    if not path.exists():
+        return np.empty(0, dtype=TICK_DTYPE)
+    # Decode member by member so a damaged trailing member only loses itself
+    data = path.read_bytes()
+    chunks: List[bytes] = []
+    while data:
+        decoder = zlib.decompressobj(wbits=31)
+        try:
+            chunk = decoder.decompress(data)
+        except zlib.error as exc:
+            logger.warning("Tick file %s has a corrupt member (%s); replaying earlier records only", path, exc)
+            break
+        if not decoder.eof:
+            logger.warning("Tick file %s is truncated; replaying complete members only", path)
+            break
+        chunks.append(chunk)
+        data = decoder.unused_data
+    raw = b"".join(chunks)
+    if not raw.startswith(TICK_MAGIC):
+        if raw:
+            logger.warning("Ignoring tick file %s: unrecognised header", path)
+        return np.empty(0, dtype=TICK_DTYPE)
+    usable = (len(raw) - len(TICK_MAGIC)) // TICK_DTYPE.itemsize * TICK_DTYPE.itemsize
+    return np.frombuffer(raw, dtype=TICK_DTYPE, count=usable // TICK_DTYPE.itemsize, offset=len(TICK_MAGIC))
+
+
+def iter_tick_packets(records: np.ndarray) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+    """
+    Yield ``(epoch_seconds, ticks)`` per recorded websocket packet, in order.
+
+    Ticks are rebuilt in the normalized KiteBroker format
+    (instrument_token, last_price, timestamp, volume, last_traded_quantity, oi).
+    """
+    if records.size == 0:
+        return
+    seqs = records["seq"]
+    boundaries = np.flatnonzero(np.diff(seqs)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(records)]))
+
+    tz_cache: Dict[int, Optional[timezone]] = {NAIVE_OFFSET: None}
+    rows = records.tolist()
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        packet: List[Dict[str, Any]] = []
+        for ts, offset, _seq, token, last_price, volume, last_qty, oi in rows[start:end]:
+            if offset not in tz_cache:
+                tz_cache[offset] = timezone(timedelta(minutes=offset))
+            tz = tz_cache[offset]
+            if tz is None:
+                stamp = datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+            else:
+                stamp = datetime.fromtimestamp(ts, tz)
+            packet.append(
+                {
+                    "instrument_token": token,
+                    "last_price": None if last_price != last_price else last_price,
+                    "timestamp": stamp,
+                    "volume": None if volume != volume else volume,
+                    "last_traded_quantity": None if last_qty != last_qty else last_qty,
+                    "oi": None if oi != oi else oi,
+                }
+            )
+        yield rows[start][0], packet
+
+
+class SimulatedClock:
+    """Replay clock: reports the timestamp of the packet being delivered."""
+
+    def __init__(self) -> None:
+        self._now: Optional[float] = None
+
+    def advance(self, epoch_seconds: float) -> None:
+        self._now = epoch_seconds
+
+    def time(self) -> float:
+        return self._now if self._now is not None else time.time()
+
+    def now(self, tz: timezone = timezone.utc) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+
+class TickReplayer:
+    """
+    Feed recorded ticks back into a tick consumer (normally
+    ``MarketDataEngineV2.on_tick_batch``).
+
+    ``speed`` > 0 paces packets at that multiple of real time (1.0 = real
+    time, 100.0 = 100x). ``speed`` <= 0 delivers packets back to back.
+    Either way ``clock`` follows the recorded timestamps.
+    """
+
+    def __init__(
+        self,
+        on_ticks: Callable[[List[Dict[str, Any]]], None],
+        speed: float = 1.0,
+        clock: Optional[SimulatedClock] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.on_ticks = on_ticks
+        self.speed = float(speed or 0.0)
+        self.clock = clock or SimulatedClock()
+        self._sleep = sleep
+        self._monotonic = monotonic
+        self._stop = threading.Event()
+        self.packets_replayed = 0
+        self.ticks_replayed = 0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def replay_records(self, records: np.ndarray) -> int:
+        """Replay one array of records; returns the number of ticks delivered."""
+        delivered = 0
+        start_wall: Optional[float] = None
+        start_ts: Optional[float] = None
+        for ts, packet in iter_tick_packets(records):
+            if self._stop.is_set():
+                break
+            if self.speed > 0:
+                if start_wall is None:
+                    start_wall, start_ts = self._monotonic(), ts
+                delay = (ts - start_ts) / self.speed - (self._monotonic() - start_wall)
+                if delay > 0:
+                    self._sleep(delay)
+            self.clock.advance(ts)
+            self.on_ticks(packet)
+            delivered += len(packet)
+            self.packets_replayed += 1
+        self.ticks_replayed += delivered
+        return delivered
+
+    def replay_files(self, paths: Sequence[Path]) -> int:
+        """Replay day files in order; returns the number of ticks delivered."""
+        delivered = 0
+        for path in paths:
+            if self._stop.is_set():
+                break
+            delivered += self.replay_records(read_ticks(path))
+        return delivered
+
+
+def resolve_replay_files(tick_dir: Optional[Path], days: Optional[Iterable[Any]] = None) -> List[Path]:
+    """Day files to replay: the given dates (``date`` or YYYY-MM-DD), or every file in tick_dir."""
+    tick_dir = _resolve_dir(tick_dir)
+    if not days:
+        return sorted(tick_dir.glob("*.ticks.gz"))
+    paths = []
+    for day in days:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        paths.append(tick_file_path(tick_dir, day))
+    return paths
@@ -0,0 +1,208 @@
+"""
+Warm-start snapshots of indicator and strategy state.
+
+After a restart the strategy engines rebuild their state bar by bar:
+streaming indicators re-seed, sample-based strategies such as
+FnoIntradayTrendStrategy sit in warmup until they have seen enough
+prices again. WarmStartStore checkpoints that state to one binary file
+and hands it back on startup:
+
+    store = WarmStartStore.from_config(cfg.get("warm_start"), name="paper_engine")
+    store.register("strategy_engine_v2", engine.export_warm_state, engine.import_warm_state)
+    store.restore()         # at startup
+    store.maybe_save()      # every loop; writes every interval_sec
+    store.save()            # on shutdown
+
+Each section is produced by an exporter and consumed by an importer that
+receives the payload and the wall-clock time it was saved at. Snapshots
+older than ``max_age_sec``, or written by a different SNAPSHOT_FORMAT, are
+ignored. Importers validate their own state against the data they see
+next (indicator streams only continue when the saved last bar is in the
+incoming window; trend strategies drop a symbol whose first new price
+gapped away from the saved one), so a stale section degrades to the
+normal cold start.
+
+The file is a zlib-compressed pickle written atomically, in the same way
+as the instrument snapshot. Sections hold plain data (dicts, lists,
+tuples, floats), never live engine objects. A deploy that changes a class
+therefore cannot restore an old object into the new layout; each section
+versions its own layout (e.g. indicator_stream.STREAM_STATE_VERSION).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_WARM_START_DIR = BASE_DIR / "artifacts" / "warm_start"
+
+SNAPSHOT_FORMAT = 1
+
+Exporter = Callable[[], Any]
+# (payload, saved_at epoch seconds) -> anything (logged)
+Importer = Callable[[Any, float], Any]
+
+
+class WarmStartStore:
+    """
+    Periodic binary checkpoint of registered state sections.
+
+    Args:
+        path: Snapshot file
+        interval_sec: Minimum seconds between maybe_save() writes
+        max_age_sec: Snapshots older than this are not restored
+        enabled: When False, save/restore do nothing
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        interval_sec: float = 60.0,
+        max_age_sec: float = 900.0,
+        enabled: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.interval_sec = float(interval_sec)
+        self.max_age_sec = float(max_age_sec)
+        self.enabled = bool(enabled)
+        self._sections: Dict[str, Tuple[Exporter, Importer]] = {}
+        self._last_save: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]], name: str) -> "WarmStartStore":
+        """
+        Build from a ``warm_start`` config block (disabled when missing).
+
+        The file is ``<dir>/<name>.pkl``; ``dir`` defaults to
+        artifacts/warm_start.
+        """
+        cfg = cfg or {}
+        directory = Path(cfg.get("dir") or DEFAULT_WARM_START_DIR)
+        return cls(
+            directory / f"{name}.pkl",
+            interval_sec=cfg.get("interval_sec", 60.0),
+            max_age_sec=cfg.get("max_age_sec", 900.0),
+            enabled=cfg.get("enabled", False),
+        )
+
+    def register(self, name: str, exporter: Exporter, importer: Importer) -> None:
+        self._sections[name] = (exporter, importer)
+
+    def save(self) -> bool:
+        """Export every section and write the snapshot; returns True on success."""
+        if not self.enabled or not self._sections:
+            return False
+        sections: Dict[str, Any] = {}
+        for name, (exporter, _) in self._sections.items():
+            try:
+                sections[name] = exporter()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Warm-start export of %s failed: %s", name, exc)
+        payload = {"format": SNAPSHOT_FORMAT, "saved_at": time.time(), "sections": sections}
+        try:
+            data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to write warm-start snapshot %s: %s", self.path, exc)
+            return False
+        self._last_save = time.monotonic()
+        logger.debug("Warm-start snapshot written: %s (%d bytes)", self.path, len(data))
+        return True
+
+    def maybe_save(self) -> bool:
+        """save() when interval_sec has passed since the last write."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if self._last_save is None:
+            # The first interval starts at the first call, not at import time
+            self._last_save = now
+            return False
+        if now - self._last_save < self.interval_sec:
+            return False
+        return self.save()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The snapshot payload if present, readable, current-format and fresh."""
+        if not self.enabled or not self.path.exists():
+            return None
+        try:
+            payload = pickle.loads(zlib.decompress(self.path.read_bytes()))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to read warm-start snapshot %s: %s", self.path, exc)
+            return None
+        snapshot_format = payload.get("format") if isinstance(payload, dict) else None
+        if snapshot_format != SNAPSHOT_FORMAT:
+            logger.info("Ignoring warm-start snapshot %s with format %s", self.path, snapshot_format)
+            return None
+        age = time.time() - float(payload.get("saved_at", 0.0))
+        if age > self.max_age_sec:
+            logger.info("Ignoring warm-start snapshot %s: %.0fs old (max %.0fs)", self.path, age, self.max_age_sec)
+            return None
+        return payload
+
+    def restore(self) -> Dict[str, bool]:
+        """
+        Hand each registered section its saved state.
+
+        Returns:
+            Section name -> True if its importer ran without error
+        """
+        payload = self.load()
+        if payload is None:
+            return {}
+        saved_at = float(payload["saved_at"])
+        sections = payload.get("sections") or {}
+        restored: Dict[str, bool] = {}
+        for name, (_, importer) in self._sections.items():
+            if name not in sections:
+                continue
+            try:
+                result = importer(sections[name], saved_at)
+                restored[name] = True
+                logger.info("Warm start: restored %s (%s)", name, result)
+            except Exception as exc:  # noqa: BLE001
+                restored[name] = False
+                logger.warning("Warm-start import of %s failed: %s", name, exc)
+        return restored
+
+
+def _instance_key(strategy: Any) -> str:
+    return f"{getattr(strategy, 'logical', '')}|{getattr(strategy, 'timeframe', '')}"
+
+
+def register_strategy_instances(
+    store: WarmStartStore,
+    name: str,
+    instances: Callable[[], Iterable[Any]],
+) -> None:
+    """
+    Register strategy instances (export_state / import_state, e.g.
+    FnoIntradayTrendStrategy) as one section keyed by logical|timeframe.
+
+    ``instances`` is called at save and restore time, so engines that
+    rebuild their instance list are handled.
+    """
+    def export() -> Dict[str, Any]:
+        return {_instance_key(s): s.export_state() for s in instances()}
+
+    def restore(state: Dict[str, Any], saved_at: float) -> int:
+        restored = 0
+        for strategy in instances():
+            saved = state.get(_instance_key(strategy))
+            if saved:
+                restored += strategy.import_state(saved, max_age_sec=store.max_age_sec)
+        return restored
+
+    store.register(name, export, restore)
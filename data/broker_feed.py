@@ -1,4 +1,6 @@
 import logging
+from typing import Any, Dict, Iterable, List
+
 from kiteconnect import KiteConnect, exceptions as kite_exceptions
 from core.kite_http import kite_request
 
@@ -10,6 +12,10 @@ class BrokerAuthError(Exception):
     pass
 
 
+# Kite's /quote/ltp endpoint accepts up to 1000 instruments per request.
+LTP_MAX_INSTRUMENTS_PER_CALL = 1000
+
+
 class BrokerFeed:
     def __init__(self, kite: KiteConnect):
         self._kite = kite
@@ -19,6 +25,7 @@ class BrokerFeed:
         # Count consecutive auth errors to detect persistent auth failures
         self._consecutive_auth_errors = 0
         self._max_auth_errors_before_raise = 3
+        self.max_instruments_per_call = LTP_MAX_INSTRUMENTS_PER_CALL
 
     def get_ltp(self, symbol: str, exchange: str = "NSE") -> float | None:
         """
@@ -36,18 +43,59 @@ class BrokerFeed:
             If a symbol is missing in the LTP map, logs a warning once per symbol
             and returns None instead of raising KeyError.
         """
-        key = f"{exchange}:{symbol}"
+        return self.get_ltp_many([symbol], exchange=exchange).get(symbol)
+
+    def get_ltp_many(self, symbols: Iterable[str], exchange: str = "NSE") -> Dict[str, float | None]:
+        """
+        Fetch last traded prices for many symbols in as few REST calls as possible.
+
+        Keys are de-duplicated and sent to ``kite.ltp`` in chunks of
+        ``max_instruments_per_call``, so a full-universe sweep costs one call
+        per chunk instead of one call per symbol.
+
+        Returns:
+            Dict[str, float | None]: Symbol -> last traded price. Every requested
+            symbol is present; unavailable prices map to None.
+
+        Raises:
+            BrokerAuthError: If broker authentication consistently fails
+                            (after multiple consecutive failures).
+        """
+        keys: Dict[str, str] = {}
+        for symbol in symbols:
+            if symbol and symbol not in keys:
+                keys[symbol] = f"{exchange}:{symbol}"
+
+        prices: Dict[str, float | None] = {symbol: None for symbol in keys}
+        ordered = list(keys.items())
+        chunk_size = max(1, int(self.max_instruments_per_call))
+        for start in range(0, len(ordered), chunk_size):
+            chunk = ordered[start:start + chunk_size]
+            data = self._fetch_ltp_chunk([key for _, key in chunk])
+            if data is None:
+                continue
+            for symbol, key in chunk:
+                quote = data.get(key)
+                if quote is None or quote.get("last_price") is None:
+                    # Symbol not found in LTP response - log once per symbol
+                    if key not in self._warned_missing_symbols:
+                        log.warning("Symbol %s not found in LTP data (will not warn again)", key)
+                        self._warned_missing_symbols.add(key)
+                    continue
+                try:
+                    prices[symbol] = float(quote["last_price"])
+                except (TypeError, ValueError):
+                    log.warning("Invalid LTP for %s: %r", key, quote.get("last_price"))
+        return prices
+
+    def _fetch_ltp_chunk(self, keys: List[str]) -> Dict[str, Any] | None:
+        """Issue one ``kite.ltp`` call for ``keys``; returns None on failure."""
+        label = keys[0] if len(keys) == 1 else f"{len(keys)} instruments"
         try:
-            data = kite_request(self._kite.ltp, key)
+            data = kite_request(self._kite.ltp, *keys)
             # Reset auth error count on success
             self._consecutive_auth_errors = 0
-            return float(data[key]["last_price"])
-        except KeyError:
-            # Symbol not found in LTP response - log once per symbol
-            if key not in self._warned_missing_symbols:
-                log.warning("Symbol %s not found in LTP data (will not warn again)", key)
-                self._warned_missing_symbols.add(key)
-            return None
+            return data or {}
         except kite_exceptions.TokenException as exc:
             self._consecutive_auth_errors += 1
             error_msg = str(exc)
@@ -57,7 +105,7 @@ class BrokerFeed:
             )
             
             if not self._warned_token:
-                log.error("Kite token invalid while fetching LTP (%s): %s", key, exc)
+                log.error("Kite token invalid while fetching LTP (%s): %s", label, exc)
                 self._warned_token = True
             
             # Raise BrokerAuthError after multiple consecutive auth errors
@@ -69,5 +117,45 @@ class BrokerFeed:
             
             return None
         except Exception as exc:
-            log.warning("Error fetching LTP for %s: %r", key, exc)
-            return None
\ No newline at end of file
+            log.warning("Error fetching LTP for %s: %r", label, exc)
+            return None
+
+
+class QuoteSnapshot:
+    """
+    Per-loop LTP snapshot shared by the paper engines.
+
+    ``prefetch`` pulls every symbol a loop is about to touch with a single
+    batched ``get_ltp_many`` call; ``ltp`` then serves from the snapshot and
+    only falls back to a per-symbol fetch for symbols that were not prefetched.
+    Feeds without ``get_ltp_many`` (replay feeds, test doubles) ignore
+    ``prefetch`` and are queried lazily one symbol at a time, preserving their
+    existing behaviour.
+    """
+
+    def __init__(self, feed: Any, exchange: str = "NSE") -> None:
+        self._feed = feed
+        self.exchange = exchange
+        self._prices: Dict[str, float | None] = {}
+        self._batched = callable(getattr(type(feed), "get_ltp_many", None))
+
+    def prefetch(self, symbols: Iterable[str]) -> None:
+        """Fetch all not-yet-cached ``symbols`` in one batched request."""
+        missing = [s for s in dict.fromkeys(symbols) if s and s not in self._prices]
+        if not missing:
+            return
+        if self._batched:
+            self._prices.update(self._feed.get_ltp_many(missing, exchange=self.exchange))
+
+    def ltp(self, symbol: str) -> float | None:
+        """Return the snapshot price for ``symbol``, fetching it if needed."""
+        if symbol not in self._prices:
+            self._prices[symbol] = self._feed.get_ltp(symbol, exchange=self.exchange)
+        return self._prices[symbol]
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._prices
+
+    def prices(self) -> Dict[str, float]:
+        """Return all non-None prices captured in this snapshot."""
+        return {s: p for s, p in self._prices.items() if p is not None}
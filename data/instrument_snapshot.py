@@ -0,0 +1,455 @@
+"""
+Daily on-disk snapshot of the Kite instrument master.
+
+Kite publishes the instrument dumps once a day. Every engine used to
+download the NSE/NFO dumps (tens of thousands of rows) at startup and build
+its own lookup tables. ``get_instrument_snapshot()`` downloads them once per
+IST day and stores them in ``artifacts/instruments/YYYY-MM-DD.pkl``. The
+file is a column-oriented pickle that also holds the lookup indexes, so
+other processes load it without rebuilding anything:
+
+- (exchange, tradingsymbol) -> instrument_token
+- instrument_token -> row (exchange, tradingsymbol, expiry, strike, ...)
+- underlying -> futures, sorted by expiry
+- underlying -> option chain, keyed by expiry and sorted by strike
+
+Processes starting at the same time coordinate through a lock file, so only
+one of them downloads. The snapshot is cached per process and rows are built
+into dicts only when asked for.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.kite_http import kite_request
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_SNAPSHOT_DIR = BASE_DIR / "artifacts" / "instruments"
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+DEFAULT_EXCHANGES: Tuple[str, ...] = ("NSE", "NFO")
+SNAPSHOT_FORMAT = 1
+# Fields kept from each Kite instrument row
+SNAPSHOT_FIELDS: Tuple[str, ...] = (
+    "instrument_token",
+    "exchange_token",
+    "tradingsymbol",
+    "name",
+    "last_price",
+    "expiry",
+    "strike",
+    "tick_size",
+    "lot_size",
+    "instrument_type",
+    "segment",
+    "exchange",
+)
+# Columns with few distinct values; interned so the pickle memo stores each once
+_INTERNED_FIELDS = ("name", "instrument_type", "segment", "exchange")
+
+LOCK_TIMEOUT_SEC = 120.0
+LOCK_STALE_SEC = 300.0
+
+
+def today_ist() -> date:
+    return datetime.now(IST).date()
+
+
+def snapshot_path(snapshot_dir: Path, day: date) -> Path:
+    return Path(snapshot_dir) / f"{day.isoformat()}.pkl"
+
+
+def _expiry(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def _strike(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class InstrumentSnapshot:
+    """
+    Instrument master for one day, stored column-wise with prebuilt indexes.
+
+    Row dicts returned by the lookup methods are shared and cached; callers
+    must not modify them.
+    """
+
+    def __init__(
+        self,
+        day: date,
+        exchanges: Sequence[str],
+        columns: Dict[str, List[Any]],
+        indexes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.day = day
+        self.exchanges: Tuple[str, ...] = tuple(exchanges)
+        self.columns = columns
+        self._rows: List[Optional[Dict[str, Any]]] = [None] * len(columns["instrument_token"])
+        indexes = indexes if indexes is not None else self._build_indexes(columns)
+        self.token_index: Dict[Tuple[str, str], int] = indexes["token_index"]
+        self.token_rows: Dict[int, int] = indexes["token_rows"]
+        self.exchange_rows: Dict[str, Tuple[int, int]] = indexes["exchange_rows"]
+        self.futures_index: Dict[str, List[int]] = indexes["futures_index"]
+        self.options_index: Dict[str, Dict[date, List[int]]] = indexes["options_index"]
+        self._symbol_maps: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+    # ------------------------------------------------------------ building
+    @classmethod
+    def from_instruments(cls, day: date, dumps: Dict[str, Iterable[Dict[str, Any]]]) -> "InstrumentSnapshot":
+        """Build from raw ``kite.instruments(exchange)`` results keyed by exchange."""
+        columns: Dict[str, List[Any]] = {field: [] for field in SNAPSHOT_FIELDS}
+        expiries: Dict[Any, Optional[date]] = {}
+        for exchange, instruments in dumps.items():
+            for inst in instruments:
+                token = inst.get("instrument_token")
+                tradingsymbol = inst.get("tradingsymbol")
+                if not token or not tradingsymbol:
+                    continue
+                for field in SNAPSHOT_FIELDS:
+                    value = inst.get(field)
+                    if field == "instrument_token":
+                        value = int(value)
+                    elif field == "expiry":
+                        # One date object per expiry, so the pickle memo stores each once
+                        if value not in expiries:
+                            expiries[value] = _expiry(value)
+                        value = expiries[value]
+                    elif field == "strike":
+                        value = _strike(value)
+                    elif field == "exchange":
+                        value = value or exchange
+                    if field in _INTERNED_FIELDS and isinstance(value, str):
+                        value = sys.intern(value)
+                    columns[field].append(value)
+        return cls(day, list(dumps), columns)
+
+    @staticmethod
+    def _build_indexes(columns: Dict[str, List[Any]]) -> Dict[str, Any]:
+        tokens = columns["instrument_token"]
+        symbols = columns["tradingsymbol"]
+        exchanges = columns["exchange"]
+        names = columns["name"]
+        segments = columns["segment"]
+        types = columns["instrument_type"]
+        expiries = columns["expiry"]
+        strikes = columns["strike"]
+
+        token_index: Dict[Tuple[str, str], int] = {}
+        token_rows: Dict[int, int] = {}
+        exchange_rows: Dict[str, Tuple[int, int]] = {}
+        futures: Dict[str, List[int]] = {}
+        options: Dict[str, Dict[date, List[int]]] = {}
+        for row, token in enumerate(tokens):
+            exchange = exchanges[row]
+            token_index[(exchange, symbols[row])] = token
+            token_rows[token] = row
+            start, _ = exchange_rows.get(exchange, (row, row))
+            exchange_rows[exchange] = (start, row + 1)
+
+            name = names[row]
+            if not name:
+                continue
+            segment = segments[row] or ""
+            inst_type = (types[row] or "").upper()
+            if inst_type == "FUT" or segment.endswith("-FUT"):
+                futures.setdefault(name.upper(), []).append(row)
+            elif segment.endswith("-OPT") and expiries[row] is not None:
+                options.setdefault(name.upper(), {}).setdefault(expiries[row], []).append(row)
+
+        no_expiry = date.max
+        for rows in futures.values():
+            rows.sort(key=lambda r: expiries[r] or no_expiry)
+        for chain in options.values():
+            for rows in chain.values():
+                rows.sort(key=lambda r: (strikes[r] is None, strikes[r] or 0.0, types[r] or ""))
+        return {
+            "token_index": token_index,
+            "token_rows": token_rows,
+            "exchange_rows": exchange_rows,
+            "futures_index": futures,
+            "options_index": {name: dict(sorted(chain.items())) for name, chain in options.items()},
+        }
+
+    # ------------------------------------------------------------ persistence
+    def save(self, path: Path) -> None:
+        """Write atomically so concurrent readers never see a partial file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": SNAPSHOT_FORMAT,
+            "day": self.day.isoformat(),
+            "exchanges": list(self.exchanges),
+            "columns": self.columns,
+            "indexes": {
+                "token_index": self.token_index,
+                "token_rows": self.token_rows,
+                "exchange_rows": self.exchange_rows,
+                "futures_index": self.futures_index,
+                "options_index": self.options_index,
+            },
+        }
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["InstrumentSnapshot"]:
+        """Load a snapshot file; returns None if it is missing or unreadable."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as fh:
+                payload = pickle.load(fh)
+            if payload.get("format") != SNAPSHOT_FORMAT:
+                logger.info("Ignoring instrument snapshot %s with format %s", path, payload.get("format"))
+                return None
+            return cls(
+                date.fromisoformat(payload["day"]),
+                payload["exchanges"],
+                payload["columns"],
+                payload["indexes"],
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to read instrument snapshot %s: %s", path, exc)
+            return None
+
+    # ------------------------------------------------------------ lookups
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def covers(self, exchanges: Iterable[str]) -> bool:
+        return set(exchanges) <= set(self.exchanges)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        cached = self._rows[index]
+        if cached is None:
+            cached = {field: self.columns[field][index] for field in SNAPSHOT_FIELDS}
+            self._rows[index] = cached
+        return cached
+
+    def instruments(self, exchange: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All rows, or the rows of one exchange, in Kite dump order."""
+        if exchange is None:
+            return [self.row(i) for i in range(len(self))]
+        start, end = self.exchange_rows.get(exchange, (0, 0))
+        return [self.row(i) for i in range(start, end)]
+
+    def token(self, exchange: str, tradingsymbol: str) -> Optional[int]:
+        return self.token_index.get((exchange, tradingsymbol))
+
+    def instrument(self, exchange: str, tradingsymbol: str) -> Optional[Dict[str, Any]]:
+        token = self.token_index.get((exchange, tradingsymbol))
+        return self.by_token(token) if token is not None else None
+
+    def by_token(self, token: int) -> Optional[Dict[str, Any]]:
+        index = self.token_rows.get(int(token))
+        return self.row(index) if index is not None else None
+
+    def symbol(self, token: int) -> Optional[Tuple[str, str]]:
+        """(exchange, tradingsymbol) for an instrument token."""
+        index = self.token_rows.get(int(token))
+        if index is None:
+            return None
+        return self.columns["exchange"][index], self.columns["tradingsymbol"][index]
+
+    def futures(self, underlying: str) -> List[Dict[str, Any]]:
+        """Futures contracts of an underlying, nearest expiry first."""
+        return [self.row(i) for i in self.futures_index.get(underlying.upper(), [])]
+
+    def option_expiries(self, underlying: str) -> List[date]:
+        return list(self.options_index.get(underlying.upper(), {}))
+
+    def option_chain(self, underlying: str) -> Dict[date, List[Dict[str, Any]]]:
+        """Option contracts of an underlying by expiry (ascending), each sorted by strike."""
+        chain = self.options_index.get(underlying.upper(), {})
+        return {expiry: [self.row(i) for i in rows] for expiry, rows in chain.items()}
+
+    def options_by_underlying(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Every option contract grouped by underlying name."""
+        return {
+            name: [self.row(i) for rows in chain.values() for i in rows]
+            for name, chain in self.options_index.items()
+        }
+
+    def tradingsymbol_token_map(self, exchanges: Sequence[str] = DEFAULT_EXCHANGES) -> Dict[str, int]:
+        """
+        Upper-cased tradingsymbol -> token across ``exchanges``. Later
+        exchanges win when a tradingsymbol is listed on several.
+        """
+        key = tuple(exchanges)
+        cached = self._symbol_maps.get(key)
+        if cached is None:
+            symbols = self.columns["tradingsymbol"]
+            tokens = self.columns["instrument_token"]
+            cached = {}
+            for exchange in key:
+                start, end = self.exchange_rows.get(exchange, (0, 0))
+                for i in range(start, end):
+                    cached[symbols[i].upper()] = tokens[i]
+            self._symbol_maps[key] = cached
+        return cached
+
+
+def fetch_instrument_dumps(kite: Any, exchanges: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Download ``kite.instruments()`` per exchange; failed exchanges are left out."""
+    dumps: Dict[str, List[Dict[str, Any]]] = {}
+    for exchange in exchanges:
+        try:
+            dumps[exchange] = list(kite_request(kite.instruments, exchange))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to fetch instruments for exchange=%s: %s", exchange, exc)
+    return dumps
+
+
+def _acquire_lock(lock_path: Path, timeout: float) -> bool:
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > LOCK_STALE_SEC:
+                    logger.warning("Removing stale instrument snapshot lock %s", lock_path)
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.2)
+            continue
+        with os.fdopen(fd, "w") as fh:
+            fh.write(str(os.getpid()))
+        return True
+
+
+def _latest_snapshot(snapshot_dir: Path, exchanges: Sequence[str]) -> Optional[InstrumentSnapshot]:
+    for path in sorted(Path(snapshot_dir).glob("*.pkl"), reverse=True):
+        snapshot = InstrumentSnapshot.load(path)
+        if snapshot is not None and snapshot.covers(exchanges):
+            return snapshot
+    return None
+
+
+def _prune_snapshots(snapshot_dir: Path, keep: Path) -> None:
+    for path in Path(snapshot_dir).glob("*.pkl"):
+        if path != keep:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _default_kite() -> Any:
+    from broker.kite_client import KiteClient
+
+    return KiteClient().api
+
+
+def _load_or_fetch(kite: Any, exchanges: Sequence[str], snapshot_dir: Path, day: date) -> InstrumentSnapshot:
+    path = snapshot_path(snapshot_dir, day)
+    snapshot = InstrumentSnapshot.load(path)
+    if snapshot is not None and snapshot.covers(exchanges):
+        return snapshot
+    if snapshot is not None:
+        # Today's file exists but lacks an exchange; refetch the union
+        exchanges = tuple(dict.fromkeys(list(snapshot.exchanges) + list(exchanges)))
+
+    lock_path = path.with_suffix(".lock")
+    locked = _acquire_lock(lock_path, LOCK_TIMEOUT_SEC)
+    try:
+        if locked:
+            # Another process may have written it while we waited
+            snapshot = InstrumentSnapshot.load(path)
+            if snapshot is not None and snapshot.covers(exchanges):
+                return snapshot
+        else:
+            logger.warning("Timed out waiting for instrument snapshot lock %s; fetching anyway", lock_path)
+
+        if kite is None:
+            kite = _default_kite()
+        t0 = time.perf_counter()
+        dumps = fetch_instrument_dumps(kite, exchanges)
+        snapshot = InstrumentSnapshot.from_instruments(day, dumps)
+        logger.info(
+            "Fetched instrument master for %s: %d rows from %s in %.1fs",
+            day, len(snapshot), ",".join(dumps) or "-", time.perf_counter() - t0,
+        )
+        if snapshot.covers(exchanges):
+            snapshot.save(path)
+            _prune_snapshots(snapshot_dir, keep=path)
+            return snapshot
+    finally:
+        if locked:
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    fallback = _latest_snapshot(snapshot_dir, exchanges)
+    if fallback is not None:
+        logger.warning("Instrument download incomplete; using snapshot from %s", fallback.day)
+        return fallback
+    # Partial data is kept for this process only and never written to disk
+    return snapshot
+
+
+_snapshots: Dict[Tuple[Path, date], InstrumentSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_instrument_snapshot(
+    kite: Any = None,
+    exchanges: Sequence[str] = DEFAULT_EXCHANGES,
+    snapshot_dir: Optional[Path] = None,
+    day: Optional[date] = None,
+) -> InstrumentSnapshot:
+    """
+    Today's instrument snapshot, shared by every caller in the process.
+
+    Loads it from disk, or downloads it via ``kite`` (a KiteConnect-like
+    object; created from ``KiteClient`` when None) if today's file is missing.
+    """
+    snapshot_dir = Path(snapshot_dir) if snapshot_dir else DEFAULT_SNAPSHOT_DIR
+    day = day or today_ist()
+    with _snapshots_lock:
+        snapshot = _snapshots.get((snapshot_dir, day))
+        if snapshot is not None and snapshot.covers(exchanges):
+            return snapshot
+        snapshot = _load_or_fetch(kite, exchanges, snapshot_dir, day)
+        _snapshots[(snapshot_dir, day)] = snapshot
+        return snapshot
+
+
+def reset_instrument_snapshots() -> None:
+    """Drop the per-process snapshot cache (the files on disk are kept)."""
+    with _snapshots_lock:
+        _snapshots.clear()
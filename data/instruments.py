@@ -5,7 +5,7 @@ from datetime import date
 from typing import Dict, List, Sequence
 
 from broker.kite_client import KiteClient
-from core.kite_http import kite_request
+from data.instrument_snapshot import get_instrument_snapshot
 from kiteconnect import KiteConnect
 
 logger = logging.getLogger(__name__)
@@ -45,30 +45,15 @@ def resolve_fno_symbols(
     """
     Resolve logical names like ["NIFTY", "BANKNIFTY"] to actual NFO FUT tradingsymbols.
 
-    - Fetches instruments("NFO") from Kite.
-    - Filters to segment == "NFO-FUT".
-    - Groups by instrument["name"].
+    - Uses the daily instrument snapshot (downloads instruments("NFO") at most once a day).
+    - Looks up NFO futures by underlying name.
     - Picks nearest expiry for each requested logical name.
     """
-    kite_client = kite_client or KiteClient()
-    kite = kite_client.api
-
-    logger.info("Fetching NFO instruments from Kite to resolve FnO symbols...")
-    instruments = kite_request(kite.instruments, "NFO")
-
-    by_name: Dict[str, List[dict]] = {}
-    for inst in instruments:
-        if inst.get("segment") != "NFO-FUT":
-            continue
-        name = inst.get("name")
-        if not name:
-            continue
-        by_name.setdefault(name.upper(), []).append(inst)
+    snapshot = get_instrument_snapshot(kite_client.api if kite_client else None)
 
     result: Dict[str, str] = {}
     for logical in logical_names:
-        key = logical.upper()
-        contracts = by_name.get(key, [])
+        contracts = [c for c in snapshot.futures(logical) if c.get("segment") == "NFO-FUT"]
         chosen = _pick_nearest_expiry(contracts)
         if not chosen:
             logger.warning("No FUT contract found in NFO for logical name=%s", logical)
@@ -85,45 +70,23 @@ def resolve_fno_symbols(
 
 def ensure_instruments_loaded(kite_client: KiteClient | None = None):
     """
-    Load and cache all instruments from Kite API.
-    Builds a token index for fast lookup by (exchange, tradingsymbol).
+    Load and cache all NSE/NFO instruments from the daily instrument snapshot.
+    The snapshot carries a prebuilt token index for lookup by (exchange, tradingsymbol).
     """
     global _instrument_cache, _token_index
     if _instrument_cache is not None:
         return
 
-    kite_client = kite_client or KiteClient()
-    kite = kite_client.api
-
-    logger.info("Loading all instruments from Kite API to build token index...")
-    
-    # Fetch instruments for NSE and NFO exchanges
-    all_instruments = []
-    for exchange in ["NSE", "NFO"]:
-        try:
-            instruments = kite_request(kite.instruments, exchange)
-            all_instruments.extend(instruments)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch instruments for exchange=%s: %s", exchange, exc)
-
-    _instrument_cache = all_instruments
-    logger.info("Loaded %d total instruments from Kite API", len(all_instruments))
-
-    # Build token index
-    for inst in all_instruments:
-        ex = inst.get("exchange")
-        ts = inst.get("tradingsymbol")
-        token = inst.get("instrument_token")
-        if ex and ts and token:
-            _token_index[(ex, ts)] = token
-
-    logger.info("Built token index with %d entries", len(_token_index))
+    snapshot = get_instrument_snapshot(kite_client.api if kite_client else None)
+    _instrument_cache = snapshot
+    _token_index = snapshot.token_index
+    logger.info("Loaded %d instruments (token index from snapshot %s)", len(snapshot), snapshot.day)
 
 
 def get_instrument_token(exchange: str, tradingsymbol: str) -> int | None:
     """
     Look up instrument token by exchange and tradingsymbol.
-    Loads instruments from Kite API on first call.
+    Loads the instrument snapshot on first call.
     
     Args:
         exchange: Exchange name (e.g., "NSE", "NFO")
@@ -148,12 +111,13 @@ def load_instrument_token_map(
     """
     Build and cache a dict of tradingsymbol -> instrument_token for specified segments.
     
-    This function fetches instruments once per segment and builds a unified mapping
-    that can be used to quickly resolve instrument tokens by tradingsymbol alone
-    (without needing to know the exchange).
+    The mapping comes from the daily instrument snapshot (instruments are
+    downloaded at most once a day) and resolves instrument tokens by
+    tradingsymbol alone (without needing to know the exchange).
     
     Args:
-        kite: KiteConnect instance (if None, will create via KiteClient)
+        kite: KiteConnect instance, used only if today's snapshot must be
+            downloaded (if None, will create via KiteClient)
         segments: Tuple of exchange segments to include (default: NSE, NFO)
     
     Returns:
@@ -165,35 +129,17 @@ def load_instrument_token_map(
     if _instrument_token_map_loaded and _instrument_token_map is not None:
         return _instrument_token_map
     
-    # If no kite client provided and we can't create one, return empty map
-    if kite is None:
-        try:
-            kite_client = KiteClient()
-            kite = kite_client.api
-        except Exception as exc:
-            logger.warning("Cannot create KiteClient for instrument token map: %s", exc)
-            _instrument_token_map = {}
-            _instrument_token_map_loaded = True
-            return _instrument_token_map
-    
-    logger.info("Building instrument token map for segments: %s", segments)
-    
-    token_map: Dict[str, int] = {}
+    # Without a snapshot on disk and no way to create a KiteClient, return an empty map
+    try:
+        snapshot = get_instrument_snapshot(kite, exchanges=segments)
+    except Exception as exc:
+        logger.warning("Cannot load instrument snapshot for instrument token map: %s", exc)
+        _instrument_token_map = {}
+        _instrument_token_map_loaded = True
+        return _instrument_token_map
     
-    for segment in segments:
-        try:
-            instruments = kite_request(kite.instruments, segment)
-            count = 0
-            for inst in instruments:
-                ts = inst.get("tradingsymbol")
-                token = inst.get("instrument_token")
-                if ts and token:
-                    # Store with uppercase key for case-insensitive lookup
-                    token_map[ts.upper()] = int(token)
-                    count += 1
-            logger.info("Loaded %d instruments from %s", count, segment)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch instruments for segment %s: %s", segment, exc)
+    # Uppercase keys for case-insensitive lookup
+    token_map = snapshot.tradingsymbol_token_map(segments)
     
     _instrument_token_map = token_map
     _instrument_token_map_loaded = True
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import bisect
 import logging
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
 from broker.kite_client import KiteClient
-from core.kite_http import kite_request
+from data.instrument_snapshot import get_instrument_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -35,31 +38,189 @@ class ATMOptionPair:
         }
 
 
+class StrikeLadder:
+    """
+    Strikes of one underlying and expiry as sorted arrays, for binary search.
+
+    ``strikes`` holds every listed strike in ascending order, with ``ce`` and
+    ``pe`` giving the tradingsymbol at each strike (None if that side is not
+    listed). ``ce_strikes``/``pe_strikes`` hold only the strikes listed on
+    that side.
+    """
+
+    def __init__(self, expiry: Optional[date], contracts: Sequence[dict], underlying: str = "") -> None:
+        self.expiry = expiry
+        sides: Dict[str, Dict[float, str]] = {"CE": {}, "PE": {}}
+        for c in contracts:
+            ts = c.get("tradingsymbol")
+            inst_type = (c.get("instrument_type") or "").upper()
+            if not ts or inst_type not in sides:
+                continue
+            try:
+                strike = float(c.get("strike"))
+            except (TypeError, ValueError):
+                logger.error(
+                    "StrikeLadder: invalid strike %r for contract %s in %s; skipping this contract.",
+                    c.get("strike"), ts, underlying,
+                )
+                continue
+            # First listing wins, as in the original linear scan
+            sides[inst_type].setdefault(strike, ts)
+
+        self.strikes = np.array(sorted(set(sides["CE"]) | set(sides["PE"])), dtype=np.float64)
+        self.ce: List[Optional[str]] = [sides["CE"].get(k) for k in self.strikes.tolist()]
+        self.pe: List[Optional[str]] = [sides["PE"].get(k) for k in self.strikes.tolist()]
+        self.ce_strikes = np.array(sorted(sides["CE"]), dtype=np.float64)
+        self.pe_strikes = np.array(sorted(sides["PE"]), dtype=np.float64)
+        self._ce_symbols = [sides["CE"][k] for k in self.ce_strikes.tolist()]
+        self._pe_symbols = [sides["PE"][k] for k in self.pe_strikes.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    @staticmethod
+    def _nearest(strikes: np.ndarray, value: float) -> int:
+        """Index of the strike closest to ``value`` (lower strike on ties); -1 if empty."""
+        n = len(strikes)
+        if n == 0:
+            return -1
+        i = int(np.searchsorted(strikes, value))
+        if i == 0:
+            return 0
+        if i == n:
+            return n - 1
+        return i - 1 if value - strikes[i - 1] <= strikes[i] - value else i
+
+    def nearest(self, side: str, spot: float) -> Optional[Tuple[float, str]]:
+        """(strike, tradingsymbol) of the ``side`` ("CE"/"PE") contract nearest ``spot``."""
+        strikes, symbols = (
+            (self.ce_strikes, self._ce_symbols) if side == "CE" else (self.pe_strikes, self._pe_symbols)
+        )
+        i = self._nearest(strikes, spot)
+        if i < 0:
+            return None
+        return float(strikes[i]), symbols[i]
+
+    def at_strike(self, strike: float, tolerance: float = 0.01) -> Optional[int]:
+        """Index of ``strike`` in ``strikes`` if listed (within ``tolerance``)."""
+        i = self._nearest(self.strikes, strike)
+        if i < 0 or abs(self.strikes[i] - strike) >= tolerance:
+            return None
+        return i
+
+    def band(self, spot: float, width: int) -> List[Dict[str, object]]:
+        """
+        ATM strike (nearest ``spot``) and ``width`` strikes either side, ascending.
+
+        Each entry is ``{"strike", "offset", "CE", "PE"}``, where ``offset``
+        is the distance from ATM in strike steps.
+        """
+        atm = self._nearest(self.strikes, spot)
+        if atm < 0:
+            return []
+        lo, hi = max(0, atm - width), min(len(self.strikes), atm + width + 1)
+        return [
+            {"strike": float(self.strikes[i]), "offset": i - atm, "CE": self.ce[i], "PE": self.pe[i]}
+            for i in range(lo, hi)
+        ]
+
+
 class OptionUniverse:
     """
     Helper to work with index options instruments from NFO.
 
-    - Loads instruments("NFO") once.
+    - Reads NFO options from the daily instrument snapshot (shared across
+      engines, downloaded at most once a day).
     - Groups options by underlying name (e.g., NIFTY, BANKNIFTY).
     - For each underlying + spot, can resolve ATM CE and ATM PE on nearest expiry.
+
+    Strikes are indexed per underlying and expiry as a ``StrikeLadder`` the
+    first time an underlying is resolved, so ATM and ATM+/-k lookups are
+    binary searches. The ladders are rebuilt only when the instrument
+    snapshot changes (a new trading day).
     """
 
+    _snapshot = None
+    _ladders: Optional[Dict[str, Dict[Optional[date], StrikeLadder]]] = None
+    _nearest_expiry_cache: Optional[Dict[str, Tuple[date, Optional[date]]]] = None
+
     def __init__(self, kite_client: KiteClient | None = None) -> None:
-        self._kite_client = kite_client or KiteClient()
-        kite = self._kite_client.api
+        self._kite_client = kite_client
 
         logger.info("Loading NFO option instruments for OptionUniverse...")
-        instruments = kite_request(kite.instruments, "NFO")
+        self._load(get_instrument_snapshot(kite_client.api if kite_client else None))
 
-        self._by_name: Dict[str, List[dict]] = {}
-        for inst in instruments:
-            # We only care about index options
-            if inst.get("segment") != "NFO-OPT":
-                continue
-            name = inst.get("name")
-            if not name:
-                continue
-            self._by_name.setdefault(name.upper(), []).append(inst)
+    def _load(self, snapshot) -> None:
+        self._snapshot = snapshot
+        # Option chains come pre-grouped by underlying, sorted by expiry then strike
+        self._by_name: Dict[str, List[dict]] = {
+            name: [c for c in contracts if c.get("segment") == "NFO-OPT"]
+            for name, contracts in snapshot.options_by_underlying().items()
+        }
+        self._ladders = {}
+        self._nearest_expiry_cache = {}
+
+    def refresh(self) -> bool:
+        """
+        Pick up a new instrument snapshot (e.g. after the day rolls over).
+        Returns True if the option chains were reloaded.
+        """
+        if self._snapshot is None:
+            return False
+        try:
+            snapshot = get_instrument_snapshot(self._kite_client.api if self._kite_client else None)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Could not refresh instrument snapshot; keeping option chains from %s: %s", self._snapshot.day, exc)
+            return False
+        if snapshot is self._snapshot:
+            return False
+        logger.info("Instrument snapshot changed (%s); rebuilding option strike index", snapshot.day)
+        self._load(snapshot)
+        return True
+
+    def _expiry_ladders(self, key: str) -> Dict[Optional[date], StrikeLadder]:
+        """StrikeLadder per expiry for an underlying (ascending expiry; None = undated)."""
+        if self._ladders is None:
+            self._ladders = {}
+        ladders = self._ladders.get(key)
+        if ladders is None:
+            by_expiry: Dict[Optional[date], List[dict]] = {}
+            for c in self._by_name.get(key, []):
+                expiry = c.get("expiry")
+                by_expiry.setdefault(expiry if isinstance(expiry, date) else None, []).append(c)
+            dated = sorted(e for e in by_expiry if e is not None)
+            ladders = {e: StrikeLadder(e, by_expiry[e], key) for e in dated}
+            if not dated and None in by_expiry:
+                ladders[None] = StrikeLadder(None, by_expiry[None], key)
+            self._ladders[key] = ladders
+        return ladders
+
+    def _nearest_ladder(self, key: str) -> Optional[StrikeLadder]:
+        """Ladder of the nearest expiry >= today (earliest expiry if all have passed)."""
+        ladders = self._expiry_ladders(key)
+        if not ladders:
+            return None
+        if self._nearest_expiry_cache is None:
+            self._nearest_expiry_cache = {}
+        today = date.today()
+        cached = self._nearest_expiry_cache.get(key)
+        if cached is None or cached[0] != today:
+            expiries = list(ladders)
+            if expiries == [None]:
+                expiry = None
+            else:
+                i = bisect.bisect_left(expiries, today)
+                expiry = expiries[i] if i < len(expiries) else expiries[0]
+            cached = (today, expiry)
+            self._nearest_expiry_cache[key] = cached
+        return ladders[cached[1]]
+
+    def strike_ladder(self, underlying: str, expiry: Optional[date] = None) -> Optional[StrikeLadder]:
+        """Strike index for ``underlying`` on ``expiry`` (default: nearest expiry)."""
+        key = underlying.upper()
+        if expiry is None:
+            return self._nearest_ladder(key)
+        return self._expiry_ladders(key).get(expiry)
 
     @staticmethod
     def _pick_nearest_expiry(contracts: Sequence[dict]) -> List[dict]:
@@ -105,51 +266,23 @@ class OptionUniverse:
             return None
 
         key = logical.upper()
-        contracts = self._by_name.get(key, [])
-        if not contracts:
+        if not self._by_name.get(key):
             logger.warning("No option contracts found in NFO for logical=%s", logical)
             return {}
 
-        same_expiry = self._pick_nearest_expiry(contracts)
-        if not same_expiry:
+        ladder = self._nearest_ladder(key)
+        if ladder is None or not len(ladder):
             logger.warning("No contracts with valid expiry for logical=%s", logical)
             return {}
 
-        ce_best: Tuple[float, str] | None = None
-        pe_best: Tuple[float, str] | None = None
-
-        for c in same_expiry:
-            ts = c.get("tradingsymbol")
-            inst_type = c.get("instrument_type")
-            if not ts or not inst_type:
-                continue
-
-            strike_raw = c.get("strike")
-            if strike_raw is None:
-                logger.error(
-                    "resolve_atm_for_underlying: strike is None for contract %s "
-                    "in %s; skipping this contract.",
-                    ts, logical,
-                )
-                continue
-
-            try:
-                strike = float(strike_raw)
-                dist = abs(strike - spot)
-            except (TypeError, ValueError):
-                logger.error(
-                    "resolve_atm_for_underlying: invalid types for strike/spot "
-                    "(strike=%r, spot=%r) for %s; skipping this strike.",
-                    strike_raw, spot, logical,
-                )
-                continue
+        try:
+            spot = float(spot)
+        except (TypeError, ValueError):
+            logger.error("resolve_atm_for_underlying: invalid spot %r for %s", spot, logical)
+            return {}
 
-            if inst_type.upper() == "CE":
-                if ce_best is None or dist < ce_best[0]:
-                    ce_best = (dist, ts)
-            elif inst_type.upper() == "PE":
-                if pe_best is None or dist < pe_best[0]:
-                    pe_best = (dist, ts)
+        ce_best = ladder.nearest("CE", spot)
+        pe_best = ladder.nearest("PE", spot)
 
         result: Dict[str, str] = {}
         if ce_best:
@@ -172,12 +305,36 @@ class OptionUniverse:
         Returns:
             mapping logical_name -> {"CE": ts_ce, "PE": ts_pe}
         """
+        self.refresh()
         out: Dict[str, Dict[str, str]] = {}
         for logical, spot in spots.items():
             res = self.resolve_atm_for_underlying(logical, spot)
             if res:
                 out[logical] = res
         return out
+
+    def resolve_strike_band(
+        self,
+        underlying: str,
+        spot: Optional[float],
+        width: int = 1,
+        expiry: Optional[date] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        ATM strike and ``width`` strikes either side on ``expiry`` (default:
+        nearest expiry), ascending by strike.
+
+        Returns:
+            [{"strike": 24950.0, "offset": -1, "CE": ..., "PE": ...}, ...]
+            ("offset" is strikes away from ATM; CE/PE may be None where a
+            side is not listed). Empty if spot is None or nothing is listed.
+        """
+        if spot is None:
+            return []
+        ladder = self.strike_ladder(underlying, expiry)
+        if ladder is None:
+            return []
+        return ladder.band(float(spot), max(0, int(width)))
     
     def iter_underlyings(self):
         """
@@ -237,14 +394,13 @@ class OptionUniverse:
             
             # Get all contracts for this underlying
             key = underlying.upper()
-            contracts = self._by_name.get(key, [])
-            if not contracts:
+            if not self._by_name.get(key):
                 logger.warning("No option contracts found for underlying=%s", underlying)
                 return None
             
-            # Filter contracts for the target expiry
-            expiry_contracts = [c for c in contracts if c.get("expiry") == next_expiry]
-            if not expiry_contracts:
+            # Strike index for the target expiry
+            ladder = self._expiry_ladders(key).get(next_expiry)
+            if ladder is None or not len(ladder):
                 logger.warning(
                     "No contracts found for underlying=%s on expiry=%s",
                     underlying, next_expiry
@@ -258,17 +414,10 @@ class OptionUniverse:
             # Find CE and PE at ATM strike
             ce_symbol = None
             pe_symbol = None
-            
-            for c in expiry_contracts:
-                strike = float(c.get("strike", 0.0))
-                if abs(strike - atm_strike) < 0.01:  # Match with small tolerance
-                    ts = c.get("tradingsymbol")
-                    inst_type = (c.get("instrument_type") or "").upper()
-                    
-                    if inst_type == "CE" and not ce_symbol:
-                        ce_symbol = ts
-                    elif inst_type == "PE" and not pe_symbol:
-                        pe_symbol = ts
+            index = ladder.at_strike(atm_strike)
+            if index is not None:
+                ce_symbol = ladder.ce[index]
+                pe_symbol = ladder.pe[index]
             
             # If exact ATM not found, find nearest strike
             if not ce_symbol or not pe_symbol:
@@ -277,29 +426,11 @@ class OptionUniverse:
                     atm_strike, underlying
                 )
                 
-                ce_best: Tuple[float, str] | None = None
-                pe_best: Tuple[float, str] | None = None
-                
-                for c in expiry_contracts:
-                    strike = float(c.get("strike", 0.0))
-                    ts = c.get("tradingsymbol")
-                    inst_type = (c.get("instrument_type") or "").upper()
-                    
-                    if not ts:
-                        continue
-                    
-                    dist = abs(strike - spot)
-                    
-                    if inst_type == "CE":
-                        if ce_best is None or dist < ce_best[0]:
-                            ce_best = (dist, ts)
-                            atm_strike = strike  # Update to actual strike
-                    elif inst_type == "PE":
-                        if pe_best is None or dist < pe_best[0]:
-                            pe_best = (dist, ts)
+                ce_best = ladder.nearest("CE", spot)
+                pe_best = ladder.nearest("PE", spot)
                 
                 if ce_best:
-                    ce_symbol = ce_best[1]
+                    atm_strike, ce_symbol = ce_best  # Update to actual strike
                 if pe_best:
                     pe_symbol = pe_best[1]
             
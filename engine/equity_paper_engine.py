@@ -11,6 +11,7 @@ from types import SimpleNamespace
 
 from core.config import AppConfig
 from core.modes import TradingMode
+from core.warm_start import WarmStartStore, register_strategy_instances
 from core.pattern_filters import should_trade_trend
 from core.strategy_tags import Profile
 from core.state_store import record_strategy_signal
@@ -22,7 +23,7 @@ from broker.execution_router import ExecutionRouter
 from broker.paper_broker import PaperBroker
 from broker.kite_client import KiteClient
 from configs.timeframes import MULTI_TF_CONFIG, resolve_multi_tf_config
-from data.broker_feed import BrokerFeed
+from data.broker_feed import BrokerFeed, QuoteSnapshot
 from kiteconnect import KiteConnect
 from strategies.base import Decision
 from strategies.fno_intraday_trend import (
@@ -228,6 +229,11 @@ class EquityPaperEngine:
 
         self.strategy_instances = self._build_strategy_instances()
 
+        # Warm start: reload per-symbol trend state saved before a restart
+        self.warm_start = WarmStartStore.from_config(self.cfg.raw.get("warm_start"), name="equity_paper_engine")
+        register_strategy_instances(self.warm_start, "trend_strategies", lambda: self.strategy_instances)
+        self.warm_start.restore()
+
         self.sleep_sec = 5
         self.exchange = "NSE"
         self.running = True
@@ -289,10 +295,14 @@ class EquityPaperEngine:
                 cache_dir = self.artifacts_dir / "market_data"
                 cache_dir.mkdir(parents=True, exist_ok=True)
                 universe_snapshot = {}  # Can be populated from universe
+                data_cfg = self.cfg.raw.get("data", {})
                 self.market_data_engine = MarketDataEngine(
                     self.kite,
                     universe_snapshot,
-                    cache_dir=cache_dir
+                    cache_dir=cache_dir,
+                    refresh_grace_sec=float(data_cfg.get("refresh_grace_sec", 3.0)),
+                    max_refreshes_per_loop=data_cfg.get("refresh_max_per_loop"),
+                    cache_backend=data_cfg.get("cache_backend", "binary"),
                 )
             except Exception as exc:
                 logger.warning("Failed to initialize MarketDataEngine: %s", exc)
@@ -527,6 +537,7 @@ class EquityPaperEngine:
                         continue
 
                     self._loop_once()
+                    self.warm_start.maybe_save()
                     time.sleep(self.sleep_sec)
                 except KeyboardInterrupt:
                     logger.info("EquityPaperEngine interrupted by user.")
@@ -543,6 +554,9 @@ class EquityPaperEngine:
                 except Exception as exc:
                     logger.warning("Error stopping MDE v2: %s", exc)
             
+            # Checkpoint strategy state for the next start
+            self.warm_start.save()
+            
             # Publish engine shutdown telemetry
             publish_engine_health(
                 "equity_paper_engine",
@@ -553,17 +567,12 @@ class EquityPaperEngine:
     def _loop_once(self) -> None:
         self._loop_counter += 1
 
-        price_cache: Dict[str, float] = {}
-
-        def _ltp(symbol: str) -> float:
-            if symbol not in price_cache:
-                price = self.feed.get_ltp(symbol, exchange=self.exchange)
-                price_cache[symbol] = price
-                self.last_prices[symbol] = price
-            return price_cache[symbol]
+        quotes = QuoteSnapshot(self.feed, exchange=self.exchange)
 
         # If Strategy Engine v2 is available, use it
         if self.strategy_engine_v2 and self.market_data_engine:
+            # One batched LTP request for every tradable symbol this loop
+            quotes.prefetch(s for s in self.universe if s not in self.banned_symbols)
             for symbol in self.universe:
                 if symbol in self.banned_symbols:
                     logger.info("Equity %s is banned for this session due to per-symbol loss limit; skipping.", symbol)
@@ -574,7 +583,8 @@ class EquityPaperEngine:
                     continue
 
                 try:
-                    price = _ltp(symbol)
+                    price = quotes.ltp(symbol)
+                    self.last_prices[symbol] = price
                     if price is None:
                         continue
                     
@@ -583,7 +593,7 @@ class EquityPaperEngine:
                     logical_base = f"EQ_{symbol}"
                     tf = self.default_timeframe
                     
-                    # Update market data cache
+                    # Update market data cache (no-op until the current bar closes)
                     try:
                         self.market_data_engine.update_cache(symbol, tf)
                     except Exception as exc:
@@ -603,6 +613,7 @@ class EquityPaperEngine:
                         "low": [c["low"] for c in window],
                         "close": [c["close"] for c in window],
                         "volume": [c.get("volume", 0) for c in window],
+                        "ts": [c.get("ts") for c in window],
                     }
                     
                     # Get current candle
@@ -731,6 +742,11 @@ class EquityPaperEngine:
                     logger.exception("Error processing equity symbol=%s with v2 engine: %s", symbol, exc)
         else:
             # Use legacy strategy instances
+            quotes.prefetch(
+                getattr(strat, "logical", "")
+                for strat in self.strategy_instances
+                if getattr(strat, "logical", "") not in self.banned_symbols
+            )
             for strat in self.strategy_instances:
                 symbol = getattr(strat, "logical", "")
                 if not symbol:
@@ -745,7 +761,8 @@ class EquityPaperEngine:
                     continue
 
                 try:
-                    price = _ltp(symbol)
+                    price = quotes.ltp(symbol)
+                    self.last_prices[symbol] = price
                     if price is not None:
                         self._record_regime_sample(symbol, price)
 
@@ -9,6 +9,7 @@ from types import SimpleNamespace
 
 from core.config import AppConfig
 from core.modes import TradingMode
+from core.warm_start import WarmStartStore, register_strategy_instances
 from core.market_session import is_market_open
 from core.pattern_filters import should_trade_trend
 from core.strategy_tags import Profile
@@ -21,7 +22,7 @@ from broker.paper_broker import PaperBroker
 from broker.kite_client import KiteClient
 from kiteconnect import KiteConnect
 from configs.timeframes import MULTI_TF_CONFIG, resolve_multi_tf_config
-from data.broker_feed import BrokerFeed, BrokerAuthError
+from data.broker_feed import BrokerFeed, BrokerAuthError, QuoteSnapshot
 from data.instruments import resolve_fno_symbols
 from data.options_instruments import OptionUniverse
 from strategies.base import Decision
@@ -227,6 +228,11 @@ class OptionsPaperEngine:
 
         self.strategy_instances = self._build_strategy_instances()
 
+        # Warm start: reload per-symbol trend state saved before a restart
+        self.warm_start = WarmStartStore.from_config(self.cfg.raw.get("warm_start"), name="options_paper_engine")
+        register_strategy_instances(self.warm_start, "trend_strategies", lambda: self.strategy_instances)
+        self.warm_start.restore()
+
         # NFO option universe
         if option_universe_override is not None:
             self.option_universe = option_universe_override
@@ -304,10 +310,12 @@ class OptionsPaperEngine:
                 cache_dir = self.artifacts_dir / "market_data"
                 cache_dir.mkdir(parents=True, exist_ok=True)
                 universe_snapshot = {}  # Can be populated from universe
+                data_cfg = self.cfg.raw.get("data", {})
                 self.market_data_engine = MarketDataEngine(
                     self.kite,
                     universe_snapshot,
-                    cache_dir=cache_dir
+                    cache_dir=cache_dir,
+                    cache_backend=data_cfg.get("cache_backend", "binary"),
                 )
             except Exception as exc:
                 logger.warning("Failed to initialize MarketDataEngine: %s", exc)
@@ -580,6 +588,7 @@ class OptionsPaperEngine:
                         continue
 
                     self._loop_once()
+                    self.warm_start.maybe_save()
                     time.sleep(self.sleep_sec)
                 except KeyboardInterrupt:
                     logger.info("OptionsPaperEngine interrupted by user.")
@@ -609,6 +618,9 @@ class OptionsPaperEngine:
                 except Exception as exc:
                     logger.warning("Error stopping MDE v2: %s", exc)
             
+            # Checkpoint strategy state for the next start
+            self.warm_start.save()
+            
             # Publish engine shutdown telemetry
             publish_engine_health(
                 "options_paper_engine",
@@ -632,11 +644,15 @@ class OptionsPaperEngine:
             "signals_by_symbol": {},
         }
 
+        # Per-loop LTP snapshot: one batched request for FUTs, one for options
+        quotes = QuoteSnapshot(self.feed, exchange=self.fno_exchange)
+
         # Step 1: get underlying FUT spots
         spots: Dict[str, float] = {}
+        quotes.prefetch(self.underlying_futs.values())
         for logical_base, fut_ts in self.underlying_futs.items():
             try:
-                price = self.feed.get_ltp(fut_ts, exchange=self.fno_exchange)
+                price = quotes.ltp(fut_ts)
                 spots[logical_base] = price
                 self.last_prices[fut_ts] = price
                 if price is not None:
@@ -675,14 +691,12 @@ class OptionsPaperEngine:
             time.sleep(2)
             return
 
-        price_cache: Dict[str, float] = {}
-
-        def _ltp(symbol: str) -> float:
-            if symbol not in price_cache:
-                price = self.feed.get_ltp(symbol, exchange=self.fno_exchange)
-                price_cache[symbol] = price
-                self.last_prices[symbol] = price
-            return price_cache[symbol]
+        quotes.prefetch(
+            ts
+            for option_series in atm_map.values()
+            for ts in option_series.values()
+            if ts not in self.banned_symbols
+        )
 
         # Step 3: process each strategy instance (per logical + timeframe)
         for strat in self.strategy_instances:
@@ -711,7 +725,8 @@ class OptionsPaperEngine:
                     continue
 
                 try:
-                    price = _ltp(ts)
+                    price = quotes.ltp(ts)
+                    self.last_prices[ts] = price
                     bar = {"close": price, "tf": tf_label, "option_type": opt_type}
                     raw_decision = strat.on_bar(ts, bar)
                     decision = self._ensure_decision(strat, raw_decision)
@@ -1372,11 +1387,19 @@ class OptionsPaperEngine:
             if now - getattr(self, "_last_position_price_refresh", 0.0) < self.position_price_refresh_interval:
                 return
 
-        for symbol, pos in self.paper_broker.get_all_positions().items():
-            if not symbol or pos.quantity == 0:
-                continue
+        open_symbols = [
+            symbol
+            for symbol, pos in self.paper_broker.get_all_positions().items()
+            if symbol and pos.quantity != 0
+        ]
+        quotes = QuoteSnapshot(self.feed, exchange=self.fno_exchange)
+        try:
+            quotes.prefetch(open_symbols)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Batched LTP refresh failed, falling back per symbol: %s", exc)
+        for symbol in open_symbols:
             try:
-                price = self.feed.get_ltp(symbol, exchange=self.fno_exchange)
+                price = quotes.ltp(symbol)
             except Exception as exc:  # noqa: BLE001
                 logger.debug("Failed to refresh LTP for %s: %s", symbol, exc)
                 continue
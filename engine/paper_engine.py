@@ -48,6 +48,7 @@ except Exception:
 
 from core.config import AppConfig
 from core.modes import TradingMode
+from core.warm_start import WarmStartStore
 from core.market_session import is_market_open
 from core.pattern_filters import should_trade_trend
 from core.strategy_tags import Profile
@@ -57,7 +58,7 @@ from core.portfolio_engine import PortfolioEngine, PortfolioConfig
 from broker.execution_router import ExecutionRouter
 from broker.paper_broker import PaperBroker
 
-from data.broker_feed import BrokerFeed
+from data.broker_feed import BrokerFeed, QuoteSnapshot
 from data.instruments import resolve_fno_symbols
 
 from kiteconnect import KiteConnect
@@ -70,6 +71,7 @@ from strategies.fno_intraday_trend import (
     build_reason,
 )
 
+from analytics.diagnostics import configure_diagnostics_writer, flush_diagnostics
 from analytics.trade_recorder import TradeRecorder
 from analytics.trade_journal import finalize_trade, TRADE_JOURNAL_FIELDS
 from analytics.multi_timeframe_engine import MultiTimeframeEngine
@@ -174,6 +176,7 @@ from core.trade_throttler import (
 from core.risk_engine import RiskEngine, RiskDecision, RiskAction
 from core.strategy_registry import STRATEGY_REGISTRY
 from core.strategy_metrics import StrategyMetricsTracker
+from core.evaluation_scheduler import EvaluationScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -601,10 +604,17 @@ class PaperEngine:
         )
         universe_snapshot = load_universe()
         cache_dir = self.artifacts_dir / "market_data"
-        self.market_data_engine = MarketDataEngine(self.kite, universe_snapshot, cache_dir=cache_dir)
+        data_config = self.cfg.raw.get("data", {})
+        self.market_data_engine = MarketDataEngine(
+            self.kite,
+            universe_snapshot,
+            cache_dir=cache_dir,
+            refresh_grace_sec=float(data_config.get("refresh_grace_sec", 3.0)),
+            max_refreshes_per_loop=data_config.get("refresh_max_per_loop"),
+            cache_backend=data_config.get("cache_backend", "binary"),
+        )
         
         # Initialize Market Data Engine v2 (optional, based on config)
-        data_config = self.cfg.raw.get("data", {})
         use_mde_v2 = data_config.get("use_mde_v2", False)
         self.market_data_engine_v2 = None
         
@@ -851,6 +861,29 @@ class PaperEngine:
                 self.strategy_engine_v2 = None
                 self.strategy_engine_v3 = None
         
+        # Evaluate v2/v3 strategies only when a bar closed or the price moved
+        scheduler_config = (self.cfg.raw.get("strategy_engine") or {}).get("scheduler")
+        self.evaluation_scheduler = EvaluationScheduler.from_config(scheduler_config)
+        if self.market_data_engine_v2:
+            self.market_data_engine_v2.register_on_candle_close(self.evaluation_scheduler.on_candle_close)
+        
+        # Batched background writer for strategy diagnostics (SRDE)
+        if self.cfg.raw.get("diagnostics"):
+            configure_diagnostics_writer(self.cfg.raw.get("diagnostics"))
+        
+        # Warm start: reload strategy engine state saved before a restart
+        # (StrategyEngineV3 routes it to its worker pool when parallel is on)
+        self.warm_start = WarmStartStore.from_config(self.cfg.raw.get("warm_start"), name="paper_engine")
+        if getattr(self, "strategy_engine_v2", None):
+            self.warm_start.register(
+                "strategy_engine_v2", self.strategy_engine_v2.export_warm_state, self.strategy_engine_v2.import_warm_state
+            )
+        if getattr(self, "strategy_engine_v3", None):
+            self.warm_start.register(
+                "strategy_engine_v3", self.strategy_engine_v3.export_warm_state, self.strategy_engine_v3.import_warm_state
+            )
+        self.warm_start.restore()
+        
         risk_config = self.cfg.risk or {}
         self.risk_engine = RiskEngine(risk_config, self.state_store.load_checkpoint() or {}, logger)
         
@@ -1179,6 +1212,7 @@ class PaperEngine:
                     continue
 
                 self._loop_once()
+                self.warm_start.maybe_save()
                 time.sleep(self.sleep_sec)
         except Exception as exc:
             logger.error("PaperEngine error: %s", exc, exc_info=True)
@@ -1197,6 +1231,16 @@ class PaperEngine:
                 except Exception as exc:
                     logger.warning("Error stopping MDE v2: %s", exc)
             
+            # Stop Strategy Engine v3 worker processes, if any
+            if getattr(self, "strategy_engine_v3", None):
+                self.strategy_engine_v3.close()
+            
+            # Write out diagnostics still queued for the background writer
+            flush_diagnostics()
+            
+            # Checkpoint strategy state for the next start
+            self.warm_start.save()
+            
             # Publish engine shutdown telemetry
             publish_engine_health(
                 "paper_engine",
@@ -1204,35 +1248,121 @@ class PaperEngine:
                 {"mode": self.mode.value}
             )
 
+    def _process_v3_intent(self, symbol: str, ltp: float, primary_tf: str, intent: Any) -> None:
+        """Emit diagnostics for a StrategyEngineV3 intent and act on it unless HOLD."""
+        logical = self.logical_alias.get(symbol, symbol)
+        
+        # Emit diagnostics for V3 engine (non-blocking, best-effort)
+        if intent:
+            try:
+                from analytics.diagnostics import build_diagnostic_record, append_diagnostic
+                
+                # Extract metadata
+                metadata = intent.metadata or {}
+                indicators = metadata.get("indicators", {})
+                
+                # Get indicator values
+                ema20 = indicators.get("ema20")
+                ema50 = indicators.get("ema50")
+                trend_strength = indicators.get("trend_strength")
+                
+                # Get regime if available
+                regime_label = indicators.get("regime")
+                
+                # Get RR if available
+                rr = indicators.get("rr") or indicators.get("risk_reward")
+                
+                # Determine risk block
+                risk_block = "none"
+                if intent.action == "HOLD":
+                    reason_lower = intent.reason.lower()
+                    if "loss" in reason_lower or "capital" in reason_lower:
+                        risk_block = "max_loss"
+                    elif "cooldown" in reason_lower or "throttle" in reason_lower:
+                        risk_block = "cooldown"
+                    elif "slippage" in reason_lower:
+                        risk_block = "slippage"
+                
+                # Build diagnostic record
+                diagnostic = build_diagnostic_record(
+                    price=ltp,
+                    decision=intent.action,
+                    reason=intent.reason,
+                    confidence=intent.confidence,
+                    ema20=ema20,
+                    ema50=ema50,
+                    trend_strength=trend_strength,
+                    rr=rr,
+                    regime=regime_label,
+                    risk_block=risk_block,
+                    # Additional fields
+                    strategy_id=intent.strategy_code,
+                    timeframe=primary_tf,
+                    setup=metadata.get("setup", ""),
+                )
+                
+                append_diagnostic(logical, intent.strategy_code, diagnostic)
+            except Exception as diag_exc:
+                # Never let diagnostics crash the engine
+                logger.debug("Diagnostics emission failed for %s: %s", symbol, diag_exc)
+        
+        # Process intent if not HOLD
+        if intent and intent.action != "HOLD":
+            # Extract metadata for logging
+            metadata = intent.metadata or {}
+            indicators = metadata.get("indicators", {})
+            
+            # Log the fused signal
+            self.recorder.log_fused_signal(
+                symbol=symbol,
+                price=ltp,
+                action=intent.action,
+                confidence=intent.confidence,
+                setup=metadata.get("setup", ""),
+                fuse_reason=metadata.get("fuse_reason", ""),
+                multi_tf_status=metadata.get("multi_tf_status", ""),
+                num_strategies=metadata.get("num_strategies", 0),
+                strategy_codes=metadata.get("strategy_codes", []),
+                indicators=indicators,
+            )
+            
+            # Call _handle_signal to execute the trade
+            self._handle_signal(
+                symbol=symbol,
+                signal=intent.action,
+                price=ltp,
+                logical=logical,
+                tf=primary_tf,
+                strategy_name=intent.strategy_code,
+                strategy_code=intent.strategy_code,
+                confidence=intent.confidence,
+                reason=intent.reason,
+                indicators=indicators,
+                playbook=metadata.get("setup", ""),
+            )
+
     def _loop_once(self) -> None:
         self._loop_counter += 1
 
-        price_cache: Dict[str, float | None] = {}
+        # One batched LTP request for the whole universe per loop
+        quotes = QuoteSnapshot(self.feed, exchange=self.fno_exchange)
+        quotes.prefetch(self.universe)
 
-        def _ltp(symbol: str) -> float | None:
-            if symbol not in price_cache:
-                price = self.feed.get_ltp(symbol, exchange=self.fno_exchange)
-                price_cache[symbol] = price
-                if price is not None:
-                    self.last_prices[symbol] = price
-            return price_cache[symbol]
-
-        # Update market data cache for all symbols before strategies run
+        # Refresh market data caches whose bar has closed since the last fetch
         if self.market_data_engine:
+            refresh_keys = []
             for symbol in self.universe:
-                try:
-                    # Determine timeframe - use default or symbol-specific
-                    logical = self.logical_alias.get(symbol, symbol)
-                    timeframes = self.multi_tf_config.get(logical, [self.default_timeframe])
-                    tf = timeframes[0] if timeframes else self.default_timeframe
-                    self.market_data_engine.update_cache(symbol, tf)
-                except Exception as exc:  # noqa: BLE001
-                    logger.debug("Market data cache update failed for %s: %s", symbol, exc)
+                # Determine timeframe - use default or symbol-specific
+                logical = self.logical_alias.get(symbol, symbol)
+                timeframes = self.multi_tf_config.get(logical, [self.default_timeframe])
+                refresh_keys.append((symbol, timeframes[0] if timeframes else self.default_timeframe))
+            self.market_data_engine.refresh_due(refresh_keys)
 
         ticks = {}
         for symbol in self.universe:
-            ltp = _ltp(symbol)
+            ltp = quotes.ltp(symbol)
             if ltp is not None:
+                self.last_prices[symbol] = ltp
                 ticks[symbol] = {"close": ltp}
                 
                 # Feed ticks to MDE v2 if available
@@ -1263,19 +1393,24 @@ class PaperEngine:
 
         # Run strategy engine (v1, v2, or v3 based on initialization)
         if hasattr(self, 'strategy_engine_v3') and self.strategy_engine_v3:
-            # Use Strategy Engine v3
+            # Use Strategy Engine v3: collect the symbols to evaluate, then
+            # evaluate them in one batch (across worker processes when the
+            # engine's parallel mode is enabled)
+            primary_tf = self.strategy_engine_v3.primary_tf
+            secondary_tf = self.strategy_engine_v3.secondary_tf
+            requests = []
             for symbol in self.universe:
-                logical = self.logical_alias.get(symbol, symbol)
                 ltp = ticks.get(symbol, {}).get("close")
                 
                 if ltp is None:
                     continue
                 
-                # Prepare market data for v3
-                # Get primary and secondary timeframe series
-                primary_tf = self.strategy_engine_v3.primary_tf
-                secondary_tf = self.strategy_engine_v3.secondary_tf
+                # Skip symbols with no new bar and no significant price move
+                latest_bar = self.market_data_engine.get_latest_candle(symbol, primary_tf) or {}
+                if not self.evaluation_scheduler.should_evaluate(symbol, primary_tf, ltp, bar_ts=latest_bar.get("ts")):
+                    continue
                 
+                # Prepare market data for v3
                 # Fetch primary series
                 primary_window = self.market_data_engine.get_window(symbol, primary_tf, 200)
                 primary_series = {}
@@ -1286,6 +1421,7 @@ class PaperEngine:
                         "low": [c["low"] for c in primary_window],
                         "close": [c["close"] for c in primary_window],
                         "volume": [c.get("volume", 0) for c in primary_window],
+                        "ts": [c.get("ts") for c in primary_window],
                     }
                 
                 # Fetch secondary series
@@ -1298,6 +1434,7 @@ class PaperEngine:
                         "low": [c["low"] for c in secondary_window],
                         "close": [c["close"] for c in secondary_window],
                         "volume": [c.get("volume", 0) for c in secondary_window],
+                        "ts": [c.get("ts") for c in secondary_window],
                     }
                 
                 # Prepare market data dict
@@ -1306,102 +1443,18 @@ class PaperEngine:
                     "secondary_series": secondary_series,
                 }
                 
-                # Evaluate v3 engine
+                ts = datetime.now(timezone.utc).isoformat()
+                requests.append((symbol, ts, ltp, md))
+            
+            intents = self.strategy_engine_v3.evaluate_many(requests)
+            for (symbol, _, ltp, _), intent in zip(requests, intents):
                 try:
-                    ts = datetime.now(timezone.utc).isoformat()
-                    
-                    intent = self.strategy_engine_v3.evaluate(symbol, ts, ltp, md)
-                    
-                    # Emit diagnostics for V3 engine (non-blocking, best-effort)
-                    if intent:
-                        try:
-                            from analytics.diagnostics import build_diagnostic_record, append_diagnostic
-                            
-                            # Extract metadata
-                            metadata = intent.metadata or {}
-                            indicators = metadata.get("indicators", {})
-                            
-                            # Get indicator values
-                            ema20 = indicators.get("ema20")
-                            ema50 = indicators.get("ema50")
-                            trend_strength = indicators.get("trend_strength")
-                            
-                            # Get regime if available
-                            regime_label = indicators.get("regime")
-                            
-                            # Get RR if available
-                            rr = indicators.get("rr") or indicators.get("risk_reward")
-                            
-                            # Determine risk block
-                            risk_block = "none"
-                            if intent.action == "HOLD":
-                                reason_lower = intent.reason.lower()
-                                if "loss" in reason_lower or "capital" in reason_lower:
-                                    risk_block = "max_loss"
-                                elif "cooldown" in reason_lower or "throttle" in reason_lower:
-                                    risk_block = "cooldown"
-                                elif "slippage" in reason_lower:
-                                    risk_block = "slippage"
-                            
-                            # Build diagnostic record
-                            diagnostic = build_diagnostic_record(
-                                price=ltp,
-                                decision=intent.action,
-                                reason=intent.reason,
-                                confidence=intent.confidence,
-                                ema20=ema20,
-                                ema50=ema50,
-                                trend_strength=trend_strength,
-                                rr=rr,
-                                regime=regime_label,
-                                risk_block=risk_block,
-                                # Additional fields
-                                strategy_id=intent.strategy_code,
-                                timeframe=primary_tf,
-                                setup=metadata.get("setup", ""),
-                            )
-                            
-                            append_diagnostic(logical, intent.strategy_code, diagnostic)
-                        except Exception as diag_exc:
-                            # Never let diagnostics crash the engine
-                            logger.debug("Diagnostics emission failed for %s: %s", symbol, diag_exc)
-                    
-                    # Process intent if not HOLD
-                    if intent and intent.action != "HOLD":
-                        # Extract metadata for logging
-                        metadata = intent.metadata or {}
-                        indicators = metadata.get("indicators", {})
-                        
-                        # Log the fused signal
-                        self.recorder.log_fused_signal(
-                            symbol=symbol,
-                            price=ltp,
-                            action=intent.action,
-                            confidence=intent.confidence,
-                            setup=metadata.get("setup", ""),
-                            fuse_reason=metadata.get("fuse_reason", ""),
-                            multi_tf_status=metadata.get("multi_tf_status", ""),
-                            num_strategies=metadata.get("num_strategies", 0),
-                            strategy_codes=metadata.get("strategy_codes", []),
-                            indicators=indicators,
-                        )
-                        
-                        # Call _handle_signal to execute the trade
-                        self._handle_signal(
-                            symbol=symbol,
-                            signal=intent.action,
-                            price=ltp,
-                            logical=logical,
-                            tf=primary_tf,
-                            strategy_name=intent.strategy_code,
-                            strategy_code=intent.strategy_code,
-                            confidence=intent.confidence,
-                            reason=intent.reason,
-                            indicators=indicators,
-                            playbook=metadata.get("setup", ""),
-                        )
+                    self._process_v3_intent(symbol, ltp, primary_tf, intent)
                 except Exception as e:
-                    logger.error("Strategy Engine v3 evaluation failed for %s: %s", symbol, e, exc_info=True)
+                    logger.error("Strategy Engine v3 signal handling failed for %s: %s", symbol, e, exc_info=True)
+            
+            # Strategy latency histograms (rate-limited inside the engine)
+            self.strategy_engine_v3.publish_health()
         
         elif self.strategy_engine_v2:
             # Use Strategy Engine v2 with evaluate() method
@@ -1426,6 +1479,11 @@ class PaperEngine:
                 timeframes = self.multi_tf_config.get(logical, [self.default_timeframe])
                 tf = timeframes[0] if timeframes else self.default_timeframe
                 
+                # Skip symbols with no new bar and no significant price move
+                latest_bar = self.market_data_engine.get_latest_candle(symbol, tf) or {}
+                if not self.evaluation_scheduler.should_evaluate(symbol, tf, ltp, bar_ts=latest_bar.get("ts")):
+                    continue
+                
                 # Fetch candle window from market data engine
                 window = self.market_data_engine.get_window(symbol, tf, 200)
                 
@@ -1440,6 +1498,7 @@ class PaperEngine:
                     "low": [c["low"] for c in window],
                     "close": [c["close"] for c in window],
                     "volume": [c.get("volume", 0) for c in window],
+                    "ts": [c.get("ts") for c in window],
                 }
                 
                 # Get current candle
@@ -1609,6 +1668,9 @@ class PaperEngine:
                 # Update unrealized PnL
                 self.metrics_tracker.update_unrealized_pnl(total_unrealized)
                 
+                # Executed vs skipped strategy evaluations
+                self.metrics_tracker.update_evaluation_stats(self.evaluation_scheduler.snapshot())
+                
                 # Push equity snapshot (rate-limited to every 5 seconds)
                 self.metrics_tracker.push_equity_snapshot(min_interval_sec=5.0)
                 
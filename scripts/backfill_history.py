@@ -3,17 +3,16 @@ from __future__ import annotations
 import argparse
 import csv
 import logging
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Sequence, Set
 
 from core.config import AppConfig, load_config
+from core.historical_fetcher import DEFAULT_FETCH_WORKERS, HistoricalFetcher, HistoricalRequest
 from core.history_loader import _default_history_path as history_path  # type: ignore import
 from core.history_loader import _resolve_instrument_token  # type: ignore import
 from core.kite_env import load_kite_env, make_kite_client_from_env
 from core.logging_utils import setup_logging
-from core.kite_http import kite_request
 from core.universe import fno_underlyings, load_equity_universe as load_equity_universe_csv
 from data.instruments import resolve_fno_symbols
 
@@ -21,7 +20,6 @@ from data.instruments import resolve_fno_symbols
 logger = logging.getLogger(__name__)
 
 INTERVALS: Sequence[str] = ("5minute", "15minute", "60minute", "day")
-RATE_LIMIT_SEC = 0.3
 
 
 def parse_date(value: str) -> datetime:
@@ -126,17 +124,14 @@ def fetch_history(
     interval: str,
     start: datetime,
     end: datetime,
+    fetcher: HistoricalFetcher | None = None,
 ) -> List[Dict[str, float | str]]:
     token = _resolve_instrument_token(kite, symbol)
-    candles = kite_request(
-        kite.historical_data,
-        instrument_token=token,
-        from_date=start,
-        to_date=end,
-        interval=interval,
-        continuous=False,
-        oi=False,
-    )
+    fetcher = fetcher or HistoricalFetcher(kite)
+    return candles_to_rows(fetcher.fetch(token, interval, start, end))
+
+
+def candles_to_rows(candles: List[Dict]) -> List[Dict[str, float | str]]:
     rows: List[Dict[str, float | str]] = []
     for candle in candles or []:
         ts = candle.get("date")
@@ -184,6 +179,12 @@ def main() -> None:
         action="store_true",
         help="Force refetch even if data for the date already exists.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help=f"Concurrent historical requests (rate limited to the Kite quota). Default: {DEFAULT_FETCH_WORKERS}.",
+    )
     args = parser.parse_args()
 
     cfg = load_config(args.config)
@@ -209,19 +210,33 @@ def main() -> None:
     start_dt = date_anchor
     end_dt = date_anchor + timedelta(days=1)
 
+    requests: List[HistoricalRequest] = []
     for symbol in sorted(symbols):
+        token = None
         for interval in INTERVALS:
             path = history_path(symbol, interval)
             if not args.force and history_contains_date(path, date_str):
                 logger.info("[SKIP] %s %s already has data for %s", symbol, interval, date_str)
                 continue
-            rows = fetch_history(kite, symbol, interval, start_dt, end_dt)
-            if not rows:
-                logger.warning("[MISS] No data returned for %s interval=%s", symbol, interval)
-                continue
-            write_history(path, rows)
-            logger.info("[BACKFILL] %s %s (%d bars)", symbol, interval, len(rows))
-            time.sleep(RATE_LIMIT_SEC)
+            if token is None:
+                try:
+                    token = _resolve_instrument_token(kite, symbol)
+                except KeyError as exc:
+                    logger.warning("[MISS] %s", exc)
+                    break
+            requests.append(HistoricalRequest((symbol, interval), token, interval, start_dt, end_dt))
+
+    # Fetch everything concurrently; the fetcher keeps us under the historical API quota
+    fetcher = HistoricalFetcher(kite, max_workers=args.workers)
+    results = fetcher.fetch_many(requests)
+    for request in requests:
+        symbol, interval = request.key
+        rows = candles_to_rows(results.get(request.key) or [])
+        if not rows:
+            logger.warning("[MISS] No data returned for %s interval=%s", symbol, interval)
+            continue
+        write_history(history_path(symbol, interval), rows)
+        logger.info("[BACKFILL] %s %s (%d bars)", symbol, interval, len(rows))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+StrategyEngineV3 Parallel Evaluation Benchmark
+
+Evaluates a synthetic universe with StrategyEngineV3 in-process and through
+evaluate_many() with 1..N worker processes, and reports the time per batch
+(one evaluation per symbol) and the speedup over the in-process loop.
+
+No broker connection is needed: series are random walks.
+
+Usage:
+    python -m scripts.bench_strategy_v3_parallel --symbols 200 --workers 1 2 4 8
+    python -m scripts.bench_strategy_v3_parallel --bars 500 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add parent directory to path to allow imports
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from core.strategy_engine_v3 import STRATEGY_REGISTRY_V3, StrategyEngineV3
+
+
+def build_series(num_bars: int, seed: int) -> Dict[str, List[Any]]:
+    """Random-walk OHLCV series with ISO timestamps."""
+    rng = random.Random(seed)
+    price = 1000.0 + seed
+    cols: Dict[str, List[Any]] = {"open": [], "high": [], "low": [], "close": [], "volume": [], "ts": []}
+    for i in range(num_bars):
+        open_ = price
+        price = max(1.0, price + rng.gauss(0.0, 4.0))
+        cols["open"].append(open_)
+        cols["high"].append(max(open_, price) + rng.random() * 2)
+        cols["low"].append(min(open_, price) - rng.random() * 2)
+        cols["close"].append(price)
+        cols["volume"].append(rng.randint(100, 5000))
+        cols["ts"].append(f"bar-{i:06d}")
+    return cols
+
+
+def build_requests(num_symbols: int, num_bars: int, batch: int) -> List[Tuple[str, str, float, Dict[str, Any]]]:
+    """One request per symbol; `batch` makes each round's bar keys distinct (no cache hits)."""
+    requests = []
+    for i in range(num_symbols):
+        primary = build_series(num_bars, i)
+        secondary = build_series(num_bars, 10_000 + i)
+        primary["ts"][-1] = secondary["ts"][-1] = f"round-{batch}"
+        md = {"primary_series": primary, "secondary_series": secondary}
+        requests.append((f"SYM{i:04d}", f"round-{batch}", primary["close"][-1], md))
+    return requests
+
+
+def time_rounds(engine: StrategyEngineV3, rounds: List[list], parallel: bool) -> float:
+    """Median seconds per batch."""
+    timings = []
+    for requests in rounds:
+        start = time.perf_counter()
+        if parallel:
+            engine.evaluate_many(requests)
+        else:
+            for request in requests:
+                engine.evaluate(*request)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel StrategyEngineV3 evaluation")
+    parser.add_argument("--symbols", type=int, default=200, help="Universe size")
+    parser.add_argument("--bars", type=int, default=200, help="Bars per series (primary and secondary)")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed batches per configuration")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to test")
+    args = parser.parse_args()
+
+    cfg = {
+        "primary_tf": "5m",
+        "secondary_tf": "15m",
+        "strategies": [{"id": sid} for sid in STRATEGY_REGISTRY_V3],
+    }
+    # Warmup batch (pool start-up, imports) plus the timed batches
+    rounds = [build_requests(args.symbols, args.bars, batch) for batch in range(args.rounds + 1)]
+
+    print(f"CPUs: {os.cpu_count()}  symbols: {args.symbols}  bars: {args.bars}  rounds: {args.rounds}")
+    engine = StrategyEngineV3(cfg)
+    time_rounds(engine, rounds[:1], parallel=False)
+    baseline = time_rounds(engine, rounds[1:], parallel=False)
+    print(f"{'mode':<14}{'batch ms':>10}{'us/symbol':>12}{'speedup':>9}")
+    print(f"{'in-process':<14}{baseline * 1e3:>10.1f}{baseline / args.symbols * 1e6:>12.0f}{1.0:>8.2f}x")
+
+    for workers in args.workers:
+        engine = StrategyEngineV3({**cfg, "parallel": {"enabled": True, "workers": workers, "fallback_inline": False}})
+        try:
+            time_rounds(engine, rounds[:1], parallel=True)
+            elapsed = time_rounds(engine, rounds[1:], parallel=True)
+        finally:
+            engine.close()
+        label = f"{workers} worker" + ("s" if workers > 1 else "")
+        print(f"{label:<14}{elapsed * 1e3:>10.1f}{elapsed / args.symbols * 1e6:>12.0f}{baseline / elapsed:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
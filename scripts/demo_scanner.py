@@ -147,9 +147,10 @@ def main():
     mock_config = MagicMock()
     print("✅ Mock API ready\n")
     
-    # Create scanner
+    # Create scanner (mock instrument snapshot stays out of artifacts/)
     print("🔍 Initializing MarketScanner...")
-    scanner = MarketScanner(mock_kite, mock_config)
+    output_dir = Path("/tmp/scanner_demo")
+    scanner = MarketScanner(mock_kite, mock_config, artifacts_dir=output_dir)
     print("✅ Scanner initialized\n")
     
     # Run scan
@@ -187,7 +188,6 @@ def main():
     
     # Test persistence
     print("💾 Testing persistence...")
-    output_dir = Path("/tmp/scanner_demo")
     scanner_with_tmp = MarketScanner(mock_kite, mock_config, artifacts_dir=output_dir)
     saved_path = scanner_with_tmp.save(universe)
     print(f"✅ Universe saved to: {saved_path}")
@@ -24,6 +24,7 @@ from core.kite_env import (
     token_is_valid,
 )
 from core.market_session import now_ist
+from core.tick_recorder import TickRecorder
 from core.universe import fno_underlyings, load_equity_universe
 from data.instruments import resolve_fno_symbols
 
@@ -206,6 +207,7 @@ def _run_live_quotes_session(
     api_key: str,
     access_token: str,
     stop_event: Optional[threading.Event] = None,
+    recorder: Optional[TickRecorder] = None,
 ) -> None:
     if not api_key:
         raise RuntimeError("Kite API key missing. Please configure secrets/kite.env or environment variables.")
@@ -234,6 +236,11 @@ def _run_live_quotes_session(
     ticker = KiteTicker(api_key, access_token)
 
     def handle_ticks(_ws, ticks: List[Dict[str, Any]]) -> None:
+        if recorder is not None and ticks:
+            try:
+                recorder.record(ticks)
+            except Exception as exc:  # noqa: BLE001
+                log.error("Failed to record ticks: %s", exc)
         for tick in ticks or []:
             token = tick.get("instrument_token")
             if token not in token_lookup:
@@ -282,12 +289,20 @@ def _run_live_quotes_session(
         except Exception:  # noqa: BLE001
             pass
         writer.join(timeout=3.0)
+        if recorder is not None:
+            recorder.flush()
         log.info("Live quotes streamer stopped.")
 
 
-def run_live_quotes_service(stop_event: Optional[threading.Event] = None) -> None:
+def run_live_quotes_service(
+    stop_event: Optional[threading.Event] = None,
+    recorder: Optional[TickRecorder] = None,
+) -> None:
     """
     Continuously stream quotes, reloading credentials after failures so other terminals can refresh tokens.
+
+    When ``recorder`` is given, every websocket packet is also written to the
+    daily tick files used for offline replay.
     """
     local_stop = stop_event or threading.Event()
     while not local_stop.is_set():
@@ -313,7 +328,7 @@ def run_live_quotes_service(stop_event: Optional[threading.Event] = None) -> Non
                 time.sleep(30)
                 continue
 
-            _run_live_quotes_session(kite, api_key, access_token, local_stop)
+            _run_live_quotes_session(kite, api_key, access_token, local_stop, recorder=recorder)
         except kite_exceptions.TokenException:
             if local_stop.is_set():
                 break
@@ -336,6 +351,11 @@ def main() -> None:
         action="store_true",
         help="Log additional diagnostics about credential sources and preflight checks.",
     )
+    parser.add_argument(
+        "--record-ticks",
+        action="store_true",
+        help="Also record raw ticks to artifacts/ticks/YYYY-MM-DD.ticks.gz for offline replay.",
+    )
     args = parser.parse_args()
 
     log_level_name = os.environ.get("LOG_LEVEL")
@@ -348,8 +368,9 @@ def main() -> None:
 
     log.info("Starting live quotes streamer...")
     stop_event = threading.Event()
+    recorder = TickRecorder(ARTIFACTS_ROOT / "ticks") if args.record_ticks else None
     try:
-        run_live_quotes_service(stop_event=stop_event)
+        run_live_quotes_service(stop_event=stop_event, recorder=recorder)
     except KeyboardInterrupt:
         log.info("Interrupted by user, shutting down...")
         stop_event.set()
@@ -357,6 +378,10 @@ def main() -> None:
         log.exception("Live quotes streamer failed")
         print(f"Live quotes streamer failed: {exc}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if recorder is not None:
+            recorder.close()
+            log.info("Recorded %d ticks to %s", recorder.ticks_recorded, recorder.tick_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Migrate Market Data Cache Script
+
+Purpose: One-shot conversion of the JSON candle cache files in
+artifacts/market_data to the append-only binary format used by
+MarketDataEngine's default "binary" cache backend.
+
+The binary backend also imports a JSON file lazily the first time a
+(symbol, timeframe) is read, so running this script is optional; it just
+moves the conversion cost out of engine startup.
+
+Usage:
+    python scripts/migrate_market_cache.py [--cache-dir artifacts/market_data] [--remove-json] [--overwrite]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from core.candle_cache import migrate_json_cache
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert JSON market data cache files to the binary cache format"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(BASE_DIR / "artifacts" / "market_data"),
+        help="Market data cache directory (default: artifacts/market_data)"
+    )
+    parser.add_argument(
+        "--remove-json",
+        action="store_true",
+        help="Delete each JSON file after it has been converted"
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Rebuild binary files that already exist from their JSON source"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    cache_dir = Path(args.cache_dir)
+    if not cache_dir.exists():
+        logger.error("Cache directory not found: %s", cache_dir)
+        sys.exit(1)
+
+    converted = migrate_json_cache(cache_dir, remove_json=args.remove_json, overwrite=args.overwrite)
+    logger.info("Converted %d JSON cache files in %s", converted, cache_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -135,23 +135,23 @@ def main():
     # Create market data engine
     artifacts_dir = BASE_DIR / "artifacts"
     cache_dir = artifacts_dir / "market_data"
-    mde = MarketDataEngine(kite, universe_snapshot, cache_dir=cache_dir)
-    logger.info("Market data engine initialized with cache_dir=%s", cache_dir)
-    
-    # Refresh cache for each symbol
-    success_count = 0
+    cache_backend = (cfg.raw.get("data") or {}).get("cache_backend", "binary")
+    mde = MarketDataEngine(kite, universe_snapshot, cache_dir=cache_dir, cache_backend=cache_backend)
+    logger.info("Market data engine initialized with cache_dir=%s backend=%s", cache_dir, cache_backend)
+    
+    # Refresh all symbols concurrently (rate limited to the historical API quota)
+    logger.info("Refreshing cache for %d symbols (timeframe=%s, count=%d)",
+               len(symbols), args.timeframe, args.count)
+    mde.refresh_due([(symbol, args.timeframe) for symbol in symbols], count=args.count, force=True)
     fail_count = 0
-    
     for symbol in symbols:
-        try:
-            logger.info("Refreshing cache for %s (timeframe=%s, count=%d)", 
-                       symbol, args.timeframe, args.count)
-            mde.update_cache(symbol, args.timeframe, count=args.count)
-            success_count += 1
-            logger.info("✓ Cache refreshed for %s", symbol)
-        except Exception as exc:
-            logger.warning("✗ Failed to refresh cache for %s: %s", symbol, exc)
+        reason = mde.refresh_failures.get((symbol.upper(), args.timeframe))
+        if reason is not None:
             fail_count += 1
+            logger.warning("✗ Failed to refresh cache for %s: %s", symbol, reason)
+        else:
+            logger.info("✓ Cache refreshed for %s", symbol)
+    success_count = len(symbols) - fail_count
     
     # Summary
     logger.info("")
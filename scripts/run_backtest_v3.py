@@ -9,6 +9,8 @@ Usage:
     python -m scripts.run_backtest_v3 --config configs/dev.yaml --bt-config configs/backtest.dev.yaml
     python -m scripts.run_backtest_v3 --config configs/dev.yaml --symbols NIFTY,BANKNIFTY --start 2025-01-01 --end 2025-01-05
     python -m scripts.run_backtest_v3 --config configs/dev.yaml --strategies ema20_50_intraday_v2 --data-source csv
+    python -m scripts.run_backtest_v3 --config configs/dev.yaml --start 2025-01-01 --end 2025-03-31 --workers 4
+    python -m scripts.run_backtest_v3 --config configs/dev.yaml --start 2025-01-01 --end 2025-12-31 --event-loop chronological
 """
 
 from __future__ import annotations
@@ -103,6 +105,29 @@ def parse_args() -> argparse.Namespace:
         help="Enable TradeGuardian pre-execution checks",
     )
     
+    parser.add_argument(
+        "--event-loop",
+        type=str,
+        default="per_symbol",
+        choices=["per_symbol", "chronological"],
+        help="Replay symbols one after another, or all together in timestamp order "
+        "for portfolio-level limits and equity (default: per_symbol)",
+    )
+    
+    # Sharded execution
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; more than 1 runs a sharded backtest (default: 1)",
+    )
+    parser.add_argument(
+        "--shard-by",
+        type=str,
+        choices=["symbol", "day"],
+        help="Shard granularity; results do not depend on --workers (default: serial, or symbol with --workers > 1)",
+    )
+    
     # Logging
     parser.add_argument(
         "--log-level",
@@ -189,6 +214,9 @@ def load_backtest_config(
         risk_config=main_config_dict.get("risk"),
         regime_config=main_config_dict.get("regime"),
         enable_guardian=args.enable_guardian,
+        workers=args.workers,
+        shard_by=args.shard_by,
+        event_loop=args.event_loop,
     )
     
     return main_config_dict, bt_config
@@ -231,6 +259,8 @@ def main():
     logger.info("  Initial Equity: %.2f", bt_config.initial_equity)
     logger.info("  Position Sizing: %s", bt_config.position_sizing_mode)
     logger.info("  Guardian Enabled: %s", bt_config.enable_guardian)
+    logger.info("  Event Loop: %s", bt_config.event_loop)
+    logger.info("  Workers: %d (shard by %s)", bt_config.workers, bt_config.shard_by or ("symbol" if bt_config.workers > 1 else "-"))
     
     # Initialize backtest engine
     try:
@@ -17,7 +17,7 @@ from analytics.multi_timeframe_scanner import INTRADAY_TF, IndicatorSnapshot, Mu
 from analytics.trade_recorder import TradeRecorder
 from broker.kite_client import KiteClient
 from core.config import load_config
-from core.history_loader import fetch_and_store_history
+from core.history_loader import fetch_and_store_history_many
 from core.strategy_tags import Profile
 from core.universe import fno_underlyings
 from core.history_loader import load_history
@@ -154,13 +154,14 @@ def refresh_history(symbols: List[str], kite_client: KiteClient, days: int) -> N
     kite = kite_client.api
     to_dt = datetime.utcnow()
     from_dt = to_dt - timedelta(days=days)
+    # All symbol/interval pairs are fetched concurrently under the shared rate limit
+    stored = fetch_and_store_history_many(kite, symbols, BASE_INTERVALS, from_dt, to_dt)
     for symbol in symbols:
         for interval in BASE_INTERVALS:
-            try:
-                fetch_and_store_history(kite, symbol, interval, from_dt, to_dt, out_path=None)
+            if (symbol, interval) in stored:
                 logger.info("Fetched history %s %s", symbol, interval)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed to fetch history for %s (%s): %s", symbol, interval, exc)
+            else:
+                logger.warning("Failed to fetch history for %s (%s)", symbol, interval)
 
 
 def main() -> None:
@@ -181,6 +182,11 @@ def main() -> None:
         default=30,
         help="Lookback window (in days) when refreshing history (default: 30).",
     )
+    parser.add_argument(
+        "--per-symbol",
+        action="store_true",
+        help="Scan symbol by symbol instead of one vectorized pass per timeframe.",
+    )
     args = parser.parse_args()
 
     cfg = load_config(args.config)
@@ -221,9 +227,8 @@ def main() -> None:
         logger.error("No instruments to scan. Check universe files or --symbols filter.")
         raise SystemExit(1)
 
-    def process_instrument(inst: UniverseInstrument) -> None:
+    def process_instrument(inst: UniverseInstrument, snapshots: List[IndicatorSnapshot]) -> None:
         symbol = inst.tradingsymbol.upper()
-        snapshots = scanner.scan_symbol(symbol)
         if not snapshots:
             return
         base = _instrument_base(inst)
@@ -270,17 +275,28 @@ def main() -> None:
                 strategy=strategy_name,
             )
 
+    selected: List[UniverseInstrument] = []
     for inst in equity_universe:
         adv = _avg_daily_traded_value(inst.tradingsymbol)
         if adv < min_adv:
             continue
-        process_instrument(inst)
+        selected.append(inst)
 
     for inst in deriv_universe:
         volume = _avg_daily_volume(inst.tradingsymbol)
         if (inst.lot_size or 0) <= 0 or volume < min_deriv_vol:
             continue
-        process_instrument(inst)
+        selected.append(inst)
+
+    if args.per_symbol:
+        for inst in selected:
+            process_instrument(inst, scanner.scan_symbol(inst.tradingsymbol.upper()))
+        return
+
+    # One (symbols x bars) pass per timeframe, timeframes in parallel
+    by_symbol = scanner.scan_universe([inst.tradingsymbol for inst in selected])
+    for inst in selected:
+        process_instrument(inst, by_symbol.get(inst.tradingsymbol.upper(), []))
 
 
 def _fmt(value: Optional[float]) -> str:
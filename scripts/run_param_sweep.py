@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Runner - grid or random search over one strategy's params.
+
+Bars are loaded once into shared memory, indicators are computed once per
+EMA period, and combinations are evaluated with BacktestEngineV3 on a worker
+pool (see backtest/sweep.py). Ranked results go to
+artifacts/sweeps/<sweep_id>/results.json.
+
+With --walk-forward the sweep runs on rolling in-sample windows and the
+winner of each is traded on the following out-of-sample period (see
+backtest/walk_forward.py); the stitched out-of-sample run goes to
+artifacts/backtests/<strategy>/<run_id>/ for the dashboard.
+
+The sweep is read from the ``sweep`` section of --sweep-config (or the main
+config), and --grid entries add to or replace its grid:
+
+    sweep:
+      strategy: EMA_20_50
+      search: random          # or grid
+      samples: 50
+      max_drawdown_pct: 5.0   # stop a combination past this drawdown
+      grid:
+        ema_fast: [5, 9, 13, 20]
+        ema_slow: [30, 50, 100]
+        min_confidence: [0.0, 0.3, 0.5]
+      walk_forward:           # used with --walk-forward
+        in_sample_months: 3
+        out_of_sample_months: 1
+
+Usage:
+    python -m scripts.run_param_sweep --config configs/dev.yaml --sweep-config configs/sweep.yaml --start 2025-01-01 --end 2025-06-30 --workers 4
+    python -m scripts.run_param_sweep --config configs/dev.yaml --strategy EMA_20_50 --grid ema_fast=5,9,13 --grid ema_slow=30,50 --start 2025-01-01 --end 2025-03-31
+    python -m scripts.run_param_sweep --config configs/dev.yaml --sweep-config configs/sweep.yaml --start 2025-01-01 --end 2025-12-31 --walk-forward --in-sample-months 3 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from backtest.sweep import SweepConfig, run_sweep
+from backtest.walk_forward import WalkForwardConfig, run_walk_forward
+from core.config import load_config
+from core.logging_utils import setup_logging
+from scripts.run_backtest_v3 import load_backtest_config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Parameter sweep over one strategy with Backtest Engine v3"
+    )
+    parser.add_argument("--config", type=str, required=True, help="Main trading config YAML file")
+    parser.add_argument("--bt-config", type=str, help="Backtest-specific config YAML file (optional)")
+    parser.add_argument("--sweep-config", type=str, help="YAML file with a 'sweep' section (default: main config)")
+
+    parser.add_argument("--strategy", type=str, help="strategies_v2 id to sweep (overrides sweep.strategy)")
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="PARAM=V1,V2,...",
+        help="Candidate values for one param (repeatable; values parsed as YAML scalars)",
+    )
+    parser.add_argument("--search", type=str, choices=["grid", "random"], help="Search mode (overrides sweep.search)")
+    parser.add_argument("--samples", type=int, help="Combinations for a random search")
+    parser.add_argument("--seed", type=int, help="Random search seed")
+    parser.add_argument("--max-drawdown-pct", type=float, help="Stop a combination once its drawdown exceeds this")
+    parser.add_argument("--rank-by", type=str, help="Metric to rank by (default: total_return_pct)")
+    parser.add_argument("--workers", type=int, help="Worker processes (overrides sweep.workers)")
+
+    parser.add_argument(
+        "--walk-forward",
+        action="store_true",
+        help="Optimize on rolling in-sample windows and trade each winner out of sample",
+    )
+    parser.add_argument("--in-sample-months", type=int, help="Walk-forward in-sample months (default: 3)")
+    parser.add_argument("--out-of-sample-months", type=int, help="Walk-forward out-of-sample months (default: 1)")
+
+    parser.add_argument("--symbols", type=str, help="Comma-separated list of symbols")
+    parser.add_argument("--start", type=str, required=True, help="Start date in YYYY-MM-DD format")
+    parser.add_argument("--end", type=str, required=True, help="End date in YYYY-MM-DD format")
+    parser.add_argument(
+        "--data-source",
+        type=str,
+        default="csv",
+        choices=["csv", "hdf", "kite_historical"],
+        help="Data source for historical data (default: csv)",
+    )
+    parser.add_argument(
+        "--timeframe",
+        type=str,
+        default="5m",
+        choices=["1m", "5m", "15m", "1h", "1d"],
+        help="Bar timeframe (default: 5m)",
+    )
+    parser.add_argument("--initial-equity", type=float, help="Initial capital (default: from config or 100000)")
+    parser.add_argument(
+        "--position-sizing",
+        type=str,
+        default="fixed_qty",
+        choices=["fixed_qty", "fixed_risk_atr"],
+        help="Position sizing mode (default: fixed_qty)",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (default: INFO)",
+    )
+
+    args = parser.parse_args()
+    # Fields load_backtest_config() reads that a sweep fixes
+    args.strategies = None
+    args.enable_guardian = False
+    args.shard_by = None
+    args.event_loop = "per_symbol"
+    return args
+
+
+def build_sweep_section(args: argparse.Namespace) -> dict:
+    """The sweep section of --sweep-config (or --config) with the command line applied."""
+    source = load_config(args.sweep_config or args.config)
+    section = dict((source.raw if hasattr(source, "raw") else {}).get("sweep") or {})
+
+    grid = dict(section.get("grid") or {})
+    for entry in args.grid:
+        name, _, values = entry.partition("=")
+        if not name or not values:
+            raise ValueError(f"Expected PARAM=V1,V2,... in --grid, got {entry!r}")
+        grid[name.strip()] = [yaml.safe_load(value) for value in values.split(",")]
+    section["grid"] = grid
+
+    overrides = {
+        "strategy": args.strategy,
+        "search": args.search,
+        "samples": args.samples,
+        "seed": args.seed,
+        "max_drawdown_pct": args.max_drawdown_pct,
+        "rank_by": args.rank_by,
+        "workers": args.workers,
+    }
+    section.update({key: value for key, value in overrides.items() if value is not None})
+    if not section.get("strategy"):
+        raise ValueError("No strategy to sweep (set sweep.strategy or --strategy)")
+
+    walk_forward = dict(section.get("walk_forward") or {})
+    if args.in_sample_months is not None:
+        walk_forward["in_sample_months"] = args.in_sample_months
+    if args.out_of_sample_months is not None:
+        walk_forward["out_of_sample_months"] = args.out_of_sample_months
+    section["walk_forward"] = walk_forward
+    return section
+
+
+def run_walk_forward_mode(section: dict, main_config: dict, bt_config) -> int:
+    """Run --walk-forward and log the windows."""
+    try:
+        walk_forward = WalkForwardConfig.from_dict(section)
+        logger.info(
+            "Walk-forward: %d in-sample / %d out-of-sample months",
+            walk_forward.in_sample_months, walk_forward.out_of_sample_months,
+        )
+        result = run_walk_forward(bt_config, main_config, walk_forward)
+    except Exception as e:
+        logger.error("Walk-forward failed: %s", e, exc_info=True)
+        return 1
+
+    for window in result.overall_metrics["walk_forward"]["windows"]:
+        params = ", ".join(f"{name}={value}" for name, value in window["params"].items())
+        logger.info(
+            "  Window %d: in %s..%s -> %s; out %s..%s: return %.2f%%",
+            window["index"], *window["in_sample"], params, *window["out_of_sample"],
+            window["out_of_sample_metrics"].get("total_return_pct", 0.0),
+        )
+    logger.info("Out-of-sample return: %.2f%%", result.overall_metrics.get("total_return_pct", 0.0))
+    logger.info("Run ID: %s/%s", walk_forward.sweep.strategy, result.run_id)
+    return 0
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    setup_logging({"level": args.log_level, "directory": "logs", "file_prefix": "param_sweep"})
+
+    try:
+        section = build_sweep_section(args)
+        sweep = SweepConfig.from_dict(section)
+        args.workers = sweep.workers
+        main_config, bt_config = load_backtest_config(args.config, args.bt_config, args)
+    except Exception as e:
+        logger.error("Failed to load configuration: %s", e, exc_info=True)
+        return 1
+
+    logger.info("=" * 80)
+    logger.info("Parameter Sweep: %s over %s", sweep.strategy, ", ".join(sweep.grid) or "-")
+    logger.info("  Search: %s%s", sweep.search, f" ({sweep.samples} samples)" if sweep.search == "random" else "")
+    logger.info("  Symbols: %s", bt_config.symbols)
+    logger.info("  Date Range: %s to %s", bt_config.start_date, bt_config.end_date)
+    logger.info("  Workers: %d", sweep.workers)
+    logger.info("=" * 80)
+
+    if args.walk_forward:
+        return run_walk_forward_mode(section, main_config, bt_config)
+
+    try:
+        rows, path = run_sweep(bt_config, main_config, sweep)
+    except Exception as e:
+        logger.error("Sweep failed: %s", e, exc_info=True)
+        return 1
+
+    logger.info("Top combinations by %s:", sweep.rank_by)
+    for row in rows[:10]:
+        params = ", ".join(f"{name}={row[name]}" for name in sweep.grid)
+        logger.info(
+            "  #%d %s: return %.2f%%, max drawdown %.2f%%, %d trades%s",
+            row["rank"], params, row["total_return_pct"], row["max_drawdown_pct"], row["closed_trades"],
+            " (stopped early)" if row["stopped_early"] else "",
+        )
+    logger.info("Results: %s", path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
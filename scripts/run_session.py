@@ -34,6 +34,7 @@ import pytz
 
 from core.config import load_config
 from core.logging_utils import setup_logging
+from data.instrument_snapshot import get_instrument_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -646,6 +647,12 @@ def start_multi_process_engines(mode: str, config_path: str) -> Dict[str, subpro
                 }
                 logger.info("PAPER mode: starting default paper engines (fallback)")
 
+    # Download today's instrument master once so every engine loads it from disk
+    try:
+        get_instrument_snapshot()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Could not prepare instrument snapshot before starting engines: %s", exc)
+
     processes: Dict[str, subprocess.Popen] = {}
     
     logger.info("=" * 60)
@@ -6,6 +6,7 @@ Provides high-level interface for running multi-strategy evaluation.
 
 Features:
 - run_symbol(symbol, ts) - Fetch data, run strategies, publish signals
+- run_symbols(symbols, ts) - Same for many symbols in one engine batch
 - Multi-timeframe evaluation (primary + secondary)
 - Signal fusion and confidence scoring
 - EventBus integration for raw and fused signals
@@ -15,7 +16,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from core.strategy_engine_v2 import OrderIntent
 from core.strategy_engine_v3 import StrategyEngineV3
@@ -91,6 +92,68 @@ class StrategyService:
         if ts is None:
             ts = datetime.now(timezone.utc).isoformat()
         
+        prepared = self._prepare(symbol, ts)
+        if isinstance(prepared, OrderIntent):
+            return prepared
+        price, md = prepared
+        
+        # Step 3: Run strategy evaluation
+        try:
+            intent = self.engine.evaluate(symbol, ts, price, md)
+        except Exception as exc:
+            logger.error(
+                "Strategy evaluation failed for %s: %s",
+                symbol, exc,
+                exc_info=True
+            )
+            return self._hold_intent(symbol, f"Strategy error: {exc}", ts)
+        
+        self._publish(symbol, ts, price, intent)
+        return intent
+    
+    def run_symbols(
+        self,
+        symbols: List[str],
+        ts: Optional[str] = None,
+    ) -> Dict[str, OrderIntent]:
+        """
+        Run strategy evaluation for several symbols in one engine batch.
+        
+        Same steps as run_symbol(), but the evaluations go through
+        StrategyEngineV3.evaluate_many(), so they run across the engine's
+        worker processes when its parallel mode is enabled.
+        
+        Args:
+            symbols: Trading symbols
+            ts: Timestamp (ISO format, defaults to now)
+            
+        Returns:
+            Dict of symbol -> OrderIntent, in the order of symbols
+        """
+        if ts is None:
+            ts = datetime.now(timezone.utc).isoformat()
+        
+        results: Dict[str, OrderIntent] = {}
+        requests = []
+        for symbol in symbols:
+            prepared = self._prepare(symbol, ts)
+            if isinstance(prepared, OrderIntent):
+                results[symbol] = prepared
+            else:
+                results[symbol] = None  # keeps the order of symbols
+                price, md = prepared
+                requests.append((symbol, ts, price, md))
+        
+        for (symbol, _, price, _), intent in zip(requests, self.engine.evaluate_many(requests)):
+            if intent is None:
+                results[symbol] = self._hold_intent(symbol, "Strategy error", ts)
+                continue
+            self._publish(symbol, ts, price, intent)
+            results[symbol] = intent
+        return results
+    
+    def _prepare(self, symbol: str, ts: str) -> Any:
+        """Fetch price and bundles for a symbol: (price, md), or a HOLD intent."""
         # Step 1: Fetch current price
         price = self.mds.get_ltp(symbol)
         if price is None:
@@ -116,46 +179,34 @@ class StrategyService:
             )
             return self._hold_intent(symbol, "No primary timeframe data", ts)
         
-        # Step 3: Build market data dict for StrategyEngineV3
-        md = self._build_market_data(primary_bundle, secondary_bundle)
-        
-        # Step 4: Run strategy evaluation
+        return price, self._build_market_data(primary_bundle, secondary_bundle)
+    
+    def _publish(self, symbol: str, ts: str, price: float, intent: OrderIntent) -> None:
+        """Publish raw and fused signals to the EventBus."""
+        if not self.bus:
+            return
         try:
-            intent = self.engine.evaluate(symbol, ts, price, md)
+            # Publish raw signals (candidates before fusion)
+            self.bus.publish("signals.raw", {
+                "symbol": symbol,
+                "ts": ts,
+                "price": price,
+                "primary_tf": self.primary_tf,
+                "secondary_tf": self.secondary_tf,
+            })
+            
+            # Publish fused signal
+            self.bus.publish("signals.fused", {
+                "symbol": symbol,
+                "ts": ts,
+                "price": price,
+                "action": intent.action,
+                "confidence": intent.confidence,
+                "reason": intent.reason,
+                "strategy_code": intent.strategy_code,
+            })
         except Exception as exc:
-            logger.error(
-                "Strategy evaluation failed for %s: %s",
-                symbol, exc,
-                exc_info=True
-            )
-            return self._hold_intent(symbol, f"Strategy error: {exc}", ts)
-        
-        # Step 5: Publish signals to EventBus
-        if self.bus:
-            try:
-                # Publish raw signals (candidates before fusion)
-                self.bus.publish("signals.raw", {
-                    "symbol": symbol,
-                    "ts": ts,
-                    "price": price,
-                    "primary_tf": self.primary_tf,
-                    "secondary_tf": self.secondary_tf,
-                })
-                
-                # Publish fused signal
-                self.bus.publish("signals.fused", {
-                    "symbol": symbol,
-                    "ts": ts,
-                    "price": price,
-                    "action": intent.action,
-                    "confidence": intent.confidence,
-                    "reason": intent.reason,
-                    "strategy_code": intent.strategy_code,
-                })
-            except Exception as exc:
-                logger.debug("Error publishing signals: %s", exc)
-        
-        return intent
+            logger.debug("Error publishing signals: %s", exc)
     
     def _build_market_data(
         self,
@@ -5,6 +5,7 @@ from typing import Any, Dict, List
 
 import logging
 import math
+import time
 import pandas as pd
 
 from .base import Decision
@@ -20,6 +21,8 @@ class _SymbolState:
     down_trend: bool = False
     indicators: Dict[str, Any] = field(default_factory=dict)
     regime: str = "UNKNOWN"
+    updated_at: float = 0.0  # wall-clock time of the last sample
+    restored: bool = False  # loaded from a warm-start snapshot, not yet checked against a new price
 
 
 class FnoIntradayTrendStrategy:
@@ -75,6 +78,10 @@ class FnoIntradayTrendStrategy:
         # symbol -> _SymbolState
         self._state: Dict[str, _SymbolState] = {}
 
+        # Largest relative move between a restored state's last price and the
+        # first new price that still continues the restored series
+        self.max_restore_gap_pct = 0.02
+
     def on_bar(self, symbol: str, bar: Dict[str, float]) -> Decision:
         """
         Accepts a dict {"close": price} and returns a Decision(Action: BUY/SELL/HOLD).
@@ -94,7 +101,14 @@ class FnoIntradayTrendStrategy:
             return Decision(action="HOLD", reason="invalid_price", mode=self.mode, confidence=0.0)
 
         st = self._state.setdefault(symbol, _SymbolState())
+        if st.restored:
+            st.restored = False
+            last = st.prices[-1] if st.prices else None
+            if not last or abs(close - last) > self.max_restore_gap_pct * last:
+                log.info("Symbol %s: price gapped since the warm-start snapshot (%s -> %.2f); starting fresh", symbol, last, close)
+                st = self._state[symbol] = _SymbolState()
         st.prices.append(close)
+        st.updated_at = time.time()
         bar_entry = {
             "open": float(bar.get("open", close)),
             "high": float(bar.get("high", close)),
@@ -114,11 +128,15 @@ class FnoIntradayTrendStrategy:
             # not enough data to form reliable trend
             return Decision(action="HOLD", reason="warmup", mode=self.mode, confidence=0.0)
 
-        # compute EMAs
-        ema_fast = self._ema(st.prices, self.fast_len)
-        ema_slow = self._ema(st.prices, self.slow_len)
-        ema_fast_htf = self._ema(st.prices, self.fast_htf_len)
-        ema_slow_htf = self._ema(st.prices, self.slow_htf_len)
+        # compute EMAs (slow_len and fast_htf_len default to the same length)
+        emas: Dict[int, float] = {}
+        for length in (self.fast_len, self.slow_len, self.fast_htf_len, self.slow_htf_len):
+            if length not in emas:
+                emas[length] = self._ema(st.prices, length)
+        ema_fast = emas[self.fast_len]
+        ema_slow = emas[self.slow_len]
+        ema_fast_htf = emas[self.fast_htf_len]
+        ema_slow_htf = emas[self.slow_htf_len]
 
         up_trend = ema_fast > ema_slow and ema_fast_htf > ema_slow_htf
         down_trend = ema_fast < ema_slow and ema_fast_htf < ema_slow_htf
@@ -155,6 +173,47 @@ class FnoIntradayTrendStrategy:
 
         return Decision(action="HOLD", reason="no_transition", mode=self.mode, confidence=0.0)
 
+    def export_state(self) -> Dict[str, Dict[str, Any]]:
+        """Per-symbol price/bar history and trend flags for a warm-start snapshot."""
+        return {
+            symbol: {
+                "prices": list(st.prices),
+                "bars": list(st.bars),
+                "up_trend": st.up_trend,
+                "down_trend": st.down_trend,
+                "updated_at": st.updated_at,
+            }
+            for symbol, st in self._state.items()
+            if st.prices
+        }
+
+    def import_state(self, state: Dict[str, Dict[str, Any]], max_age_sec: float = 900.0) -> int:
+        """
+        Restore export_state() output; returns the number of symbols restored.
+
+        Symbols whose last sample is older than max_age_sec are skipped. A
+        restored symbol is checked against its first new price in on_bar()
+        and dropped if the price gapped by more than max_restore_gap_pct.
+        """
+        now = time.time()
+        restored = 0
+        for symbol, saved in (state or {}).items():
+            if symbol in self._state or now - float(saved.get("updated_at", 0.0)) > max_age_sec:
+                continue
+            prices = [float(p) for p in saved.get("prices", [])][-self.max_history :]
+            if not prices:
+                continue
+            self._state[symbol] = _SymbolState(
+                prices=prices,
+                bars=list(saved.get("bars", []))[-self.max_history :],
+                up_trend=bool(saved.get("up_trend", False)),
+                down_trend=bool(saved.get("down_trend", False)),
+                updated_at=float(saved["updated_at"]),
+                restored=True,
+            )
+            restored += 1
+        return restored
+
     def get_latest_indicators(self, symbol: str) -> Dict[str, Any]:
         st = self._state.get(symbol)
         return st.indicators if st and st.indicators else {}
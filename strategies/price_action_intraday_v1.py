@@ -8,15 +8,48 @@ Multi-factor strategy using:
 - ATR volatility mode filter
 
 This strategy co-exists with EMA_20_50 and uses the Strategy Engine v2 architecture.
+When the series carries timestamps, the volumes and true ranges of closed bars
+are kept per symbol, so the volume spike and volatility checks only compute
+the current candle's values instead of rescanning the window on every call.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 from core.strategy_engine_v2 import BaseStrategy, StrategyState
 from strategies.base import Decision
 
 
+class _ClosedBars:
+    """
+    Volume and true range of a symbol's most recent closed bars.
+    
+    Holds the values the window scans read besides the current candle:
+    the last ``volume_window - 1`` volumes and ``atr_period - 1`` true
+    ranges, newest last.
+    """
+    
+    __slots__ = ("volumes", "true_ranges", "last_ts", "last_close")
+    
+    def __init__(self, volume_window: int, atr_period: int):
+        self.volumes: Deque[float] = deque(maxlen=max(0, volume_window - 1))
+        self.true_ranges: Deque[float] = deque(maxlen=max(0, atr_period - 1))
+        self.last_ts: Any = None
+        self.last_close: Optional[float] = None
+    
+    def push(self, ts: Any, high: float, low: float, close: float, volume: float) -> None:
+        if self.last_close is None:
+            true_range = high - low
+        else:
+            c_prev = self.last_close
+            true_range = max(high - low, abs(high - c_prev), abs(low - c_prev))
+        self.volumes.append(volume)
+        self.true_ranges.append(true_range)
+        self.last_ts = ts
+        self.last_close = close
+
+
 class PriceActionIntradayV1(BaseStrategy):
     """
     Price Action Intraday Strategy - Version 1
@@ -67,6 +100,9 @@ class PriceActionIntradayV1(BaseStrategy):
         
         # Track previous state for crossover detection
         self._prev_state: Dict[str, Dict[str, Any]] = {}
+        
+        # Closed-bar volumes and true ranges per symbol
+        self._closed_bars: Dict[str, _ClosedBars] = {}
     
     def generate_signal(
         self,
@@ -124,7 +160,7 @@ class PriceActionIntradayV1(BaseStrategy):
         
         # Build signal components
         signal_components = self._analyze_signal_components(
-            candle, series, indicators
+            candle, series, indicators, stream_key=context.get("symbol") or symbol
         )
         
         # Calculate confidence
@@ -221,11 +257,16 @@ class PriceActionIntradayV1(BaseStrategy):
         self,
         candle: Dict[str, float],
         series: Dict[str, List[float]],
-        indicators: Dict[str, Any]
+        indicators: Dict[str, Any],
+        stream_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyze individual signal components.
         
+        With a stream_key and a timestamped series, the volume spike and
+        volatility checks read the symbol's closed bars from _ClosedBars
+        instead of rescanning the series; the results are the same.
+        
         Returns dict with:
         - bullish_pattern: bool
         - bearish_pattern: bool
@@ -243,21 +284,59 @@ class PriceActionIntradayV1(BaseStrategy):
             "volatility_mode": "normal",
         }
         
+        closed_bars = self._sync_closed_bars(stream_key, series) if stream_key else None
+        
         # Detect candle patterns if enabled
         if self.enable_patterns:
             pattern_result = self._detect_patterns(candle, series)
             components.update(pattern_result)
         
         # Detect volume spike
-        components["volume_spike"] = self._detect_volume_spike(candle, series)
+        components["volume_spike"] = self._detect_volume_spike(candle, series, closed_bars)
         
         # Detect ATR volatility mode
-        volatility_result = self._detect_volatility_mode(series, indicators)
+        volatility_result = self._detect_volatility_mode(series, indicators, closed_bars)
         components["volatility_mode"] = volatility_result
         components["is_compressing"] = volatility_result == "compressing"
         
         return components
     
+    def _sync_closed_bars(self, key: str, series: Dict[str, List[float]]) -> Optional[_ClosedBars]:
+        """
+        The symbol's _ClosedBars, advanced to the series' last closed bar.
+        
+        Every bar but the last (the current candle) is closed. Only closed
+        bars after the last one seen are added; if that bar is missing from
+        the series or its close changed, the state is rebuilt from the
+        series. Returns None when the series has no usable timestamps.
+        """
+        ts = series.get("ts")
+        close = series.get("close", [])
+        high = series.get("high", [])
+        low = series.get("low", [])
+        n = len(ts) if ts is not None else 0
+        if n < 2 or not n == len(close) == len(high) == len(low) or ts[-1] is None:
+            return None
+        
+        bars = self._closed_bars.get(key)
+        start = None
+        if bars is not None and bars.last_ts is not None:
+            for i in range(n - 2, -1, -1):
+                if ts[i] == bars.last_ts:
+                    if close[i] == bars.last_close:
+                        start = i + 1
+                    break
+        if start is None:
+            bars = self._closed_bars[key] = _ClosedBars(self.volume_window, self.atr_period)
+            start = 0
+        
+        volume = series.get("volume")
+        if volume is None or len(volume) != n:
+            volume = [0.0] * n
+        for i in range(start, n - 1):
+            bars.push(ts[i], high[i], low[i], close[i], volume[i])
+        return bars
+    
     def _detect_patterns(
         self,
         candle: Dict[str, float],
@@ -357,12 +436,14 @@ class PriceActionIntradayV1(BaseStrategy):
     def _detect_volume_spike(
         self,
         candle: Dict[str, float],
-        series: Dict[str, List[float]]
+        series: Dict[str, List[float]],
+        closed_bars: Optional[_ClosedBars] = None
     ) -> bool:
         """
         Detect if current volume is a spike above rolling average.
         
         Returns True if volume > factor * rolling_mean(window).
+        closed_bars, if given, supplies the window's closed-bar volumes.
         """
         current_volume = candle.get("volume", 0)
         volume_list = series.get("volume", [])
@@ -371,7 +452,10 @@ class PriceActionIntradayV1(BaseStrategy):
             return False
         
         # Calculate rolling average volume
-        window_data = volume_list[-self.volume_window:]
+        if closed_bars is not None and len(closed_bars.volumes) == self.volume_window - 1:
+            window_data = [*closed_bars.volumes, volume_list[-1]]
+        else:
+            window_data = volume_list[-self.volume_window:]
         avg_volume = sum(window_data) / len(window_data)
         
         if avg_volume <= 0:
@@ -382,12 +466,14 @@ class PriceActionIntradayV1(BaseStrategy):
     def _detect_volatility_mode(
         self,
         series: Dict[str, List[float]],
-        indicators: Dict[str, Any]
+        indicators: Dict[str, Any],
+        closed_bars: Optional[_ClosedBars] = None
     ) -> str:
         """
         Detect ATR volatility mode.
         
         Returns: "expanding", "normal", or "compressing"
+        closed_bars, if given, supplies the closed bars' true ranges.
         """
         # Try to get ATR from indicators
         atr_val = indicators.get("atr14") or indicators.get(f"atr{self.atr_period}")
@@ -411,13 +497,17 @@ class PriceActionIntradayV1(BaseStrategy):
         tr_values = []
         # Ensure we don't go beyond available data
         max_lookback = min(self.atr_period, len(close_list) - 1)
-        for i in range(1, max_lookback + 1):
+        # With closed_bars only the current candle's true range is computed here
+        use_closed = closed_bars is not None and len(closed_bars.true_ranges) == max_lookback - 1
+        for i in range(1, (1 if use_closed else max_lookback) + 1):
             h = high_list[-i]
             l = low_list[-i]
             # i ranges from 1 to max_lookback, so -i-1 is valid since we have at least 2*atr_period bars
             c_prev = close_list[-i-1]
             tr = max(h - l, abs(h - c_prev), abs(l - c_prev))
             tr_values.append(tr)
+        if use_closed:
+            tr_values.extend(reversed(closed_bars.true_ranges))
         
         if not tr_values:
             return "normal"
@@ -0,0 +1,203 @@
+"""Tests for the chronological multi-symbol replay (backtest/event_loop.py)"""
+
+import math
+import shutil
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.bar_store import IndicatorArrays, SymbolBars
+from backtest.engine_v3 import BacktestConfig, BacktestEngineV3
+from backtest.event_loop import RollingBars, SymbolStream, merge_bar_streams
+
+START = datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)
+
+CONFIG = {
+    "strategy_engine": {
+        "strategies_v2": [{
+            "id": "EMA_20_50",
+            "module": "strategies.ema20_50_intraday_v2",
+            "class": "EMA2050IntradayV2",
+            "params": {"timeframe": "5m", "use_regime_filter": False},
+        }],
+    },
+    "risk": {"max_consecutive_losses_symbol": 100, "max_consecutive_losses_strategy": 100},
+}
+
+
+def _bars(n, phase=0.0, skip_every=0):
+    bars = []
+    for i in range(n):
+        if skip_every and i % skip_every == 0:
+            continue
+        close = 100.0 + 8.0 * math.sin(i / 15.0 + phase) + 0.01 * i
+        bars.append({
+            "timestamp": START + timedelta(minutes=5 * (i % 75)) + timedelta(days=i // 75),
+            "open": close - 0.3,
+            "high": close + 0.6,
+            "low": close - 0.7,
+            "close": close,
+            "volume": 1000.0 + (i * 37) % 500,
+        })
+    return bars
+
+
+class _Loader:
+    def __init__(self, bars_by_symbol):
+        self.bars_by_symbol = bars_by_symbol
+
+    def iter_bars(self, symbol, start_date, end_date):
+        for bar in self.bars_by_symbol[symbol]:
+            yield dict(bar)
+
+
+def test_merge_orders_by_timestamp_then_symbol():
+    a = _bars(6)
+    b = _bars(6, skip_every=2)
+    b.insert(2, dict(b[0]))  # repeated timestamp is dropped
+    merged = list(merge_bar_streams(_Loader({"AAA": a, "BBB": b}), ["BBB", "AAA"], "", ""))
+
+    keys = [(bar["timestamp"], bar["symbol"]) for bar in merged]
+    assert len(keys) == 6 + 3
+    assert keys == sorted(keys, key=lambda k: (k[0], k[1] != "BBB"))
+
+
+def test_rolling_bars_window_across_compaction():
+    bars = _bars(40)
+    rolling = RollingBars(7)
+    for i, bar in enumerate(bars):
+        rolling.append(bar)
+        window = rolling.window()
+        expected = bars[max(0, i - 6):i + 1]
+        assert list(window["close"]) == [b["close"] for b in expected]
+        assert list(window["ts"]) == [b["timestamp"] for b in expected]
+    assert len(rolling) == 7
+
+
+def test_stream_bundles_match_precomputed_arrays():
+    bars = _bars(260)
+    arrays = IndicatorArrays.compute(SymbolBars.from_bars("AAA", bars))
+    stream = SymbolStream("AAA", 200)
+    for i, bar in enumerate(bars):
+        got = stream.push(bar)
+        expected = arrays.bundle(i)
+        assert set(got) == set(expected), i
+        for key, value in expected.items():
+            assert got[key] == (value if isinstance(value, str) else pytest.approx(value, rel=1e-9, abs=1e-9)), (i, key)
+
+
+def test_stream_bundles_match_precomputed_arrays_with_extra_emas():
+    bars = _bars(260)
+    arrays = IndicatorArrays.compute(SymbolBars.from_bars("AAA", bars), ema_periods=(12, 26, 50, 120))
+    stream = SymbolStream("AAA", 200, ema_periods=(12, 26, 50, 120))
+    for i, bar in enumerate(bars):
+        got = stream.push(bar)
+        expected = arrays.bundle(i)
+        assert set(got) == set(expected), i
+        for key in ("ema12", "ema26", "ema120"):
+            if key in expected:
+                assert got[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-9), (i, key)
+    assert {"ema12", "ema26", "ema120"} <= set(got)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for phase, symbol in enumerate(("AAA", "BBB", "CCC")):
+        lines = ["timestamp,open,high,low,close,volume"]
+        for bar in _bars(600, phase=phase * 0.05):
+            lines.append(
+                f"{bar['timestamp'].isoformat()},{bar['open']},{bar['high']},{bar['low']},{bar['close']},{bar['volume']}"
+            )
+        (tmp_path / f"{symbol}_5m.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _run(data_dir, symbols, config=CONFIG, **kwargs):
+    bt_config = BacktestConfig(
+        symbols=symbols,
+        strategies=["EMA_20_50"],
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        **kwargs,
+    )
+    engine = BacktestEngineV3(bt_config=bt_config, config=config)
+    engine.data_loader.market_data_dir = data_dir
+    try:
+        return engine, engine.run()
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+
+
+def test_single_symbol_matches_per_symbol_loop(data_dir):
+    _, per_symbol = _run(data_dir, ["AAA"])
+    _, chronological = _run(data_dir, ["AAA"], event_loop="chronological")
+    assert per_symbol.overall_metrics["total_trades"] > 0
+    key = lambda t: (t["timestamp"], t["side"], t["qty"], t["reason"])
+    assert [key(t) for t in chronological.trades] == [key(t) for t in per_symbol.trades]
+    assert chronological.overall_metrics["realized_pnl"] == pytest.approx(per_symbol.overall_metrics["realized_pnl"])
+
+
+def test_non_default_ema_periods_trade_in_both_loops(data_dir):
+    config = {
+        **CONFIG,
+        "strategy_engine": {"strategies_v2": [{
+            **CONFIG["strategy_engine"]["strategies_v2"][0],
+            "params": {"timeframe": "5m", "use_regime_filter": False, "ema_fast": 12, "ema_slow": 26},
+        }]},
+    }
+    _, per_symbol = _run(data_dir, ["AAA"], config=config)
+    _, chronological = _run(data_dir, ["AAA"], config=config, event_loop="chronological")
+    assert per_symbol.overall_metrics["total_trades"] > 0
+    key = lambda t: (t["timestamp"], t["side"], t["qty"], t["reason"])
+    assert [key(t) for t in chronological.trades] == [key(t) for t in per_symbol.trades]
+
+    _, portfolio = _run(data_dir, ["AAA", "BBB"], config=config, event_loop="chronological")
+    assert {t["symbol"] for t in portfolio.trades} == {"AAA", "BBB"}
+
+
+def test_portfolio_replay_marks_all_positions(data_dir):
+    symbols = ["AAA", "BBB", "CCC"]
+    config = dict(CONFIG, trading={"max_open_positions": 2})
+    engine, result = _run(data_dir, symbols, config=config, event_loop="chronological")
+    metrics = result.overall_metrics
+
+    # One bar per symbol per step, one equity point per timestamp
+    assert metrics["bars_processed"] == 1800
+    assert len(result.equity_curve) == 600
+    assert [p["bar_index"] for p in result.equity_curve] == list(range(3, 1801, 3))
+
+    # Replaying the trades: never more than two positions open, and each
+    # snapshot's unrealized P&L marks every open position at its last close
+    closes = {symbol: {b["timestamp"].isoformat(): b["close"] for b in _bars(600, phase=i * 0.05)}
+              for i, symbol in enumerate(symbols)}
+    open_positions, trades = {}, iter(result.trades)
+    trade = next(trades, None)
+    multi_position_steps = 0
+    for point in result.equity_curve:
+        while trade is not None and trade["bar_index"] <= point["bar_index"]:
+            if trade["position_qty"] == 0:
+                open_positions.pop(trade["symbol"])
+            else:
+                open_positions[trade["symbol"]] = (trade["position_qty"], trade["price"])
+            assert len(open_positions) <= 2
+            trade = next(trades, None)
+        expected = sum((closes[s][point["timestamp"]] - price) * qty for s, (qty, price) in open_positions.items())
+        assert point["unrealized_pnl"] == pytest.approx(expected)
+        multi_position_steps += len(open_positions) > 1
+    assert multi_position_steps > 0
+    assert metrics["rejected_intents"].get("max_open_positions", 0) > 0
+
+    assert not engine.positions
+    realized = sum(t["pnl"] for t in result.trades if t["position_qty"] == 0)
+    assert metrics["realized_pnl"] == pytest.approx(realized)
+    assert metrics["final_equity"] == pytest.approx(engine.bt_config.initial_equity + realized)
+
+
+def test_chronological_runs_are_not_sharded(data_dir):
+    with pytest.raises(ValueError):
+        _run(data_dir, ["AAA"], event_loop="chronological", workers=2)
@@ -0,0 +1,107 @@
+"""Tests for the precomputed-indicator fast path of BacktestEngineV3 (backtest/bar_store.py)"""
+
+import math
+import shutil
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.bar_store import IndicatorArrays, SymbolBars
+from backtest.engine_v3 import BacktestConfig, BacktestEngineV3
+from core.strategy_engine_v2 import StrategyEngineV2
+
+
+def _bars(n, start=datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)):
+    bars = []
+    for i in range(n):
+        close = 100.0 + 8.0 * math.sin(i / 15.0) + 0.01 * i
+        bars.append({
+            "timestamp": start + timedelta(minutes=5 * (i % 75)) + timedelta(days=i // 75),
+            "open": close - 0.3,
+            "high": close + 0.6,
+            "low": close - 0.7,
+            "close": close,
+            "volume": 1000.0 + (i * 37) % 500,
+        })
+    return bars
+
+
+def test_bundles_match_strategy_engine_v2():
+    bars = SymbolBars.from_bars("AAA", _bars(260))
+    arrays = IndicatorArrays.compute(bars)
+    engine = StrategyEngineV2({})
+    engine.stop_telemetry()
+
+    for i in (10, 19, 30, 49, 75, 99, 150, 199, 259):
+        series = {key: list(values) for key, values in bars.window(i, i + 1).items() if key != "ts"}
+        expected = engine.compute_indicators(series)
+        got = arrays.bundle(i)
+        assert set(got) == set(expected), i
+        for key, value in expected.items():
+            assert got[key] == (value if isinstance(value, str) else pytest.approx(value, rel=1e-9, abs=1e-9)), (i, key)
+
+    assert list(arrays.iter_bundles()) == [arrays.bundle(i) for i in range(len(bars))]
+
+
+def test_window_is_a_view():
+    bars = SymbolBars.from_bars("AAA", _bars(50))
+    window = bars.window(30, 10)
+    assert len(window["close"]) == len(window["ts"]) == 10
+    assert window["close"][-1] == bars.bar(30)["close"]
+    assert window["close"].base is bars.close
+
+
+def _write_csv(directory, symbol, bars):
+    lines = ["timestamp,open,high,low,close,volume"]
+    for bar in bars:
+        lines.append(
+            f"{bar['timestamp'].isoformat()},{bar['open']},{bar['high']},{bar['low']},{bar['close']},{bar['volume']}"
+        )
+    (directory / f"{symbol}_5m.csv").write_text("\n".join(lines) + "\n")
+
+
+def test_engine_runs_v2_strategies(tmp_path):
+    for symbol in ("AAA", "BBB"):
+        _write_csv(tmp_path, symbol, _bars(600))
+    config = {
+        "strategy_engine": {
+            "strategies_v2": [{
+                "id": "EMA_20_50",
+                "module": "strategies.ema20_50_intraday_v2",
+                "class": "EMA2050IntradayV2",
+                "enabled": False,  # requested explicitly, so it still runs
+                "params": {"timeframe": "5m", "use_regime_filter": False},
+            }],
+        },
+        "risk": {"max_consecutive_losses_symbol": 100, "max_consecutive_losses_strategy": 100},
+    }
+    bt_config = BacktestConfig(
+        symbols=["AAA", "BBB"],
+        strategies=["ema20_50_intraday_v2"],
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+    )
+    engine = BacktestEngineV3(bt_config=bt_config, config=config)
+    engine.data_loader.market_data_dir = tmp_path
+    try:
+        result = engine.run()
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+
+    assert list(engine.strategies) == ["EMA_20_50"]
+    metrics = result.overall_metrics
+    assert metrics["bars_processed"] == 1200
+    assert metrics["total_trades"] > 0
+    assert not engine.positions  # closed at the end of each symbol's data
+
+    closed = [trade for trade in result.trades if trade["position_qty"] == 0]
+    realized = sum(trade["pnl"] for trade in closed)
+    assert metrics["realized_pnl"] == pytest.approx(realized)
+    assert metrics["final_equity"] == pytest.approx(bt_config.initial_equity + realized)
+    assert result.per_strategy["EMA_20_50"]["trades"] == len(closed)
+    assert sum(stats["trades"] for stats in result.per_symbol.values()) == len(closed)
@@ -0,0 +1,122 @@
+"""Tests for sharded Backtest Engine v3 runs (backtest/sharding.py)"""
+
+import math
+import shutil
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.bar_store import IndicatorArrays, SymbolBars
+from backtest.engine_v3 import BacktestConfig, BacktestEngineV3
+from backtest.sharding import plan_shards
+
+CONFIG = {
+    "strategy_engine": {
+        "strategies_v2": [{
+            "id": "EMA_20_50",
+            "module": "strategies.ema20_50_intraday_v2",
+            "class": "EMA2050IntradayV2",
+            "params": {"timeframe": "5m", "use_regime_filter": False},
+        }],
+    },
+    "risk": {"max_consecutive_losses_symbol": 100, "max_consecutive_losses_strategy": 100},
+}
+
+
+def _bars(n, phase=0.0, start=datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)):
+    bars = []
+    for i in range(n):
+        close = 100.0 + 8.0 * math.sin(i / 15.0 + phase) + 0.01 * i
+        bars.append({
+            "timestamp": start + timedelta(minutes=5 * (i % 75)) + timedelta(days=i // 75),
+            "open": close - 0.3,
+            "high": close + 0.6,
+            "low": close - 0.7,
+            "close": close,
+            "volume": 1000.0 + (i * 37) % 500,
+        })
+    return bars
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for phase, symbol in enumerate(("AAA", "BBB", "CCC")):
+        lines = ["timestamp,open,high,low,close,volume"]
+        for bar in _bars(600, phase=phase):
+            lines.append(
+                f"{bar['timestamp'].isoformat()},{bar['open']},{bar['high']},{bar['low']},{bar['close']},{bar['volume']}"
+            )
+        (tmp_path / f"{symbol}_5m.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _run(data_dir, **kwargs):
+    bt_config = BacktestConfig(
+        symbols=["AAA", "BBB", "CCC"],
+        strategies=["EMA_20_50"],
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        **kwargs,
+    )
+    engine = BacktestEngineV3(bt_config=bt_config, config=CONFIG)
+    engine.data_loader.market_data_dir = data_dir
+    try:
+        result = engine.run()
+        assert not (engine.backtest_dir / "shards").exists()
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+    metrics = dict(result.overall_metrics)
+    metrics.pop("elapsed_sec")
+    return result, metrics
+
+
+def test_plan_shards():
+    shards = plan_shards(["AAA", "BBB"], "2025-01-01", "2025-01-03", "day")
+    assert [(s.index, s.symbol, s.start_date) for s in shards[:4]] == [
+        (0, "AAA", "2025-01-01"), (1, "AAA", "2025-01-02"), (2, "AAA", "2025-01-03"), (3, "BBB", "2025-01-01"),
+    ]
+    assert shards[0].close_reason == "end_of_day"
+    assert plan_shards(["AAA"], "2025-01-01", "2025-01-03", "symbol")[0].close_reason == "end_of_data"
+    with pytest.raises(ValueError):
+        plan_shards(["AAA"], "2025-01-01", "2025-01-03", "week")
+
+
+def test_day_range_bundles():
+    bars = SymbolBars.from_bars("AAA", _bars(300))
+    arrays = IndicatorArrays.compute(bars)
+    lo, hi = bars.index_range(date(2025, 1, 2), date(2025, 1, 3))
+    assert (lo, hi) == (75, 225)
+    assert list(arrays.iter_bundles(lo, hi)) == [arrays.bundle(i) for i in range(lo, hi)]
+    assert list(arrays.iter_bundles(5, 30)) == [arrays.bundle(i) for i in range(5, 30)]
+
+
+def test_symbol_shards_match_serial_run_for_any_worker_count(data_dir):
+    serial, serial_metrics = _run(data_dir)
+    assert serial_metrics["total_trades"] > 0
+    for workers in (1, 2):
+        sharded, metrics = _run(data_dir, workers=workers, shard_by="symbol")
+        assert sharded.trades == serial.trades
+        assert sharded.equity_curve == serial.equity_curve
+        assert sharded.per_strategy == serial.per_strategy
+        assert sharded.per_symbol == serial.per_symbol
+        assert metrics == serial_metrics
+
+
+def test_day_shards_are_worker_count_independent(data_dir):
+    one, one_metrics = _run(data_dir, workers=1, shard_by="day")
+    two, two_metrics = _run(data_dir, workers=2, shard_by="day")
+    assert one.trades == two.trades
+    assert one.equity_curve == two.equity_curve
+    assert one_metrics == two_metrics
+    assert one_metrics["bars_processed"] == 1800
+    # Every day ends flat
+    assert all(trade["reason"] != "end_of_data" for trade in one.trades)
+    days = {}
+    for trade in one.trades:
+        days[(trade["symbol"], trade["timestamp"][:10])] = trade["position_qty"]
+    assert set(days.values()) == {0}
@@ -0,0 +1,200 @@
+"""Tests for parameter sweeps (backtest/sweep.py) and SharedBarStore"""
+
+import json
+import math
+import shutil
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.bar_store import BarStore, IndicatorArrays, SharedBarStore, SymbolBars
+from backtest.engine_v3 import BacktestConfig, BacktestEngineV3
+from backtest.sweep import SweepConfig, grid_combinations, random_combinations, run_sweep
+
+CONFIG = {
+    "strategy_engine": {
+        "strategies_v2": [{
+            "id": "EMA_20_50",
+            "module": "strategies.ema20_50_intraday_v2",
+            "class": "EMA2050IntradayV2",
+            "params": {"timeframe": "5m", "use_regime_filter": False},
+        }],
+    },
+    "risk": {"max_consecutive_losses_symbol": 100, "max_consecutive_losses_strategy": 100},
+}
+
+
+def _bars(n, phase=0.0, start=datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)):
+    bars = []
+    for i in range(n):
+        # A slow swing plus fast wiggles, so some crossovers lose money
+        close = 100.0 + 8.0 * math.sin(i / 15.0 + phase) + 1.5 * math.sin(i * 1.7) + 0.01 * i
+        bars.append({
+            "timestamp": start + timedelta(minutes=5 * (i % 75)) + timedelta(days=i // 75),
+            "open": close - 0.3,
+            "high": close + 0.6,
+            "low": close - 0.7,
+            "close": close,
+            "volume": 1000.0 + (i * 37) % 500,
+        })
+    return bars
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for phase, symbol in enumerate(("AAA", "BBB")):
+        lines = ["timestamp,open,high,low,close,volume"]
+        for bar in _bars(600, phase=phase):
+            lines.append(
+                f"{bar['timestamp'].isoformat()},{bar['open']},{bar['high']},{bar['low']},{bar['close']},{bar['volume']}"
+            )
+        (tmp_path / f"{symbol}_5m.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _bt_config():
+    return BacktestConfig(
+        symbols=["AAA", "BBB"],
+        strategies=["EMA_20_50"],
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+    )
+
+
+def test_combinations():
+    grid = {"ema_fast": [5, 9, 20], "ema_slow": [30, 50]}
+    combos = grid_combinations(grid)
+    assert len(combos) == 6
+    assert combos[1] == {"ema_fast": 5, "ema_slow": 50}
+
+    sampled = random_combinations(grid, 4, seed=7)
+    assert len(sampled) == 4
+    assert all(combo in combos for combo in sampled)
+    assert len({tuple(combo.values()) for combo in sampled}) == 4
+    assert sampled == random_combinations(grid, 4, seed=7)
+    assert sorted(map(str, random_combinations(grid, 50))) == sorted(map(str, combos))
+
+    with pytest.raises(ValueError):
+        SweepConfig.from_dict({"strategy": "EMA_20_50", "grid": grid, "search": "random"})
+    with pytest.raises(ValueError):
+        SweepConfig(strategy="EMA_20_50", grid=grid, rank_by="sharpe")
+
+
+def test_extra_ema_columns_follow_warmup():
+    bars = SymbolBars.from_bars("AAA", _bars(120))
+    arrays = IndicatorArrays.compute(bars, ema_periods=(5, 30, 50))
+    assert "ema5" in arrays.columns and "ema30" in arrays.columns
+    assert "ema5" in arrays.bundle(19) and "ema5" not in arrays.bundle(18)
+    assert "ema30" in arrays.bundle(29) and "ema30" not in arrays.bundle(28)
+    assert list(arrays.iter_bundles()) == [arrays.bundle(i) for i in range(120)]
+    # Standard columns are unchanged
+    plain = IndicatorArrays.compute(bars)
+    for i in (19, 49, 99, 119):
+        assert {k: v for k, v in arrays.bundle(i).items() if k not in ("ema5", "ema30")} == plain.bundle(i)
+
+
+def test_shared_store_matches_bar_store(data_dir):
+    engine = BacktestEngineV3(bt_config=_bt_config(), config=CONFIG)
+    engine.data_loader.market_data_dir = data_dir
+    bar_store = BarStore(engine.data_loader, "2025-01-01", "2025-01-31")
+    try:
+        with SharedBarStore.create(bar_store, ["AAA", "BBB"], ema_periods=(5,)) as store:
+            attached = SharedBarStore.attach(store.spec)
+            for symbol in ("AAA", "BBB"):
+                expected = bar_store.bars(symbol)
+                bars = attached.bars(symbol)
+                assert list(bars.timestamps) == list(expected.timestamps)
+                assert bars.bar(10) == expected.bar(10)
+                assert attached.bars(symbol) is bars
+
+                full = IndicatorArrays.compute(expected, ema_periods=(5,))
+                assert list(attached.indicators(symbol).iter_bundles()) == list(full.iter_bundles())
+                attached.ema_periods = frozenset()
+                plain = IndicatorArrays.compute(expected)
+                assert list(attached.indicators(symbol).iter_bundles()) == list(plain.iter_bundles())
+                attached.ema_periods = None
+            attached.close()
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+
+
+def test_evaluate_matches_run(data_dir):
+    engine = BacktestEngineV3(bt_config=_bt_config(), config=CONFIG)
+    engine.data_loader.market_data_dir = data_dir
+    try:
+        result = engine.run()
+        evaluated = engine.evaluate()
+        again = engine.evaluate()
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+    assert result.overall_metrics["total_trades"] > 0
+    assert result.overall_metrics["max_drawdown_pct"] > 0
+    assert evaluated.trades == result.trades == again.trades
+    assert evaluated.equity_curve == result.equity_curve
+    assert evaluated.overall_metrics["stopped_early"] is False
+
+    equity = [point["equity"] for point in result.equity_curve]
+    peak, drawdown = engine.bt_config.initial_equity, 0.0
+    for value in equity:
+        peak = max(peak, value)
+        drawdown = max(drawdown, (peak - value) / peak * 100)
+    assert result.overall_metrics["max_drawdown_pct"] == pytest.approx(drawdown)
+
+
+def _rows_by_params(rows):
+    return {(row["ema_fast"], row["ema_slow"]): row for row in rows}
+
+
+def test_sweep_matches_individual_runs(data_dir, tmp_path):
+    grid = {"ema_fast": [5, 9], "ema_slow": [30, 50]}
+    sweep = SweepConfig(strategy="EMA_20_50", grid=grid)
+    rows, path = run_sweep(_bt_config(), CONFIG, sweep, output_dir=tmp_path / "sweep", data_dir=data_dir)
+
+    data = json.loads(path.read_text())
+    columns = data["columns"]
+    assert columns["rank"] == [1, 2, 3, 4]
+    assert columns["total_return_pct"] == sorted(columns["total_return_pct"], reverse=True)
+    assert list(columns)[:3] == ["rank", "ema_fast", "ema_slow"]
+
+    by_params = _rows_by_params(rows)
+    for fast, slow in [(5, 30), (9, 50)]:
+        config = json.loads(json.dumps(CONFIG))
+        config["strategy_engine"]["strategies_v2"][0]["params"].update(ema_fast=fast, ema_slow=slow)
+        engine = BacktestEngineV3(bt_config=_bt_config(), config=config)
+        engine.data_loader.market_data_dir = data_dir
+        try:
+            metrics = engine.run().overall_metrics
+        finally:
+            shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+        row = by_params[(fast, slow)]
+        assert row["total_trades"] == metrics["total_trades"]
+        assert row["realized_pnl"] == pytest.approx(metrics["realized_pnl"])
+        assert row["max_drawdown_pct"] == pytest.approx(metrics["max_drawdown_pct"])
+
+    # Same results on a worker pool
+    sweep.workers = 2
+    pooled, _ = run_sweep(_bt_config(), CONFIG, sweep, output_dir=tmp_path / "pooled", data_dir=data_dir)
+    assert pooled == rows
+
+
+def test_drawdown_stop_ranks_last(data_dir, tmp_path):
+    grid = {"ema_fast": [5, 9], "ema_slow": [30, 50]}
+    full, _ = run_sweep(_bt_config(), CONFIG, SweepConfig(strategy="EMA_20_50", grid=grid), output_dir=tmp_path / "full", data_dir=data_dir)
+    drawdowns = sorted(row["max_drawdown_pct"] for row in full)
+    limit = (drawdowns[1] + drawdowns[2]) / 2
+
+    sweep = SweepConfig(strategy="EMA_20_50", grid=grid, max_drawdown_pct=limit)
+    rows, _ = run_sweep(_bt_config(), CONFIG, sweep, output_dir=tmp_path / "stopped", data_dir=data_dir)
+    stopped = [row for row in rows if row["stopped_early"]]
+    assert len(stopped) == 2
+    assert rows[-2:] == stopped
+    complete = _rows_by_params(full)
+    for row in rows[:2]:
+        assert row["total_return_pct"] == complete[(row["ema_fast"], row["ema_slow"])]["total_return_pct"]
+    for row in stopped:
+        assert row["total_trades"] <= complete[(row["ema_fast"], row["ema_slow"])]["total_trades"]
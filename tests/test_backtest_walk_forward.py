@@ -0,0 +1,171 @@
+"""Tests for walk-forward optimization (backtest/walk_forward.py)"""
+
+import json
+import math
+import shutil
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.engine_v3 import BacktestConfig, BacktestEngineV3
+from backtest.sweep import SweepConfig
+from backtest.walk_forward import WalkForwardConfig, plan_windows, run_walk_forward
+from core.backtest_registry import list_backtest_runs, load_backtest_equity_curve, load_backtest_summary
+
+CONFIG = {
+    "strategy_engine": {
+        "strategies_v2": [{
+            "id": "EMA_20_50",
+            "module": "strategies.ema20_50_intraday_v2",
+            "class": "EMA2050IntradayV2",
+            "params": {"timeframe": "5m", "use_regime_filter": False},
+        }],
+    },
+    "risk": {"max_consecutive_losses_symbol": 100, "max_consecutive_losses_strategy": 100},
+}
+
+GRID = {"ema_fast": [5, 9], "ema_slow": [30, 50]}
+
+# Twelve bars a day, every day from January to April
+BARS_PER_DAY = 12
+DAYS = 120
+
+
+def _bars(phase=0.0, start=datetime(2025, 1, 1, 3, 45, tzinfo=timezone.utc)):
+    bars = []
+    for i in range(BARS_PER_DAY * DAYS):
+        close = 100.0 + 8.0 * math.sin(i / 15.0 + phase) + 1.5 * math.sin(i * 1.7) + 0.01 * i
+        bars.append({
+            "timestamp": start + timedelta(minutes=5 * (i % BARS_PER_DAY)) + timedelta(days=i // BARS_PER_DAY),
+            "open": close - 0.3,
+            "high": close + 0.6,
+            "low": close - 0.7,
+            "close": close,
+            "volume": 1000.0 + (i * 37) % 500,
+        })
+    return bars
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for phase, symbol in enumerate(("AAA", "BBB")):
+        lines = ["timestamp,open,high,low,close,volume"]
+        for bar in _bars(phase=phase):
+            lines.append(
+                f"{bar['timestamp'].isoformat()},{bar['open']},{bar['high']},{bar['low']},{bar['close']},{bar['volume']}"
+            )
+        (tmp_path / f"{symbol}_5m.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _bt_config():
+    return BacktestConfig(
+        symbols=["AAA", "BBB"],
+        strategies=["EMA_20_50"],
+        start_date="2025-01-01",
+        end_date="2025-04-30",
+    )
+
+
+def _walk_forward(data_dir, base_dir, run_id, workers=1):
+    walk_forward = WalkForwardConfig(
+        sweep=SweepConfig(strategy="EMA_20_50", grid=GRID, workers=workers),
+        in_sample_months=2,
+    )
+    return run_walk_forward(
+        _bt_config(), CONFIG, walk_forward,
+        run_id=run_id, output_dir=base_dir / "EMA_20_50" / run_id, data_dir=data_dir,
+    )
+
+
+def test_plan_windows():
+    windows = plan_windows("2025-01-15", "2025-05-20", 2)
+    assert [(w.in_sample_start, w.in_sample_end, w.out_of_sample_start, w.out_of_sample_end) for w in windows] == [
+        (date(2025, 1, 15), date(2025, 3, 14), date(2025, 3, 15), date(2025, 4, 14)),
+        (date(2025, 2, 15), date(2025, 4, 14), date(2025, 4, 15), date(2025, 5, 14)),
+        (date(2025, 3, 15), date(2025, 5, 14), date(2025, 5, 15), date(2025, 5, 20)),
+    ]
+    assert len(plan_windows("2025-01-01", "2025-12-31", 3, out_of_sample_months=3)) == 3
+    with pytest.raises(ValueError):
+        plan_windows("2025-01-01", "2025-02-28", 2)
+    with pytest.raises(ValueError):
+        WalkForwardConfig(sweep=SweepConfig(strategy="EMA_20_50"), in_sample_months=0)
+
+
+def test_walk_forward_picks_in_sample_best_and_stitches(data_dir, tmp_path):
+    result = _walk_forward(data_dir, tmp_path / "backtests", "wf_test")
+    windows = result.overall_metrics["walk_forward"]["windows"]
+    assert [(w["in_sample"], w["out_of_sample"]) for w in windows] == [
+        (["2025-01-01", "2025-02-28"], ["2025-03-01", "2025-03-31"]),
+        (["2025-02-01", "2025-03-31"], ["2025-04-01", "2025-04-30"]),
+    ]
+
+    # Reference: every combination evaluated on the full range's bars
+    engine = BacktestEngineV3(bt_config=_bt_config(), config=CONFIG)
+    engine.data_loader.market_data_dir = data_dir
+    try:
+        realized, bar_offset = 0.0, 0
+        for window in windows:
+            in_sample = [date.fromisoformat(d) for d in window["in_sample"]]
+            returns = {}
+            for fast in GRID["ema_fast"]:
+                for slow in GRID["ema_slow"]:
+                    params = {"EMA_20_50": {"ema_fast": fast, "ema_slow": slow}}
+                    returns[(fast, slow)] = engine.evaluate(params, start=in_sample[0], end=in_sample[1]).overall_metrics["total_return_pct"]
+            chosen = (window["params"]["ema_fast"], window["params"]["ema_slow"])
+            assert returns[chosen] == max(returns.values())
+            assert window["in_sample_metrics"]["total_return_pct"] == pytest.approx(returns[chosen])
+
+            out_of_sample = [date.fromisoformat(d) for d in window["out_of_sample"]]
+            expected = engine.evaluate({"EMA_20_50": window["params"]}, start=out_of_sample[0], end=out_of_sample[1])
+            trades = [t for t in result.trades if t["window"] == window["index"]]
+            assert [(t["timestamp"], t["side"], t["pnl"], t["bar_index"] - bar_offset) for t in trades] == [
+                (t["timestamp"], t["side"], t["pnl"], t["bar_index"]) for t in expected.trades
+            ]
+            first = next(p for p in result.equity_curve if p["timestamp"] == expected.equity_curve[0]["timestamp"])
+            assert first["cash"] == pytest.approx(engine.bt_config.initial_equity + realized)
+            realized += expected.overall_metrics["realized_pnl"]
+            bar_offset += expected.overall_metrics["bars_processed"]
+    finally:
+        shutil.rmtree(engine.backtest_dir, ignore_errors=True)
+
+    metrics = result.overall_metrics
+    assert metrics["total_trades"] > 0
+    assert metrics["bars_processed"] == bar_offset == len(result.equity_curve)
+    assert metrics["realized_pnl"] == pytest.approx(realized)
+    assert metrics["final_equity"] == pytest.approx(engine.bt_config.initial_equity + realized)
+    assert result.equity_curve[0]["timestamp"].startswith("2025-03-01")
+
+
+def test_windows_in_parallel_match_serial(data_dir, tmp_path):
+    serial = _walk_forward(data_dir, tmp_path / "serial", "wf_serial")
+    pooled = _walk_forward(data_dir, tmp_path / "pooled", "wf_pooled", workers=2)
+    assert pooled.trades == serial.trades
+    assert pooled.equity_curve == serial.equity_curve
+    assert pooled.overall_metrics["walk_forward"]["windows"] == serial.overall_metrics["walk_forward"]["windows"]
+
+
+def test_registry_lists_walk_forward_run(data_dir, tmp_path):
+    base_dir = tmp_path / "backtests"
+    result = _walk_forward(data_dir, base_dir, "wf_registry")
+
+    runs = list_backtest_runs(str(base_dir))
+    assert len(runs) == 1
+    run = runs[0]
+    closed = [t for t in result.trades if t["position_qty"] == 0]
+    assert (run["strategy"], run["run_id"], run["symbol"]) == ("EMA_20_50", "wf_registry", "AAA")
+    assert (run["date_from"], run["date_to"]) == ("2025-01-01", "2025-04-30")
+    assert run["total_trades"] == len(closed)
+    assert run["net_pnl"] == pytest.approx(result.overall_metrics["realized_pnl"])
+
+    summary = load_backtest_summary("EMA_20_50/wf_registry", str(base_dir))
+    assert len(summary["overall_metrics"]["walk_forward"]["windows"]) == 2
+    curve = load_backtest_equity_curve("EMA_20_50/wf_registry", str(base_dir))
+    assert len(curve) == len(result.equity_curve) + 1
+    assert curve[-1]["equity"] == pytest.approx(result.overall_metrics["final_equity"])
+    assert json.loads((base_dir / "EMA_20_50" / "wf_registry" / "config.json").read_text())["start_date"] == "2025-01-01"
@@ -0,0 +1,158 @@
+"""Tests for batched LTP fetching in data/broker_feed.py"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.broker_feed import BrokerAuthError, BrokerFeed, QuoteSnapshot
+
+
+def _fake_ltp(*keys):
+    """Echo back a price for every key except those containing MISSING."""
+    return {
+        key: {"last_price": 100.0 + i}
+        for i, key in enumerate(keys)
+        if "MISSING" not in key
+    }
+
+
+def test_get_ltp_many_single_call_for_universe():
+    """A whole universe should be fetched with a single kite.ltp call"""
+    mock_kite = Mock()
+    mock_kite.ltp = Mock(side_effect=_fake_ltp)
+
+    feed = BrokerFeed(mock_kite)
+    symbols = [f"SYM{i}" for i in range(120)]
+
+    prices = feed.get_ltp_many(symbols, exchange="NSE")
+
+    assert mock_kite.ltp.call_count == 1
+    assert len(prices) == 120
+    assert prices["SYM0"] == 100.0
+    assert prices["SYM119"] == 219.0
+    print("✓ test_get_ltp_many_single_call_for_universe")
+
+
+def test_get_ltp_many_chunks_requests():
+    """Keys beyond the per-call limit should be split into chunks"""
+    mock_kite = Mock()
+    mock_kite.ltp = Mock(side_effect=_fake_ltp)
+
+    feed = BrokerFeed(mock_kite)
+    feed.max_instruments_per_call = 50
+
+    prices = feed.get_ltp_many([f"SYM{i}" for i in range(120)], exchange="NFO")
+
+    assert mock_kite.ltp.call_count == 3
+    assert all(p is not None for p in prices.values())
+    first_call_keys = mock_kite.ltp.call_args_list[0].args
+    assert len(first_call_keys) == 50
+    assert first_call_keys[0] == "NFO:SYM0"
+    print("✓ test_get_ltp_many_chunks_requests")
+
+
+def test_get_ltp_many_dedupes_and_handles_missing():
+    """Duplicates are fetched once and missing symbols map to None"""
+    mock_kite = Mock()
+    mock_kite.ltp = Mock(side_effect=_fake_ltp)
+
+    feed = BrokerFeed(mock_kite)
+    prices = feed.get_ltp_many(["A", "MISSING1", "A", "B"], exchange="NSE")
+
+    assert mock_kite.ltp.call_args.args == ("NSE:A", "NSE:MISSING1", "NSE:B")
+    assert prices["MISSING1"] is None
+    assert prices["A"] is not None and prices["B"] is not None
+    assert "NSE:MISSING1" in feed._warned_missing_symbols
+    print("✓ test_get_ltp_many_dedupes_and_handles_missing")
+
+
+def test_get_ltp_many_raises_auth_error():
+    """Batched fetch shares the consecutive auth-error accounting"""
+    from kiteconnect import exceptions as kite_exceptions
+
+    with patch("data.broker_feed.kite_request") as mock_kite_request:
+        mock_kite_request.side_effect = kite_exceptions.TokenException(
+            "Incorrect `api_key` or `access_token`."
+        )
+        feed = BrokerFeed(Mock())
+
+        assert feed.get_ltp_many(["A", "B"]) == {"A": None, "B": None}
+        assert feed.get_ltp_many(["A", "B"]) == {"A": None, "B": None}
+        try:
+            feed.get_ltp_many(["A", "B"])
+            assert False, "Should have raised BrokerAuthError"
+        except BrokerAuthError:
+            pass
+    print("✓ test_get_ltp_many_raises_auth_error")
+
+
+def test_quote_snapshot_serves_prefetched_prices():
+    """QuoteSnapshot should not hit the broker again for prefetched symbols"""
+    mock_kite = Mock()
+    mock_kite.ltp = Mock(side_effect=_fake_ltp)
+
+    feed = BrokerFeed(mock_kite)
+    quotes = QuoteSnapshot(feed, exchange="NSE")
+    quotes.prefetch(["A", "B", "MISSING1"])
+
+    assert quotes.ltp("A") == 100.0
+    assert quotes.ltp("B") == 101.0
+    assert quotes.ltp("MISSING1") is None
+    assert mock_kite.ltp.call_count == 1
+
+    # Symbols outside the prefetch are fetched on demand
+    assert quotes.ltp("C") == 100.0
+    assert mock_kite.ltp.call_count == 2
+    assert quotes.prices() == {"A": 100.0, "B": 101.0, "C": 100.0}
+    print("✓ test_quote_snapshot_serves_prefetched_prices")
+
+
+def test_quote_snapshot_falls_back_for_simple_feeds():
+    """Feeds without get_ltp_many are queried per symbol, once each"""
+    simple_feed = Mock()
+    simple_feed.get_ltp = Mock(return_value=19500.0)
+
+    quotes = QuoteSnapshot(simple_feed, exchange="NFO")
+    quotes.prefetch(["NIFTY24DECFUT"])
+    assert simple_feed.get_ltp.call_count == 0
+
+    assert quotes.ltp("NIFTY24DECFUT") == 19500.0
+    assert quotes.ltp("NIFTY24DECFUT") == 19500.0
+    simple_feed.get_ltp.assert_called_once_with("NIFTY24DECFUT", exchange="NFO")
+    print("✓ test_quote_snapshot_falls_back_for_simple_feeds")
+
+
+def run_all_tests():
+    """Run all tests and report results"""
+    tests = [
+        test_get_ltp_many_single_call_for_universe,
+        test_get_ltp_many_chunks_requests,
+        test_get_ltp_many_dedupes_and_handles_missing,
+        test_get_ltp_many_raises_auth_error,
+        test_quote_snapshot_serves_prefetched_prices,
+        test_quote_snapshot_falls_back_for_simple_feeds,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print(f"\nResults: {passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
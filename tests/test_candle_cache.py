@@ -0,0 +1,122 @@
+"""
+Tests for the on-disk candle cache backends used by MarketDataEngine.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from core.candle_cache import (
+    HEADER_SIZE,
+    RECORD_SIZE,
+    BinaryCandleCache,
+    JsonCandleCache,
+    make_candle_cache,
+    migrate_json_cache,
+)
+from core.market_data_engine import MarketDataEngine
+
+
+def _candle(minute, close, offset="+00:00"):
+    return {
+        "ts": f"2024-11-15T10:{minute:02d}:00{offset}",
+        "open": close - 1,
+        "high": close + 1,
+        "low": close - 2,
+        "close": close,
+        "volume": 100.0 * minute,
+    }
+
+
+@pytest.mark.parametrize("backend", ["binary", "json"])
+def test_backends_round_trip_and_merge(tmp_path, backend):
+    store = make_candle_cache(backend, tmp_path)
+    store.save("NIFTY", "1m", [_candle(1, 101.0), _candle(0, 100.0), _candle(2, 102.0)])
+
+    assert [c["close"] for c in store.load("NIFTY", "1m")] == [100.0, 101.0, 102.0]
+    assert store.load("NIFTY", "1m")[0] == _candle(0, 100.0)
+
+    # Forming bar updated, two new bars appended
+    store.merge("NIFTY", "1m", [_candle(2, 102.5), _candle(3, 103.0), _candle(4, 104.0)])
+    assert [c["close"] for c in store.load("NIFTY", "1m")] == [100.0, 101.0, 102.5, 103.0, 104.0]
+    assert [c["ts"] for c in store.tail("NIFTY", "1m", 2)] == [_candle(3, 0)["ts"], _candle(4, 0)["ts"]]
+    assert store.count("NIFTY", "1m") == 5
+    assert store.tail("BANKNIFTY", "1m", 5) == []
+
+
+def test_binary_merge_only_grows_file(tmp_path):
+    store = BinaryCandleCache(tmp_path)
+    store.save("NIFTY", "1m", [_candle(m, 100.0 + m) for m in range(10)])
+    path = store.path("NIFTY", "1m")
+    assert path.stat().st_size == HEADER_SIZE + 10 * RECORD_SIZE
+
+    before = path.read_bytes()
+    store.merge("NIFTY", "1m", [_candle(9, 200.0), _candle(10, 201.0)])
+    after = path.read_bytes()
+
+    assert len(after) == HEADER_SIZE + 11 * RECORD_SIZE
+    # Records before the overlapping bar are untouched
+    prefix = HEADER_SIZE + 9 * RECORD_SIZE
+    assert after[:prefix] == before[:prefix]
+    assert [c["close"] for c in store.tail("NIFTY", "1m", 2)] == [200.0, 201.0]
+
+    # Another reader of the same directory sees the appended bars
+    assert BinaryCandleCache(tmp_path).count("NIFTY", "1m") == 11
+
+
+def test_binary_keeps_original_utc_offset(tmp_path):
+    store = BinaryCandleCache(tmp_path)
+    store.save("NIFTY", "5m", [_candle(0, 100.0, "+05:30"), _candle(5, 101.0)])
+
+    # Ordered by instant, each ts rendered with the offset it was stored with
+    assert [c["ts"] for c in store.load("NIFTY", "5m")] == [
+        "2024-11-15T10:00:00+05:30",
+        "2024-11-15T10:05:00+00:00",
+    ]
+
+
+def test_binary_imports_json_on_first_read(tmp_path):
+    candles = [_candle(m, 100.0 + m) for m in range(3)]
+    JsonCandleCache(tmp_path).save("NIFTY", "5m", candles)
+
+    store = BinaryCandleCache(tmp_path)
+    assert store.load("NIFTY", "5m") == candles
+    assert store.path("NIFTY", "5m").exists()
+
+
+def test_migrate_json_cache(tmp_path):
+    (tmp_path / "NIFTY_5m.json").write_text(json.dumps([_candle(0, 100.0)]), encoding="utf-8")
+    (tmp_path / "BANKNIFTY_1m.json").write_text(json.dumps([_candle(1, 200.0)]), encoding="utf-8")
+
+    assert migrate_json_cache(tmp_path, remove_json=True) == 2
+    assert not list(tmp_path.glob("*.json"))
+
+    store = BinaryCandleCache(tmp_path, import_json=False)
+    assert store.load("BANKNIFTY", "1m") == [_candle(1, 200.0)]
+    # Already migrated
+    assert migrate_json_cache(tmp_path) == 0
+
+
+def test_market_data_engine_window_reads_binary_tail(tmp_path):
+    mde = MarketDataEngine(None, {}, cache_dir=tmp_path, enable_telemetry=False)
+    mde.save_cache("NIFTY", "5m", [_candle(m, 100.0 + m) for m in range(50)])
+
+    window = mde.get_window("NIFTY", "5m", 3)
+    assert [c["close"] for c in window] == [147.0, 148.0, 149.0]
+    assert mde.get_latest_candle("NIFTY", "5m")["close"] == 149.0
+    assert (tmp_path / "NIFTY_5m.bin").exists()
+
+    json_mde = MarketDataEngine(None, {}, cache_dir=tmp_path / "json", enable_telemetry=False, cache_backend="json")
+    json_mde.save_cache("NIFTY", "5m", [_candle(0, 100.0)])
+    assert (tmp_path / "json" / "NIFTY_5m.json").exists()
+
+
+def test_unknown_backend_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_candle_cache("sqlite", tmp_path)
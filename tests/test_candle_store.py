@@ -0,0 +1,80 @@
+"""
+Tests for the columnar candle ring buffer used by MarketDataEngineV2.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from core.candle_store import CandleRingBuffer
+
+
+def _bar(i):
+    return {"ts": f"t{i}", "o": i + 0.1, "h": i + 0.5, "l": i - 0.5, "c": float(i), "v": 10.0 * i}
+
+
+def test_append_and_index_before_wrap():
+    buf = CandleRingBuffer(5)
+    assert len(buf) == 0
+    assert not buf
+
+    for i in range(3):
+        buf.append(_bar(i))
+
+    assert len(buf) == 3
+    assert buf[0] == _bar(0)
+    assert buf[-1] == _bar(2)
+    assert list(buf) == [_bar(0), _bar(1), _bar(2)]
+
+
+def test_wraparound_keeps_newest_bars():
+    buf = CandleRingBuffer(4)
+    for i in range(11):
+        buf.append(_bar(i))
+
+    assert len(buf) == 4
+    assert [b["ts"] for b in buf] == ["t7", "t8", "t9", "t10"]
+    assert buf.tail(2) == [_bar(9), _bar(10)]
+    assert buf.tail(100) == [_bar(i) for i in range(7, 11)]
+
+
+def test_series_is_contiguous_zero_copy_view():
+    buf = CandleRingBuffer(4)
+    for i in range(6):
+        buf.append(_bar(i))
+
+    series = buf.series(3)
+    close = series["close"]
+    assert close.tolist() == [3.0, 4.0, 5.0]
+    assert close.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(close, buf._values)
+    assert series["ts"].tolist() == ["t3", "t4", "t5"]
+    assert series.num_bars == 3
+
+    full = buf.series()
+    assert full["volume"].tolist() == [20.0, 30.0, 40.0, 50.0]
+    assert set(full) == {"open", "high", "low", "close", "volume", "ts"}
+    assert full.to_lists()["high"] == [2.5, 3.5, 4.5, 5.5]
+
+
+def test_long_key_bars_accepted():
+    buf = CandleRingBuffer(2)
+    buf.append({"ts": "x", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 7})
+    assert buf[-1] == {"ts": "x", "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 7.0}
+
+
+def test_index_errors():
+    buf = CandleRingBuffer(3)
+    with pytest.raises(IndexError):
+        buf[0]
+    buf.append(_bar(1))
+    with pytest.raises(IndexError):
+        buf[1]
+    with pytest.raises(ValueError):
+        CandleRingBuffer(0)
@@ -0,0 +1,101 @@
+"""Tests for the batched diagnostics writer and tail reads (analytics/diagnostics.py)"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import analytics.diagnostics as diagnostics
+from analytics.diagnostics import DiagnosticsWriter, append_diagnostic, load_diagnostics
+
+
+@pytest.fixture
+def diag_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(diagnostics, "DIAGNOSTICS_DIR", tmp_path / "diagnostics")
+    # Restored after the test, so the process-wide writer is left untouched
+    monkeypatch.setattr(diagnostics, "_writer", None)
+    writer = diagnostics.configure_diagnostics_writer({"flush_interval_sec": 60.0})
+    yield tmp_path / "diagnostics"
+    writer.close()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_append_is_queued_and_load_sees_it(diag_dir):
+    for i in range(5):
+        assert append_diagnostic("NIFTY", "EMA_20_50", {"price": float(i)})
+    path = diag_dir / "NIFTY" / "EMA_20_50.jsonl"
+    assert not path.exists()  # still queued
+
+    records = load_diagnostics("NIFTY", "EMA_20_50", limit=3)
+    assert [r["price"] for r in records] == [4.0, 3.0, 2.0]
+    assert all("ts" in r for r in records)
+    assert len(_lines(path)) == 5
+
+
+def test_batch_reuses_handles_with_lru_eviction(tmp_path):
+    writer = DiagnosticsWriter(max_open_files=2, flush_interval_sec=60.0)
+    paths = [tmp_path / name / "s.jsonl" for name in ("A", "B", "C")]
+    for round_ in range(3):
+        for path in paths[:2]:
+            writer.submit(path, {"round": round_})
+        writer.flush()
+    writer.submit(paths[2], {"round": 0})
+    writer.flush()
+
+    stats = writer.snapshot()
+    assert stats["written"] == 7
+    assert stats["files_opened"] == 3
+    assert stats["files_evicted"] == 1
+    assert stats["open_files"] == 2
+    assert [r["round"] for r in _lines(paths[0])] == [0, 1, 2]
+    writer.close()
+
+
+@pytest.mark.parametrize("policy, kept", [("drop_oldest", [2, 3]), ("drop_newest", [0, 1])])
+def test_queue_full_drop_policy(tmp_path, policy, kept):
+    writer = DiagnosticsWriter(max_queue=2, flush_interval_sec=60.0, drop_policy=policy)
+    path = tmp_path / "s.jsonl"
+    accepted = [writer.submit(path, {"i": i}) for i in range(4)]
+    writer.flush()
+
+    assert accepted == ([True] * 4 if policy == "drop_oldest" else [True, True, False, False])
+    assert [r["i"] for r in _lines(path)] == kept
+    assert writer.snapshot()["dropped"] == 2
+    writer.close()
+
+
+def test_background_thread_flushes_on_batch_size(tmp_path):
+    writer = DiagnosticsWriter(batch_size=3, flush_interval_sec=60.0)
+    path = tmp_path / "s.jsonl"
+    for i in range(3):
+        writer.submit(path, {"i": i})
+    writer.close()  # joins the thread, which already woke on the batch
+    assert len(_lines(path)) == 3
+    assert writer.submit(path, {"i": 3}) is False
+
+
+def test_submit_queues_a_copy_of_the_record(tmp_path):
+    writer = DiagnosticsWriter(flush_interval_sec=60.0)
+    path = tmp_path / "s.jsonl"
+    record = {"decision": "HOLD"}
+    writer.submit(path, record)
+    record["decision"] = "BUY"
+    record["extra"] = 1
+    writer.flush()
+
+    assert _lines(path) == [{"decision": "HOLD"}]
+    writer.close()
+
+
+def test_tail_read_across_blocks(tmp_path):
+    path = tmp_path / "s.jsonl"
+    path.write_text("".join(json.dumps({"i": i, "pad": "x" * (i % 50)}) + "\n" for i in range(500)))
+    lines = list(diagnostics._tail_lines(path, block_size=64))
+    assert [json.loads(line)["i"] for line in lines if line] == list(range(499, -1, -1))
@@ -0,0 +1,60 @@
+"""Tests for the dirty-symbol strategy evaluation scheduler (core/evaluation_scheduler.py)"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analytics.runtime_metrics import RuntimeMetricsTracker
+from core.evaluation_scheduler import EvaluationScheduler
+
+
+def test_only_dirty_keys_are_evaluated():
+    scheduler = EvaluationScheduler(price_move_pct=0.01)
+
+    assert scheduler.should_evaluate("nifty", "5m", 100.0, bar_ts="09:15")
+    # Same bar, small move: nothing changed
+    assert not scheduler.should_evaluate("NIFTY", "5m", 100.5, bar_ts="09:15")
+    assert not scheduler.should_evaluate("NIFTY", "5m", 100.9, bar_ts="09:15")
+
+    # Intra-bar move past the threshold (relative to the last evaluated price)
+    assert scheduler.should_evaluate("NIFTY", "5m", 101.0, bar_ts="09:15")
+    assert not scheduler.should_evaluate("NIFTY", "5m", 101.5, bar_ts="09:15")
+
+    # A new bar in the cache, or an MDE v2 bar close
+    assert scheduler.should_evaluate("NIFTY", "5m", 101.5, bar_ts="09:20")
+    scheduler.on_candle_close("NIFTY", "5m", {"close": 101.5})
+    assert scheduler.should_evaluate("NIFTY", "5m", 101.5, bar_ts="09:20")
+    # Bar closes on another timeframe do not affect this key
+    scheduler.on_candle_close("NIFTY", "15m", {"close": 101.5})
+    assert not scheduler.should_evaluate("NIFTY", "5m", 101.5, bar_ts="09:20")
+
+    stats = scheduler.snapshot()
+    assert (stats["executed"], stats["skipped"]) == (4, 4)
+    assert (stats["first_eval"], stats["price_move"], stats["new_bar"], stats["bar_close"]) == (1, 1, 1, 1)
+    assert stats["execute_rate"] == 0.5
+
+
+def test_disabled_scheduler_always_evaluates():
+    scheduler = EvaluationScheduler.from_config({"enabled": False})
+    assert all(scheduler.should_evaluate("BANKNIFTY", "1m", 50000.0, bar_ts="t") for _ in range(3))
+    assert scheduler.snapshot()["skipped"] == 0
+
+    # No price trigger: only bar changes count
+    scheduler = EvaluationScheduler.from_config({"price_move_pct": 0})
+    scheduler.should_evaluate("BANKNIFTY", "1m", 50000.0)
+    assert not scheduler.should_evaluate("BANKNIFTY", "1m", 60000.0)
+    scheduler.forget("banknifty")
+    assert scheduler.should_evaluate("BANKNIFTY", "1m", 60000.0)
+
+
+def test_runtime_metrics_report_evaluations(tmp_path):
+    tracker = RuntimeMetricsTracker(starting_capital=100000.0, artifacts_dir=tmp_path)
+    scheduler = EvaluationScheduler()
+    scheduler.should_evaluate("NIFTY", "5m", 100.0)
+    scheduler.should_evaluate("NIFTY", "5m", 100.0)
+
+    tracker.update_evaluation_stats(scheduler.snapshot())
+    evaluations = tracker.get_metrics().evaluations
+    assert evaluations["executed"] == 1 and evaluations["skipped"] == 1
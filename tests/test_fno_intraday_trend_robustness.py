@@ -115,6 +115,21 @@ def test_strategy_no_crash_on_bad_bars():
     print("✓ test_strategy_no_crash_on_bad_bars")
 
 
+def test_successive_instances_keep_their_own_emas():
+    """A new instance (or symbol state) never sees another one's EMAs"""
+    for n in range(20):
+        # Alternate rising and falling prices at a different level each time
+        step = 1.0 if n % 2 == 0 else -1.0
+        strategy = FnoIntradayTrendStrategy()
+        for i in range(55):
+            strategy.on_bar("TEST_SYMBOL", {"close": 1000.0 + 100.0 * n + step * i})
+        trends = (strategy._state["TEST_SYMBOL"].up_trend, strategy._state["TEST_SYMBOL"].down_trend)
+        del strategy
+        assert trends == (step > 0, step < 0)
+
+    print("✓ test_successive_instances_keep_their_own_emas")
+
+
 def run_all_tests():
     """Run all tests and report results"""
     tests = [
@@ -125,6 +140,7 @@ def run_all_tests():
         test_strategy_handles_zero_close,
         test_strategy_handles_valid_close,
         test_strategy_no_crash_on_bad_bars,
+        test_successive_instances_keep_their_own_emas,
     ]
     
     passed = 0
@@ -0,0 +1,119 @@
+"""Tests for the shared per-bar indicator cache (core/indicator_cache.py)"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analytics.htf_trend import compute_htf_trend
+from core import indicators
+from core.indicator_cache import IndicatorCache, bar_key, get_indicator_cache, reset_indicator_cache
+from core.regime_engine import RegimeEngine
+from core.strategy_engine_v3 import StrategyEngineV3
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    reset_indicator_cache()
+    yield
+    reset_indicator_cache()
+
+
+def _series(n, seed=5):
+    rng = random.Random(seed)
+    price = 100.0
+    cols = {"ts": [], "open": [], "high": [], "low": [], "close": [], "volume": []}
+    for i in range(n):
+        open_ = price
+        price = max(1.0, price + rng.gauss(0, 1.0))
+        cols["ts"].append(f"2025-11-20T09:{i // 60:02d}:{i % 60:02d}")
+        cols["open"].append(open_)
+        cols["high"].append(max(open_, price) + rng.random())
+        cols["low"].append(min(open_, price) - rng.random())
+        cols["close"].append(price)
+        cols["volume"].append(float(rng.randint(1, 1000)))
+    return cols
+
+
+def test_hits_and_new_bar_eviction():
+    cache = IndicatorCache(bars_per_series=1)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42.0
+
+    assert cache.get("nifty", "5m", ("t1", 100.0), ("ema", 20, 50), compute) == 42.0
+    assert cache.get("NIFTY", "5m", ("t1", 100.0), ("ema", 20, 50), compute) == 42.0
+    assert (cache.hits, cache.misses, len(calls)) == (1, 1, 1)
+
+    # The forming bar's close moved: a different key, recomputed
+    cache.get("NIFTY", "5m", ("t1", 100.5), ("ema", 20, 50), compute)
+    assert cache.misses == 2 and cache.evictions == 1
+
+    # No timestamp: computed every time, never stored
+    cache.get("NIFTY", "5m", None, ("ema", 20, 50), compute)
+    assert cache.uncached == 1 and cache.stats()["entries"] == 1
+
+
+def test_errors_are_not_cached():
+    cache = IndicatorCache()
+
+    def warmup():
+        raise indicators.IndicatorWarmupError("EMA(20)", 20, 5)
+
+    for _ in range(2):
+        with pytest.raises(indicators.IndicatorWarmupError):
+            cache.get("X", "1m", ("t", 1.0), ("ema", 20, 5), warmup)
+    assert cache.stats()["entries"] == 0
+
+
+def test_bar_key():
+    s = _series(30)
+    assert bar_key(s) == (s["ts"][-1], s["close"][-1])
+    assert bar_key({"close": s["close"]}) is None
+    assert bar_key({"close": s["close"], "ts": s["ts"][:-1]}) is None
+
+
+def test_consumers_share_entries():
+    cache = get_indicator_cache()
+    window = _series(100)
+    engine = StrategyEngineV3({"primary_tf": "5m", "secondary_tf": "15m"})
+
+    bundle = engine._compute_bundle(window, "NIFTY", "15m")
+    assert bundle == indicators.compute_bundle(window)
+    assert engine._compute_bundle(window, "NIFTY", "15m") == bundle
+    assert cache.hits == 1
+
+    # The HTF filter on the same 15m window reuses the bundle's EMA20/EMA50
+    result = compute_htf_trend("NIFTY", htf_df_15m=window)
+    assert result.ema20_15m == bundle["ema20"] and result.ema50_15m == bundle["ema50"]
+    assert cache.hits == 3
+
+    # A new bar closes: nothing from the previous bar is served
+    moved = _series(101)
+    assert engine._compute_bundle(moved, "NIFTY", "15m") == indicators.compute_bundle(moved)
+    assert cache.hits == 3
+
+
+def test_regime_engine_reads_bundle_atr():
+    window = _series(100)
+
+    class MDE:
+        def get_candles(self, symbol, timeframe, limit=100):
+            return [
+                type("Bar", (), {key: window[key][i] for key in ("ts", "open", "high", "low", "close")})
+                for i in range(len(window["close"]))
+            ]
+
+    regime = RegimeEngine({"regime_engine": {"bar_period": "5m"}}, MDE())
+    engine = StrategyEngineV3({"primary_tf": "5m"})
+    bundle = engine._compute_bundle(window, "NIFTY", "5m")
+
+    snapshot = regime.compute_snapshot("NIFTY")
+    assert snapshot.atr == bundle["atr14"]
+    assert get_indicator_cache().stats()["hits"] == 1
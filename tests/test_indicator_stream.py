@@ -0,0 +1,234 @@
+"""Tests for core/indicator_stream.py (parity with the batch indicators)"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import indicators
+from core.candle_store import CandleRingBuffer
+from core.indicator_cache import bar_key, get_indicator_cache, reset_indicator_cache
+from core.indicator_stream import (
+    IndicatorStream,
+    StreamingATR,
+    StreamingBollinger,
+    StreamingEMA,
+    StreamingIndicatorEngine,
+    StreamingRSI,
+    StreamingSlope,
+    StreamingSMA,
+    StreamingSupertrend,
+    StreamingVWAP,
+    batch_bundle,
+)
+from core.strategy_engine_v2 import StrategyEngineV2
+from core.strategy_engine_v3 import StrategyEngineV3
+
+
+def _bars(n, seed=7):
+    rng = random.Random(seed)
+    price = 100.0
+    bars = []
+    for i in range(n):
+        open_ = price
+        price = max(1.0, price + rng.gauss(0, 1.0))
+        high = max(open_, price) + rng.random()
+        low = min(open_, price) - rng.random()
+        bars.append({"ts": f"t{i:04d}", "open": open_, "high": high, "low": low, "close": price, "volume": float(rng.randint(0, 1000))})
+    return bars
+
+
+def _series(bars):
+    return {key: [b[key] for b in bars] for key in ("ts", "open", "high", "low", "close", "volume")}
+
+
+def _assert_same(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        assert a[key] == pytest.approx(b[key], rel=1e-12, abs=1e-12), key
+
+
+def test_single_indicators_match_batch_at_every_bar():
+    bars = _bars(80)
+    s = _series(bars)
+    streams = {
+        "ema": StreamingEMA(10),
+        "sma": StreamingSMA(10),
+        "rsi": StreamingRSI(14),
+        "atr": StreamingATR(14),
+        "bb": StreamingBollinger(20, 2.0),
+        "vwap": StreamingVWAP(),
+        "slope": StreamingSlope(10),
+        "st": StreamingSupertrend(10, 3.0),
+    }
+    for i, bar in enumerate(bars):
+        n = i + 1
+        h, l, c = s["high"][:n], s["low"][:n], s["close"][:n]
+        # peek() before update() must agree with update() and leave state alone
+        peeked = streams["st"].peek(bar["high"], bar["low"], bar["close"])
+        got = {
+            "ema": streams["ema"].update(bar["close"]),
+            "sma": streams["sma"].update(bar["close"]),
+            "rsi": streams["rsi"].update(bar["close"]),
+            "atr": streams["atr"].update(bar["high"], bar["low"], bar["close"]),
+            "bb": streams["bb"].update(bar["close"]),
+            "vwap": streams["vwap"].update(bar["close"], bar["volume"]),
+            "slope": streams["slope"].update(bar["close"]),
+            "st": streams["st"].update(bar["high"], bar["low"], bar["close"]),
+        }
+        assert peeked == got["st"]
+        assert got["vwap"] == indicators.vwap(c, s["volume"][:n])
+        if n >= 10:
+            assert got["ema"] == indicators.ema(c, 10)
+            assert got["sma"] == indicators.sma(c, 10)
+            assert got["slope"] == indicators.slope(c, 10)
+            expected = indicators.supertrend(h, l, c, 10, 3.0)
+            assert got["st"] == expected
+        else:
+            assert got["ema"] is None and got["sma"] is None and got["st"] is None
+        if n >= 14:
+            assert got["atr"] == indicators.atr(h, l, c, 14)
+        if n >= 15:
+            assert got["rsi"] == indicators.rsi(c, 14)
+        if n >= 20:
+            assert got["bb"] == indicators.bollinger(c, 20, 2.0)
+
+
+def test_stream_snapshot_matches_compute_bundle():
+    bars = _bars(230)
+    stream = IndicatorStream()
+    for n in (19, 20, 49, 50, 120, 229):
+        while stream.count < n:
+            stream.update(bars[stream.count])
+        series = _series(bars[: n + 1])
+        # In-progress bar as a preview, then the closed-bar view
+        _assert_same(stream.snapshot(bars[n]), indicators.compute_bundle(series))
+        _assert_same(stream.snapshot(), indicators.compute_bundle(_series(bars[:n])))
+
+
+def test_engine_facade_processes_only_new_bars():
+    bars = _bars(260)
+    engine = StreamingIndicatorEngine(include_supertrend=True)
+
+    # First call seeds from the window and equals the batch bundle of that window
+    window = bars[:200]
+    _assert_same(engine.compute_bundle(_series(window), symbol="NIFTY", timeframe="5m"),
+                 batch_bundle(_series(window), include_supertrend=True))
+    assert engine.stats["bars"] == 199
+
+    # The forming bar changes, then new bars arrive; the window slides
+    forming = dict(bars[200], close=bars[200]["close"] + 0.5)
+    engine.compute_bundle(_series(bars[1:200] + [forming]), symbol="NIFTY", timeframe="5m")
+    result = engine.compute_bundle(_series(bars[60:260]), symbol="NIFTY", timeframe="5m")
+
+    assert engine.stats["bars"] == 259
+    assert engine.stats["reseeds"] == 0
+    _assert_same(result, batch_bundle(_series(bars[60:260]), include_supertrend=True))
+
+
+def test_engine_facade_sliding_window_matches_batch_of_that_window():
+    bars = _bars(700)
+    engine = StreamingIndicatorEngine(include_supertrend=True)
+    for end in range(200, 700, 7):
+        window = bars[end - 200:end]
+        got = engine.compute_bundle(_series(window), symbol="NIFTY", timeframe="5m")
+        _assert_same(got, batch_bundle(_series(window), include_supertrend=True))
+        # Closed-bar view of the same window
+        stream = engine.streams[("NIFTY", "5m")]
+        closed = stream.snapshot(start=stream.count - 199)
+        _assert_same(closed, batch_bundle(_series(window[:-1]), include_supertrend=True))
+    assert engine.stats["reseeds"] == 0
+    assert engine.stats["bars"] == 696
+    # Only the running values of the current window are kept
+    assert len(engine.streams[("NIFTY", "5m")].history) <= 201
+
+    # A window reaching back past what was kept re-seeds
+    _assert_same(engine.compute_bundle(_series(bars[60:699]), symbol="NIFTY", timeframe="5m"),
+                 batch_bundle(_series(bars[60:699]), include_supertrend=True))
+    assert engine.stats["reseeds"] == 1
+
+
+def test_engine_facade_leaves_out_supertrend_without_high_low():
+    bars = _bars(260)
+    engine = StreamingIndicatorEngine(include_supertrend=True)
+    for window in (bars[:200], bars[60:260]):
+        series = {key: values for key, values in _series(window).items() if key not in ("high", "low")}
+        got = engine.compute_bundle(series, symbol="NIFTY", timeframe="5m")
+        assert "supertrend" not in got and "supertrend_direction" not in got
+        assert "supertrend" not in batch_bundle(series, include_supertrend=True)
+
+
+def test_engine_facade_reseeds_on_revised_history_and_falls_back_without_ts():
+    bars = _bars(120)
+    engine = StreamingIndicatorEngine()
+    engine.compute_bundle(_series(bars[:100]), symbol="X", timeframe="1m")
+
+    revised = [dict(b) for b in bars[:110]]
+    revised[98]["close"] += 1.0
+    _assert_same(engine.compute_bundle(_series(revised), symbol="X", timeframe="1m"),
+                 indicators.compute_bundle(_series(revised)))
+    assert engine.stats["reseeds"] == 1
+
+    no_ts = {k: v for k, v in _series(bars).items() if k != "ts"}
+    _assert_same(engine.compute_bundle(no_ts, symbol="X", timeframe="1m"), indicators.compute_bundle(no_ts))
+    assert engine.stats["batch_fallbacks"] == 1
+
+
+def _cached_ema20(series, num_bars):
+    """The shared cache's EMA20 entry for this window, or None (nothing is stored)."""
+    def missing():
+        raise LookupError
+
+    try:
+        return get_indicator_cache().get("NIFTY", "5m", bar_key(series), ("ema", 20, num_bars), missing)
+    except LookupError:
+        return None
+
+
+def test_strategy_engine_v2_streaming_matches_batch():
+    bars = _bars(200)
+    reset_indicator_cache()
+    batch_engine = StrategyEngineV2({})
+    stream_engine = StrategyEngineV2({"streaming_indicators": True})
+    try:
+        for end in (60, 61, 62, 150):
+            series = _series(bars[:end])
+            # Streaming first: its bundle must neither be served to the batch
+            # engine nor publish components for other consumers
+            got = stream_engine.compute_indicators(series, symbol="NIFTY", timeframe="5m")
+            assert _cached_ema20(series, end) is None
+            expected = batch_engine.compute_indicators(series, symbol="NIFTY", timeframe="5m")
+            _assert_same(got, expected)
+            assert _cached_ema20(series, end) == expected["ema20"]
+        assert stream_engine.streaming_indicators.stats["bars"] == 149
+    finally:
+        reset_indicator_cache()
+        for engine in (batch_engine, stream_engine):
+            engine._telemetry_stop.set()
+
+
+def test_engines_stream_candle_series_views():
+    """MDE v2 hands out CandleSeries whose columns are NumPy views."""
+    bars = _bars(160)
+    buffer = CandleRingBuffer(300)
+    reset_indicator_cache()
+    v2 = StrategyEngineV2({"streaming_indicators": True})
+    v3 = StrategyEngineV3({"streaming_indicators": True})
+    try:
+        for end in (120, 121, 160):
+            while len(buffer) < end:
+                buffer.append(bars[len(buffer)])
+            series = buffer.series()
+            expected = batch_bundle(series.to_lists(), include_supertrend=True)
+            _assert_same(v2.compute_indicators(series, symbol="NIFTY", timeframe="5m"), expected)
+            _assert_same(v3._compute_bundle(series, symbol="NIFTY", timeframe="5m"), indicators.compute_bundle(series.to_lists()))
+        assert v2.streaming_indicators.stats["batch_fallbacks"] == 0
+        assert v2.streaming_indicators.stats["bars"] == 159
+        assert v3.streaming_indicators.stats["bars"] == 159
+    finally:
+        v2._telemetry_stop.set()
+        reset_indicator_cache()
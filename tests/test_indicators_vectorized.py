@@ -0,0 +1,122 @@
+"""Parity tests: core/indicators_np.py against the pure-Python core/indicators.py"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import indicators
+from core import indicators_np
+from core.indicators import IndicatorWarmupError
+
+
+def _ohlcv(n, seed=11, start=22000.0):
+    rng = random.Random(seed)
+    price = start
+    cols = {"open": [], "high": [], "low": [], "close": [], "volume": []}
+    for _ in range(n):
+        open_ = price
+        price = max(1.0, price + rng.gauss(0, 15.0))
+        cols["open"].append(open_)
+        cols["high"].append(max(open_, price) + rng.random() * 10)
+        cols["low"].append(min(open_, price) - rng.random() * 10)
+        cols["close"].append(price)
+        # Leading zero-volume bars exercise the VWAP fallback
+        cols["volume"].append(0.0 if len(cols["volume"]) < 3 else float(rng.randint(0, 5000)))
+    return cols
+
+
+@pytest.fixture
+def pure(monkeypatch):
+    """Force the pure-Python path for list inputs."""
+    monkeypatch.setattr(indicators, "VECTORIZE_MIN_LENGTH", 10 ** 9)
+    return indicators
+
+
+def _close(a, b):
+    np.testing.assert_allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("n", [30, 600, 5000])
+@pytest.mark.parametrize("period", [1, 5, 14, 200])
+def test_moving_averages_and_oscillators_match(pure, n, period):
+    s = _ohlcv(n)
+    if n <= period:
+        pytest.skip("warmup")
+    close = np.array(s["close"])
+    high, low = np.array(s["high"]), np.array(s["low"])
+
+    for name in ("ema", "sma", "slope"):
+        expected = getattr(pure, name)(s["close"], period, return_series=True)
+        got = getattr(indicators_np, name)(close, period, return_series=True)
+        assert isinstance(got, np.ndarray) and len(got) == len(expected)
+        _close(got, expected)
+        assert getattr(indicators_np, name)(close, period) == pytest.approx(expected[-1], rel=1e-9, abs=1e-9)
+
+    if period > 1:
+        _close(indicators_np.rsi(close, period, return_series=True), pure.rsi(s["close"], period, return_series=True))
+    _close(indicators_np.atr(high, low, close, period, return_series=True),
+           pure.atr(s["high"], s["low"], s["close"], period, return_series=True))
+
+
+@pytest.mark.parametrize("n", [25, 700])
+def test_band_indicators_match(pure, n):
+    s = _ohlcv(n, seed=3)
+    close, high, low = (np.array(s[k]) for k in ("close", "high", "low"))
+
+    bb = indicators_np.bollinger(close, 20, 2.0, return_series=True)
+    expected = pure.bollinger(s["close"], 20, 2.0, return_series=True)
+    for key in ("middle", "upper", "lower"):
+        _close(bb[key], [row[key] for row in expected])
+    assert indicators_np.bollinger(close, 20, 2.0) == pytest.approx(expected[-1], rel=1e-9)
+
+    st = indicators_np.supertrend(high, low, close, 10, 3.0, return_series=True)
+    expected = pure.supertrend(s["high"], s["low"], s["close"], 10, 3.0, return_series=True)
+    assert st["direction"].tolist() == [row["direction"] for row in expected]
+    for key in ("supertrend", "upper_band", "lower_band"):
+        _close(st[key], [row[key] for row in expected])
+
+    _close(indicators_np.vwap(close, np.array(s["volume"]), return_series=True),
+           pure.vwap(s["close"], s["volume"], return_series=True))
+    _close(indicators_np.hl3(high, low, close, return_series=True),
+           pure.hl3(s["high"], s["low"], s["close"], return_series=True))
+
+
+def test_dispatch_keeps_return_types(pure, monkeypatch):
+    s = _ohlcv(800)
+    expected = pure.ema(s["close"], 20, return_series=True)
+    pure_bundle = pure.compute_bundle(s)
+    pure_st = pure.supertrend(s["high"], s["low"], s["close"], return_series=True)
+    monkeypatch.setattr(indicators, "VECTORIZE_MIN_LENGTH", 512)
+
+    # Long lists: vectorized internally, lists out
+    as_list = indicators.ema(s["close"], 20, return_series=True)
+    assert isinstance(as_list, list)
+    _close(as_list, expected)
+    st = indicators.supertrend(s["high"], s["low"], s["close"], return_series=True)
+    assert isinstance(st, list) and st[-1].keys() == pure_st[-1].keys()
+
+    # Arrays: arrays out, no list conversion
+    as_array = indicators.ema(np.array(s["close"]), 20, return_series=True)
+    assert isinstance(as_array, np.ndarray)
+    assert isinstance(indicators.rsi(np.array(s["close"])), float)
+
+    arrays = {k: np.array(v) for k, v in s.items()}
+    for bundle in (indicators.compute_bundle(s), indicators.compute_bundle(arrays)):
+        assert bundle.keys() == pure_bundle.keys()
+        for key, value in pure_bundle.items():
+            assert bundle[key] == (value if key == "trend" else pytest.approx(value, rel=1e-9)), key
+
+
+def test_vectorized_warmup_errors():
+    with pytest.raises(IndicatorWarmupError):
+        indicators.ema(np.arange(5.0), 10)
+    with pytest.raises(IndicatorWarmupError):
+        indicators.rsi(np.arange(14.0), 14)
+    with pytest.raises(ValueError):
+        indicators.atr(np.ones(20), np.ones(19), np.ones(20), 14)
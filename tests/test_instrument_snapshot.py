@@ -0,0 +1,143 @@
+"""
+Tests for the daily instrument snapshot, using a local fake kite.instruments.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import data.instrument_snapshot as instrument_snapshot
+from data.instrument_snapshot import InstrumentSnapshot, get_instrument_snapshot, snapshot_path
+from data.instruments import resolve_fno_symbols
+from data.options_instruments import OptionUniverse
+
+DAY = date(2025, 11, 20)
+
+
+def _dumps():
+    near, far = DAY + timedelta(days=5), DAY + timedelta(days=33)
+    nse = [
+        {"instrument_token": 738561, "tradingsymbol": "RELIANCE", "name": "RELIANCE", "exchange": "NSE", "segment": "NSE", "instrument_type": "EQ", "expiry": "", "strike": 0.0},
+        {"instrument_token": 256265, "tradingsymbol": "NIFTY 50", "name": "NIFTY 50", "exchange": "NSE", "segment": "INDICES", "instrument_type": "EQ", "expiry": "", "strike": 0.0},
+    ]
+    nfo = [
+        {"instrument_token": 2, "tradingsymbol": "NIFTY25DECFUT", "name": "NIFTY", "exchange": "NFO", "segment": "NFO-FUT", "instrument_type": "FUT", "expiry": far, "strike": 0.0},
+        {"instrument_token": 1, "tradingsymbol": "NIFTY25NOVFUT", "name": "NIFTY", "exchange": "NFO", "segment": "NFO-FUT", "instrument_type": "FUT", "expiry": near, "strike": 0.0},
+    ]
+    token = 100
+    for expiry in (far, near):
+        for strike in (26100.0, 25900.0, 26000.0):
+            for kind in ("PE", "CE"):
+                token += 1
+                nfo.append({
+                    "instrument_token": token,
+                    "tradingsymbol": f"NIFTY{expiry:%y%b}{int(strike)}{kind}".upper(),
+                    "name": "NIFTY",
+                    "exchange": "NFO",
+                    "segment": "NFO-OPT",
+                    "instrument_type": kind,
+                    "expiry": expiry,
+                    "strike": strike,
+                })
+    return {"NSE": nse, "NFO": nfo}
+
+
+class FakeKite:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def instruments(self, exchange):
+        self.calls.append(exchange)
+        if exchange in self.fail:
+            raise ValueError(f"{exchange} down")
+        return _dumps()[exchange]
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrument_snapshot, "DEFAULT_SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(instrument_snapshot, "today_ist", lambda: DAY)
+    instrument_snapshot.reset_instrument_snapshots()
+    yield tmp_path
+    instrument_snapshot.reset_instrument_snapshots()
+
+
+def test_indexes():
+    snapshot = InstrumentSnapshot.from_instruments(DAY, _dumps())
+
+    assert snapshot.token("NSE", "RELIANCE") == 738561
+    assert snapshot.symbol(1) == ("NFO", "NIFTY25NOVFUT")
+    assert [c["tradingsymbol"] for c in snapshot.futures("nifty")] == ["NIFTY25NOVFUT", "NIFTY25DECFUT"]
+    assert [row["tradingsymbol"] for row in snapshot.instruments("NSE")] == ["RELIANCE", "NIFTY 50"]
+
+    chain = snapshot.option_chain("NIFTY")
+    assert list(chain) == sorted(chain)
+    near = chain[DAY + timedelta(days=5)]
+    assert [(c["strike"], c["instrument_type"]) for c in near[:3]] == [(25900.0, "CE"), (25900.0, "PE"), (26000.0, "CE")]
+    assert snapshot.by_token(738561)["expiry"] is None
+
+
+def test_downloads_once_per_day_and_reloads_from_disk(snapshot_dir):
+    kite = FakeKite()
+    first = get_instrument_snapshot(kite)
+    assert kite.calls == ["NSE", "NFO"]
+    assert snapshot_path(snapshot_dir, DAY).exists()
+
+    # Same process: cached; fresh process: loaded from disk with its indexes
+    assert get_instrument_snapshot(kite) is first
+    instrument_snapshot.reset_instrument_snapshots()
+    reloaded = get_instrument_snapshot(kite)
+    assert kite.calls == ["NSE", "NFO"]
+    assert reloaded is not first
+    assert reloaded.token_index == first.token_index
+    assert reloaded.option_chain("NIFTY") == first.option_chain("NIFTY")
+
+
+def test_incomplete_download_is_not_saved_and_falls_back(snapshot_dir):
+    yesterday = InstrumentSnapshot.from_instruments(DAY - timedelta(days=1), _dumps())
+    yesterday.save(snapshot_path(snapshot_dir, yesterday.day))
+
+    snapshot = get_instrument_snapshot(FakeKite(fail={"NFO"}))
+
+    assert snapshot.day == yesterday.day
+    assert not snapshot_path(snapshot_dir, DAY).exists()
+
+    # The next complete download replaces the stale file
+    instrument_snapshot.reset_instrument_snapshots()
+    assert get_instrument_snapshot(FakeKite()).day == DAY
+    assert [p.name for p in snapshot_dir.glob("*.pkl")] == [f"{DAY.isoformat()}.pkl"]
+
+
+def test_option_universe_rebuilds_strikes_when_snapshot_changes(monkeypatch):
+    kite = FakeKite()
+    monkeypatch.setattr(instrument_snapshot, "_default_kite", lambda: kite)
+    universe = OptionUniverse()
+    ladder = universe.strike_ladder("NIFTY")
+
+    assert not universe.refresh()
+    assert universe.strike_ladder("NIFTY") is ladder
+
+    monkeypatch.setattr(instrument_snapshot, "today_ist", lambda: DAY + timedelta(days=1))
+    assert universe.refresh()
+    assert universe.strike_ladder("NIFTY") is not ladder
+    assert kite.calls == ["NSE", "NFO", "NSE", "NFO"]
+
+
+def test_call_sites_share_the_snapshot(monkeypatch):
+    kite = FakeKite()
+    monkeypatch.setattr(instrument_snapshot, "_default_kite", lambda: kite)
+    monkeypatch.setattr("data.instruments.date", type("FakeDate", (date,), {"today": staticmethod(lambda: DAY)}))
+
+    assert resolve_fno_symbols(["NIFTY", "MISSING"]) == {"NIFTY": "NIFTY25NOVFUT"}
+    universe = OptionUniverse()
+    atm = universe.resolve_atm_for_underlying("NIFTY", 26020.0)
+
+    assert atm == {"CE": "NIFTY25NOV26000CE", "PE": "NIFTY25NOV26000PE"}
+    assert kite.calls == ["NSE", "NFO"]
@@ -0,0 +1,211 @@
+"""
+Tests for MarketDataEngineV2 tick processing and candle building.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import data.instruments as instruments
+from core.market_data_engine_v2 import MarketDataEngineV2
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.fixture(autouse=True)
+def offline_token_map(monkeypatch):
+    """Avoid any Kite instrument download while building engines."""
+    monkeypatch.setattr(instruments, "_instrument_token_map", {})
+    monkeypatch.setattr(instruments, "_instrument_token_map_loaded", True)
+
+
+def _make_engine(symbols=("NIFTY", "BANKNIFTY"), timeframes=("1m", "5m"), **cfg):
+    meta = {sym: {"instrument_token": 1000 + i} for i, sym in enumerate(symbols)}
+    engine = MarketDataEngineV2(
+        cfg={"feed": "kite", "timeframes": list(timeframes), **cfg},
+        kite=None,
+        universe=list(symbols),
+        meta=meta,
+    )
+    engine.start()
+    return engine
+
+
+def _tick(token, price, ts):
+    return {"instrument_token": token, "last_price": price, "timestamp": ts}
+
+
+def test_token_reverse_index():
+    engine = _make_engine()
+    assert engine._token_to_symbol(1000) == "NIFTY"
+    assert engine._token_to_symbol(1001) == "BANKNIFTY"
+    assert engine._token_to_symbol(9999) is None
+
+
+def test_set_universe_keeps_reverse_index_in_sync():
+    engine = _make_engine()
+    engine.set_universe(["FINNIFTY"], meta={"FINNIFTY": {"instrument_token": 2000}})
+
+    assert engine._token_to_symbol(2000) == "FINNIFTY"
+    assert engine._token_to_symbol(1000) is None
+
+    base = datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+    engine.on_tick_batch([_tick(2000, 100.0, base), _tick(1000, 50.0, base)])
+    assert engine.get_ltp("FINNIFTY") == 100.0
+    assert engine.get_ltp("NIFTY") is None
+
+
+def test_bar_closes_on_boundary_with_iso_timestamp():
+    engine = _make_engine(timeframes=("1m", "5m"))
+    base = datetime(2024, 1, 1, 9, 15, 5, tzinfo=IST)
+
+    engine.on_tick_batch([
+        _tick(1000, 100.0, base),
+        _tick(1000, 102.0, base + timedelta(seconds=20)),
+        _tick(1000, 99.0, base + timedelta(seconds=40)),
+        _tick(1000, 101.0, base + timedelta(seconds=50)),
+    ])
+    # Still inside the first minute: nothing closed, open bar has no ts yet
+    assert engine.get_latest_bar("NIFTY", "1m") is None
+    assert engine.current_bars[("NIFTY", "1m")]["ts"] is None
+
+    engine.on_tick_batch([_tick(1000, 103.0, base + timedelta(seconds=60))])
+    bar = engine.get_latest_bar("NIFTY", "1m")
+    assert bar == {
+        "ts": "2024-01-01T09:15:00+05:30",
+        "o": 100.0,
+        "h": 102.0,
+        "l": 99.0,
+        "c": 101.0,
+        "v": 0.0,
+    }
+    # 5m bar is still open
+    assert engine.get_latest_bar("NIFTY", "5m") is None
+
+    engine.on_tick_batch([_tick(1000, 104.0, base + timedelta(minutes=5))])
+    bar_5m = engine.get_latest_bar("NIFTY", "5m")
+    assert bar_5m["ts"] == "2024-01-01T09:15:00+05:30"
+    assert bar_5m["c"] == 103.0
+
+
+def test_buckets_match_floor_to_timeframe():
+    engine = _make_engine(timeframes=("1m", "3m", "15m", "1h"))
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=IST)
+
+    ticks = [_tick(1000, 100.0 + i, start + timedelta(seconds=37 * i)) for i in range(400)]
+    engine.on_tick_batch(ticks)
+
+    for timeframe in ("1m", "3m", "15m", "1h"):
+        history = engine.get_history("NIFTY", timeframe, 1000)
+        assert history, timeframe
+        for bar in history:
+            bar_ts = datetime.fromisoformat(bar["ts"])
+            assert engine._floor_to_timeframe(bar_ts, timeframe) == bar_ts
+
+
+def test_naive_timestamps_treated_as_utc():
+    engine = _make_engine(timeframes=("1m",))
+    base = datetime(2024, 1, 1, 3, 45)
+
+    engine.on_tick_batch([_tick(1000, 100.0, base), _tick(1000, 101.0, base + timedelta(minutes=1))])
+
+    assert engine.get_latest_bar("NIFTY", "1m")["ts"] == "2024-01-01T03:45:00+00:00"
+    assert engine.ltp_timestamp["NIFTY"].tzinfo is timezone.utc
+
+
+def test_candle_close_handlers_fire_once_per_bar():
+    engine = _make_engine(timeframes=("1m",))
+    closed = []
+    engine.register_on_candle_close(lambda s, tf, bar: closed.append((s, tf, bar["ts"])))
+    base = datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+
+    engine.on_tick_batch([_tick(1000, 100.0, base + timedelta(seconds=10 * i)) for i in range(7)])
+
+    assert closed == [("NIFTY", "1m", "2024-01-01T09:15:00+05:30")]
+
+
+def test_get_series_returns_column_views():
+    engine = _make_engine(timeframes=("1m",), history_lookback=3)
+    base = datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+
+    engine.on_tick_batch([_tick(1000, 100.0 + i, base + timedelta(minutes=i)) for i in range(6)])
+
+    series = engine.get_series("nifty", "1m")
+    # Five bars closed, capacity keeps the newest three
+    assert series["close"].tolist() == [102.0, 103.0, 104.0]
+    assert series["ts"][-1] == "2024-01-01T09:19:00+05:30"
+    assert engine.get_series("NIFTY", "1m", 2)["open"].tolist() == [103.0, 104.0]
+    assert engine.get_series("BANKNIFTY", "1m") is None
+
+    # Legacy list APIs read from the same store
+    assert [c["close"] for c in engine.get_candles("NIFTY", "1m", 2)] == [103.0, 104.0]
+    assert engine.get_window("NIFTY", "1m", 10)[0]["c"] == 102.0
+
+
+def _random_ticks(token, start, count, seed=7):
+    import random
+
+    rng = random.Random(seed)
+    ticks = []
+    ts = start
+    for _ in range(count):
+        ts += timedelta(seconds=rng.uniform(0.5, 25))
+        ticks.append(_tick(token, 100.0 + rng.uniform(-3, 3), ts))
+    return ticks
+
+
+def test_rollup_matches_tick_built_bars():
+    timeframes = ("1m", "5m", "15m", "1h")
+    tick_engine = _make_engine(timeframes=timeframes, history_lookback=1000)
+    rollup_engine = _make_engine(timeframes=timeframes, history_lookback=1000, candle_rollup=True)
+    tick_closes = []
+    rollup_closes = []
+    tick_engine.register_on_candle_close(lambda s, tf, bar: tick_closes.append((tf, bar["ts"])))
+    rollup_engine.register_on_candle_close(lambda s, tf, bar: rollup_closes.append((tf, bar["ts"])))
+
+    ticks = _random_ticks(1000, datetime(2024, 1, 1, 9, 15, tzinfo=IST), 2000)
+    for i in range(0, len(ticks), 50):
+        tick_engine.on_tick_batch(ticks[i:i + 50])
+        rollup_engine.on_tick_batch(ticks[i:i + 50])
+
+    for timeframe in timeframes:
+        expected = tick_engine.get_history("NIFTY", timeframe, 1000)
+        assert expected, timeframe
+        assert rollup_engine.get_history("NIFTY", timeframe, 1000) == expected
+    # Same bars close in the same order
+    assert rollup_closes == tick_closes
+
+
+def test_rollup_ticks_only_touch_base_timeframe():
+    engine = _make_engine(timeframes=("5m", "1m", "15m"), candle_rollup=True)
+    assert engine.base_timeframe == "1m"
+    assert [key for key, _ in engine._symbol_bar_keys["NIFTY"]] == [("NIFTY", "1m")]
+
+    base = datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+    engine.on_tick_batch([_tick(1000, 100.0, base + timedelta(seconds=10))])
+    assert ("NIFTY", "5m") not in engine.current_bars
+
+
+def test_rollup_closes_on_next_period_when_last_base_bar_missing():
+    engine = _make_engine(timeframes=("1m", "5m"), candle_rollup=True)
+    base = datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+
+    # Ticks in 09:15 and 09:17 only, then a gap until 09:21
+    engine.on_tick_batch([
+        _tick(1000, 100.0, base),
+        _tick(1000, 105.0, base + timedelta(minutes=2)),
+        _tick(1000, 98.0, base + timedelta(minutes=6)),
+    ])
+    assert engine.get_latest_bar("NIFTY", "5m") is None
+
+    # 09:21 bar closes and opens the next 5m period, closing 09:15
+    engine.on_tick_batch([_tick(1000, 99.0, base + timedelta(minutes=7))])
+    bar = engine.get_latest_bar("NIFTY", "5m")
+    assert bar["ts"] == "2024-01-01T09:15:00+05:30"
+    assert (bar["o"], bar["h"], bar["l"], bar["c"]) == (100.0, 105.0, 100.0, 105.0)
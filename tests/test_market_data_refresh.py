@@ -0,0 +1,208 @@
+"""
+Tests for bar-boundary-aware refreshes in MarketDataEngine.update_cache.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from core.historical_fetcher import HistoricalFetcher, TokenBucket
+from core.market_data_engine import MarketDataEngine, RefreshScheduler
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+class FakeClock:
+    def __init__(self, start: datetime) -> None:
+        self.now = start.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeKite:
+    """Records historical_data calls and returns a single bar."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def historical_data(self, instrument_token, from_date, to_date, interval, continuous=False, oi=False):
+        self.calls.append((instrument_token, from_date, to_date, interval))
+        bar_ts = to_date.replace(second=0, microsecond=0)
+        return [{"date": bar_ts, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}]
+
+
+class FlakyKite(FakeKite):
+    """Returns every 1m bar in the requested range; fails the calls listed in ``fail_on``."""
+
+    def __init__(self, fail_on=()) -> None:
+        super().__init__()
+        self.fail_on = set(fail_on)
+
+    def historical_data(self, instrument_token, from_date, to_date, interval, continuous=False, oi=False):
+        self.calls.append((instrument_token, from_date, to_date, interval))
+        if len(self.calls) in self.fail_on:
+            raise RuntimeError("flaky historical_data")
+        bar = from_date.replace(second=0, microsecond=0)
+        bars = []
+        while bar <= to_date:
+            bars.append({"date": bar, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10})
+            bar += timedelta(minutes=1)
+        return bars
+
+
+def _make_engine(tmp_path, clock, symbols=("NIFTY", "BANKNIFTY"), kite=None, **kwargs):
+    kite = kite or FakeKite()
+    universe = {"meta": {sym: {"token": 1000 + i} for i, sym in enumerate(symbols)}}
+    fetcher = HistoricalFetcher(kite, bucket=TokenBucket(rate=1000), delays=())
+    engine = MarketDataEngine(
+        kite, universe, cache_dir=tmp_path, enable_telemetry=False, historical_fetcher=fetcher, **kwargs
+    )
+    engine.refresh_scheduler._clock = clock
+    return engine, kite
+
+
+def test_next_boundary_aligned_to_exchange_clock():
+    scheduler = RefreshScheduler()
+    after = datetime(2024, 1, 1, 9, 17, 30, tzinfo=IST).timestamp()
+
+    assert scheduler.next_boundary("1m", after) == datetime(2024, 1, 1, 9, 18, tzinfo=IST).timestamp()
+    assert scheduler.next_boundary("5m", after) == datetime(2024, 1, 1, 9, 20, tzinfo=IST).timestamp()
+    assert scheduler.next_boundary("15m", after) == datetime(2024, 1, 1, 9, 30, tzinfo=IST).timestamp()
+    assert scheduler.next_boundary("1d", after) == datetime(2024, 1, 2, 0, 0, tzinfo=IST).timestamp()
+
+
+def test_update_cache_skips_until_bar_boundary(tmp_path):
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    engine, kite = _make_engine(tmp_path, clock, refresh_grace_sec=2)
+
+    assert engine.update_cache("NIFTY", "1m") is True
+    assert len(kite.calls) == 1
+
+    # Same bar: repeated loops do not refetch
+    for _ in range(5):
+        clock.advance(5)
+        assert engine.update_cache("NIFTY", "1m") is False
+    assert len(kite.calls) == 1
+
+    # Boundary passed but still inside the grace period
+    clock.now = datetime(2024, 1, 1, 9, 16, 1, tzinfo=IST).timestamp()
+    assert engine.update_cache("NIFTY", "1m") is False
+
+    clock.advance(2)
+    assert engine.update_cache("NIFTY", "1m") is True
+    assert len(kite.calls) == 2
+
+    # force bypasses the schedule
+    assert engine.update_cache("NIFTY", "1m", force=True) is True
+    assert len(kite.calls) == 3
+
+
+def test_update_cache_requests_only_missing_bars(tmp_path):
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    engine, kite = _make_engine(tmp_path, clock, refresh_grace_sec=0)
+
+    engine.update_cache("NIFTY", "1m", count=200)
+    first_span = kite.calls[-1][2] - kite.calls[-1][1]
+    assert first_span >= timedelta(minutes=200)
+
+    # Three bars later only the delta (plus the previously forming bar) is requested
+    clock.advance(3 * 60)
+    engine.update_cache("NIFTY", "1m", count=200)
+    delta_span = kite.calls[-1][2] - kite.calls[-1][1]
+    assert delta_span < timedelta(minutes=10)
+
+
+def _cached_minutes(engine, symbol):
+    return [candle["ts"][11:16] for candle in engine.load_cache(symbol, "1m")]
+
+
+def test_failed_refresh_is_retried_from_latest_cached_bar(tmp_path):
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    engine, kite = _make_engine(tmp_path, clock, kite=FlakyKite(fail_on={2}), refresh_grace_sec=0)
+
+    engine.update_cache("NIFTY", "1m", count=5)
+    assert _cached_minutes(engine, "NIFTY")[-1] == "09:15"
+
+    # The refresh at 09:18 fails; the key stays due and nothing is cached
+    clock.advance(3 * 60)
+    assert engine.update_cache("NIFTY", "1m") is True
+    assert _cached_minutes(engine, "NIFTY")[-1] == "09:15"
+
+    # The retry a few seconds later still reaches back to the 09:15 bar
+    clock.advance(5)
+    assert engine.update_cache("NIFTY", "1m") is True
+    assert kite.calls[-1][1] <= datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+    assert _cached_minutes(engine, "NIFTY")[-4:] == ["09:15", "09:16", "09:17", "09:18"]
+
+
+def test_rewritten_cache_file_does_not_shorten_the_delta(tmp_path):
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    engine, _ = _make_engine(tmp_path, clock, kite=FlakyKite(), refresh_grace_sec=0, cache_backend="json")
+    engine.update_cache("NIFTY", "1m", count=5)
+
+    # Ten bars later the cache file is rewritten without new bars (e.g. a migration)
+    clock.advance(10 * 60)
+    engine.save_cache("NIFTY", "1m", engine.load_cache("NIFTY", "1m"))
+    restarted, kite = _make_engine(tmp_path, clock, kite=FlakyKite(), refresh_grace_sec=0, cache_backend="json")
+    restarted.refresh_scheduler.seed(("NIFTY", "1m"), clock.now - 60)
+
+    assert restarted.update_cache("NIFTY", "1m") is True
+    assert kite.calls[-1][1] <= datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+    assert _cached_minutes(restarted, "NIFTY")[-1] == "09:25"
+
+
+def test_refresh_due_prioritises_and_defers(tmp_path):
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    symbols = ("A", "B", "C")
+    engine, kite = _make_engine(tmp_path, clock, symbols=symbols, max_refreshes_per_loop=2)
+    keys = [(sym, "1m") for sym in symbols]
+
+    assert engine.refresh_due(keys) == 2
+    assert engine.refresh_due(keys) == 1
+    assert engine.refresh_scheduler.stats["deferred"] == 1
+    assert engine.refresh_due(keys) == 0
+    assert len(kite.calls) == 3
+
+    clock.advance(60)
+    assert engine.refresh_due(keys, max_refreshes=10) == 3
+
+
+def test_refresh_due_keeps_failed_keys_due(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.market_data_engine.get_instrument_token", lambda exchange, symbol: None)
+    clock = FakeClock(datetime(2024, 1, 1, 9, 15, 10, tzinfo=IST))
+    # Second historical_data call fails; "B" is fetched second
+    engine, kite = _make_engine(tmp_path, clock, symbols=("A", "B"), kite=FlakyKite(fail_on={2}))
+    engine.historical_fetcher.max_workers = 1
+    keys = [("A", "1m"), ("B", "1m"), ("NOTOKEN", "1m")]
+
+    assert engine.refresh_due(keys, count=5) == 2
+    assert set(engine.refresh_failures) == {("B", "1m"), ("NOTOKEN", "1m")}
+    assert engine.refresh_scheduler.last_refresh(("A", "1m")) == clock.now
+    assert engine.refresh_scheduler.last_refresh(("B", "1m")) is None
+
+    # Within the same bar only the failed key is retried
+    clock.advance(5)
+    assert engine.refresh_due(keys, count=5) == 1
+    assert kite.calls[-1][0] == 1001
+    assert set(engine.refresh_failures) == {("NOTOKEN", "1m")}
+    assert _cached_minutes(engine, "B")[-1] == "09:15"
+
+
+def test_cache_mtime_seeds_schedule_after_restart(tmp_path):
+    clock = FakeClock(datetime.now(timezone.utc))
+    engine, kite = _make_engine(tmp_path, clock)
+    engine.update_cache("NIFTY", "1d")
+    assert len(kite.calls) == 1
+
+    # A fresh engine sees the cache file was written today and skips the fetch
+    restarted, restarted_kite = _make_engine(tmp_path, clock)
+    assert restarted.update_cache("NIFTY", "1d") is False
+    assert restarted_kite.calls == []
@@ -0,0 +1,82 @@
+"""Batch (symbols x bars) scan parity with the per-symbol MultiTimeframeScanner path"""
+
+import math
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import analytics.multi_timeframe_scanner as mtf
+from analytics.multi_timeframe_scanner import MultiTimeframeScanner
+
+
+def _frame(n, freq, seed, start="2025-06-02 03:45"):
+    rng = np.random.default_rng(seed)
+    close = 500 + np.cumsum(rng.normal(0, 3, n))
+    spread = rng.random(n) * 4
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start, periods=n, freq=freq, tz="UTC"),
+        "open": close + rng.normal(0, 1, n),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(0, 10_000, n).astype(float),
+    })
+
+
+@pytest.fixture
+def history(monkeypatch):
+    data = {
+        ("AAA", "5minute"): _frame(420, "5min", 1),
+        ("BBB", "5minute"): _frame(25, "5min", 2),
+        ("CCC", "5minute"): _frame(260, "5min", 3),
+        ("AAA", "day"): _frame(300, "D", 4),
+        ("BBB", "day"): _frame(60, "D", 5),
+        ("CCC", "day"): _frame(220, "D", 6),
+    }
+    # A gap in the highs sends CCC's daily bars down the per-symbol path
+    data[("CCC", "day")].loc[100, "high"] = np.nan
+    # Zero volume on AAA's last session exercises the VWAP division guard
+    aaa = data[("AAA", "5minute")]
+    aaa.loc[aaa["timestamp"].dt.date == aaa["timestamp"].iloc[-1].date(), "volume"] = 0.0
+    empty = pd.DataFrame(columns=["timestamp", "open", "high", "low", "close", "volume"])
+    monkeypatch.setattr(mtf, "load_history", lambda symbol, interval: data.get((symbol, interval), empty).copy())
+    return data
+
+
+def _assert_snapshots_equal(batch, single):
+    assert [s.timeframe for s in batch] == [s.timeframe for s in single]
+    for got, expected in zip(batch, single):
+        for key, value in asdict(expected).items():
+            other = asdict(got)[key]
+            if isinstance(value, float) and not math.isinf(value):
+                assert other == pytest.approx(value, rel=1e-9, abs=1e-9), (expected.symbol, expected.timeframe, key)
+            else:
+                assert other == value, (expected.symbol, expected.timeframe, key)
+
+
+def test_scan_universe_matches_scan_symbol(history):
+    scanner = MultiTimeframeScanner(["5m", "1d", "1w", "1M"])
+    batch = scanner.scan_universe(["AAA", "bbb", "CCC", "MISSING"])
+
+    assert list(batch) == ["AAA", "BBB", "CCC", "MISSING"]
+    assert batch["MISSING"] == []
+    for symbol in ("AAA", "BBB", "CCC"):
+        _assert_snapshots_equal(batch[symbol], scanner.scan_symbol(symbol))
+
+    # Warmup: 25 bars leave the long EMAs and ADX undefined
+    bbb_5m = batch["BBB"][0]
+    assert bbb_5m.ema50 is None and bbb_5m.adx14 is None and bbb_5m.ema20 is not None
+
+
+def test_batch_vwap_only_for_intraday(history):
+    batch = MultiTimeframeScanner(["5m", "1d"]).scan_universe(["AAA"], max_workers=1)
+    intraday, daily = batch["AAA"]
+    assert intraday.vwap is None  # the last session only traded zero volume
+    assert daily.vwap is None
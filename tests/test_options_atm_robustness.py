@@ -3,7 +3,7 @@
 import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
-from datetime import date
+from datetime import date, timedelta
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -127,6 +127,46 @@ def test_resolve_atm_for_underlying_handles_invalid_strike_type():
     print("✓ test_resolve_atm_for_underlying_handles_invalid_strike_type")
 
 
+def _chain(expiry, strikes, prefix="NIFTY"):
+    return [
+        {"tradingsymbol": f"{prefix}{expiry:%d%b}{int(k)}{t}".upper(), "strike": k, "instrument_type": t, "expiry": expiry}
+        for k in strikes
+        for t in ("CE", "PE")
+    ]
+
+
+def test_strike_ladder_uses_nearest_expiry_and_binary_search():
+    """ATM comes from the nearest unexpired expiry; ties go to the lower strike."""
+    today = date.today()
+    expired, near, far = today - timedelta(days=1), today + timedelta(days=2), today + timedelta(days=9)
+    strikes = [25200.0, 24900.0, 25000.0, 25100.0, 24800.0]
+    universe = create_test_universe({
+        "NIFTY": _chain(far, strikes) + _chain(expired, strikes) + _chain(near, strikes)
+        + [{"tradingsymbol": "NIFTYONLYCE", "strike": 25300.0, "instrument_type": "CE", "expiry": near}],
+    })
+
+    ce = f"NIFTY{near:%d%b}25000CE".upper()
+    assert universe.resolve_atm_for_underlying("nifty", 25049.0)["CE"] == ce
+    assert universe.resolve_atm_for_underlying("NIFTY", 25050.0)["CE"] == ce
+    assert universe.resolve_atm_for_underlying("NIFTY", 99999.0) == {"CE": "NIFTYONLYCE", "PE": f"NIFTY{near:%d%b}25200PE".upper()}
+    assert universe.strike_ladder("NIFTY").expiry == near
+    print("✓ test_strike_ladder_uses_nearest_expiry_and_binary_search")
+
+
+def test_resolve_strike_band():
+    """ATM±k strikes come back in order, clipped at the ends of the chain."""
+    today = date.today()
+    universe = create_test_universe({"NIFTY": _chain(today, [24800.0, 24900.0, 25000.0, 25100.0, 25200.0])})
+
+    band = universe.resolve_strike_band("NIFTY", 25020.0, width=1)
+    assert [(b["strike"], b["offset"]) for b in band] == [(24900.0, -1), (25000.0, 0), (25100.0, 1)]
+    assert band[1]["PE"] == f"NIFTY{today:%d%b}25000PE".upper()
+    assert [b["strike"] for b in universe.resolve_strike_band("NIFTY", 24700.0, width=2)] == [24800.0, 24900.0, 25000.0]
+    assert universe.resolve_strike_band("NIFTY", None) == []
+    assert universe.resolve_strike_band("BANKNIFTY", 50000.0) == []
+    print("✓ test_resolve_strike_band")
+
+
 def run_all_tests():
     """Run all tests and report results."""
     tests = [
@@ -135,6 +175,8 @@ def run_all_tests():
         test_resolve_atm_for_many_skips_none_spots,
         test_resolve_atm_for_many_returns_empty_when_all_none,
         test_resolve_atm_for_underlying_handles_invalid_strike_type,
+        test_strike_ladder_uses_nearest_expiry_and_binary_search,
+        test_resolve_strike_band,
     ]
     
     passed = 0
@@ -315,6 +315,55 @@ def test_detect_volatility_mode():
     assert mode == "normal"
 
 
+def test_closed_bar_components_match_window_scans():
+    """Timestamped series keep closed-bar state per symbol; results equal the window scans."""
+    from analytics import ta_patterns
+    
+    strategy = PriceActionIntradayV1({"name": "price_action_v1"}, StrategyState())
+    df = ta_patterns._create_dummy_ohlcv(n_bars=400)
+    df["ts"] = [f"2025-11-20T{9 + i // 60:02d}:{i % 60:02d}:00" for i in range(len(df))]
+    rows = df.to_dict("records")
+    atr = ta_patterns.atr(df, 14).fillna(1.0).tolist()
+    
+    evaluations = 0
+    modes = set()
+    for end in list(range(30, 400, 3)) + [399, 399]:
+        # A sliding 120-bar window whose forming bar is evaluated twice
+        window = rows[max(0, end - 120):end]
+        for forming_close in (window[-1]["close"], window[-1]["close"] * 1.002):
+            bars = window[:-1] + [dict(window[-1], close=forming_close)]
+            series = {k: [bar[k] for bar in bars] for k in ("open", "high", "low", "close", "volume", "ts")}
+            candle = bars[-1]
+            indicators = {"atr14": atr[end - 1] * (0.7, 1.0, 1.3)[(end // 3) % 3]}
+            plain = {k: v for k, v in series.items() if k != "ts"}
+            
+            streamed = strategy._analyze_signal_components(candle, series, indicators, stream_key="NIFTY")
+            scanned = strategy._analyze_signal_components(candle, plain, indicators, stream_key="NIFTY")
+            assert streamed == scanned
+            evaluations += 1
+            modes.add(streamed["volatility_mode"])
+    assert evaluations > 200
+    assert modes == {"expanding", "normal", "compressing"}
+    
+    closed = strategy._closed_bars["NIFTY"]
+    assert closed.last_ts == rows[397]["ts"]
+    assert list(closed.volumes) == [row["volume"] for row in rows[379:398]]
+    
+    # Revised history (the last closed bar seen changed) rebuilds the state
+    window = [dict(row) for row in rows[280:400]]
+    window[-3]["high"] += 5.0
+    window[-3]["close"] += 1.0
+    series = {k: [bar[k] for bar in window] for k in ("open", "high", "low", "close", "volume", "ts")}
+    plain = {k: v for k, v in series.items() if k != "ts"}
+    streamed = strategy._analyze_signal_components(window[-1], series, {"atr14": 1.0}, stream_key="NIFTY")
+    assert strategy._closed_bars["NIFTY"] is not closed
+    assert streamed == strategy._analyze_signal_components(window[-1], plain, {"atr14": 1.0}, stream_key="NIFTY")
+    
+    # Without timestamps the window scans are used
+    strategy._analyze_signal_components(window[-1], plain, {"atr14": 1.0}, stream_key="BANKNIFTY")
+    assert "BANKNIFTY" not in strategy._closed_bars
+
+
 def test_calculate_confidence():
     """Test confidence calculation."""
     config = {"name": "price_action_v1"}
@@ -434,6 +483,7 @@ def run_all_tests():
         test_detect_engulfing_pattern,
         test_detect_volume_spike,
         test_detect_volatility_mode,
+        test_closed_bar_components_match_window_scans,
         test_calculate_confidence,
         test_factory_function,
         test_strategy_state_position_tracking,
@@ -63,7 +63,7 @@ class TestMarketScanner:
         assert isinstance(empty["equity"], list)
         assert isinstance(empty["meta"], dict)
 
-    def test_scan_with_mock_data(self):
+    def test_scan_with_mock_data(self, tmp_path):
         """Test scanner with mocked Kite API responses."""
         # Mock Kite API
         mock_kite = MagicMock()
@@ -139,8 +139,8 @@ class TestMarketScanner:
         
         mock_kite.instruments = MagicMock(side_effect=mock_instruments)
         
-        # Create scanner
-        scanner = MarketScanner(mock_kite, mock_config)
+        # Create scanner (instrument snapshot goes under tmp_path)
+        scanner = MarketScanner(mock_kite, mock_config, artifacts_dir=tmp_path)
         
         # Scan
         result = scanner.scan()
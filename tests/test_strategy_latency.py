@@ -0,0 +1,113 @@
+"""Tests for strategy latency histograms and the call budget (core/strategy_latency.py)"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.strategy_engine_v3 import StrategyEngineV3
+from core.strategy_latency import LatencyHistogram, StrategyLatencyTracker
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.add(ms / 1e3)
+    summary = hist.summary()
+    assert summary["count"] == 100
+    assert summary["mean_ms"] == pytest.approx(50.5)
+    assert summary["max_ms"] == pytest.approx(100.0)
+    # Bucket edges are within one bucket (~9%) above the exact quantile
+    for key, exact in (("p50_ms", 50.0), ("p95_ms", 95.0), ("p99_ms", 99.0)):
+        assert exact <= summary[key] <= exact * 1.1, key
+    assert LatencyHistogram().summary()["p99_ms"] == 0.0
+
+
+def test_budget_logs_and_skips(caplog):
+    tracker = StrategyLatencyTracker(budget_ms=10, skip_over_budget=True, skip_evaluations=2)
+    assert tracker.record("slow", "AAA", 0.002) is False
+    with caplog.at_level("WARNING", logger="core.strategy_latency"):
+        assert tracker.record("slow", "AAA", 0.050) is True
+        tracker.record("slow", "AAA", 0.050)
+    assert len(caplog.records) == 1  # rate-limited per strategy
+
+    # Skipped for two evaluations of AAA only
+    assert [tracker.should_skip("slow", "AAA") for _ in range(3)] == [True, True, False]
+    assert tracker.should_skip("slow", "BBB") is False
+
+    stats = tracker.snapshot()["strategies"]["slow"]
+    assert (stats["count"], stats["overruns"], stats["skipped"]) == (3, 2, 2)
+    assert list(stats["symbols"]) == ["AAA"]
+
+
+def test_log_only_budget_never_skips():
+    tracker = StrategyLatencyTracker(budget_ms=1)
+    tracker.record("slow", "AAA", 1.0)
+    assert tracker.should_skip("slow", "AAA") is False
+    assert tracker.snapshot()["strategies"]["slow"]["overruns"] == 1
+
+
+def test_snapshot_lists_slowest_symbols():
+    tracker = StrategyLatencyTracker()
+    for i in range(5):
+        tracker.record("s", f"SYM{i}", (i + 1) / 1e3)
+    tracker.record_call("evaluate", "SYM0", 0.01)
+    snap = tracker.snapshot(symbol_limit=2)
+    assert list(snap["strategies"]["s"]["symbols"]) == ["SYM4", "SYM3"]
+    assert snap["calls"]["evaluate"]["count"] == 1
+
+
+def test_merge_matches_direct_recording():
+    worker = StrategyLatencyTracker(budget_ms=5, skip_over_budget=True, skip_evaluations=1)
+    worker.sink = []
+    worker.record("s", "AAA", 0.010)
+    worker.should_skip("s", "AAA")
+    worker.record_call("evaluate", "AAA", 0.012)
+
+    parent = StrategyLatencyTracker(budget_ms=5, skip_over_budget=True)
+    parent.merge(worker.sink)
+    assert parent.snapshot() == worker.snapshot()
+    # Cooldowns stay with the tracker that took the decision
+    assert parent.should_skip("s", "AAA") is False
+
+
+def _md(n=80):
+    closes = [100.0 + (i % 7) - 3 + i * 0.1 for i in range(n)]
+    series = {
+        "open": closes,
+        "high": [c + 1 for c in closes],
+        "low": [c - 1 for c in closes],
+        "close": closes,
+        "volume": [1000] * n,
+        "ts": [f"bar-{i}" for i in range(n)],
+    }
+    return {"primary_series": series, "secondary_series": series}
+
+
+def test_engine_v3_times_and_skips_strategies(monkeypatch):
+    cfg = {
+        "strategies": [{"id": "ema20_50"}, {"id": "trend"}],
+        "latency": {"budget_ms": 1, "skip_over_budget": True, "skip_evaluations": 1},
+    }
+    engine = StrategyEngineV3(cfg)
+    slow = engine.strategies[1]
+    ticks = iter(float(t) for t in range(1000))
+    monkeypatch.setattr(engine.latency, "clock", lambda: next(ticks))  # every call "takes" 1 s
+
+    calls = []
+    original = slow.generate
+    monkeypatch.setattr(slow, "generate", lambda *a: calls.append(a[0]) or original(*a))
+
+    md = _md()
+    for _ in range(3):
+        engine.evaluate("AAA", "t", md["primary_series"]["close"][-1], md)
+
+    # Overran on the first evaluation, skipped on the second, ran on the third
+    assert calls == ["AAA", "AAA"]
+    snap = engine.latency.snapshot()
+    assert snap["strategies"]["trend"]["skipped"] == 1
+    assert snap["strategies"]["trend"]["overruns"] == 2
+    assert snap["calls"]["evaluate"]["count"] == 3
@@ -0,0 +1,95 @@
+"""Tests for process-pool StrategyEngineV3 evaluation (core/strategy_pool_v3.py)"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.strategy_engine_v3 import STRATEGY_REGISTRY_V3, StrategyEngineV3
+from core.strategy_pool_v3 import PackedSeries, StrategyPoolError, pack_market_data, unpack_market_data
+
+
+def _series(n, seed):
+    rng = random.Random(seed)
+    price = 1000.0 + seed
+    cols = {"open": [], "high": [], "low": [], "close": [], "volume": [], "ts": []}
+    for i in range(n):
+        open_ = price
+        price = max(1.0, price + rng.gauss(0.3 if seed % 2 else -0.3, 4.0))
+        cols["open"].append(open_)
+        cols["high"].append(max(open_, price) + rng.random() * 2)
+        cols["low"].append(min(open_, price) - rng.random() * 2)
+        cols["close"].append(price)
+        cols["volume"].append(rng.randint(100, 5000))
+        cols["ts"].append(f"2025-11-20T{9 + i // 60:02d}:{i % 60:02d}:00+05:30")
+    return cols
+
+
+def _requests(count=6):
+    requests = []
+    for i in range(count):
+        md = {"primary_series": _series(120, i), "secondary_series": _series(60, 100 + i)}
+        requests.append((f"SYM{i}", "2025-11-20T11:00:00+05:30", md["primary_series"]["close"][-1], md))
+    return requests
+
+
+class _Bus:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, topic, payload):
+        self.events.append((topic, payload["symbol"]))
+
+
+CONFIG = {
+    "primary_tf": "5m",
+    "secondary_tf": "15m",
+    "strategies": [{"id": sid} for sid in STRATEGY_REGISTRY_V3],
+}
+
+
+def test_pack_round_trip():
+    md = _requests(1)[0][3]
+    packed = pack_market_data(md)
+    assert isinstance(packed["primary_series"], PackedSeries)
+    assert unpack_market_data(packed)["primary_series"] == md["primary_series"]
+    # Ragged columns are sent as they are
+    ragged = {"primary_series": {"close": [1.0, 2.0], "open": [1.0]}}
+    assert pack_market_data(ragged) == ragged
+
+
+def test_parallel_matches_serial_in_order():
+    requests = _requests()
+    serial_bus = _Bus()
+    serial = StrategyEngineV3(CONFIG, bus=serial_bus)
+    expected = [serial.evaluate(*request) for request in requests]
+
+    parallel_bus = _Bus()
+    engine = StrategyEngineV3({**CONFIG, "parallel": {"enabled": True, "workers": 2}}, bus=parallel_bus)
+    try:
+        for _ in range(2):  # second batch reuses the running workers
+            parallel_bus.events.clear()
+            intents = engine.evaluate_many(requests)
+            assert [i.to_dict() for i in intents] == [e.to_dict() for e in expected]
+            assert parallel_bus.events == serial_bus.events[: len(parallel_bus.events)]
+            assert len(parallel_bus.events) == 2 * len(requests)
+        assert engine._pool.worker_for("SYM0") != engine._pool.worker_for("SYM1")
+    finally:
+        engine.close()
+
+
+def test_fallback_to_in_process():
+    requests = _requests(2)
+    cfg = {**CONFIG, "parallel": {"enabled": True, "workers": 2, "start_method": "no-such-method"}}
+    engine = StrategyEngineV3(cfg)
+    intents = engine.evaluate_many(requests)
+    assert [i.to_dict() for i in intents] == [StrategyEngineV3(CONFIG).evaluate(*r).to_dict() for r in requests]
+    assert engine._pool_failed
+
+    strict = StrategyEngineV3({**cfg, "parallel": {**cfg["parallel"], "fallback_inline": False}})
+    with pytest.raises(StrategyPoolError):
+        strict.evaluate_many(requests)
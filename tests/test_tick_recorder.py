@@ -0,0 +1,198 @@
+"""
+Tests for the raw tick recorder and replay driver.
+"""
+
+import gzip
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import data.instruments as instruments
+from core.market_data_engine_v2 import MarketDataEngineV2
+from core.tick_recorder import (
+    TickRecorder,
+    TickReplayer,
+    iter_tick_packets,
+    read_ticks,
+    tick_file_path,
+)
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+@pytest.fixture(autouse=True)
+def offline_token_map(monkeypatch):
+    """Avoid any Kite instrument download while building engines."""
+    monkeypatch.setattr(instruments, "_instrument_token_map", {})
+    monkeypatch.setattr(instruments, "_instrument_token_map_loaded", True)
+
+
+def _packets(start, count=30, step_sec=10):
+    packets = []
+    for i in range(count):
+        ts = start + timedelta(seconds=step_sec * i)
+        packets.append([
+            {"instrument_token": 1000, "last_price": 100.0 + i, "timestamp": ts, "volume": 10 * i},
+            {"instrument_token": 1001, "last_price": 200.0 - i, "timestamp": ts, "oi": 5},
+        ])
+    return packets
+
+
+def _record(tmp_path, packets, **kwargs):
+    recorder = TickRecorder(tmp_path, **kwargs)
+    for packet in packets:
+        recorder.record(packet)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip_preserves_packets_and_timestamps(tmp_path):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    packets = _packets(start, count=5)
+    # Kite sends naive exchange-local timestamps; those must stay naive
+    packets.append([{"instrument_token": 1000, "last_price": 99.5, "timestamp": datetime(2024, 11, 15, 9, 16)}])
+    _record(tmp_path, packets, flush_every=3)
+
+    records = read_ticks(tick_file_path(tmp_path, start.date()))
+    replayed = [packet for _, packet in iter_tick_packets(records)]
+
+    assert len(replayed) == len(packets)
+    assert replayed[0][0] == {
+        "instrument_token": 1000,
+        "last_price": 100.0,
+        "timestamp": start,
+        "volume": 0.0,
+        "last_traded_quantity": None,
+        "oi": None,
+    }
+    assert replayed[0][0]["timestamp"].utcoffset() == timedelta(hours=5, minutes=30)
+    assert replayed[-1][0]["timestamp"] == datetime(2024, 11, 15, 9, 16)
+    assert replayed[2][1]["oi"] == 5.0
+
+
+def test_files_are_split_by_ist_day_and_appendable(tmp_path):
+    # 23:59 UTC on the 14th is already the 15th in IST
+    late = datetime(2024, 11, 14, 23, 59, tzinfo=timezone.utc)
+    _record(tmp_path, [[{"instrument_token": 1, "last_price": 1.0, "timestamp": late}]])
+    _record(tmp_path, [[{"instrument_token": 2, "last_price": 2.0, "timestamp": late}]])
+
+    path = tick_file_path(tmp_path, late.astimezone(IST).date())
+    assert path.name == "2024-11-15.ticks.gz"
+    # Two sessions appended as two gzip members
+    assert read_ticks(path)["token"].tolist() == [1, 2]
+
+
+def test_due_buffers_are_written_off_the_recording_thread(tmp_path, monkeypatch):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    release = threading.Event()
+    writing = threading.Event()
+    writer_threads = []
+    original_append = TickRecorder._append
+
+    def slow_append(self, path, records):
+        writer_threads.append(threading.current_thread())
+        writing.set()
+        release.wait(timeout=5)
+        original_append(self, path, records)
+
+    monkeypatch.setattr(TickRecorder, "_append", slow_append)
+    recorder = TickRecorder(tmp_path, flush_every=2)
+    began = time.monotonic()
+    for packet in _packets(start, count=4):
+        recorder.record(packet)
+    # The gzip write is blocked, yet recording went on without waiting for it
+    assert time.monotonic() - began < 1.0
+    assert writing.wait(timeout=5)
+    assert writer_threads[0] is not threading.current_thread()
+
+    release.set()
+    recorder.close()
+    assert recorder.ticks_recorded == 8
+    assert len(read_ticks(tick_file_path(tmp_path, start.date()))) == 8
+
+
+def test_truncated_trailing_member_is_ignored(tmp_path):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    _record(tmp_path, _packets(start, count=4))
+    path = tick_file_path(tmp_path, start.date())
+    with open(path, "ab") as fh:
+        fh.write(gzip.compress(b"\x00" * 500)[:20])
+
+    assert len(read_ticks(path)) == 8
+
+
+def test_replay_matches_live_candles(tmp_path):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    packets = _packets(start, count=60)
+    _record(tmp_path, packets)
+
+    def make_engine():
+        engine = MarketDataEngineV2(
+            cfg={"feed": "kite", "timeframes": ["1m", "5m"]},
+            kite=None,
+            universe=["NIFTY", "BANKNIFTY"],
+            meta={"NIFTY": {"instrument_token": 1000}, "BANKNIFTY": {"instrument_token": 1001}},
+        )
+        engine.start()
+        return engine
+
+    live = make_engine()
+    for packet in packets:
+        live.on_tick_batch(packet)
+
+    replayed = make_engine()
+    replayer = TickReplayer(replayed.on_tick_batch, speed=0)
+    assert replayer.replay_files([tick_file_path(tmp_path, start.date())]) == 120
+
+    for key in live.candles:
+        assert replayed.get_history(*key, 1000) == live.get_history(*key, 1000)
+    assert replayer.packets_replayed == 60
+    assert replayer.clock.now(IST) == start + timedelta(seconds=590)
+
+
+def test_replay_paces_at_speed_multiple(tmp_path):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    _record(tmp_path, _packets(start, count=11, step_sec=10))
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    replayer = TickReplayer(lambda ticks: None, speed=100, sleep=sleep, monotonic=lambda: now[0])
+    replayer.replay_files([tick_file_path(tmp_path, start.date())])
+
+    # 100 recorded seconds at 100x
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_mde_v2_replay_feed_mode(tmp_path):
+    start = datetime(2024, 11, 15, 9, 15, tzinfo=IST)
+    _record(tmp_path, _packets(start, count=30))
+
+    engine = MarketDataEngineV2(
+        cfg={
+            "feed": "replay",
+            "timeframes": ["1m"],
+            "replay_dir": str(tmp_path),
+            "replay_date": "2024-11-15",
+            "replay_speed": 0,
+        },
+        kite=None,
+        universe=["NIFTY"],
+        meta={"NIFTY": {"instrument_token": 1000}},
+    )
+    engine.start()
+    engine.replay_thread.join(timeout=5)
+    try:
+        assert engine.replayer.ticks_replayed == 60
+        assert len(engine.get_history("NIFTY", "1m", 100)) == 4
+    finally:
+        engine.stop()
@@ -0,0 +1,190 @@
+"""Tests for warm-start snapshots (core/warm_start.py)"""
+
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.indicator_cache import reset_indicator_cache
+from core.indicator_stream import StreamingIndicatorEngine
+from core.strategy_engine_v3 import StrategyEngineV3
+from core.warm_start import WarmStartStore, register_strategy_instances
+from strategies.fno_intraday_trend import FnoIntradayTrendStrategy
+
+
+def _series(n, start=0):
+    close = [100.0 + ((i * 7) % 11) - 5 + i * 0.2 for i in range(start, start + n)]
+    return {
+        "open": close,
+        "high": [c + 1 for c in close],
+        "low": [c - 1 for c in close],
+        "close": close,
+        "volume": [1000.0 + i for i in range(start, start + n)],
+        "ts": [f"bar-{i:05d}" for i in range(start, start + n)],
+    }
+
+
+def test_store_round_trip_and_freshness(tmp_path):
+    store = WarmStartStore(tmp_path / "engine.pkl", max_age_sec=60)
+    received = {}
+    store.register("a", lambda: {"x": [1.0, 2.0]}, lambda state, saved_at: received.update(state))
+    store.register("missing", lambda: 1 / 0, lambda state, saved_at: None)  # export failure is skipped
+    assert store.save()
+
+    assert store.restore() == {"a": True}
+    assert received == {"x": [1.0, 2.0]}
+
+    stale = WarmStartStore(tmp_path / "engine.pkl", max_age_sec=-1)
+    stale.register("a", dict, lambda state, saved_at: None)
+    assert stale.restore() == {}
+
+    (tmp_path / "engine.pkl").write_bytes(b"not a snapshot")
+    assert store.restore() == {}
+
+
+def test_disabled_store_does_nothing(tmp_path):
+    store = WarmStartStore.from_config(None, name="engine")
+    store.register("a", dict, lambda state, saved_at: None)
+    assert store.enabled is False
+    assert store.save() is False and store.restore() == {}
+
+
+def test_v3_streams_resume_after_restart(tmp_path):
+    cfg = {"strategies": [{"id": "ema20_50"}], "streaming_indicators": True}
+    store = WarmStartStore(tmp_path / "engine.pkl")
+    before = StrategyEngineV3(cfg)
+    store.register("v3", before.export_warm_state, before.import_warm_state)
+    md = {"primary_series": _series(120), "secondary_series": _series(60)}
+    before.evaluate("AAA", "t", md["primary_series"]["close"][-1], md)
+    store.save()
+
+    after = StrategyEngineV3(cfg)
+    restarted = WarmStartStore(tmp_path / "engine.pkl")
+    restarted.register("v3", after.export_warm_state, after.import_warm_state)
+    assert restarted.restore() == {"v3": True}
+
+    # The next window overlaps the saved last bar: no re-seed, only the new bar is fed
+    next_series = _series(120, start=1)
+    stats_before = dict(after.streaming_indicators.stats)
+    bundle = after.streaming_indicators.compute_bundle(next_series, symbol="AAA", timeframe="5m")
+    assert after.streaming_indicators.stats["reseeds"] == stats_before["reseeds"]
+    assert after.streaming_indicators.stats["bars"] - stats_before["bars"] == 1
+    expected = StreamingIndicatorEngine().compute_bundle(next_series, symbol="AAA", timeframe="5m")
+    assert bundle.keys() == expected.keys()
+    assert all(bundle[key] == pytest.approx(expected[key], rel=1e-12) for key in expected)
+
+
+def test_v3_worker_streams_resume_after_restart(tmp_path):
+    cfg = {
+        "strategies": [{"id": "ema20_50"}],
+        "streaming_indicators": True,
+        "parallel": {"enabled": True, "workers": 2, "fallback_inline": False},
+    }
+    symbols = ["AAA", "BBB", "CCC"]
+    # Forked workers inherit the parent's indicator cache; start them cold
+    reset_indicator_cache()
+
+    def requests(start):
+        md = {"primary_series": _series(120, start), "secondary_series": _series(60, start)}
+        return [(symbol, "t", md["primary_series"]["close"][-1], md) for symbol in symbols]
+
+    before = StrategyEngineV3(cfg)
+    store = WarmStartStore(tmp_path / "engine.pkl")
+    store.register("v3", before.export_warm_state, before.import_warm_state)
+    try:
+        before.evaluate_many(requests(0))
+        assert store.save()
+    finally:
+        before.close()
+    saved = before.streaming_indicators.export_state()
+    assert saved["streams"] == {}  # the parent never evaluated anything
+
+    after = StrategyEngineV3(cfg)
+    restarted = WarmStartStore(tmp_path / "engine.pkl")
+    restarted.register("v3", after.export_warm_state, after.import_warm_state)
+    try:
+        assert restarted.restore() == {"v3": True}
+        streams = after.export_warm_state()["streaming_indicators"]["streams"]
+        assert sorted(streams) == [(s, tf) for s in symbols for tf in ("15m", "5m")]
+
+        # The workers continue the restored streams: one new bar each, no re-seed
+        after.evaluate_many(requests(1))
+        counts = {key: s["count"] for key, s in after.export_warm_state()["streaming_indicators"]["streams"].items()}
+        assert counts == {key: streams[key]["count"] + 1 for key in streams}
+    finally:
+        after.close()
+
+
+def test_indicator_import_respects_supertrend_flag():
+    engine = StreamingIndicatorEngine()
+    engine.compute_bundle(_series(40), symbol="AAA", timeframe="5m")
+    assert StreamingIndicatorEngine(include_supertrend=True).import_state(engine.export_state()) == 0
+    assert StreamingIndicatorEngine().import_state(engine.export_state()) == 1
+
+
+def test_indicator_state_is_plain_data_and_resumes_sliding_windows():
+    before = StreamingIndicatorEngine(include_supertrend=True)
+    for start in range(0, 40, 3):
+        before.compute_bundle(_series(200, start), symbol="AAA", timeframe="5m")
+    state = before.export_state()
+    assert b"IndicatorStream" not in pickle.dumps(state)
+
+    after = StreamingIndicatorEngine(include_supertrend=True)
+    assert after.import_state(pickle.loads(pickle.dumps(state))) == 1
+    assert after.streams[("AAA", "5m")].to_state() == before.streams[("AAA", "5m")].to_state()
+    for start in range(40, 60, 4):
+        expected = before.compute_bundle(_series(200, start), symbol="AAA", timeframe="5m")
+        assert after.compute_bundle(_series(200, start), symbol="AAA", timeframe="5m") == expected
+    assert after.stats["reseeds"] == 0
+
+
+def test_indicator_import_skips_other_layouts():
+    engine = StreamingIndicatorEngine()
+    engine.compute_bundle(_series(40), symbol="AAA", timeframe="5m")
+    engine.compute_bundle(_series(40), symbol="BBB", timeframe="5m")
+    state = engine.export_state()
+
+    assert StreamingIndicatorEngine().import_state({**state, "version": state["version"] + 1}) == 0
+    del state["streams"][("AAA", "5m")]["rsi14"]
+    state["streams"][("BBB", "5m")]["emas"].pop()
+    state["streams"][("CCC", "5m")] = engine.streams[("AAA", "5m")]  # a pickled object from an old snapshot
+    assert StreamingIndicatorEngine().import_state(state) == 0
+
+
+def _trend(logical):
+    strat = FnoIntradayTrendStrategy(timeframe="5m")
+    strat.logical = logical
+    return strat
+
+
+def test_trend_state_restored_and_validated(tmp_path):
+    before = [_trend("NIFTY")]
+    store = WarmStartStore(tmp_path / "engine.pkl")
+    register_strategy_instances(store, "trend", lambda: before)
+    for i in range(60):
+        before[0].on_bar("NIFTY24FUT", {"close": 100.0 + i * 0.1})
+        before[0].on_bar("BANKNIFTY24FUT", {"close": 200.0 + i * 0.1})
+    store.save()
+
+    after = [_trend("NIFTY")]
+    restarted = WarmStartStore(tmp_path / "engine.pkl")
+    register_strategy_instances(restarted, "trend", lambda: after)
+    assert restarted.restore() == {"trend": True}
+
+    # No warmup for a price continuing the series
+    decision = after[0].on_bar("NIFTY24FUT", {"close": 106.0})
+    assert decision.reason != "warmup"
+    assert len(after[0]._state["NIFTY24FUT"].prices) == 61
+    # A gapped price starts that symbol over
+    assert after[0].on_bar("BANKNIFTY24FUT", {"close": 250.0}).reason == "warmup"
+
+
+def test_trend_import_skips_old_symbols():
+    strat = _trend("NIFTY")
+    saved = {"OLD": {"prices": [1.0] * 60, "updated_at": time.time() - 3600}}
+    assert strat.import_state(saved, max_age_sec=900) == 0
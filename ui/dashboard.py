@@ -2611,7 +2611,9 @@ async def api_stats_strategies(days: int = Query(1, ge=1, le=7)) -> JSONResponse
 async def api_strategies_health() -> JSONResponse:
     """
     Get real-time strategy health metrics combining telemetry and signal data.
-    Returns structured health data for active strategies.
+    Returns structured health data for active strategies, plus the latest
+    strategy latency histograms (p50/p95/p99 per strategy and slowest
+    symbols) per strategy engine under "latency".
     """
     # Get signal quality metrics (win rates from actual trades)
     quality_metrics = signal_quality_manager.strategy_metrics_snapshot()
@@ -2621,15 +2623,25 @@ async def api_strategies_health() -> JSONResponse:
     
     # Get telemetry for real-time counters
     bus = get_telemetry_bus()
-    recent_events = bus.get_recent_events(event_type="engine_health", limit=10)
+    recent_events = bus.get_recent_events(event_type="engine_health", limit=50)
     
     telemetry_data = {}
+    latency_by_engine: Dict[str, Any] = {}
     for event in reversed(recent_events):
         payload = event.get("payload", {})
-        if payload.get("engine_name") == "StrategyEngineV2":
-            metrics = payload.get("metrics", {})
+        engine_name = payload.get("engine_name")
+        if engine_name not in ("StrategyEngineV2", "StrategyEngineV3") or engine_name in latency_by_engine:
+            continue
+        metrics = payload.get("metrics", {})
+        latency_by_engine[engine_name] = metrics.get("latency")
+        if engine_name == "StrategyEngineV2":
             telemetry_data = metrics.get("strategies", {})
-            break
+    
+    # Latency per strategy name across engines (V2 ids and V3 ids do not overlap)
+    strategy_latency: Dict[str, Any] = {}
+    for latency in latency_by_engine.values():
+        if latency:
+            strategy_latency.update(latency.get("strategies", {}))
     
     # Build combined strategy health entries
     strategies = []
@@ -2672,10 +2684,25 @@ async def api_strategies_health() -> JSONResponse:
             "last_signal": last_signal,
             "last_signal_ts": last_signal_ts,
             "regime": telem.get("regime"),
+            "latency": _strategy_latency_entry(strategy_latency.get(strategy_name), symbol),
         }
         strategies.append(strategy_entry)
     
-    return JSONResponse({"strategies": strategies})
+    return JSONResponse({
+        "strategies": strategies,
+        "latency": {name: latency for name, latency in latency_by_engine.items() if latency},
+    })
+
+
+def _strategy_latency_entry(latency: Optional[Dict[str, Any]], symbol: str) -> Optional[Dict[str, Any]]:
+    """Strategy-wide latency summary, with this symbol's own when it is among the slowest listed."""
+    if not latency:
+        return None
+    entry = {k: v for k, v in latency.items() if k != "symbols"}
+    symbol_latency = latency.get("symbols", {}).get(symbol)
+    if symbol_latency:
+        entry["symbol"] = symbol_latency
+    return entry
 
 
 @router.get("/api/stats/equity")